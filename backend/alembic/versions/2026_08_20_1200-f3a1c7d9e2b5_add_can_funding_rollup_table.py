@@ -0,0 +1,59 @@
+"""add can_funding_rollup table
+
+Revision ID: f3a1c7d9e2b5
+Revises: b8c9d0e1f2a3
+Create Date: 2026-08-20 12:00:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "f3a1c7d9e2b5"
+down_revision: Union[str, None] = "b8c9d0e1f2a3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The table is populated by data_tools/src/rebuild_can_funding_rollup.py
+    op.create_table(
+        "can_funding_rollup",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("can_id", sa.Integer(), nullable=False),
+        sa.Column("fiscal_year", sa.Integer(), nullable=True),
+        sa.Column(
+            "status",
+            postgresql.ENUM(
+                "DRAFT",
+                "PLANNED",
+                "IN_EXECUTION",
+                "OBLIGATED",
+                "PLANNED_MOD",
+                name="budgetlineitemstatus",
+                create_type=False,
+            ),
+            nullable=True,
+        ),
+        sa.Column("amount", sa.Numeric(), nullable=False),
+        sa.Column("fees", sa.Numeric(), nullable=False),
+        sa.Column("budget", sa.Numeric(), nullable=False),
+        sa.Column("received", sa.Numeric(), nullable=False),
+        sa.ForeignKeyConstraint(["can_id"], ["can.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_can_funding_rollup_can_id_fiscal_year",
+        "can_funding_rollup",
+        ["can_id", "fiscal_year"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_can_funding_rollup_can_id_fiscal_year", table_name="can_funding_rollup")
+    op.drop_table("can_funding_rollup")
@@ -0,0 +1,52 @@
+"""add stored fiscal_year to budget_line_item
+
+Revision ID: 0c4e8a2d6f1b
+Revises: f3a1c7d9e2b5
+Create Date: 2026-08-27 12:00:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0c4e8a2d6f1b"
+down_revision: Union[str, None] = "f3a1c7d9e2b5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FISCAL_YEAR_EXPRESSION = (
+    "CASE WHEN EXTRACT(MONTH FROM date_needed) >= 10 "
+    "THEN CAST(EXTRACT(YEAR FROM date_needed) AS INTEGER) + 1 "
+    "ELSE CAST(EXTRACT(YEAR FROM date_needed) AS INTEGER) END"
+)
+
+
+def upgrade() -> None:
+    # A stored generated column is computed for the existing rows when it is added
+    op.add_column(
+        "budget_line_item",
+        sa.Column("fiscal_year", sa.Integer(), sa.Computed(FISCAL_YEAR_EXPRESSION, persisted=True), nullable=True),
+    )
+    # the column is derived from date_needed, so it is not versioned (see BudgetLineItem.__versioned__)
+
+    op.create_index(
+        "ix_budget_line_item_fiscal_year_status",
+        "budget_line_item",
+        ["fiscal_year", "status"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_budget_line_item_can_id_fiscal_year",
+        "budget_line_item",
+        ["can_id", "fiscal_year"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_budget_line_item_can_id_fiscal_year", table_name="budget_line_item")
+    op.drop_index("ix_budget_line_item_fiscal_year_status", table_name="budget_line_item")
+    op.drop_column("budget_line_item", "fiscal_year")
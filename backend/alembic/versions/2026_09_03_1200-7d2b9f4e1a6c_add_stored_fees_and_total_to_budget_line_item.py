@@ -0,0 +1,32 @@
+"""add stored fees and total to budget_line_item
+
+Revision ID: 7d2b9f4e1a6c
+Revises: 0c4e8a2d6f1b
+Create Date: 2026-09-03 12:00:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7d2b9f4e1a6c"
+down_revision: Union[str, None] = "0c4e8a2d6f1b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The columns are populated by data_tools/src/refresh_budget_line_item_totals.py; they are derived from the
+    # procurement shop fees, so they are not versioned (see BudgetLineItem.__versioned__)
+    op.add_column("budget_line_item", sa.Column("fees", sa.Numeric(), nullable=True))
+    op.add_column("budget_line_item", sa.Column("total", sa.Numeric(), nullable=True))
+    op.create_index("ix_budget_line_item_total", "budget_line_item", ["total"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_budget_line_item_total", table_name="budget_line_item")
+    op.drop_column("budget_line_item", "total")
+    op.drop_column("budget_line_item", "fees")
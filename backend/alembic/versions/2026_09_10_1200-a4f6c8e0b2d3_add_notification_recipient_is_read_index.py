@@ -0,0 +1,30 @@
+"""add notification recipient_id, is_read index
+
+Revision ID: a4f6c8e0b2d3
+Revises: 7d2b9f4e1a6c
+Create Date: 2026-09-10 12:00:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a4f6c8e0b2d3"
+down_revision: Union[str, None] = "7d2b9f4e1a6c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "idx_notification_recipient_is_read",
+        "notification",
+        ["recipient_id", "is_read"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_notification_recipient_is_read", table_name="notification")
@@ -0,0 +1,47 @@
+"""add trigram search indexes
+
+Revision ID: c3e7a1d5f9b2
+Revises: a4f6c8e0b2d3
+Create Date: 2026-09-17 12:00:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c3e7a1d5f9b2"
+down_revision: Union[str, None] = "a4f6c8e0b2d3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGRAM_INDEXES = [
+    ("ix_agreement_name_trgm", "agreement", "name"),
+    ("ix_agreement_nick_name_trgm", "agreement", "nick_name"),
+    ("ix_project_title_trgm", "project", "title"),
+    ("ix_project_short_title_trgm", "project", "short_title"),
+    ("ix_can_number_trgm", "can", "number"),
+    ("ix_can_nick_name_trgm", "can", "nick_name"),
+    ("ix_budget_line_item_line_description_trgm", "budget_line_item", "line_description"),
+]
+
+
+def upgrade() -> None:
+    # on Azure Database for PostgreSQL pg_trgm must be allow-listed in the azure.extensions server parameter
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for index_name, table_name, column_name in TRIGRAM_INDEXES:
+        op.create_index(
+            index_name,
+            table_name,
+            [column_name],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={column_name: "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    # the pg_trgm extension is left installed
+    for index_name, table_name, _ in reversed(TRIGRAM_INDEXES):
+        op.drop_index(index_name, table_name=table_name, postgresql_using="gin")
@@ -0,0 +1,50 @@
+"""add can_funding_rollup unique key
+
+Revision ID: d5b8f2a6c4e1
+Revises: c3e7a1d5f9b2
+Create Date: 2026-09-24 12:00:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d5b8f2a6c4e1"
+down_revision: Union[str, None] = "c3e7a1d5f9b2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Concurrent refreshes may have inserted the rows of a CAN twice, and budget lines without a status were
+    # rolled up into the CAN's funding row; run data_tools/src/rebuild_can_funding_rollup.py afterwards to
+    # recompute the rows removed here.
+    op.execute("""
+        DELETE FROM can_funding_rollup
+        WHERE can_id IN (
+            SELECT can_id
+            FROM can_funding_rollup
+            GROUP BY can_id, fiscal_year, status
+            HAVING count(*) > 1
+        )
+        """)
+    op.drop_index("ix_can_funding_rollup_can_id_fiscal_year", table_name="can_funding_rollup")
+    op.create_index(
+        "ix_can_funding_rollup_can_id_fiscal_year_status",
+        "can_funding_rollup",
+        ["can_id", "fiscal_year", "status"],
+        unique=True,
+        postgresql_nulls_not_distinct=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_can_funding_rollup_can_id_fiscal_year_status", table_name="can_funding_rollup")
+    op.create_index(
+        "ix_can_funding_rollup_can_id_fiscal_year",
+        "can_funding_rollup",
+        ["can_id", "fiscal_year"],
+        unique=False,
+    )
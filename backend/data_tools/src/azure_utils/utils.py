@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import codecs
 import csv
 import io
 import os
 import sys
 from dataclasses import dataclass
 from io import StringIO
+from typing import Iterable, Iterator
 from urllib.parse import urlparse
 
 from azure.core.credentials import AzureNamedKeyCredential
@@ -52,6 +54,70 @@ def blob_to_records(storage_account: AzureStorageAccount, file_name: str, dialec
     return csv.DictReader(StringIO(blob_string), dialect=dialect)
 
 
+FILE_CHUNK_SIZE = 4 * 1024 * 1024  # bytes read at a time from a local file when streaming
+
+
+def iter_blob_chunks(container_client: ContainerClient, blob_name: str) -> Iterator[bytes]:
+    """
+    Download a blob one chunk at a time (the container client's max_chunk_get_size, 4 MiB by default).
+
+    :param container_client: The blob container client.
+    :param blob_name: The name of the blob.
+
+    :return: An iterator of the blob's chunks.
+    """
+    size = 0
+    for chunk in container_client.download_blob(blob_name).chunks():
+        size += len(chunk)
+        yield chunk
+    logger.info(f"Downloaded {size} bytes.")
+
+
+def iter_file_chunks(path: str, chunk_size: int = FILE_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Read a local file one chunk at a time.
+
+    :param path: The path of the file.
+    :param chunk_size: The number of bytes to read at a time.
+
+    :return: An iterator of the file's chunks.
+    """
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            yield chunk
+
+
+def iter_lines(chunks: Iterable[bytes], encoding: str = "utf-8") -> Iterator[str]:
+    """
+    Decode chunks of bytes into lines (ending with "\n", like the lines of a StringIO). Characters and lines
+    split across chunks are reassembled, so only one chunk and one partial line are held in memory.
+
+    :param chunks: The chunks of bytes, e.g. from iter_blob_chunks or iter_file_chunks.
+    :param encoding: The encoding of the bytes.
+
+    :return: An iterator of the lines.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    pending = ""
+    for chunk in chunks:
+        *lines, pending = (pending + decoder.decode(chunk)).split("\n")
+        for line in lines:
+            yield line + "\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+def stream_records(chunks: Iterable[bytes], dialect: str = "excel-tab") -> csv.DictReader:
+    """
+    A DictReader reading the rows of a CSV file from chunks of bytes as they are iterated.
+
+    :param chunks: The chunks of bytes, e.g. from iter_blob_chunks or iter_file_chunks.
+    :param dialect: The CSV dialect to use when reading the file.
+    """
+    return csv.DictReader(iter_lines(chunks), dialect=dialect)
+
+
 @dataclass
 class AzureVaultPath:
     url: str
@@ -61,7 +127,9 @@ class AzureVaultPath:
 PYTEST_CONFIG = PytestConfig()
 
 
-def get_csv(csv_path: str, config: DataToolsConfig = PYTEST_CONFIG, dialect: str = "excel-tab") -> csv.DictReader:
+def get_csv(
+    csv_path: str, config: DataToolsConfig = PYTEST_CONFIG, dialect: str = "excel-tab", stream: bool = False
+) -> csv.DictReader:
     """
     Get a CSV file from a local path or a remote URL. If the path is a remote URL,
     the file will be downloaded from Azure Blob Storage.
@@ -69,6 +137,8 @@ def get_csv(csv_path: str, config: DataToolsConfig = PYTEST_CONFIG, dialect: str
     :param csv_path: The path to the CSV file. This can be a local path or a remote URL.
     :param config: The configuration object.
     :param dialect: The CSV dialect to use when reading the file.
+    :param stream: Read the file in chunks as the rows are iterated (see stream_records) instead of
+        downloading it first.
     """
     logger.debug(f"Getting CSV file from {csv_path}.")
     logger.debug(f"Using config: {config}")
@@ -79,7 +149,7 @@ def get_csv(csv_path: str, config: DataToolsConfig = PYTEST_CONFIG, dialect: str
     if parts.scheme == "https":
         # file is remote
         if config.file_storage_auth_method == "rbac":
-            return get_csv_using_mi_or_rbac(parts, dialect=dialect)
+            return get_csv_using_mi_or_rbac(parts, dialect=dialect, stream=stream)
 
         elif config.file_storage_auth_method == "access_key":
             storage_account = AzureStorageAccount(
@@ -88,26 +158,34 @@ def get_csv(csv_path: str, config: DataToolsConfig = PYTEST_CONFIG, dialect: str
                 account_url=f"https://{parts.hostname}",
                 access_key=get_secret(config.vault_url, config.vault_file_storage_key),
             )
-            return blob_to_records(storage_account, "/".join(parts.path.split("/")[2:]), dialect=dialect)
+            blob_name = "/".join(parts.path.split("/")[2:])
+            if stream:
+                return stream_records(iter_blob_chunks(get_container_client(storage_account), blob_name), dialect)
+            return blob_to_records(storage_account, blob_name, dialect=dialect)
         elif config.file_storage_auth_method == "mi":
-            return get_csv_using_mi_or_rbac(parts, dialect=dialect)
+            return get_csv_using_mi_or_rbac(parts, dialect=dialect, stream=stream)
         else:
             raise ValueError("Invalid value for FILE_STORAGE_AUTH_METHOD.")
     else:
         # file is local
+        if stream:
+            return stream_records(iter_file_chunks(csv_path), dialect)
         return csv.DictReader(open(csv_path, "r"), dialect=dialect)
 
 
 MI_CLIENT_ID = os.getenv("MI_CLIENT_ID")
 
 
-def get_csv_using_mi_or_rbac(parts: tuple, dialect: str = "excel-tab", client_id: str = MI_CLIENT_ID) -> csv.DictReader:
+def get_csv_using_mi_or_rbac(
+    parts: tuple, dialect: str = "excel-tab", client_id: str = MI_CLIENT_ID, stream: bool = False
+) -> csv.DictReader:
     """
     Get a CSV file from a remote URL using Managed Identity.
 
     :param parts: The parsed URL parts.
     :param dialect: The CSV dialect to use when reading the file.
     :param client_id: The client ID to use for Managed Identity.
+    :param stream: Read the blob in chunks as the rows are iterated instead of downloading it first.
     """
     account_url = f"https://{parts.hostname}"
     logger.debug(f"Using Managed Identity with account URL: {account_url}")
@@ -122,6 +200,9 @@ def get_csv_using_mi_or_rbac(parts: tuple, dialect: str = "excel-tab", client_id
         credential = DefaultAzureCredential()
     else:
         credential = DefaultAzureCredential(managed_identity_client_id=client_id)
+    if stream:
+        chunks = _iter_blob_chunks_using_credential(account_url, credential, container_name, blob_name)
+        return stream_records(chunks, dialect)
     with BlobServiceClient(account_url, credential=credential) as blob_service_client:
         container_client = blob_service_client.get_container_client(container=container_name)
         bytes_data = get_blob(container_client, blob_name)
@@ -130,6 +211,15 @@ def get_csv_using_mi_or_rbac(parts: tuple, dialect: str = "excel-tab", client_id
         return csv.DictReader(io.StringIO(stream_str), dialect=dialect)
 
 
+def _iter_blob_chunks_using_credential(
+    account_url: str, credential, container_name: str, blob_name: str
+) -> Iterator[bytes]:
+    """Download a blob one chunk at a time, keeping the BlobServiceClient open until the last chunk is read."""
+    with BlobServiceClient(account_url, credential=credential) as blob_service_client:
+        container_client = blob_service_client.get_container_client(container=container_name)
+        yield from iter_blob_chunks(container_client, blob_name)
+
+
 def get_blob(container_client: ContainerClient, blob_name: str) -> bytes:
     """
     Download a blob to bytes.
@@ -0,0 +1,120 @@
+"""
+Helpers for the bulk mode of the spreadsheet loaders (the default; ``load_data.py --safe`` loads one row at a
+time instead).
+
+In bulk mode a loader prefetches the reference tables it looks rows up in (agreements, CANs, procurement
+shops, ...) into dictionaries keyed by their natural key, stages a chunk of rows in the session, flushes them
+together (SQLAlchemy batches the INSERTs and UPDATEs of a flush into executemany calls), creates the chunk's
+OpsEvents and history events, and commits once per chunk. Rows are still written through the ORM so the
+OpsDBHistory audit (see common/db.py setup_triggers) records them.
+
+If a row fails, the rows of its chunk are rolled back and the error is raised; earlier chunks stay committed.
+
+The chunks are committed inside keep_loaded_on_commit, so the prefetched reference objects stay loaded from one
+chunk (or batch) to the next instead of being expired and refreshed one SELECT at a time.
+
+With ``load_data.py --stream`` the CSV is also read in chunks (see azure_utils/utils.py stream_records) and
+converted, validated and loaded one batch of rows at a time (see validated_batches), so a large spreadsheet is
+never held in memory whole. A validation error then stops the load at the first invalid batch, after the
+batches before it were committed.
+"""
+
+import os
+from contextlib import contextmanager
+from typing import Callable, Hashable, Iterable, Iterator, TypeVar
+
+from loguru import logger
+from sqlalchemy.orm import Session, scoped_session
+
+T = TypeVar("T")
+
+BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", "500"))
+
+
+def chunked(items: Iterable[T], size: int = BULK_CHUNK_SIZE) -> Iterator[list[T]]:
+    """
+    Split items into lists of at most size items.
+
+    :param items: The items to split.
+    :param size: The maximum number of items in a chunk.
+
+    :return: An iterator of the chunks.
+    """
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+@contextmanager
+def keep_loaded_on_commit(session: Session) -> Iterator[Session]:
+    """
+    Stop the session from expiring its objects when it commits (expire_on_commit=False) within the block.
+
+    :param session: The database session (or scoped session) to use.
+
+    :return: A context manager yielding the session.
+    """
+    # the option belongs to the Session itself, which a scoped_session does not proxy
+    target = session() if isinstance(session, scoped_session) else session
+    expire_on_commit = target.expire_on_commit
+    target.expire_on_commit = False
+    try:
+        yield session
+    finally:
+        target.expire_on_commit = expire_on_commit
+
+
+def validated_batches(
+    rows: Iterable[dict],
+    to_data: Callable[[dict], T],
+    validate: Callable[[T], bool],
+    size: int = BULK_CHUNK_SIZE,
+) -> Iterator[list[T]]:
+    """
+    Convert and validate rows (e.g. a streamed csv.DictReader) one batch at a time.
+
+    :param rows: The rows to convert.
+    :param to_data: A function converting a row to a data instance, e.g. create_can_data.
+    :param validate: A function validating a data instance, e.g. validate_data.
+    :param size: The maximum number of rows in a batch.
+
+    :return: An iterator of the batches of data instances.
+    :raises RuntimeError: If a row of a batch is invalid; the batches before it have already been yielded.
+    """
+    count = 0
+    for rows_chunk in chunked(rows, size):
+        batch = [to_data(row) for row in rows_chunk]
+        # validate every row of the batch so each invalid row is logged
+        if sum(1 for d in batch if validate(d)) != len(batch):
+            logger.error(f"Validation failed in rows {count + 1} to {count + len(batch)}. Exiting.")
+            raise RuntimeError("Validation failed.")
+        count += len(batch)
+        yield batch
+    logger.info(f"Validated {count} rows.")
+
+
+def index_by(items: Iterable[T], key: Callable[[T], Hashable]) -> dict[Hashable, T]:
+    """
+    Index items by a natural key. Items whose key is None are skipped; if several items have the same key the
+    first one is kept and a warning is logged.
+
+    :param items: The items to index, e.g. the result of a query.
+    :param key: A function returning the natural key of an item.
+
+    :return: A dict of {key: item}.
+    """
+    index = {}
+    for item in items:
+        item_key = key(item)
+        if item_key is None:
+            continue
+        if item_key in index:
+            logger.warning(f"Duplicate key {item_key} for {item}; using {index[item_key]}")
+            continue
+        index[item_key] = item
+    return index
@@ -6,8 +6,10 @@ from typing import List, Optional
 
 from loguru import logger
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
+from data_tools.src.common.bulk import chunked, index_by, keep_loaded_on_commit, validated_batches
+from data_tools.src.common.utils import commit_or_rollback
 from models import (
     CAN,
     CANFundingDetails,
@@ -114,24 +116,71 @@ def validate_all(data: List[CANData]) -> bool:
     return sum(1 for d in data if validate_data(d)) == len(data)
 
 
-def _find_existing_can(data: CANData, session: Session) -> Optional[CAN]:
+@dataclass
+class CANReferences:
+    """
+    The CANs and portfolios prefetched for the bulk mode, keyed by their natural keys.
+    """
+
+    cans_by_id: dict[int, CAN]
+    cans_by_number: dict[str, CAN]
+    portfolios_by_abbreviation: dict[str, Portfolio]
+
+    @classmethod
+    def load(cls, session: Session) -> "CANReferences":
+        """
+        Load every CAN (with its funding details) and portfolio.
+
+        :param session: The database session to use.
+
+        :return: A CANReferences instance.
+        """
+        cans = session.execute(select(CAN).options(selectinload(CAN.funding_details))).scalars().all()
+        portfolios = session.execute(select(Portfolio)).scalars().all()
+        return cls(
+            cans_by_id=index_by(cans, lambda can: can.id),
+            cans_by_number=index_by(cans, lambda can: can.number),
+            portfolios_by_abbreviation=index_by(portfolios, lambda portfolio: portfolio.abbreviation),
+        )
+
+    def add_can(self, can: CAN) -> None:
+        """
+        Index a CAN created by an earlier row, so later rows find it.
+
+        :param can: The new CAN.
+        """
+        if can.id:
+            self.cans_by_id.setdefault(can.id, can)
+        self.cans_by_number.setdefault(can.number, can)
+
+
+def _find_existing_can(data: CANData, session: Session, references: Optional[CANReferences] = None) -> Optional[CAN]:
     """
     Look up an existing CAN by SYS_CAN_ID, falling back to a lookup by CAN_NBR.
 
     :param data: The CANData instance to use.
     :param session: The database session to use.
+    :param references: The prefetched CANs (bulk mode), or None to query the database.
 
     :return: The existing CAN, or None if not found.
     """
-    can = session.get(CAN, data.SYS_CAN_ID) if data.SYS_CAN_ID else None
+    if references:
+        can = references.cans_by_id.get(data.SYS_CAN_ID) if data.SYS_CAN_ID else None
+    else:
+        can = session.get(CAN, data.SYS_CAN_ID) if data.SYS_CAN_ID else None
     if not can:
-        can = session.execute(select(CAN).where(CAN.number == data.CAN_NBR)).scalar_one_or_none()
+        if references:
+            can = references.cans_by_number.get(data.CAN_NBR)
+        else:
+            can = session.execute(select(CAN).where(CAN.number == data.CAN_NBR)).scalar_one_or_none()
         if can:
             logger.info(f"*** found existing CAN by number {can.number} instead of ID")
     return can
 
 
-def _resolve_portfolio(data: CANData, is_new: bool, session: Session) -> Optional[Portfolio]:
+def _resolve_portfolio(
+    data: CANData, is_new: bool, session: Session, references: Optional[CANReferences] = None
+) -> Optional[Portfolio]:
     """
     Resolve PORTFOLIO to a Portfolio. Required when creating a new CAN; a blank PORTFOLIO on an
     update returns None so the caller can leave the CAN's existing portfolio alone.
@@ -139,6 +188,7 @@ def _resolve_portfolio(data: CANData, is_new: bool, session: Session) -> Optiona
     :param data: The CANData instance to use.
     :param is_new: Whether this row is creating a brand-new CAN.
     :param session: The database session to use.
+    :param references: The prefetched portfolios (bulk mode), or None to query the database.
 
     :return: The resolved Portfolio, or None if PORTFOLIO was blank on an update.
     :raises ValueError: If PORTFOLIO is blank on a new CAN, or doesn't match a known Portfolio.
@@ -147,7 +197,12 @@ def _resolve_portfolio(data: CANData, is_new: bool, session: Session) -> Optiona
         if is_new:
             raise ValueError("PORTFOLIO is required when creating a new CAN.")
         return None
-    portfolio = session.execute(select(Portfolio).where(Portfolio.abbreviation == data.PORTFOLIO)).scalar_one_or_none()
+    if references:
+        portfolio = references.portfolios_by_abbreviation.get(data.PORTFOLIO)
+    else:
+        portfolio = session.execute(
+            select(Portfolio).where(Portfolio.abbreviation == data.PORTFOLIO)
+        ).scalar_one_or_none()
     if not portfolio:
         raise ValueError(f"Portfolio not found for {data.PORTFOLIO}")
     return portfolio
@@ -277,33 +332,52 @@ def _track_funding_details_changes(can: CAN, old_funding_details: dict, is_new:
     )
 
 
-def _record_can_event(can: CAN, sys_user: User, session: Session, is_new: bool, changes: dict) -> None:
+def _create_can_event(can: CAN, sys_user: User, is_new: bool, changes: dict) -> Optional[OpsEvent]:
     """
-    Create and commit the OpsEvent (CREATE_NEW_CAN or UPDATE_CAN) and fire the history trigger. No
-    event is created for an update with no actual changes.
+    Create the OpsEvent (CREATE_NEW_CAN or UPDATE_CAN) of an upserted CAN. No event is created for an
+    update with no actual changes.
 
-    :param can: The CAN that was just created/updated.
+    :param can: The CAN that was just created/updated (and flushed).
     :param sys_user: The system user to use.
-    :param session: The database session to use.
     :param is_new: Whether this row created a brand-new CAN.
     :param changes: The changes dict from updating the CAN and its funding_details.
+
+    :return: The OpsEvent, or None if there were no changes.
     """
     if not is_new and not changes:
         logger.info(f"No changes detected for CAN with id {can.id} and number {can.number}, skipping event creation")
-        return
+        return None
 
     event = OpsEvent(event_status=OpsEventStatus.SUCCESS, created_by=sys_user.id)
     if is_new:
         event.event_type = OpsEventType.CREATE_NEW_CAN
         event.event_details = {"new_can": can.to_dict()}
-        session.add(event)
-        session.commit()
-        logger.info(f"Created Ops Event for new CAN with id {can.id} and number {can.number}")
     else:
         event.event_type = OpsEventType.UPDATE_CAN
         event.event_details = {"can_updates": {"owner_id": can.id, "changes": changes}}
-        session.add(event)
-        session.commit()
+    return event
+
+
+def _record_can_event(can: CAN, sys_user: User, session: Session, is_new: bool, changes: dict) -> None:
+    """
+    Create and commit the OpsEvent (CREATE_NEW_CAN or UPDATE_CAN) and fire the history trigger. No
+    event is created for an update with no actual changes.
+
+    :param can: The CAN that was just created/updated.
+    :param sys_user: The system user to use.
+    :param session: The database session to use.
+    :param is_new: Whether this row created a brand-new CAN.
+    :param changes: The changes dict from updating the CAN and its funding_details.
+    """
+    event = _create_can_event(can, sys_user, is_new, changes)
+    if not event:
+        return
+
+    session.add(event)
+    session.commit()
+    if is_new:
+        logger.info(f"Created Ops Event for new CAN with id {can.id} and number {can.number}")
+    else:
         logger.info(
             f"Created Ops Event for existing CAN with id {can.id} and number {can.number} with {len(changes)} changes"
         )
@@ -311,58 +385,78 @@ def _record_can_event(can: CAN, sys_user: User, session: Session, is_new: bool,
     can_history_trigger_func(event, session, sys_user)
 
 
-def create_models(data: CANData, sys_user: User, session: Session) -> None:
+def _stage_can(
+    data: CANData, sys_user: User, session: Session, references: Optional[CANReferences] = None
+) -> tuple[CAN, bool, dict]:
     """
-    Upsert a CAN and its associated CANFundingDetails.
+    Upsert a CAN and its associated CANFundingDetails in the session, without committing.
 
     :param data: The CanData instance to convert.
     :param sys_user: The system user to use.
     :param session: The database session to use.
+    :param references: The prefetched CANs and portfolios (bulk mode), or None to query the database.
+
+    :return: The CAN, whether it is new and the changes made to an existing CAN.
     """
-    logger.debug(f"Creating models for {data}")
+    base_date = datetime(data.FISCAL_YEAR - 1, 10, 1)
+
+    can = _find_existing_can(data, session, references)
+    is_new = can is None
+
+    portfolio = _resolve_portfolio(data, is_new, session, references)
+
+    changes = {}
+    old_funding_details = {}
+
+    if can:
+        if can.funding_details:
+            old_funding_details = _capture_funding_details_values(can.funding_details)
+        changes = _update_can_fields(can, data, portfolio, sys_user)
+    else:
+        can = CAN(
+            id=data.SYS_CAN_ID if data.SYS_CAN_ID else None,
+            number=data.CAN_NBR,
+            description=data.CAN_DESCRIPTION,
+            nick_name=data.NICK_NAME,
+            portfolio=portfolio,
+            created_by=sys_user.id,
+            updated_by=sys_user.id,
+            created_on=base_date,
+            updated_on=base_date,
+        )
 
     try:
-        base_date = datetime(data.FISCAL_YEAR - 1, 10, 1)
+        validate_fund_code(data)
+        can.funding_details = get_or_create_funding_details(data, sys_user, can.funding_details)
+        changes.update(_track_funding_details_changes(can, old_funding_details, is_new))
+    except ValueError as e:
+        # Intentional: a new CAN with an invalid fund code, or missing required
+        # METHOD_OF_TRANSFER/FUNDING_SOURCE, still gets created with funding_details=None
+        # rather than failing the whole row. See test_create_models_new_can_blank_*.
+        logger.warning(
+            f"Skipping creating funding details for {data} due to invalid or missing required funding data. {e}"
+        )
 
-        can = _find_existing_can(data, session)
-        is_new = can is None
+    if is_new:
+        session.add(can)
+        if references:
+            references.add_can(can)
 
-        portfolio = _resolve_portfolio(data, is_new, session)
+    return can, is_new, changes
 
-        changes = {}
-        old_funding_details = {}
 
-        if can:
-            if can.funding_details:
-                old_funding_details = _capture_funding_details_values(can.funding_details)
-            changes = _update_can_fields(can, data, portfolio, sys_user)
-        else:
-            can = CAN(
-                id=data.SYS_CAN_ID if data.SYS_CAN_ID else None,
-                number=data.CAN_NBR,
-                description=data.CAN_DESCRIPTION,
-                nick_name=data.NICK_NAME,
-                portfolio=portfolio,
-                created_by=sys_user.id,
-                updated_by=sys_user.id,
-                created_on=base_date,
-                updated_on=base_date,
-            )
-
-        try:
-            validate_fund_code(data)
-            can.funding_details = get_or_create_funding_details(data, sys_user, can.funding_details)
-            changes.update(_track_funding_details_changes(can, old_funding_details, is_new))
-        except ValueError as e:
-            # Intentional: a new CAN with an invalid fund code, or missing required
-            # METHOD_OF_TRANSFER/FUNDING_SOURCE, still gets created with funding_details=None
-            # rather than failing the whole row. See test_create_models_new_can_blank_*.
-            logger.warning(
-                f"Skipping creating funding details for {data} due to invalid or missing required funding data. {e}"
-            )
+def create_models(data: CANData, sys_user: User, session: Session) -> None:
+    """
+    Upsert a CAN and its associated CANFundingDetails.
 
-        if is_new:
-            session.add(can)
+    :param data: The CanData instance to convert.
+    :param sys_user: The system user to use.
+    :param session: The database session to use.
+    """
+    logger.debug(f"Creating models for {data}")
+
+    try:
+        can, is_new, changes = _stage_can(data, sys_user, session)
 
         if os.getenv("DRY_RUN"):
             logger.info("Dry run enabled. Rolling back transaction.")
@@ -500,6 +594,49 @@ def create_all_models(data: List[CANData], sys_user: User, session: Session) ->
         create_models(d, sys_user, session)
 
 
+def create_all_models_bulk(
+    data: List[CANData], sys_user: User, session: Session, references: Optional[CANReferences] = None
+) -> None:
+    """
+    Upsert the CANs of a list of CanData instances in chunks (see common/bulk.py): the CANs and portfolios
+    are prefetched, and each chunk is flushed, its OpsEvents and history events created and committed together.
+
+    :param data: The list of CanData instances to convert.
+    :param sys_user: The system user to use.
+    :param session: The database session to use.
+    :param references: The prefetched CANs and portfolios, when loading several batches of rows.
+    """
+    if references is None:
+        references = CANReferences.load(session)
+        logger.info(
+            f"Prefetched {len(references.cans_by_number)} CANs and "
+            f"{len(references.portfolios_by_abbreviation)} portfolios."
+        )
+
+    with keep_loaded_on_commit(session):
+        for chunk in chunked(data):
+            try:
+                staged = []
+                for d in chunk:
+                    logger.debug(f"Creating models for {d}")
+                    staged.append(_stage_can(d, sys_user, session, references))
+                session.flush()
+
+                events = [_create_can_event(can, sys_user, is_new, changes) for can, is_new, changes in staged]
+                events = [event for event in events if event]
+                session.add_all(events)
+                session.flush()  # populate the events' id and created_on before the history trigger reads them
+                for event in events:
+                    can_history_trigger_func(event, session, sys_user, dry_run=True)
+
+                commit_or_rollback(session)
+                logger.info(f"Upserted {len(chunk)} CANs with {len(events)} events")
+            except Exception as e:
+                session.rollback()
+                logger.error(f"Error creating models for a chunk of {len(chunk)} CANs: {e}")
+                raise e
+
+
 def create_all_can_data(data: List[dict]) -> List[CANData]:
     """
     Convert a list of dictionaries to a list of CanData instances.
@@ -511,13 +648,16 @@ def create_all_can_data(data: List[dict]) -> List[CANData]:
     return [create_can_data(d) for d in data]
 
 
-def transform(data: DictReader, session: Session, sys_user: User) -> None:
+def transform(data: DictReader, session: Session, sys_user: User, bulk: bool = False, stream: bool = False) -> None:
     """
     Transform the data from the CSV file and persist the models to the database.
 
     :param data: The data from the CSV file.
     :param session: The database session to use.
     :param sys_user: The system user to use.
+    :param bulk: Load the rows in chunks (see common/bulk.py) instead of one at a time.
+    :param stream: Convert, validate and load the rows in bulk one batch at a time (see common/bulk.py) instead of
+        validating every row before loading any.
 
     :return: None
     """
@@ -528,6 +668,13 @@ def transform(data: DictReader, session: Session, sys_user: User) -> None:
         logger.error("No data to process. Exiting.")
         raise RuntimeError("No data to process.")
 
+    if stream:
+        references = CANReferences.load(session)
+        for batch in validated_batches(data, create_can_data, validate_data):
+            create_all_models_bulk(batch, sys_user, session, references)
+        logger.info("Finished loading models.")
+        return
+
     can_data = create_all_can_data(list(data))
     logger.info(f"Created {len(can_data)} CAN data instances.")
 
@@ -537,5 +684,8 @@ def transform(data: DictReader, session: Session, sys_user: User) -> None:
 
     logger.info("Data validation passed.")
 
-    create_all_models(can_data, sys_user, session)
+    if bulk:
+        create_all_models_bulk(can_data, sys_user, session)
+    else:
+        create_all_models(can_data, sys_user, session)
     logger.info("Finished loading models.")
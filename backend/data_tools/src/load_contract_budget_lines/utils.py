@@ -9,7 +9,8 @@ from loguru import logger
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from data_tools.src.common.utils import get_sc
+from data_tools.src.common.bulk import chunked, index_by, keep_loaded_on_commit, validated_batches
+from data_tools.src.common.utils import commit_or_rollback, get_sc
 from models import (
     CAN,
     CLIN,
@@ -165,116 +166,174 @@ def validate_all(data: List[BudgetLineItemData]) -> bool:
     return sum(1 for d in data if validate_data(d)) == len(data)
 
 
-def create_models(data: BudgetLineItemData, sys_user: User, session: Session) -> None:
+@dataclass
+class ContractBudgetLineReferences:
+    """
+    The reference rows prefetched for the bulk mode, keyed by their natural keys.
     """
-    Create and persist the BudgetLineItem models.
 
-    :param data: The BudgetLineItemData instance to convert.
-    :param sys_user: The system user to use.
-    :param session: The database session to use.
+    contracts_by_maps_sys_id: dict[int, ContractAgreement]
+    object_class_codes_by_code: dict[int, ObjectClassCode]
 
-    :return: A list of BaseModel instances.
+    @classmethod
+    def load(cls, session: Session) -> "ContractBudgetLineReferences":
+        """
+        Load every contract agreement and object class code.
+
+        :param session: The database session to use.
+
+        :return: A ContractBudgetLineReferences instance.
+        """
+        contracts = session.execute(select(ContractAgreement)).scalars().all()
+        object_class_codes = session.execute(select(ObjectClassCode)).scalars().all()
+        return cls(
+            contracts_by_maps_sys_id=index_by(contracts, lambda contract: contract.maps_sys_id),
+            object_class_codes_by_code=index_by(object_class_codes, lambda code: code.code),
+        )
+
+
+def _find_contract(
+    data: BudgetLineItemData, session: Session, references: Optional[ContractBudgetLineReferences] = None
+) -> ContractAgreement | None:
+    if references:
+        return references.contracts_by_maps_sys_id.get(data.SYS_CONTRACT_ID)
+    return session.execute(
+        select(ContractAgreement).where(ContractAgreement.maps_sys_id == data.SYS_CONTRACT_ID)
+    ).scalar_one_or_none()
+
+
+def _find_object_class_code(
+    data: BudgetLineItemData, session: Session, references: Optional[ContractBudgetLineReferences] = None
+) -> ObjectClassCode | None:
+    if references:
+        return references.object_class_codes_by_code.get(data.OBJECT_CLASS_CODE)
+    return session.execute(
+        select(ObjectClassCode).where(ObjectClassCode.code == data.OBJECT_CLASS_CODE)
+    ).scalar_one_or_none()
+
+
+def _stage_budget_line(
+    data: BudgetLineItemData,
+    sys_user: User,
+    session: Session,
+    references: Optional[ContractBudgetLineReferences] = None,
+) -> OpsEvent:
     """
-    logger.debug(f"Creating models for {data}")
+    Create or update the BudgetLineItem of a row, its OpsEvent and history events in the session, without
+    committing.
 
-    try:
-        # Create BudgetLineItem model
-        contract = session.execute(
-            select(ContractAgreement).where(ContractAgreement.maps_sys_id == data.SYS_CONTRACT_ID)
-        ).scalar_one_or_none()
+    :return: The OpsEvent of the row.
+    """
+    # Create BudgetLineItem model
+    contract = _find_contract(data, session, references)
 
-        if not contract:
-            raise ValueError(f"ContractAgreement with SYS_CONTRACT_ID {data.SYS_CONTRACT_ID} not found.")
+    if not contract:
+        raise ValueError(f"ContractAgreement with SYS_CONTRACT_ID {data.SYS_CONTRACT_ID} not found.")
 
-        object_class_code = session.execute(
-            select(ObjectClassCode).where(ObjectClassCode.code == data.OBJECT_CLASS_CODE)
-        ).scalar_one_or_none()
+    object_class_code = _find_object_class_code(data, session, references)
+
+    can = session.get(CAN, data.SYS_CAN_ID)
+
+    sc = get_sc(
+        data.CLIN_NAME,
+        data.SYS_CONTRACT_ID,
+        ContractAgreement,
+        session,
+        sys_user,
+        start_date=data.POP_START_DATE,
+        end_date=data.POP_END_DATE,
+    )
+    clin = get_clin(data, session, contract=contract)
+    invoice = get_invoice(data, session)
+    mod = get_mod(data, session, contract=contract)
+
+    bli = ContractBudgetLineItem(
+        id=data.SYS_BUDGET_ID,
+        line_description=data.LINE_DESCRIPTION,
+        comments=data.COMMENTS,
+        agreement_id=contract.id,
+        can_id=can.id if can else None,
+        services_component=sc,
+        clin=clin,
+        amount=data.AMOUNT,
+        status=data.STATUS,
+        on_hold=data.ON_HOLD,
+        certified=data.CERTIFIED,
+        closed=data.CLOSED,
+        closed_by=data.CLOSED_BY,
+        closed_date=data.CLOSE_DATE,
+        date_needed=data.DATE_NEEDED,
+        extend_pop_to=data.EXTEND_POP_TO,
+        start_date=data.PERF_START_DATE,
+        end_date=data.PERF_END_DATE,
+        proc_shop_fee_percentage=data.OVERWRITE_PSC_FEE_RATE,
+        invoice=invoice,
+        object_class_code_id=object_class_code.id if object_class_code else None,
+        mod=mod,
+        doc_received=data.DOC_RECEIVED,
+        psc_fee_doc_number=data.PSC_FEE_DOC_NBR,
+        psc_fee_pymt_ref_nbr=data.PSC_FEE_PYMT_REF_NBR,
+        obligation_date=data.OBLIGATION_DATE,
+        created_by=sys_user.id,
+        updated_by=sys_user.id,
+    )
 
-        can = session.get(CAN, data.SYS_CAN_ID)
+    existing_bli = session.get(BudgetLineItem, data.SYS_BUDGET_ID)
 
-        sc = get_sc(
-            data.CLIN_NAME,
-            data.SYS_CONTRACT_ID,
-            ContractAgreement,
-            session,
-            sys_user,
-            start_date=data.POP_START_DATE,
-            end_date=data.POP_END_DATE,
+    if existing_bli:
+        updates = generate_events_update(existing_bli.to_dict(), bli.to_dict(), existing_bli.id, sys_user.id)
+        bli.id = existing_bli.id
+        bli.created_on = existing_bli.created_on
+        bli.created_by = existing_bli.created_by
+        ops_event = OpsEvent(
+            event_type=OpsEventType.UPDATE_BLI,
+            event_status=OpsEventStatus.SUCCESS,
+            created_by=sys_user.id,
+            event_details={
+                "bli_updates": updates,
+                "bli": bli.to_dict(),
+            },
         )
-        clin = get_clin(data, session)
-        invoice = get_invoice(data, session)
-        mod = get_mod(data, session)
-
-        bli = ContractBudgetLineItem(
-            id=data.SYS_BUDGET_ID,
-            line_description=data.LINE_DESCRIPTION,
-            comments=data.COMMENTS,
-            agreement_id=contract.id,
-            can_id=can.id if can else None,
-            services_component=sc,
-            clin=clin,
-            amount=data.AMOUNT,
-            status=data.STATUS,
-            on_hold=data.ON_HOLD,
-            certified=data.CERTIFIED,
-            closed=data.CLOSED,
-            closed_by=data.CLOSED_BY,
-            closed_date=data.CLOSE_DATE,
-            date_needed=data.DATE_NEEDED,
-            extend_pop_to=data.EXTEND_POP_TO,
-            start_date=data.PERF_START_DATE,
-            end_date=data.PERF_END_DATE,
-            proc_shop_fee_percentage=data.OVERWRITE_PSC_FEE_RATE,
-            invoice=invoice,
-            object_class_code_id=object_class_code.id if object_class_code else None,
-            mod=mod,
-            doc_received=data.DOC_RECEIVED,
-            psc_fee_doc_number=data.PSC_FEE_DOC_NBR,
-            psc_fee_pymt_ref_nbr=data.PSC_FEE_PYMT_REF_NBR,
-            obligation_date=data.OBLIGATION_DATE,
+        session.add(ops_event)
+    else:
+        session.add(bli)
+        session.flush()
+        # Set up event for BLI created
+        ops_event = OpsEvent(
+            event_type=OpsEventType.CREATE_BLI,
+            event_status=OpsEventStatus.SUCCESS,
             created_by=sys_user.id,
-            updated_by=sys_user.id,
+            event_details={
+                "new_bli": bli.to_dict(),
+            },
         )
+        session.add(ops_event)
 
-        existing_bli = session.get(BudgetLineItem, data.SYS_BUDGET_ID)
-
-        if existing_bli:
-            updates = generate_events_update(existing_bli.to_dict(), bli.to_dict(), existing_bli.id, sys_user.id)
-            bli.id = existing_bli.id
-            bli.created_on = existing_bli.created_on
-            bli.created_by = existing_bli.created_by
-            ops_event = OpsEvent(
-                event_type=OpsEventType.UPDATE_BLI,
-                event_status=OpsEventStatus.SUCCESS,
-                created_by=sys_user.id,
-                event_details={
-                    "bli_updates": updates,
-                    "bli": bli.to_dict(),
-                },
-            )
-            session.add(ops_event)
-        else:
-            session.add(bli)
-            session.flush()
-            # Set up event for BLI created
-            ops_event = OpsEvent(
-                event_type=OpsEventType.CREATE_BLI,
-                event_status=OpsEventStatus.SUCCESS,
-                created_by=sys_user.id,
-                event_details={
-                    "new_bli": bli.to_dict(),
-                },
-            )
-            session.add(ops_event)
+    logger.debug(f"Created BudgetLineItem model for {bli.to_dict()}")
 
-        logger.debug(f"Created BudgetLineItem model for {bli.to_dict()}")
+    session.flush()
+    session.merge(bli)
+    # Set Dry Run true so that we don't commit at the end of the function
+    # This allows us to rollback the session if dry_run is enabled or not commit changes
+    # if something errors after this point
+    agreement_history_trigger_func(ops_event, session, sys_user, dry_run=True)
+    return ops_event
 
-        session.flush()
-        session.merge(bli)
-        # Set Dry Run true so that we don't commit at the end of the function
-        # This allows us to rollback the session if dry_run is enabled or not commit changes
-        # if something errors after this point
-        agreement_history_trigger_func(ops_event, session, sys_user, dry_run=True)
+
+def create_models(data: BudgetLineItemData, sys_user: User, session: Session) -> None:
+    """
+    Create and persist the BudgetLineItem models.
+
+    :param data: The BudgetLineItemData instance to convert.
+    :param sys_user: The system user to use.
+    :param session: The database session to use.
+
+    :return: A list of BaseModel instances.
+    """
+    logger.debug(f"Creating models for {data}")
+
+    try:
+        _stage_budget_line(data, sys_user, session)
         if os.getenv("DRY_RUN"):
             logger.info("Dry run enabled. Rolling back transaction.")
             session.rollback()
@@ -299,6 +358,42 @@ def create_all_models(data: List[BudgetLineItemData], sys_user: User, session: S
         create_models(d, sys_user, session)
 
 
+def create_all_models_bulk(
+    data: List[BudgetLineItemData],
+    sys_user: User,
+    session: Session,
+    references: Optional[ContractBudgetLineReferences] = None,
+) -> None:
+    """
+    Create or update the BudgetLineItem models of a list of BudgetLineItemData instances in chunks (see
+    common/bulk.py): the contract agreements and object class codes are prefetched, and the rows of a chunk
+    are committed together.
+
+    :param data: The list of BudgetLineItemData instances to convert.
+    :param sys_user: The system user to use.
+    :param session: The database session to use.
+    :param references: The prefetched contract agreements and object class codes, when loading several batches.
+
+    :return: None
+    """
+    if references is None:
+        references = ContractBudgetLineReferences.load(session)
+        logger.info(f"Prefetched {len(references.contracts_by_maps_sys_id)} contract agreements.")
+
+    with keep_loaded_on_commit(session):
+        for chunk in chunked(data):
+            try:
+                for d in chunk:
+                    logger.debug(f"Creating models for {d}")
+                    _stage_budget_line(d, sys_user, session, references)
+                commit_or_rollback(session)
+                logger.info(f"Loaded {len(chunk)} budget lines.")
+            except Exception as e:
+                logger.error(f"Error creating models for a chunk of {len(chunk)} budget lines")
+                session.rollback()
+                raise e
+
+
 def create_all_budget_line_item_data(data: List[dict]) -> List[BudgetLineItemData]:
     """
     Convert a list of dictionaries to a list of BudgetLineItemData instances.
@@ -310,13 +405,16 @@ def create_all_budget_line_item_data(data: List[dict]) -> List[BudgetLineItemDat
     return [create_budget_line_item_data(d) for d in data]
 
 
-def transform(data: DictReader, session: Session, sys_user: User) -> None:
+def transform(data: DictReader, session: Session, sys_user: User, bulk: bool = False, stream: bool = False) -> None:
     """
     Transform the data from the CSV file and persist the models to the database.
 
     :param data: The data from the CSV file.
     :param session: The database session to use.
     :param sys_user: The system user to use.
+    :param bulk: Load the rows in chunks (see common/bulk.py) instead of one at a time.
+    :param stream: Convert, validate and load the rows in bulk one batch at a time (see common/bulk.py) instead of
+        validating every row before loading any.
 
     :return: None
     """
@@ -324,6 +422,13 @@ def transform(data: DictReader, session: Session, sys_user: User) -> None:
         logger.error("No data to process. Exiting.")
         raise RuntimeError("No data to process.")
 
+    if stream:
+        references = ContractBudgetLineReferences.load(session)
+        for batch in validated_batches(data, create_budget_line_item_data, validate_data):
+            create_all_models_bulk(batch, sys_user, session, references)
+        logger.info("Finished loading models.")
+        return
+
     budget_line_item_data = create_all_budget_line_item_data(list(data))
     logger.info(f"Created {len(budget_line_item_data)} BudgetLineItemData instances.")
 
@@ -333,11 +438,14 @@ def transform(data: DictReader, session: Session, sys_user: User) -> None:
 
     logger.info("Data validation passed.")
 
-    create_all_models(budget_line_item_data, sys_user, session)
+    if bulk:
+        create_all_models_bulk(budget_line_item_data, sys_user, session)
+    else:
+        create_all_models(budget_line_item_data, sys_user, session)
     logger.info("Finished loading models.")
 
 
-def get_clin(data: BudgetLineItemData, session: Session) -> CLIN | None:
+def get_clin(data: BudgetLineItemData, session: Session, contract: Optional[ContractAgreement] = None) -> CLIN | None:
     # only create a clin if the clin id is present
     if not data.SYS_CLIN_ID:
         return None
@@ -357,9 +465,7 @@ def get_clin(data: BudgetLineItemData, session: Session) -> CLIN | None:
         if not clin:
             # if not, create a new clin
 
-            contract = session.execute(
-                select(ContractAgreement).where(ContractAgreement.maps_sys_id == data.SYS_CONTRACT_ID)
-            ).scalar_one_or_none()
+            contract = contract or _find_contract(data, session)
 
             clin = CLIN(
                 id=data.SYS_CLIN_ID,
@@ -392,10 +498,10 @@ def get_invoice(data: BudgetLineItemData, session: Session) -> Invoice | None:
     return invoice
 
 
-def get_mod(data: BudgetLineItemData, session: Session) -> AgreementMod | None:
-    contract = session.execute(
-        select(ContractAgreement).where(ContractAgreement.maps_sys_id == data.SYS_CONTRACT_ID)
-    ).scalar_one_or_none()
+def get_mod(
+    data: BudgetLineItemData, session: Session, contract: Optional[ContractAgreement] = None
+) -> AgreementMod | None:
+    contract = contract or _find_contract(data, session)
 
     # only create a mod if the mod number is present and the contract exists
     if not data.MOD_NBR or not contract:
@@ -1,16 +1,18 @@
 import os
 import sys
 import time
+from typing import Callable, Iterable
 
 import click
 from dotenv import load_dotenv
 from loguru import logger
 from sqlalchemy import text
-from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.orm import Session, scoped_session, sessionmaker
 
 from data_tools.src.azure_utils.utils import get_csv
 from data_tools.src.common.db import init_db_from_config, setup_triggers
 from data_tools.src.common.utils import get_config, get_or_create_sys_user
+from models import User
 
 load_dotenv(os.getenv("ENV_FILE", ".env"))
 
@@ -30,40 +32,144 @@ LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 logger.remove()  # Remove default handlers
 logger.add(sys.stderr, format=format, level=LOG_LEVEL)
 
+LOAD_TYPES = [
+    "projects",
+    "contract_budget_lines",
+    "contracts",
+    "grant_budget_lines",
+    "grants",
+    "users",
+    "cans",
+    "vendors",
+    "iaas",
+    "iaa_budget_lines",
+    "iaa_agency",
+    "direct_obligations",
+    "direct_obligation_budget_lines",
+    "master_spreadsheet_budget_lines",
+    "remove_budget_lines",
+    "team_members",
+    "remove_agreements",
+    "update_budget_line_type",
+    "procurement_shops",
+    "obe_budget_lines",
+    "aas",
+    "ops_contracts",
+    "roles",
+    "master_spreadsheet_budget_lines_v2",
+    "award_date",
+    "agreement_missing_data",
+]
+
+# The types whose loaders prefetch their reference tables and commit in chunks (see common/bulk.py)
+# unless --safe is passed.
+BULK_LOAD_TYPES = {"cans", "contract_budget_lines", "master_spreadsheet_budget_lines_v2"}
+
+
+def get_transform(type: str) -> Callable:
+    """
+    Import the transform function of a data type.
+
+    :param type: The type of data to load, e.g. "cans".
+
+    :return: The loader's transform function.
+    """
+    match type:
+        case "projects":
+            from data_tools.src.load_projects.utils import transform
+        case "contract_budget_lines":
+            from data_tools.src.load_contract_budget_lines.utils import transform
+        case "contracts":
+            from data_tools.src.load_contracts.utils import transform
+        case "grant_budget_lines":
+            from data_tools.src.load_grant_budget_lines.utils import transform
+        case "grants":
+            from data_tools.src.load_grants.utils import transform
+        case "users":
+            from data_tools.src.load_users.utils import transform
+        case "cans":
+            from data_tools.src.load_cans.utils import transform
+        case "vendors":
+            from data_tools.src.load_vendors.utils import transform
+        case "iaas":
+            from data_tools.src.load_iaas.utils import transform
+        case "iaa_budget_lines":
+            from data_tools.src.load_iaa_budget_lines.utils import transform
+        case "iaa_agency":
+            from data_tools.src.load_iaa_agency.utils import transform
+        case "direct_obligations":
+            from data_tools.src.load_direct_obligations.utils import transform
+        case "direct_obligation_budget_lines":
+            from data_tools.src.load_direct_obligation_budget_lines.utils import transform
+        case "master_spreadsheet_budget_lines":
+            from data_tools.src.load_master_spreadsheet_budget_lines.utils import transform
+        case "team_members":
+            from data_tools.src.load_team_members.utils import transform
+        case "remove_budget_lines":
+            from data_tools.src.load_remove_budget_lines.utils import transform
+        case "remove_agreements":
+            from data_tools.src.load_remove_agreements.utils import transform
+        case "update_budget_line_type":
+            from data_tools.src.update_budget_line_type.utils import transform
+        case "procurement_shops":
+            from data_tools.src.load_procurement_shops.utils import transform
+        case "obe_budget_lines":
+            from data_tools.src.load_obe_budget_lines.utils import transform
+        case "aas":
+            from data_tools.src.load_aas.utils import transform
+        case "ops_contracts":
+            from data_tools.src.load_ops_contracts.utils import transform
+        case "roles":
+            from data_tools.src.load_roles.utils import transform
+        case "master_spreadsheet_budget_lines_v2":
+            from data_tools.src.load_master_spreadsheet_budget_lines_v2.utils import transform
+        case "award_date":
+            from data_tools.src.load_award_date.utils import transform
+        case "agreement_missing_data":
+            from data_tools.src.load_agreement_missing_data.utils import transform
+        case _:
+            raise ValueError(f"Unsupported data type: {type}")
+
+    return transform
+
+
+def load(
+    session: Session,
+    sys_user: User,
+    type: str,
+    csv_f: Iterable[dict],
+    first_run: bool = False,
+    safe: bool = False,
+    stream: bool = False,
+) -> None:
+    """
+    Load the rows of a CSV file of a data type.
+
+    :param session: The database session to use.
+    :param sys_user: The system user to use.
+    :param type: The type of data to load, e.g. "cans".
+    :param csv_f: The rows of the CSV file.
+    :param first_run: Process all agreement types (master_spreadsheet_budget_lines only).
+    :param safe: Load one row at a time instead of in chunks (BULK_LOAD_TYPES only).
+    :param stream: Validate and load the rows one batch at a time (BULK_LOAD_TYPES only).
+    """
+    transform = get_transform(type)
+
+    # Pass is_first_run only for master_spreadsheet_budget_lines
+    if type == "master_spreadsheet_budget_lines":
+        transform(csv_f, session, sys_user, is_first_run=first_run)
+    elif type in BULK_LOAD_TYPES:
+        transform(csv_f, session, sys_user, bulk=not safe, stream=stream)
+    else:
+        transform(csv_f, session, sys_user)
+
 
 @click.command()
 @click.option("--env", help="The environment to use.")
 @click.option(
     "--type",
     type=click.Choice(
-        [
-            "projects",
-            "contract_budget_lines",
-            "contracts",
-            "grant_budget_lines",
-            "grants",
-            "users",
-            "cans",
-            "vendors",
-            "iaas",
-            "iaa_budget_lines",
-            "iaa_agency",
-            "direct_obligations",
-            "direct_obligation_budget_lines",
-            "master_spreadsheet_budget_lines",
-            "remove_budget_lines",
-            "team_members",
-            "remove_agreements",
-            "update_budget_line_type",
-            "procurement_shops",
-            "obe_budget_lines",
-            "aas",
-            "ops_contracts",
-            "roles",
-            "master_spreadsheet_budget_lines_v2",
-            "award_date",
-            "agreement_missing_data",
-        ],
+        LOAD_TYPES,
         case_sensitive=False,
     ),
     required=True,
@@ -76,11 +182,25 @@ logger.add(sys.stderr, format=format, level=LOG_LEVEL)
     default=False,
     help="Process all agreement types including contracts (used for first run only).",
 )
+@click.option(
+    "--safe",
+    is_flag=True,
+    default=False,
+    help="Load one row at a time, committing each row, instead of in chunks.",
+)
+@click.option(
+    "--stream",
+    is_flag=True,
+    default=False,
+    help="Read the CSV in chunks and validate and load it one batch of rows at a time (cannot be used with --safe).",
+)
 def main(
     env: str,
     type: str,
     input_csv: str,
     first_run: bool,
+    safe: bool,
+    stream: bool,
 ):
     """
     Main entrypoint for the script.
@@ -89,6 +209,9 @@ def main(
     logger.debug(f"Data type: {type}")
     logger.debug(f"Input CSV: {input_csv}")
 
+    if safe and stream:
+        raise click.UsageError("--stream loads the rows in bulk and cannot be used with --safe.")
+
     logger.info("Starting the ETL process.")
 
     script_config = get_config(env)
@@ -102,7 +225,7 @@ def main(
         conn.execute(text("SELECT 1"))
         logger.info("Successfully connected to the database.")
 
-    csv_f = get_csv(input_csv, script_config)
+    csv_f = get_csv(input_csv, script_config, stream=stream)
 
     logger.info(f"Loaded CSV file from {input_csv}.")
 
@@ -115,67 +238,7 @@ def main(
         setup_triggers(session, sys_user)
 
         try:
-            match type:
-                case "projects":
-                    from data_tools.src.load_projects.utils import transform
-                case "contract_budget_lines":
-                    from data_tools.src.load_contract_budget_lines.utils import transform
-                case "contracts":
-                    from data_tools.src.load_contracts.utils import transform
-                case "grant_budget_lines":
-                    from data_tools.src.load_grant_budget_lines.utils import transform
-                case "grants":
-                    from data_tools.src.load_grants.utils import transform
-                case "users":
-                    from data_tools.src.load_users.utils import transform
-                case "cans":
-                    from data_tools.src.load_cans.utils import transform
-                case "vendors":
-                    from data_tools.src.load_vendors.utils import transform
-                case "iaas":
-                    from data_tools.src.load_iaas.utils import transform
-                case "iaa_budget_lines":
-                    from data_tools.src.load_iaa_budget_lines.utils import transform
-                case "iaa_agency":
-                    from data_tools.src.load_iaa_agency.utils import transform
-                case "direct_obligations":
-                    from data_tools.src.load_direct_obligations.utils import transform
-                case "direct_obligation_budget_lines":
-                    from data_tools.src.load_direct_obligation_budget_lines.utils import transform
-                case "master_spreadsheet_budget_lines":
-                    from data_tools.src.load_master_spreadsheet_budget_lines.utils import transform
-                case "team_members":
-                    from data_tools.src.load_team_members.utils import transform
-                case "remove_budget_lines":
-                    from data_tools.src.load_remove_budget_lines.utils import transform
-                case "remove_agreements":
-                    from data_tools.src.load_remove_agreements.utils import transform
-                case "update_budget_line_type":
-                    from data_tools.src.update_budget_line_type.utils import transform
-                case "procurement_shops":
-                    from data_tools.src.load_procurement_shops.utils import transform
-                case "obe_budget_lines":
-                    from data_tools.src.load_obe_budget_lines.utils import transform
-                case "aas":
-                    from data_tools.src.load_aas.utils import transform
-                case "ops_contracts":
-                    from data_tools.src.load_ops_contracts.utils import transform
-                case "roles":
-                    from data_tools.src.load_roles.utils import transform
-                case "master_spreadsheet_budget_lines_v2":
-                    from data_tools.src.load_master_spreadsheet_budget_lines_v2.utils import transform
-                case "award_date":
-                    from data_tools.src.load_award_date.utils import transform
-                case "agreement_missing_data":
-                    from data_tools.src.load_agreement_missing_data.utils import transform
-                case _:
-                    raise ValueError(f"Unsupported data type: {type}")
-
-            # Pass is_first_run only for master_spreadsheet_budget_lines
-            if type == "master_spreadsheet_budget_lines":
-                transform(csv_f, session, sys_user, is_first_run=first_run)
-            else:
-                transform(csv_f, session, sys_user)
+            load(session, sys_user, type, csv_f, first_run=first_run, safe=safe, stream=stream)
         except RuntimeError as re:
             logger.error(f"Error transforming data: {re}")
             sys.exit(1)
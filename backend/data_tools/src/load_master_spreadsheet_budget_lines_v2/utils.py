@@ -1,4 +1,5 @@
 import os
+from collections import defaultdict
 from csv import DictReader
 from dataclasses import dataclass, field
 from datetime import date, datetime
@@ -9,6 +10,7 @@ from loguru import logger
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from data_tools.src.common.bulk import chunked, index_by, keep_loaded_on_commit, validated_batches
 from data_tools.src.common.utils import (
     calculate_proc_fee_percentage,
     commit_or_rollback,
@@ -24,6 +26,7 @@ from models import (
     AABudgetLineItem,
     Agreement,
     AgreementType,
+    BudgetLineItem,
     BudgetLineItemStatus,
     ContractBudgetLineItem,
     DirectObligationBudgetLineItem,
@@ -112,7 +115,86 @@ class BudgetLineItemData:
             self.STATUS = get_bli_status(self.STATUS)
 
 
-def _resolve_procurement_fee(data, proc_shop, agreement, session):
+@dataclass
+class BudgetLineReferences:
+    """
+    The reference rows prefetched for the bulk mode, keyed by their natural keys.
+    """
+
+    agreements_by_name_and_type: dict[tuple[str, AgreementType], Agreement]
+    cans_by_number: dict[str, CAN]
+    procurement_shops_by_abbr: dict[str, ProcurementShop]
+    procurement_shop_fees_by_shop_id: dict[int, list[ProcurementShopFee]]
+    budget_lines_by_id: dict[int, BudgetLineItem]
+
+    @classmethod
+    def load(cls, session: Session, data: List[BudgetLineItemData]) -> "BudgetLineReferences":
+        """
+        Load every agreement, CAN, procurement shop and procurement shop fee, and the budget lines of the rows.
+
+        :param session: The database session to use.
+        :param data: The rows to load.
+
+        :return: A BudgetLineReferences instance.
+        """
+        agreements = session.execute(select(Agreement)).scalars().all()
+        cans = session.execute(select(CAN)).scalars().all()
+        procurement_shops = session.execute(select(ProcurementShop)).scalars().all()
+        procurement_shop_fees = defaultdict(list)
+        for fee in session.execute(select(ProcurementShopFee)).scalars():
+            procurement_shop_fees[fee.procurement_shop_id].append(fee)
+        references = cls(
+            agreements_by_name_and_type=index_by(agreements, lambda a: (a.name, a.agreement_type)),
+            cans_by_number=index_by(cans, lambda can: can.number),
+            procurement_shops_by_abbr=index_by(procurement_shops, lambda shop: shop.abbr),
+            procurement_shop_fees_by_shop_id=dict(procurement_shop_fees),
+            budget_lines_by_id={},
+        )
+        references.load_budget_lines(session, data)
+        return references
+
+    def load_budget_lines(self, session: Session, data: List[BudgetLineItemData]) -> None:
+        """
+        Replace the prefetched budget lines with the budget lines of the rows, e.g. for the next batch of rows.
+
+        :param session: The database session to use.
+        :param data: The rows to load.
+        """
+        budget_line_ids = [d.ID for d in data if d.ID]
+        budget_lines = (
+            session.execute(select(BudgetLineItem).where(BudgetLineItem.id.in_(budget_line_ids))).scalars().all()
+            if budget_line_ids
+            else []
+        )
+        self.budget_lines_by_id = index_by(budget_lines, lambda bli: bli.id)
+
+
+def _find_procurement_shop_fee(
+    proc_shop: ProcurementShop,
+    fee_percentage: Decimal,
+    session: Session,
+    references: Optional[BudgetLineReferences] = None,
+) -> Optional[ProcurementShopFee]:
+    """Find a fee of the procurement shop within 0.01 of fee_percentage."""
+    low, high = fee_percentage - Decimal(0.01), fee_percentage + Decimal(0.01)
+    if references:
+        return next(
+            (
+                fee
+                for fee in references.procurement_shop_fees_by_shop_id.get(proc_shop.id, [])
+                if fee.fee is not None and low <= fee.fee <= high
+            ),
+            None,
+        )
+    return session.scalar(
+        select(ProcurementShopFee).where(
+            ProcurementShopFee.procurement_shop_id == proc_shop.id,
+            ProcurementShopFee.fee.between(low, high),
+        )
+    )
+
+
+def _resolve_procurement_fee(data, proc_shop, agreement, session, references=None):
     """Resolve procurement shop assignment and fee lookup. Returns procurement_shop_fee_id."""
     if proc_shop and agreement and proc_shop != agreement.procurement_shop:
         agreement.procurement_shop = proc_shop
@@ -127,12 +209,7 @@ def _resolve_procurement_fee(data, proc_shop, agreement, session):
         else:
             calc_result = calculate_proc_fee_percentage(Decimal(data.PROC_SHOP_FEE), Decimal(data.AMOUNT))
             fee_percentage = calc_result * 100 if calc_result else 0
-            procurement_shop_fee = session.scalar(
-                select(ProcurementShopFee).where(
-                    ProcurementShopFee.procurement_shop_id == proc_shop.id,
-                    ProcurementShopFee.fee.between(fee_percentage - Decimal(0.01), fee_percentage + Decimal(0.01)),
-                )
-            )
+            procurement_shop_fee = _find_procurement_shop_fee(proc_shop, fee_percentage, session, references)
             if procurement_shop_fee:
                 procurement_shop_fee_id = procurement_shop_fee.id
                 if agreement and not agreement.procurement_shop:
@@ -145,159 +222,212 @@ def _resolve_procurement_fee(data, proc_shop, agreement, session):
     return procurement_shop_fee_id
 
 
-def _find_agreement_and_can(data, session):
+def _find_agreement_and_can(data, session, references=None):
     """Find the agreement and CAN for the budget line item."""
-    agreement = session.execute(
-        select(Agreement)
-        .where(Agreement.name == data.AGREEMENT_NAME)
-        .where(Agreement.agreement_type == data.AGREEMENT_TYPE)
-    ).scalar_one_or_none()
+    can_number = data.CAN.split(" ")[0] if data.CAN else None
+    if references:
+        agreement = references.agreements_by_name_and_type.get((data.AGREEMENT_NAME, data.AGREEMENT_TYPE))
+        can = references.cans_by_number.get(can_number)
+    else:
+        agreement = session.execute(
+            select(Agreement)
+            .where(Agreement.name == data.AGREEMENT_NAME)
+            .where(Agreement.agreement_type == data.AGREEMENT_TYPE)
+        ).scalar_one_or_none()
+        can = session.execute(select(CAN).where(CAN.number == can_number)).scalar_one_or_none()
 
     if not agreement:
         logger.warning(f"Agreement with Agreement Name {data.AGREEMENT_NAME} not found.")
 
-    can_number = data.CAN.split(" ")[0] if data.CAN else None
-    can = session.execute(select(CAN).where(CAN.number == can_number)).scalar_one_or_none()
-
     if not can:
         logger.warning(f"CAN with number {can_number} not found.")
 
     return agreement, can
 
 
-def create_models(data: BudgetLineItemData, sys_user: User, session: Session) -> None:
-    """
-    Create and persist the models to the database.
+def _find_procurement_shop(data, session, references=None):
+    """Find the procurement shop of the budget line item."""
+    if references:
+        return references.procurement_shops_by_abbr.get(data.PROC_SHOP)
+    return session.scalar(select(ProcurementShop).where(ProcurementShop.abbr == data.PROC_SHOP))
+
+
+def _find_budget_line_item(data, bli_class, session, references=None):
+    """Find the existing budget line item of the row, if it is of the row's agreement type."""
+    if references:
+        budget_line_item = references.budget_lines_by_id.get(data.ID)
+        return budget_line_item if isinstance(budget_line_item, bli_class) else None
+    return session.execute(select(bli_class).where(bli_class.id == data.ID)).scalar_one_or_none()
+
+
+def _stage_budget_line(
+    data: BudgetLineItemData,
+    sys_user: User,
+    session: Session,
+    references: Optional[BudgetLineReferences] = None,
+) -> Optional[tuple]:
     """
-    logger.debug(f"Creating models for {data}.")
+    Create or update the budget line item of a row in the session, without committing.
 
-    try:
-        agreement, can = _find_agreement_and_can(data, session)
-
-        # Get the Procurement Shop if it exists
-        proc_shop = session.scalar(select(ProcurementShop).where(ProcurementShop.abbr == data.PROC_SHOP))
-        procurement_shop_fee_id = _resolve_procurement_fee(data, proc_shop, agreement, session)
-
-        # Determine which subclass to instantiate
-        bli_class = {
-            AgreementType.CONTRACT: ContractBudgetLineItem,
-            AgreementType.GRANT: GrantBudgetLineItem,
-            AgreementType.DIRECT_OBLIGATION: DirectObligationBudgetLineItem,
-            AgreementType.IAA: IAABudgetLineItem,
-            AgreementType.AA: AABudgetLineItem,
-        }.get(data.AGREEMENT_TYPE, None)
-
-        # Handle the case where the bli subclass is not found
-        if not bli_class:
-            logger.warning(f"Unable to map AgreementType={data.AGREEMENT_TYPE} to a BudgetLineItem subclass.")
-            return
+    :return: (budget line item, agreement, existing budget line dict before the update or None if it is new),
+        or None if the row is skipped.
+    """
+    agreement, can = _find_agreement_and_can(data, session, references)
+
+    # Get the Procurement Shop if it exists
+    proc_shop = _find_procurement_shop(data, session, references)
+    procurement_shop_fee_id = _resolve_procurement_fee(data, proc_shop, agreement, session, references)
+
+    # Determine which subclass to instantiate
+    bli_class = {
+        AgreementType.CONTRACT: ContractBudgetLineItem,
+        AgreementType.GRANT: GrantBudgetLineItem,
+        AgreementType.DIRECT_OBLIGATION: DirectObligationBudgetLineItem,
+        AgreementType.IAA: IAABudgetLineItem,
+        AgreementType.AA: AABudgetLineItem,
+    }.get(data.AGREEMENT_TYPE, None)
+
+    # Handle the case where the bli subclass is not found
+    if not bli_class:
+        logger.warning(f"Unable to map AgreementType={data.AGREEMENT_TYPE} to a BudgetLineItem subclass.")
+        return None
+
+    sc = None
+    if agreement:
+        sc = get_sc(data.SC, agreement.id, get_agreement_class_from_type(data.AGREEMENT_TYPE), session, sys_user)
+        if sc:
+            session.add(sc)
+            if references and sc.id is None:
+                # the session does not autoflush; flush the new services component so later rows find it
+                session.flush()
+
+    existing_budget_line_item = _find_budget_line_item(data, bli_class, session, references)
+
+    if not existing_budget_line_item and data.ID:
+        logger.warning(f"BudgetLineItem with SYS_BUDGET_ID {data.ID} not found.")
+        return None
+
+    if not existing_budget_line_item:
+        # Create a new BudgetLineItem subclass
+        bli = bli_class(
+            budget_line_item_type=data.AGREEMENT_TYPE if data.AGREEMENT_TYPE else None,
+            line_description=data.LINE_DESC,
+            comments=data.COMMENTS,
+            agreement_id=agreement.id if agreement else None,
+            agreement=agreement if agreement else None,
+            can_id=can.id if can else None,
+            can=can if can else None,
+            amount=data.AMOUNT,
+            status=data.STATUS,
+            date_needed=data.DATE_NEEDED,
+            procurement_shop_fee_id=procurement_shop_fee_id,
+            services_component=sc,
+            service_component_name_for_sort=sc.display_name_for_sort if sc else None,
+            created_by=sys_user.id,
+            created_on=datetime.now(),
+        )
+        session.add(bli)
+        return bli, agreement, None
+
+    existing_bli_dict = existing_budget_line_item.to_dict()  # capture before mutating for diff
+    bli = existing_budget_line_item
+    bli.line_description = data.LINE_DESC
+    bli.comments = data.COMMENTS
+    bli.agreement_id = agreement.id if agreement else None
+    bli.agreement = agreement if agreement else None
+    bli.can_id = can.id if can else None
+    bli.can = can if can else None
+    bli.amount = data.AMOUNT
+    bli.status = data.STATUS
+    bli.date_needed = data.DATE_NEEDED
+    bli.procurement_shop_fee_id = procurement_shop_fee_id
+    bli.services_component = sc
+    bli.service_component_name_for_sort = sc.display_name_for_sort if sc else None
+    bli.updated_by = sys_user.id
+    bli.updated_on = datetime.now()
+    session.add(bli)
+    return bli, agreement, existing_bli_dict
+
+
+def _link_procurement_action(bli, agreement, data: BudgetLineItemData, sys_user: User, session: Session) -> bool:
+    """
+    Link an IN_EXECUTION budget line of a contract, IAA or AA to its agreement's procurement action.
 
-        sc = None
-        if agreement:
-            sc = get_sc(data.SC, agreement.id, get_agreement_class_from_type(data.AGREEMENT_TYPE), session, sys_user)
-            if sc:
-                session.add(sc)
+    :return: True if the budget line was linked.
+    """
+    procurement_eligible_types = {AgreementType.CONTRACT, AgreementType.IAA, AgreementType.AA}
+    if (
+        bli.status != BudgetLineItemStatus.IN_EXECUTION
+        or not agreement
+        or data.AGREEMENT_TYPE not in procurement_eligible_types
+    ):
+        return False
+
+    is_mod = has_obligated_blis(session, agreement.id)
+    if is_mod:
+        action, _, _, _ = get_or_create_procurement_records_for_modification(
+            session, agreement, created_by=sys_user.id, source="SpreadsheetIngest"
+        )
+    else:
+        action, _, _, _ = get_or_create_procurement_records_for_new_award(
+            session, agreement, created_by=sys_user.id, source="SpreadsheetIngest"
+        )
+    link_blis_to_action(session, agreement, action, BudgetLineItemStatus.IN_EXECUTION)
+    return True
 
-        existing_budget_line_item = session.execute(
-            select(bli_class).where(bli_class.id == data.ID)
-        ).scalar_one_or_none()
 
-        if not existing_budget_line_item and data.ID:
-            logger.warning(f"BudgetLineItem with SYS_BUDGET_ID {data.ID} not found.")
-            return
+def _create_bli_event(bli, existing_bli_dict: Optional[dict], sys_user: User) -> OpsEvent:
+    """Create the OPSEvent of a BLI create/update with the correct payload shape for each case."""
+    if existing_bli_dict is None:
+        return OpsEvent(
+            event_type=OpsEventType.CREATE_BLI,
+            event_status=OpsEventStatus.SUCCESS,
+            created_by=sys_user.id,
+            event_details={"new_bli": bli.to_dict()},
+        )
+    updates = generate_events_update(existing_bli_dict, bli.to_dict(), bli.id, sys_user.id)
+    return OpsEvent(
+        event_type=OpsEventType.UPDATE_BLI,
+        event_status=OpsEventStatus.SUCCESS,
+        created_by=sys_user.id,
+        event_details={"bli_updates": updates, "bli": bli.to_dict()},
+    )
 
-        if not existing_budget_line_item:
-            # Create a new BudgetLineItem subclass
-            bli = bli_class(
-                budget_line_item_type=data.AGREEMENT_TYPE if data.AGREEMENT_TYPE else None,
-                line_description=data.LINE_DESC,
-                comments=data.COMMENTS,
-                agreement_id=agreement.id if agreement else None,
-                agreement=agreement if agreement else None,
-                can_id=can.id if can else None,
-                can=can if can else None,
-                amount=data.AMOUNT,
-                status=data.STATUS,
-                date_needed=data.DATE_NEEDED,
-                procurement_shop_fee_id=procurement_shop_fee_id,
-                services_component=sc,
-                service_component_name_for_sort=sc.display_name_for_sort if sc else None,
-                created_by=sys_user.id,
-                created_on=datetime.now(),
-            )
 
-            session.add(bli)
-            commit_or_rollback(session)
+def _log_new_budget_line(data: BudgetLineItemData, bli) -> None:
+    """Record the new SYS_BUDGET_ID to manually update the spreadsheet later."""
+    logger.warning(
+        f"***Manually update BudgetLineItem.id in Budget Spreadsheet: original Agreement "
+        f"Name={data.AGREEMENT_NAME}, Agreement Type={data.AGREEMENT_TYPE}"
+        f"original LINE_DESC={data.LINE_DESC}, created SYS_BUDGET_ID = {bli.id}.***"
+    )
 
-            logger.info(f"CREATED {bli_class.__name__} model for {bli.to_dict()}")
 
-        else:
-            existing_bli_dict = existing_budget_line_item.to_dict()  # capture before mutating for diff
-            bli = existing_budget_line_item
-            bli.line_description = data.LINE_DESC
-            bli.comments = data.COMMENTS
-            bli.agreement_id = agreement.id if agreement else None
-            bli.agreement = agreement if agreement else None
-            bli.can_id = can.id if can else None
-            bli.can = can if can else None
-            bli.amount = data.AMOUNT
-            bli.status = data.STATUS
-            bli.date_needed = data.DATE_NEEDED
-            bli.procurement_shop_fee_id = procurement_shop_fee_id
-            bli.services_component = sc
-            bli.service_component_name_for_sort = sc.display_name_for_sort if sc else None
-            bli.updated_by = sys_user.id
-            bli.updated_on = datetime.now()
-
-            session.add(bli)
-            commit_or_rollback(session)
+def create_models(data: BudgetLineItemData, sys_user: User, session: Session) -> None:
+    """
+    Create and persist the models to the database.
+    """
+    logger.debug(f"Creating models for {data}.")
 
-            logger.info(f"UPSERTING {bli_class.__name__} model for {bli.to_dict()}")
+    try:
+        staged = _stage_budget_line(data, sys_user, session)
+        if not staged:
+            return
+        bli, agreement, existing_bli_dict = staged
+        commit_or_rollback(session)
 
-        # Record the new SYS_BUDGET_ID to manually update the spreadsheet later
-        if not existing_budget_line_item:
-            logger.warning(
-                f"***Manually update BudgetLineItem.id in Budget Spreadsheet: original Agreement "
-                f"Name={data.AGREEMENT_NAME}, Agreement Type={data.AGREEMENT_TYPE}"
-                f"original LINE_DESC={data.LINE_DESC}, created SYS_BUDGET_ID = {bli.id}.***"
-            )
+        if existing_bli_dict is None:
+            logger.info(f"CREATED {type(bli).__name__} model for {bli.to_dict()}")
+            _log_new_budget_line(data, bli)
+        else:
+            logger.info(f"UPSERTING {type(bli).__name__} model for {bli.to_dict()}")
 
         commit_or_rollback(session)
 
-        procurement_eligible_types = {AgreementType.CONTRACT, AgreementType.IAA, AgreementType.AA}
-        if (
-            bli.status == BudgetLineItemStatus.IN_EXECUTION
-            and agreement
-            and data.AGREEMENT_TYPE in procurement_eligible_types
-        ):
-            is_mod = has_obligated_blis(session, agreement.id)
-            if is_mod:
-                action, _, _, _ = get_or_create_procurement_records_for_modification(
-                    session, agreement, created_by=sys_user.id, source="SpreadsheetIngest"
-                )
-            else:
-                action, _, _, _ = get_or_create_procurement_records_for_new_award(
-                    session, agreement, created_by=sys_user.id, source="SpreadsheetIngest"
-                )
-            link_blis_to_action(session, agreement, action, BudgetLineItemStatus.IN_EXECUTION)
+        if _link_procurement_action(bli, agreement, data, sys_user, session):
             commit_or_rollback(session)
 
-        # Create an OPSEvent record for the BLI create/update with the correct payload shape for each case.
-        if not existing_budget_line_item:
-            ops_event = OpsEvent(
-                event_type=OpsEventType.CREATE_BLI,
-                event_status=OpsEventStatus.SUCCESS,
-                created_by=sys_user.id,
-                event_details={"new_bli": bli.to_dict()},
-            )
-        else:
-            updates = generate_events_update(existing_bli_dict, bli.to_dict(), bli.id, sys_user.id)
-            ops_event = OpsEvent(
-                event_type=OpsEventType.UPDATE_BLI,
-                event_status=OpsEventStatus.SUCCESS,
-                created_by=sys_user.id,
-                event_details={"bli_updates": updates, "bli": bli.to_dict()},
-            )
+        ops_event = _create_bli_event(bli, existing_bli_dict, sys_user)
         session.add(ops_event)
         session.flush()  # populate ops_event.id and created_on before the history trigger reads them
         agreement_history_trigger_func(ops_event, session, sys_user, dry_run=True)
@@ -327,6 +457,106 @@ def create_all_models(data: List[BudgetLineItemData], sys_user: User, session: S
         create_models(d, sys_user, session)
 
 
+def _stage_chunk(
+    chunk: List[BudgetLineItemData],
+    sys_user: User,
+    session: Session,
+    references: BudgetLineReferences,
+) -> list[tuple]:
+    """
+    Stage the budget lines of a chunk of rows in the session, linking those in execution to their procurement
+    action.
+
+    :param chunk: The BudgetLineItemData instances of the chunk.
+    :param sys_user: The system user to use.
+    :param session: The database session to use.
+    :param references: The prefetched reference rows.
+
+    :return: The (data, (budget line, agreement, existing budget line dict)) of each staged row.
+    """
+    staged = []
+    for d in chunk:
+        logger.debug(f"Creating models for {d}.")
+        row = _stage_budget_line(d, sys_user, session, references)
+        if not row:
+            continue
+        bli, agreement, _ = row
+        if bli.status == BudgetLineItemStatus.IN_EXECUTION:
+            # the procurement records are looked up by querying the agreement's budget lines
+            session.flush()
+            _link_procurement_action(bli, agreement, d, sys_user, session)
+        staged.append((d, row))
+    return staged
+
+
+def _create_chunk_events(
+    staged: list[tuple],
+    sys_user: User,
+    session: Session,
+) -> list[OpsEvent]:
+    """
+    Create the OpsEvents and history events of the flushed budget lines of a chunk.
+
+    :param staged: The staged rows returned by _stage_chunk.
+    :param sys_user: The system user to use.
+    :param session: The database session to use.
+
+    :return: The OpsEvents created.
+    """
+    ops_events = []
+    for d, (bli, _, existing_bli_dict) in staged:
+        if existing_bli_dict is None:
+            _log_new_budget_line(d, bli)
+        ops_events.append(_create_bli_event(bli, existing_bli_dict, sys_user))
+    session.add_all(ops_events)
+    session.flush()  # populate the events' id and created_on before the history trigger reads them
+    for ops_event in ops_events:
+        agreement_history_trigger_func(ops_event, session, sys_user, dry_run=True)
+    return ops_events
+
+
+def create_all_models_bulk(
+    data: List[BudgetLineItemData],
+    sys_user: User,
+    session: Session,
+    references: Optional[BudgetLineReferences] = None,
+) -> None:
+    """
+    Create or update the budget lines of a list of BudgetLineItemData instances in chunks (see
+    common/bulk.py): the agreements, CANs, procurement shops, fees and budget lines are prefetched, and each
+    chunk is flushed, its OpsEvents and history events created and committed together.
+
+    :param data: The list of BudgetLineItemData instances to convert.
+    :param sys_user: The system user to use.
+    :param session: The database session to use.
+    :param references: The prefetched reference rows, when loading several batches of rows; the budget lines of
+        data are loaded into it.
+
+    :return: None
+    """
+    if references is None:
+        references = BudgetLineReferences.load(session, data)
+    else:
+        references.load_budget_lines(session, data)
+    logger.info(
+        f"Prefetched {len(references.agreements_by_name_and_type)} agreements, "
+        f"{len(references.cans_by_number)} CANs and {len(references.budget_lines_by_id)} budget lines."
+    )
+
+    with keep_loaded_on_commit(session):
+        for chunk in chunked(data):
+            try:
+                staged = _stage_chunk(chunk, sys_user, session, references)
+                session.flush()
+                ops_events = _create_chunk_events(staged, sys_user, session)
+                commit_or_rollback(session)
+                logger.info(f"Loaded {len(staged)} of {len(chunk)} budget lines with {len(ops_events)} events")
+            except Exception as err:
+                logger.error(f"Error creating models for a chunk of {len(chunk)} budget lines: {err}")
+                session.rollback()
+                raise err
+
+
 def validate_data(data: BudgetLineItemData) -> bool:
     """
     Validate the data in a BudgetLineItemData instance.
@@ -389,19 +619,29 @@ def create_all_budget_line_item_data(data: List[dict]) -> List[BudgetLineItemDat
     return [create_budget_line_item_data(d) for d in data]
 
 
-def transform(data: DictReader, session: Session, sys_user: User) -> None:
+def transform(data: DictReader, session: Session, sys_user: User, bulk: bool = False, stream: bool = False) -> None:
     """
     Transform the data from the TSV file and persist the models to the database.
 
     :param data: The data from the TSV file.
     :param session: The database session to use.
     :param sys_user: The system user to use.
+    :param bulk: Load the rows in chunks (see common/bulk.py) instead of one at a time.
+    :param stream: Convert, validate and load the rows in bulk one batch at a time (see common/bulk.py) instead of
+        validating every row before loading any.
     :return: None
     """
     if not data or not session or not sys_user:
         logger.error("No data to process. Exiting.")
         raise RuntimeError("No data to process.")
 
+    if stream:
+        references = BudgetLineReferences.load(session, [])
+        for batch in validated_batches(data, create_budget_line_item_data, validate_data):
+            create_all_models_bulk(batch, sys_user, session, references)
+        logger.info("Finished loading models.")
+        return
+
     budget_line_item_data = create_all_budget_line_item_data(list(data))
     logger.info(f"Created {len(budget_line_item_data)} BudgetLineItemData instances.")
 
@@ -411,5 +651,8 @@ def transform(data: DictReader, session: Session, sys_user: User) -> None:
 
     logger.info("Data validation passed.")
 
-    create_all_models(budget_line_item_data, sys_user, session)
+    if bulk:
+        create_all_models_bulk(budget_line_item_data, sys_user, session)
+    else:
+        create_all_models(budget_line_item_data, sys_user, session)
     logger.info("Finished loading models.")
@@ -16,6 +16,7 @@ from models import (
     ProcurementShopFee,
     User,
     agreement_history_trigger_func,
+    budget_line_item_totals_trigger_func,
 )
 from models.utils import generate_events_update
 
@@ -189,6 +190,8 @@ def create_models(data: ProcurementShopData, sys_user: User, session: Session) -
             # This allows us to rollback the session if dry_run is enabled or not commit changes
             # if something errors after this point
             agreement_history_trigger_func(ops_event, session, sys_user, dry_run=True)
+            # A new fee schedule re-prices the budget lines of the agreements using the shop
+            budget_line_item_totals_trigger_func(ops_event, session)
 
         session.commit()
 
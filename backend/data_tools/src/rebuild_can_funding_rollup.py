@@ -0,0 +1,92 @@
+"""
+Rebuild the can_funding_rollup table from budget_line_item, can_funding_budget and can_funding_received
+and verify it against them.
+
+The rollup is kept up to date from MessageBus events by the API. Run this script once before enabling
+USE_CAN_FUNDING_ROLLUP, after bulk loads that bypass the API and periodically (e.g. nightly) so that
+fees that depend on the current date stay correct.
+
+Usage (from backend/ directory):
+    python data_tools/src/rebuild_can_funding_rollup.py --env dev
+
+Only report differences between the rollup and the source tables:
+    python data_tools/src/rebuild_can_funding_rollup.py --env dev --verify-only
+"""
+
+import os
+import sys
+import time
+
+import click
+from dotenv import load_dotenv
+from loguru import logger
+from sqlalchemy import text
+from sqlalchemy.orm import Session, scoped_session, sessionmaker
+
+from data_tools.src.common.db import init_db_from_config
+from data_tools.src.common.utils import get_config
+from models.can_funding_rollup import rebuild_can_funding_rollup, verify_can_funding_rollup
+
+load_dotenv(os.getenv("ENV_FILE", ".env"))
+
+os.environ["TZ"] = "UTC"
+time.tzset()
+
+log_format = (
+    "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | "
+    "<level>{level: <8}</level> | "
+    "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> | "
+    "<level>{message}</level>"
+)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+logger.remove()
+logger.add(sys.stderr, format=log_format, level=LOG_LEVEL)
+
+
+def rebuild_and_verify(session: Session, verify_only: bool = False) -> list[dict]:
+    """
+    Rebuild the rollup (unless ``verify_only``) and return the rows that still differ from the source tables.
+    """
+    if not verify_only:
+        rebuild_can_funding_rollup(session)
+        session.commit()
+        logger.info("Rebuilt the CAN funding rollup.")
+
+    mismatches = verify_can_funding_rollup(session)
+    for mismatch in mismatches:
+        logger.warning(f"CAN funding rollup mismatch: {mismatch}")
+    logger.info(f"Found {len(mismatches)} CAN funding rollup mismatches.")
+    return mismatches
+
+
+@click.command()
+@click.option("--env", required=True, help="The environment to use (dev, local, azure).")
+@click.option("--verify-only", is_flag=True, default=False, help="Only compare the rollup with the source tables.")
+def main(env: str, verify_only: bool):
+    """Rebuild and verify the CAN funding rollup."""
+    logger.info("Starting CAN funding rollup rebuild.")
+
+    script_config = get_config(env)
+    db_engine, _ = init_db_from_config(script_config)
+
+    if db_engine is None:
+        logger.error("Failed to initialize the database engine.")
+        sys.exit(1)
+
+    with db_engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        logger.info("Successfully connected to the database.")
+
+    session_factory = scoped_session(sessionmaker(autocommit=False, autoflush=False, bind=db_engine))
+
+    with session_factory() as session:
+        mismatches = rebuild_and_verify(session, verify_only=verify_only)
+
+    if mismatches:
+        sys.exit(1)
+
+    logger.info("CAN funding rollup rebuild complete.")
+
+
+if __name__ == "__main__":
+    main()
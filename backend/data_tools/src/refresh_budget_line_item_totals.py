@@ -0,0 +1,91 @@
+"""
+Refresh the stored fees and total of every budget line and verify them against the computed values.
+
+The stored values are kept up to date from MessageBus events by the API. Run this script once before
+enabling USE_STORED_BLI_TOTALS, after bulk loads that bypass the API and nightly, because the current fee
+of a procurement shop depends on the date.
+
+Usage (from backend/ directory):
+    python data_tools/src/refresh_budget_line_item_totals.py --env dev
+
+Only report budget lines whose stored values are out of date:
+    python data_tools/src/refresh_budget_line_item_totals.py --env dev --verify-only
+"""
+
+import os
+import sys
+import time
+
+import click
+from dotenv import load_dotenv
+from loguru import logger
+from sqlalchemy import text
+from sqlalchemy.orm import Session, scoped_session, sessionmaker
+
+from data_tools.src.common.db import init_db_from_config
+from data_tools.src.common.utils import get_config
+from models.budget_line_item_totals import refresh_budget_line_item_totals, verify_budget_line_item_totals
+
+load_dotenv(os.getenv("ENV_FILE", ".env"))
+
+os.environ["TZ"] = "UTC"
+time.tzset()
+
+log_format = (
+    "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | "
+    "<level>{level: <8}</level> | "
+    "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> | "
+    "<level>{message}</level>"
+)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+logger.remove()
+logger.add(sys.stderr, format=log_format, level=LOG_LEVEL)
+
+
+def refresh_and_verify(session: Session, verify_only: bool = False) -> list[dict]:
+    """
+    Refresh the stored totals (unless ``verify_only``) and return the budget lines that are still out of date.
+    """
+    if not verify_only:
+        updated = refresh_budget_line_item_totals(session)
+        session.commit()
+        logger.info(f"Refreshed the stored fees and total of {updated} budget lines.")
+
+    mismatches = verify_budget_line_item_totals(session)
+    for mismatch in mismatches:
+        logger.warning(f"Budget line totals mismatch: {mismatch}")
+    logger.info(f"Found {len(mismatches)} budget lines with out-of-date totals.")
+    return mismatches
+
+
+@click.command()
+@click.option("--env", required=True, help="The environment to use (dev, local, azure).")
+@click.option("--verify-only", is_flag=True, default=False, help="Only compare the stored and computed totals.")
+def main(env: str, verify_only: bool):
+    """Refresh and verify the stored fees and total of the budget lines."""
+    logger.info("Starting budget line totals refresh.")
+
+    script_config = get_config(env)
+    db_engine, _ = init_db_from_config(script_config)
+
+    if db_engine is None:
+        logger.error("Failed to initialize the database engine.")
+        sys.exit(1)
+
+    with db_engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        logger.info("Successfully connected to the database.")
+
+    session_factory = scoped_session(sessionmaker(autocommit=False, autoflush=False, bind=db_engine))
+
+    with session_factory() as session:
+        mismatches = refresh_and_verify(session, verify_only=verify_only)
+
+    if mismatches:
+        sys.exit(1)
+
+    logger.info("Budget line totals refresh complete.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,425 @@
+"""
+Run a manifest of data loads (see load_data.py) in dependency order, running independent loads concurrently.
+
+Each load runs in its own process with its own database session. The order of the loads follows
+LOAD_DEPENDENCIES (e.g. budget lines are loaded after the agreements and CANs they reference), the steps of
+the same type run in manifest order, and a step can name further steps it depends on in ``depends_on``.
+
+Completed steps are recorded in a checkpoint file, so running the same manifest again after a failure only
+runs the failed step and the steps after it. A step is run again if its type, input file or options changed,
+or if its input is a local file whose size or modification time changed. --restart ignores the checkpoint.
+
+Usage (from backend/ directory):
+    python data_tools/src/run_pipeline.py --env dev --manifest data_tools/pipeline.json5
+
+The manifest is a JSON5 file:
+    {
+      steps: [
+        { type: "users", input_csv: "data_tools/test_csv/users.tsv" },
+        { type: "cans", input_csv: "data_tools/test_csv/can_valid.tsv" },
+        { type: "contracts", input_csv: "data_tools/test_csv/contracts.tsv" },
+        { type: "contract_budget_lines", input_csv: "data_tools/test_csv/contract_budget_lines.tsv", stream: true },
+      ],
+    }
+"""
+
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from graphlib import CycleError, TopologicalSorter
+from typing import Callable, Iterable, Iterator, Optional
+
+import click
+import json5
+from loguru import logger
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+from data_tools.src.azure_utils.utils import get_csv
+from data_tools.src.common.db import init_db_from_config, setup_triggers
+from data_tools.src.common.utils import get_config, get_or_create_sys_user
+from data_tools.src.load_data import LOAD_TYPES, load
+
+AGREEMENT_TYPES = {"contracts", "ops_contracts", "grants", "iaas", "direct_obligations", "aas"}
+BUDGET_LINE_TYPES = {
+    "contract_budget_lines",
+    "grant_budget_lines",
+    "iaa_budget_lines",
+    "direct_obligation_budget_lines",
+    "master_spreadsheet_budget_lines",
+    "master_spreadsheet_budget_lines_v2",
+    "obe_budget_lines",
+}
+
+# The types each type reads. A step runs after the steps of the manifest whose type it depends on, directly or
+# through types that are not in the manifest (those are expected to be loaded already).
+LOAD_DEPENDENCIES: dict[str, set[str]] = {
+    "roles": set(),
+    "users": {"roles"},
+    "projects": set(),
+    "cans": set(),
+    "vendors": set(),
+    "procurement_shops": set(),
+    "iaa_agency": set(),
+    "contracts": {"projects", "vendors", "users"},
+    "ops_contracts": {"projects", "vendors", "users", "procurement_shops"},
+    "grants": {"projects", "users"},
+    "iaas": {"projects", "users", "iaa_agency"},
+    "direct_obligations": {"projects", "users"},
+    "aas": {"projects", "users"},
+    "contract_budget_lines": {"contracts", "cans"},
+    "grant_budget_lines": {"grants", "cans"},
+    "iaa_budget_lines": {"iaas", "cans"},
+    "direct_obligation_budget_lines": {"direct_obligations", "cans"},
+    "master_spreadsheet_budget_lines": AGREEMENT_TYPES | {"cans", "procurement_shops"},
+    "master_spreadsheet_budget_lines_v2": AGREEMENT_TYPES | {"cans", "procurement_shops"},
+    "obe_budget_lines": BUDGET_LINE_TYPES - {"obe_budget_lines"},
+    "team_members": AGREEMENT_TYPES | {"users"},
+    "award_date": AGREEMENT_TYPES,
+    "agreement_missing_data": AGREEMENT_TYPES | {"users", "vendors"},
+    "update_budget_line_type": BUDGET_LINE_TYPES,
+    "remove_budget_lines": BUDGET_LINE_TYPES | {"update_budget_line_type"},
+    "remove_agreements": AGREEMENT_TYPES | BUDGET_LINE_TYPES | {"remove_budget_lines", "team_members"},
+}
+
+DEFAULT_MAX_WORKERS = 4
+
+
+@dataclass(frozen=True)
+class PipelineStep:
+    """
+    A load of the manifest.
+    """
+
+    name: str
+    type: str
+    input_csv: str
+    first_run: bool = False
+    safe: bool = False
+    stream: bool = False
+    depends_on: tuple[str, ...] = field(default=())
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        A hash of the type, input file and options, to tell whether a checkpointed step changed. The size and
+        modification time of a local input file are included, so a file edited in place is loaded again.
+        """
+        options = asdict(self)
+        del options["name"], options["depends_on"]
+        if os.path.isfile(self.input_csv):
+            stat = os.stat(self.input_csv)
+            options["input_size"], options["input_mtime_ns"] = stat.st_size, stat.st_mtime_ns
+        return hashlib.sha256(json.dumps(options, sort_keys=True).encode()).hexdigest()
+
+
+@dataclass
+class StepResult:
+    """
+    The timing and row count of a completed step.
+    """
+
+    name: str
+    rows: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+class CountingRows:
+    """Iterates the rows of a CSV file, counting them."""
+
+    def __init__(self, rows: Iterable[dict]):
+        self.rows = rows
+        self.count = 0
+
+    def __iter__(self) -> Iterator[dict]:
+        for row in self.rows:
+            self.count += 1
+            yield row
+
+
+def read_manifest(path: str) -> list[PipelineStep]:
+    """
+    Read the steps of a manifest file.
+
+    :param path: The path of the JSON5 manifest.
+
+    :return: The steps, in manifest order.
+    :raises ValueError: If a step has an unknown type or option, or a name is used twice.
+    """
+    with open(path) as f:
+        manifest = json5.load(f)
+
+    steps = []
+    for i, entry in enumerate(manifest.get("steps", [])):
+        if entry.get("type") not in LOAD_TYPES:
+            raise ValueError(f"Step {i + 1} of {path} has an unknown type: {entry.get('type')}")
+        if not entry.get("input_csv"):
+            raise ValueError(f"Step {i + 1} of {path} has no input_csv.")
+        unknown = set(entry) - set(PipelineStep.__dataclass_fields__)
+        if unknown:
+            raise ValueError(f"Step {i + 1} of {path} has unknown options: {', '.join(sorted(unknown))}")
+        step = PipelineStep(
+            **{
+                **entry,
+                "name": entry.get("name", entry["type"]),
+                "depends_on": tuple(entry.get("depends_on", ())),
+            }
+        )
+        if any(s.name == step.name for s in steps):
+            raise ValueError(f"Step {i + 1} of {path} has the name of another step ({step.name}); name it.")
+        steps.append(step)
+    return steps
+
+
+def _type_closure(type: str) -> set[str]:
+    """The types a type depends on, directly or indirectly."""
+    closure, pending = set(), list(LOAD_DEPENDENCIES.get(type, ()))
+    while pending:
+        dependency = pending.pop()
+        if dependency not in closure:
+            closure.add(dependency)
+            pending.extend(LOAD_DEPENDENCIES.get(dependency, ()))
+    return closure
+
+
+def build_dependencies(steps: list[PipelineStep]) -> dict[str, set[str]]:
+    """
+    Build the dependency graph of the steps.
+
+    :param steps: The steps of the manifest.
+
+    :return: A dict of {step name: names of the steps it runs after}.
+    :raises ValueError: If a step depends on an unknown step or the steps depend on each other in a cycle.
+    """
+    names = {step.name for step in steps}
+    dependencies = {}
+    for i, step in enumerate(steps):
+        types = _type_closure(step.type)
+        dependencies[step.name] = {s.name for s in steps if s.type in types and s is not step}
+        # the steps of the same type write the same tables, so they run in manifest order
+        dependencies[step.name] |= {s.name for s in steps[:i] if s.type == step.type}
+        for name in step.depends_on:
+            if name not in names:
+                raise ValueError(f"Step {step.name} depends on an unknown step: {name}")
+            dependencies[step.name].add(name)
+
+    try:
+        TopologicalSorter(dependencies).prepare()
+    except CycleError as e:
+        raise ValueError(f"The steps depend on each other in a cycle: {' -> '.join(e.args[1])}") from e
+    return dependencies
+
+
+class Checkpoint:
+    """
+    The completed steps of a pipeline, stored in a JSON file that is rewritten after each step.
+    """
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self.steps: dict[str, dict] = {}
+        if path and os.path.exists(path):
+            with open(path) as f:
+                self.steps = json.load(f).get("steps", {})
+
+    def is_completed(self, step: PipelineStep) -> bool:
+        return self.steps.get(step.name, {}).get("fingerprint") == step.fingerprint
+
+    def record(self, step: PipelineStep, result: StepResult) -> None:
+        self.steps[step.name] = {
+            "fingerprint": step.fingerprint,
+            "completed_at": datetime.now(timezone.utc).isoformat(),
+            "rows": result.rows,
+            "seconds": result.seconds,
+        }
+        self._write()
+
+    def clear(self) -> None:
+        self.steps = {}
+        self._write()
+
+    def _write(self) -> None:
+        if not self.path:
+            return
+        # write a new file and rename it, so an interrupted run never leaves a truncated checkpoint
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"steps": self.steps}, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+def run_step(env: str, step: PipelineStep) -> StepResult:
+    """
+    Run a step with its own database engine and session, e.g. in a worker process.
+
+    :param env: The environment to use.
+    :param step: The step to run.
+
+    :return: The step's timing and row count.
+    :raises RuntimeError: If the loader fails.
+    """
+    script_config = get_config(env)
+    db_engine, _ = init_db_from_config(script_config)
+    if db_engine is None:
+        raise RuntimeError("Failed to initialize the database engine.")
+
+    try:
+        started = time.perf_counter()
+        rows = CountingRows(get_csv(step.input_csv, script_config, stream=step.stream))
+        session_factory = scoped_session(sessionmaker(autocommit=False, autoflush=False, bind=db_engine))
+        with session_factory() as session:
+            sys_user = get_or_create_sys_user(session)
+            setup_triggers(session, sys_user)
+            load(session, sys_user, step.type, rows, first_run=step.first_run, safe=step.safe, stream=step.stream)
+        return StepResult(name=step.name, rows=rows.count, seconds=time.perf_counter() - started)
+    finally:
+        db_engine.dispose()
+
+
+def _wait_for_steps(
+    running: dict[Future, PipelineStep],
+    checkpoint: Checkpoint,
+    sorter: TopologicalSorter,
+    failures: dict[str, BaseException],
+) -> list[StepResult]:
+    """
+    Wait for at least one running step to finish; checkpoint the finished steps and record the errors of the
+    failed ones.
+
+    :param running: The steps running, by their future; the finished steps are removed.
+    :param checkpoint: The checkpoint of the completed steps.
+    :param sorter: The sorter of the steps; the completed steps are marked done.
+    :param failures: The errors of the failed steps, by step name.
+
+    :return: The results of the completed steps.
+    """
+    results = []
+    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+    for future in finished:
+        step = running.pop(future)
+        try:
+            result = future.result()
+        except (Exception, SystemExit) as e:
+            logger.error(f"Step {step.name} failed: {e!r}")
+            failures[step.name] = e
+            continue
+        checkpoint.record(step, result)
+        sorter.done(step.name)
+        results.append(result)
+        logger.info(
+            f"Finished {step.name}: {result.rows} rows in {result.seconds:.1f} s "
+            f"({result.rows_per_second:.1f} rows/s)."
+        )
+    return results
+
+
+def run_pipeline(
+    steps: list[PipelineStep],
+    checkpoint: Checkpoint,
+    executor: Executor,
+    env: str,
+    step_runner: Callable[[str, PipelineStep], StepResult] = run_step,
+) -> list[StepResult]:
+    """
+    Run the steps on an executor in dependency order, skipping the steps completed in the checkpoint.
+
+    When a step fails no further steps are started; the running steps are finished and checkpointed.
+
+    :param steps: The steps of the manifest.
+    :param checkpoint: The checkpoint of the completed steps.
+    :param executor: The executor to run the steps on, e.g. a ProcessPoolExecutor.
+    :param env: The environment to use.
+    :param step_runner: The function running a step (run_step, or a stand-in in tests).
+
+    :return: The results of the steps run.
+    :raises RuntimeError: If a step failed.
+    """
+    steps_by_name = {step.name: step for step in steps}
+    sorter = TopologicalSorter(build_dependencies(steps))
+    sorter.prepare()
+
+    results: list[StepResult] = []
+    failures: dict[str, BaseException] = {}
+    running: dict[Future, PipelineStep] = {}
+
+    def submit_ready_steps():
+        while ready := sorter.get_ready():
+            for name in ready:
+                step = steps_by_name[name]
+                if checkpoint.is_completed(step):
+                    logger.info(f"Skipping {name}: completed in the checkpoint.")
+                    sorter.done(name)
+                    continue
+                logger.info(f"Starting {name} ({step.type} from {step.input_csv}).")
+                running[executor.submit(step_runner, env, step)] = step
+
+    started = time.perf_counter()
+    while sorter.is_active():
+        if not failures:
+            submit_ready_steps()
+        if not running:
+            break
+        results.extend(_wait_for_steps(running, checkpoint, sorter, failures))
+
+    report(results, time.perf_counter() - started)
+    if failures:
+        raise RuntimeError(f"Steps failed: {', '.join(failures)}. Run the manifest again to resume.")
+    return results
+
+
+def report(results: list[StepResult], seconds: float) -> None:
+    """Log the timing and throughput of each step and of the pipeline."""
+    for result in results:
+        logger.info(
+            f"{result.name:<40} {result.rows:>10} rows {result.seconds:>10.1f} s "
+            f"{result.rows_per_second:>10.1f} rows/s"
+        )
+    total_rows = sum(result.rows for result in results)
+    logger.info(f"Ran {len(results)} steps: {total_rows} rows in {seconds:.1f} s.")
+
+
+@click.command()
+@click.option("--env", required=True, help="The environment to use (dev, local, azure).")
+@click.option("--manifest", required=True, type=click.Path(exists=True), help="The JSON5 manifest of the loads.")
+@click.option(
+    "--max-workers",
+    default=DEFAULT_MAX_WORKERS,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="The number of loads run at the same time.",
+)
+@click.option("--checkpoint", help="The checkpoint file (default: the manifest path + .checkpoint.json).")
+@click.option("--restart", is_flag=True, default=False, help="Run every step, ignoring the checkpoint.")
+def main(env: str, manifest: str, max_workers: int, checkpoint: Optional[str], restart: bool):
+    """Run a manifest of data loads."""
+    try:
+        steps = read_manifest(manifest)
+        build_dependencies(steps)
+    except ValueError as e:
+        raise click.UsageError(str(e)) from e
+
+    pipeline_checkpoint = Checkpoint(checkpoint or f"{manifest}.checkpoint.json")
+    if restart:
+        pipeline_checkpoint.clear()
+
+    logger.info(f"Running {len(steps)} steps of {manifest} with {max_workers} workers.")
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            run_pipeline(steps, pipeline_checkpoint, executor, env)
+        except RuntimeError as e:
+            logger.error(str(e))
+            sys.exit(1)
+
+    logger.info("Finished the pipeline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,38 @@
+import csv
 import io
 from unittest.mock import MagicMock
 from urllib.parse import urlparse
 
+import pytest
+
 from data_tools.environment.azure import AzureConfig
-from data_tools.src.azure_utils.utils import get_csv, get_csv_using_mi_or_rbac
+from data_tools.src.azure_utils.utils import get_csv, get_csv_using_mi_or_rbac, iter_file_chunks, iter_lines
+
+
+class FakeDownloader:
+    def __init__(self, data: bytes, chunk_size: int):
+        self.data = data
+        self.chunk_size = chunk_size
+
+    def chunks(self):
+        for i in range(0, len(self.data), self.chunk_size):
+            yield self.data[i : i + self.chunk_size]
+
+    def readall(self):
+        return self.data
+
+
+class FakeContainerClient:
+    """A stand-in for azure.storage.blob.ContainerClient serving one blob in chunks of chunk_size bytes."""
+
+    def __init__(self, blobs: dict[str, bytes], chunk_size: int = 4):
+        self.blobs = blobs
+        self.chunk_size = chunk_size
+        self.downloads = []
+
+    def download_blob(self, blob_name):
+        self.downloads.append(blob_name)
+        return FakeDownloader(self.blobs[blob_name], self.chunk_size)
 
 
 def test_get_csv(mocker):
@@ -62,3 +91,60 @@ def test_get_csv_using_mi(mocker):
     assert data[1]["name"] == "DIV2"
     assert data[2]["id"] == "3"
     assert data[2]["name"] == "DIV3"
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 1024])
+def test_iter_lines(chunk_size):
+    # a multi-byte character, a quoted field with a line break and a \r\n split across chunks
+    text = 'id\tname\n1\t"Café\nOPRE"\r\n2\tDIV2'
+    data = text.encode("utf-8")
+    chunks = [data[i : i + chunk_size] for i in range(0, len(data), chunk_size)]
+
+    assert list(iter_lines(chunks)) == list(io.StringIO(text))
+
+
+def test_get_csv_stream(mocker):
+    csv_string = "id,name\n1,DIV1\n2,DIV2\n3,DIV3\n"
+    container_client = FakeContainerClient({"cans.csv": csv_string.encode("utf-8")})
+    get_container_client = mocker.patch(
+        "data_tools.src.azure_utils.utils.get_container_client", return_value=container_client
+    )
+    mocker.patch("data_tools.src.azure_utils.utils.get_secret", return_value="")
+    config = MagicMock(spec=AzureConfig)
+    config.vault_url = "https://xxxxx.xxxx.xxxx.net/"
+    config.vault_file_storage_key = "xxxxx"
+    config.file_storage_auth_method = "access_key"
+
+    result = get_csv("https://xxxxxxx.xxxx.xxxx.xxxxx.net/xxxxxxxxxxx/cans.csv", config, dialect="excel", stream=True)
+
+    # nothing is downloaded until the rows are read
+    assert container_client.downloads == []
+    data = list(result)
+    assert container_client.downloads == ["cans.csv"]
+    assert get_container_client.call_args.args[0].container_name == "xxxxxxxxxxx"
+    assert data == [{"id": "1", "name": "DIV1"}, {"id": "2", "name": "DIV2"}, {"id": "3", "name": "DIV3"}]
+
+
+def test_get_csv_stream_local_file():
+    expected = list(csv.DictReader(open("test_csv/can_invalid.tsv"), dialect="excel-tab"))
+
+    assert list(get_csv("test_csv/can_invalid.tsv", stream=True)) == expected
+    lines = iter_lines(iter_file_chunks("test_csv/can_invalid.tsv", chunk_size=100))
+    assert list(csv.DictReader(lines, dialect="excel-tab")) == expected
+
+
+def test_get_csv_using_mi_stream(mocker):
+    csv_string = "id,name\n1,DIV1\n2,DIV2\n3,DIV3\n"
+    container_client = FakeContainerClient({"blob_name": csv_string.encode("utf-8")})
+    blob_service_client = mocker.patch("data_tools.src.azure_utils.utils.BlobServiceClient")
+    blob_service_client.return_value.__enter__.return_value.get_container_client.return_value = container_client
+    mocker.patch("data_tools.src.azure_utils.utils.DefaultAzureCredential")
+
+    parts = urlparse("https://xxxxx.xxxx.xxxx.net/container_name/blob_name")
+    result = get_csv_using_mi_or_rbac(parts, dialect="unix", client_id="xxxxx", stream=True)
+
+    assert list(result) == [{"id": "1", "name": "DIV1"}, {"id": "2", "name": "DIV2"}, {"id": "3", "name": "DIV3"}]
+    blob_service_client.return_value.__enter__.return_value.get_container_client.assert_called_once_with(
+        container="container_name"
+    )
+    blob_service_client.return_value.__exit__.assert_called_once()
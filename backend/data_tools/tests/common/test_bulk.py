@@ -0,0 +1,59 @@
+import pytest
+from sqlalchemy.orm import Session, scoped_session, sessionmaker
+
+from data_tools.src.common.bulk import chunked, index_by, keep_loaded_on_commit, validated_batches
+
+
+def test_chunked():
+    assert list(chunked(range(7), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert list(chunked([], 3)) == []
+
+
+def test_index_by_keeps_the_first_item_of_a_key():
+    items = [("a", 1), ("b", 2), ("a", 3), (None, 4)]
+
+    assert index_by(items, lambda item: item[0]) == {"a": ("a", 1), "b": ("b", 2)}
+
+
+def test_keep_loaded_on_commit():
+    session = Session()
+
+    with keep_loaded_on_commit(session) as kept:
+        assert kept is session
+        assert session.expire_on_commit is False
+
+    assert session.expire_on_commit is True
+
+
+def test_keep_loaded_on_commit_scoped_session():
+    session = scoped_session(sessionmaker())
+
+    with keep_loaded_on_commit(session) as kept:
+        assert kept is session
+        assert session().expire_on_commit is False
+
+    assert session().expire_on_commit is True
+
+
+def test_validated_batches_are_read_lazily():
+    read = []
+
+    def rows():
+        for i in range(5):
+            read.append(i)
+            yield {"id": str(i)}
+
+    batches = validated_batches(rows(), lambda row: int(row["id"]), lambda d: True, size=2)
+
+    assert next(batches) == [0, 1]
+    assert read == [0, 1]
+    assert list(batches) == [[2, 3], [4]]
+
+
+def test_validated_batches_stop_at_an_invalid_batch():
+    rows = [{"id": str(i)} for i in range(5)]
+    batches = validated_batches(rows, lambda row: int(row["id"]), lambda d: d != 3, size=2)
+
+    assert next(batches) == [0, 1]
+    with pytest.raises(RuntimeError, match="Validation failed."):
+        next(batches)
@@ -1,14 +1,20 @@
 import csv
+from functools import partial
 
 import pytest
 from click.testing import CliRunner
-from sqlalchemy import and_, text
+from sqlalchemy import and_, func, inspect, text
 
 from data_tools.environment.dev import DevConfig
+from data_tools.src.common.bulk import chunked
 from data_tools.src.common.utils import get_or_create_sys_user
 from data_tools.src.import_static_data.import_data import get_config
 from data_tools.src.load_cans.utils import (
     CANData,
+    CANReferences,
+    create_all_can_data,
+    create_all_models,
+    create_all_models_bulk,
     create_can_data,
     create_models,
     get_or_create_funding_details,
@@ -327,6 +333,128 @@ def test_main(db_with_portfolios):
     assert len(can_1_history) == 1
 
 
+def test_main_safe(db_with_portfolios):
+    result = CliRunner().invoke(
+        main,
+        [
+            "--env",
+            "pytest_data_tools",
+            "--type",
+            "cans",
+            "--input-csv",
+            "test_csv/can_valid.tsv",
+            "--safe",
+        ],
+    )
+
+    assert result.exit_code == 0
+
+    can_1 = db_with_portfolios.get(CAN, 500)
+    assert can_1.number == "G99HRF2"
+    assert can_1.funding_details.fund_code == "AAXXXX20231DAD"
+
+    history_objs = (
+        db_with_portfolios.execute(select(OpsDBHistory).where(OpsDBHistory.class_name == "CAN")).scalars().all()
+    )
+    assert len(history_objs) == 13
+
+
+def test_main_stream(db_with_portfolios):
+    result = CliRunner().invoke(
+        main,
+        [
+            "--env",
+            "pytest_data_tools",
+            "--type",
+            "cans",
+            "--input-csv",
+            "test_csv/can_valid.tsv",
+            "--stream",
+        ],
+    )
+
+    assert result.exit_code == 0
+
+    can_1 = db_with_portfolios.get(CAN, 500)
+    assert can_1.number == "G99HRF2"
+    assert can_1.funding_details.fund_code == "AAXXXX20231DAD"
+
+    history_objs = (
+        db_with_portfolios.execute(select(OpsDBHistory).where(OpsDBHistory.class_name == "CAN")).scalars().all()
+    )
+    assert len(history_objs) == 13
+
+
+def test_main_stream_and_safe_are_exclusive():
+    result = CliRunner().invoke(
+        main,
+        ["--env", "pytest_data_tools", "--type", "cans", "--input-csv", "test_csv/can_valid.tsv", "--stream", "--safe"],
+    )
+
+    assert result.exit_code != 0
+    assert "cannot be used with --safe" in result.output
+
+
+def _load_cans(loader, session):
+    data = create_all_can_data(list(csv.DictReader(open("test_csv/can_valid.tsv"), dialect="excel-tab")))
+    sys_user = get_or_create_sys_user(session)
+    loader(data, sys_user, session)
+    return {
+        can.id: (
+            can.number,
+            can.description,
+            can.nick_name,
+            can.portfolio_id,
+            can.funding_details.fund_code if can.funding_details else None,
+        )
+        for can in session.execute(select(CAN).where(CAN.id.in_([int(d.SYS_CAN_ID) for d in data]))).scalars()
+    }
+
+
+def test_create_all_models_bulk_matches_safe_mode(db_with_portfolios):
+    bulk_cans = _load_cans(create_all_models_bulk, db_with_portfolios)
+    bulk_events = db_with_portfolios.execute(select(func.count(OpsEvent.id))).scalar()
+
+    # loading the same rows again one at a time finds every CAN and changes nothing
+    safe_cans = _load_cans(create_all_models, db_with_portfolios)
+
+    assert safe_cans == bulk_cans
+    assert bulk_events >= len(bulk_cans)
+
+
+def test_create_all_models_bulk_commits_once_per_chunk(db_with_portfolios, mocker):
+    mocker.patch("data_tools.src.load_cans.utils.chunked", partial(chunked, size=5))
+    commit = mocker.spy(db_with_portfolios, "commit")
+
+    cans = _load_cans(create_all_models_bulk, db_with_portfolios)
+
+    assert len(cans) == 13
+    assert commit.call_count == 3  # 13 rows in chunks of 5
+    create_events = (
+        db_with_portfolios.execute(select(OpsEvent).where(OpsEvent.event_type == OpsEventType.CREATE_NEW_CAN))
+        .scalars()
+        .all()
+    )
+    assert len(create_events) == 13
+    history_objs = (
+        db_with_portfolios.execute(select(OpsDBHistory).where(OpsDBHistory.class_name == "CAN")).scalars().all()
+    )
+    assert len(history_objs) == 13
+
+
+def test_create_all_models_bulk_keeps_references_loaded(db_with_portfolios, mocker):
+    mocker.patch("data_tools.src.load_cans.utils.chunked", partial(chunked, size=5))
+    references = CANReferences.load(db_with_portfolios)
+    loader = partial(create_all_models_bulk, references=references)
+
+    _load_cans(loader, db_with_portfolios)
+
+    # the chunks' commits do not expire the prefetched portfolios, so later chunks do not reload them
+    portfolios = references.portfolios_by_abbreviation.values()
+    assert portfolios
+    assert not any(inspect(portfolio).expired_attributes for portfolio in portfolios)
+
+
 @pytest.mark.skip(reason="Need to update the test data")
 def test_create_models_upsert(db_with_portfolios):
     sys_user = get_or_create_sys_user(db_with_portfolios)
@@ -0,0 +1,115 @@
+from datetime import date
+
+import pytest
+from click.testing import CliRunner
+from sqlalchemy import delete, select
+
+from data_tools.src.common.utils import get_or_create_sys_user
+from data_tools.src.rebuild_can_funding_rollup import main, rebuild_and_verify
+from models import *  # noqa: F403, F401
+
+
+@pytest.fixture()
+def db_with_can_funding(loaded_db):
+    """A CAN with a funding budget, funding received and budget lines in two statuses and fiscal years."""
+    sys_user = get_or_create_sys_user(loaded_db)
+    loaded_db.add(sys_user)
+    loaded_db.commit()
+    uid = sys_user.id
+
+    division = Division(id=9200, name="Rollup Test Division", abbreviation="RTD", created_by=uid)
+    loaded_db.add(division)
+    loaded_db.commit()
+
+    portfolio = Portfolio(id=9200, name="Rollup Test Portfolio", abbreviation="RTP", division_id=9200, created_by=uid)
+    loaded_db.add(portfolio)
+    loaded_db.commit()
+
+    can = CAN(id=9200, number="ROLLUP0001", portfolio_id=portfolio.id, created_by=uid)
+    loaded_db.add(can)
+    loaded_db.commit()
+
+    project = ResearchProject(id=9200, title="Rollup Test Project", short_title="RTPR")
+    loaded_db.add(project)
+    loaded_db.commit()
+
+    agreement = ContractAgreement(id=9200, name="Rollup Test Contract", project_id=project.id, created_by=uid)
+    loaded_db.add(agreement)
+    loaded_db.commit()
+
+    loaded_db.add_all(
+        [
+            CANFundingBudget(can_id=can.id, fiscal_year=2024, budget=100000, created_by=uid),
+            CANFundingReceived(can_id=can.id, fiscal_year=2024, funding=40000, created_by=uid),
+            ContractBudgetLineItem(
+                agreement_id=agreement.id,
+                can_id=can.id,
+                amount=1000,
+                date_needed=date(2024, 1, 1),
+                status=BudgetLineItemStatus.PLANNED,
+                created_by=uid,
+            ),
+            ContractBudgetLineItem(
+                agreement_id=agreement.id,
+                can_id=can.id,
+                amount=2500,
+                date_needed=date(2025, 1, 1),
+                status=BudgetLineItemStatus.OBLIGATED,
+                created_by=uid,
+            ),
+        ]
+    )
+    loaded_db.commit()
+
+    yield loaded_db
+
+    loaded_db.execute(delete(CANFundingRollup))
+    loaded_db.commit()
+
+
+def test_rebuild_and_verify(db_with_can_funding):
+    mismatches = rebuild_and_verify(db_with_can_funding)
+
+    assert mismatches == []
+
+    rows = db_with_can_funding.execute(
+        select(
+            CANFundingRollup.fiscal_year,
+            CANFundingRollup.status,
+            CANFundingRollup.amount,
+            CANFundingRollup.budget,
+            CANFundingRollup.received,
+        ).where(CANFundingRollup.can_id == 9200)
+    ).all()
+    assert sorted(rows, key=str) == sorted(
+        [
+            (2024, BudgetLineItemStatus.PLANNED, 1000, 0, 0),
+            (2025, BudgetLineItemStatus.OBLIGATED, 2500, 0, 0),
+            (2024, None, 0, 100000, 40000),
+        ],
+        key=str,
+    )
+
+
+def test_verify_only_reports_stale_rollup(db_with_can_funding):
+    rebuild_and_verify(db_with_can_funding)
+
+    db_with_can_funding.add(CANFundingReceived(can_id=9200, fiscal_year=2024, funding=5000))
+    db_with_can_funding.commit()
+
+    mismatches = rebuild_and_verify(db_with_can_funding, verify_only=True)
+
+    assert len(mismatches) == 1
+    assert mismatches[0]["can_id"] == 9200
+    assert mismatches[0]["fiscal_year"] == 2024
+    assert mismatches[0]["status"] is None
+    assert mismatches[0]["expected"]["received"] == 45000
+    assert mismatches[0]["actual"]["received"] == 40000
+
+    assert rebuild_and_verify(db_with_can_funding) == []
+
+
+def test_main_requires_env():
+    result = CliRunner().invoke(main, [])
+
+    assert result.exit_code != 0
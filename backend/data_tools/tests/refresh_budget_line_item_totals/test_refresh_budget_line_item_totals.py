@@ -0,0 +1,111 @@
+from datetime import date
+
+import pytest
+from click.testing import CliRunner
+from sqlalchemy import select
+
+from data_tools.src.common.utils import get_or_create_sys_user
+from data_tools.src.refresh_budget_line_item_totals import main, refresh_and_verify
+from models import *  # noqa: F403, F401
+
+
+@pytest.fixture()
+def db_with_priced_budget_lines(loaded_db):
+    """An agreement with a procurement shop fee of 2% and two budget lines."""
+    sys_user = get_or_create_sys_user(loaded_db)
+    loaded_db.add(sys_user)
+    loaded_db.commit()
+    uid = sys_user.id
+
+    shop = ProcurementShop(id=9300, name="Totals Test Shop", abbr="TTS", created_by=uid)
+    loaded_db.add(shop)
+    loaded_db.commit()
+
+    loaded_db.add(ProcurementShopFee(procurement_shop_id=shop.id, fee=2, created_by=uid))
+    loaded_db.commit()
+
+    project = ResearchProject(id=9300, title="Totals Test Project", short_title="TTPR")
+    loaded_db.add(project)
+    loaded_db.commit()
+
+    agreement = ContractAgreement(
+        id=9300, name="Totals Test Contract", project_id=project.id, awarding_entity_id=shop.id, created_by=uid
+    )
+    loaded_db.add(agreement)
+    loaded_db.commit()
+
+    loaded_db.add_all(
+        [
+            ContractBudgetLineItem(
+                id=9300,
+                agreement_id=agreement.id,
+                amount=1000,
+                date_needed=date(2024, 1, 1),
+                status=BudgetLineItemStatus.PLANNED,
+                created_by=uid,
+            ),
+            ContractBudgetLineItem(
+                id=9301,
+                agreement_id=agreement.id,
+                amount=2500,
+                date_needed=date(2025, 1, 1),
+                status=BudgetLineItemStatus.DRAFT,
+                created_by=uid,
+            ),
+        ]
+    )
+    loaded_db.commit()
+
+    yield loaded_db
+
+
+def test_refresh_and_verify(db_with_priced_budget_lines):
+    assert len(refresh_and_verify(db_with_priced_budget_lines, verify_only=True)) == 2
+
+    mismatches = refresh_and_verify(db_with_priced_budget_lines)
+
+    assert mismatches == []
+    rows = db_with_priced_budget_lines.execute(
+        select(BudgetLineItem.id, BudgetLineItem._fees, BudgetLineItem._total)
+        .where(BudgetLineItem.agreement_id == 9300)
+        .order_by(BudgetLineItem.id)
+    ).all()
+    assert rows == [(9300, 20, 1020), (9301, 50, 2550)]
+
+
+def test_verify_only_reports_stale_totals(db_with_priced_budget_lines):
+    refresh_and_verify(db_with_priced_budget_lines)
+
+    budget_line = db_with_priced_budget_lines.get(BudgetLineItem, 9300)
+    budget_line.amount = 2000
+    db_with_priced_budget_lines.commit()
+
+    mismatches = refresh_and_verify(db_with_priced_budget_lines, verify_only=True)
+
+    assert len(mismatches) == 1
+    assert mismatches[0]["budget_line_item_id"] == 9300
+    assert mismatches[0]["expected"] == {"fees": 40, "total": 2040}
+    assert mismatches[0]["actual"] == {"fees": 20, "total": 1020}
+
+    assert refresh_and_verify(db_with_priced_budget_lines) == []
+
+
+def test_budget_line_update_is_versioned(db_with_priced_budget_lines):
+    budget_line = db_with_priced_budget_lines.get(BudgetLineItem, 9300)
+    budget_line.amount = 3000
+    budget_line.date_needed = date(2024, 11, 1)
+    db_with_priced_budget_lines.commit()
+
+    # the stored fiscal year, fees and total are not copied into the version rows
+    db_with_priced_budget_lines.refresh(budget_line)
+    assert budget_line._fiscal_year == 2025
+    latest_version = budget_line.versions[-1]
+    assert latest_version.amount == 3000
+    assert latest_version.date_needed == date(2024, 11, 1)
+    assert not hasattr(latest_version, "_fiscal_year")
+
+
+def test_main_requires_env():
+    result = CliRunner().invoke(main, [])
+
+    assert result.exit_code != 0
@@ -0,0 +1,173 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from data_tools.src.run_pipeline import (
+    Checkpoint,
+    CountingRows,
+    PipelineStep,
+    StepResult,
+    build_dependencies,
+    read_manifest,
+    run_pipeline,
+)
+
+
+def _step(type, name=None, **options):
+    return PipelineStep(name=name or type, type=type, input_csv=f"test_csv/{name or type}.tsv", **options)
+
+
+class FakeStepRunner:
+    """Records the steps run and fails the steps in fail. The steps in wait_for_each_other wait on a barrier."""
+
+    def __init__(self, fail=(), wait_for_each_other=()):
+        self.fail = set(fail)
+        self.wait_for_each_other = set(wait_for_each_other)
+        self.barrier = threading.Barrier(len(self.wait_for_each_other)) if self.wait_for_each_other else None
+        self.ran = []
+        self.lock = threading.Lock()
+
+    def __call__(self, env, step):
+        if step.name in self.wait_for_each_other:
+            self.barrier.wait(timeout=5)
+        with self.lock:
+            self.ran.append(step.name)
+        if step.name in self.fail:
+            raise RuntimeError(f"{step.name} failed")
+        return StepResult(name=step.name, rows=10, seconds=0.5)
+
+
+def test_read_manifest(tmp_path):
+    manifest = tmp_path / "pipeline.json5"
+    manifest.write_text("""{
+          // the CANs and contracts
+          steps: [
+            { type: "cans", input_csv: "test_csv/can_valid.tsv", stream: true },
+            { name: "contracts_fy24", type: "contracts", input_csv: "test_csv/contracts.tsv", depends_on: ["cans"] },
+          ],
+        }""")
+
+    assert read_manifest(str(manifest)) == [
+        PipelineStep(name="cans", type="cans", input_csv="test_csv/can_valid.tsv", stream=True),
+        PipelineStep(name="contracts_fy24", type="contracts", input_csv="test_csv/contracts.tsv", depends_on=("cans",)),
+    ]
+
+
+@pytest.mark.parametrize(
+    "steps, message",
+    [
+        ('[{ type: "budget_lines", input_csv: "a.tsv" }]', "unknown type"),
+        ('[{ type: "cans" }]', "no input_csv"),
+        ('[{ type: "cans", input_csv: "a.tsv", fast: true }]', "unknown options: fast"),
+        ('[{ type: "cans", input_csv: "a.tsv" }, { type: "cans", input_csv: "b.tsv" }]', "name of another step"),
+    ],
+)
+def test_read_manifest_invalid(tmp_path, steps, message):
+    manifest = tmp_path / "pipeline.json5"
+    manifest.write_text(f"{{ steps: {steps} }}")
+
+    with pytest.raises(ValueError, match=message):
+        read_manifest(str(manifest))
+
+
+def test_build_dependencies():
+    steps = [
+        _step("contract_budget_lines"),
+        _step("cans"),
+        _step("roles"),
+        _step("contracts"),
+        _step("vendors"),
+        _step("contract_budget_lines", name="contract_budget_lines_fy25"),
+    ]
+
+    assert build_dependencies(steps) == {
+        "contract_budget_lines": {"contracts", "cans", "vendors", "roles"},
+        "cans": set(),
+        "roles": set(),
+        # users is not in the manifest, so contracts runs after the roles users depends on
+        "contracts": {"vendors", "roles"},
+        "vendors": set(),
+        "contract_budget_lines_fy25": {"contracts", "cans", "vendors", "roles", "contract_budget_lines"},
+    }
+
+
+def test_build_dependencies_invalid():
+    with pytest.raises(ValueError, match="unknown step: users"):
+        build_dependencies([_step("cans", depends_on=("users",))])
+
+    with pytest.raises(ValueError, match="cycle"):
+        build_dependencies([_step("contracts"), _step("vendors", depends_on=("contracts",))])
+
+
+def test_run_pipeline_runs_independent_steps_concurrently(tmp_path):
+    steps = [_step("cans"), _step("vendors"), _step("projects"), _step("contracts")]
+    # cans, vendors and projects only finish once all three are running at the same time
+    runner = FakeStepRunner(wait_for_each_other={"cans", "vendors", "projects"})
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        results = run_pipeline(steps, Checkpoint(str(tmp_path / "checkpoint.json")), executor, "pytest", runner)
+
+    assert set(runner.ran[:3]) == {"cans", "vendors", "projects"}
+    assert runner.ran[3] == "contracts"
+    assert {result.name for result in results} == {"cans", "vendors", "projects", "contracts"}
+    assert results[0].rows_per_second == 20
+
+
+def test_run_pipeline_resumes_from_the_checkpoint(tmp_path):
+    checkpoint_path = str(tmp_path / "checkpoint.json")
+    steps = [_step("vendors"), _step("contracts"), _step("contract_budget_lines"), _step("cans")]
+
+    failing_runner = FakeStepRunner(fail={"contracts"})
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        with pytest.raises(RuntimeError, match="Steps failed: contracts"):
+            run_pipeline(steps, Checkpoint(checkpoint_path), executor, "pytest", failing_runner)
+
+    # contract_budget_lines is not started after contracts failed
+    assert "contract_budget_lines" not in failing_runner.ran
+    with open(checkpoint_path) as f:
+        completed = set(json.load(f)["steps"])
+    assert "contracts" not in completed
+    assert "vendors" in completed
+
+    runner = FakeStepRunner()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        run_pipeline(steps, Checkpoint(checkpoint_path), executor, "pytest", runner)
+
+    assert set(runner.ran) == {"contracts", "contract_budget_lines"} | ({"cans"} - completed)
+    assert set(Checkpoint(checkpoint_path).steps) == {"vendors", "contracts", "contract_budget_lines", "cans"}
+
+
+def test_run_pipeline_reruns_changed_steps(tmp_path):
+    checkpoint = Checkpoint(str(tmp_path / "checkpoint.json"))
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        run_pipeline([_step("cans"), _step("vendors")], checkpoint, executor, "pytest", FakeStepRunner())
+
+        runner = FakeStepRunner()
+        run_pipeline([_step("cans", stream=True), _step("vendors")], checkpoint, executor, "pytest", runner)
+
+    assert runner.ran == ["cans"]
+
+
+def test_run_pipeline_reruns_steps_whose_input_file_changed(tmp_path):
+    input_csv = tmp_path / "cans.tsv"
+    input_csv.write_text("CAN_NBR\nG99HRF2\n")
+    steps = [PipelineStep(name="cans", type="cans", input_csv=str(input_csv)), _step("vendors")]
+    checkpoint = Checkpoint(str(tmp_path / "checkpoint.json"))
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        run_pipeline(steps, checkpoint, executor, "pytest", FakeStepRunner())
+
+        # the file is edited in place, so its path is unchanged
+        input_csv.write_text("CAN_NBR\nG99HRF2\nG99PHS9\n")
+        runner = FakeStepRunner()
+        run_pipeline(steps, checkpoint, executor, "pytest", runner)
+
+    assert runner.ran == ["cans"]
+
+
+def test_counting_rows():
+    rows = CountingRows(iter([{"id": "1"}, {"id": "2"}]))
+
+    assert list(rows) == [{"id": "1"}, {"id": "2"}]
+    assert rows.count == 2
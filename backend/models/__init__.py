@@ -7,6 +7,8 @@ from .budget_line_items import *
 from .change_requests import *
 from .document import *
 from .events import *
+from .budget_line_item_totals import *
+from .can_funding_rollup import *
 from .can_history import *
 from .agreement_history import *
 from .history import *
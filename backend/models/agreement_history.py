@@ -3,7 +3,7 @@ from enum import Enum, auto
 from typing import List, Optional
 
 from loguru import logger
-from sqlalchemy import ForeignKey, Integer, Text
+from sqlalchemy import ForeignKey, Integer, Text, select
 from sqlalchemy.dialects.postgresql import ENUM
 from sqlalchemy.orm import Mapped, Session, mapped_column
 
@@ -19,6 +19,7 @@ from models import (
     User,
 )
 from models.base import BaseModel
+from models.history_dedupe import HistoryDeduplicator
 
 
 class AgreementHistoryType(Enum):
@@ -1283,33 +1284,43 @@ def create_procurement_tracker_step_update_history_event(
 def add_history_events(events: List[AgreementHistory], session: Session) -> None:
     """Add a list of AgreementHistory events to the database session.
     First check that there are not any matching events already in the database to prevent duplicates.
+
+    An event is a duplicate of another event of the same agreement with the same type and message within one
+    minute of it. The existing events that could match are read in one query, whatever the number of events.
     """
-    for event in events:
-        agreement_history_items = (
-            session.query(AgreementHistory)
-            .where(AgreementHistory.agreement_id_record == event.agreement_id_record)
-            .all()
+    if not events:
+        return
+
+    agreement_ids = {event.agreement_id_record for event in events}
+    existing_items = session.execute(
+        select(
+            AgreementHistory.agreement_id_record,
+            AgreementHistory.history_type,
+            AgreementHistory.history_message,
+            AgreementHistory.timestamp,
+        ).where(
+            AgreementHistory.agreement_id_record.in_(agreement_ids),
+            AgreementHistory.history_message.in_({event.history_message for event in events}),
         )
+    ).all()
 
-        # Also check items already added to session in this batch (not yet committed)
-        for item in session.new:
-            if isinstance(item, AgreementHistory) and item.agreement_id_record == event.agreement_id_record:
-                agreement_history_items.append(item)
-
-        duplicate_found = False
-        for item in agreement_history_items:
-            if (
-                is_timespan_within_one_minute(event.timestamp, item.timestamp)
-                and item.history_type == event.history_type
-                and item.history_message == event.history_message
-            ):
-                # enough fields match that we're willing to say this is a duplicate.
-                duplicate_found = True
-                break
+    # Also check items already added to session in this batch (not yet committed)
+    existing_items.extend(
+        item
+        for item in session.new
+        if isinstance(item, AgreementHistory) and item.agreement_id_record in agreement_ids
+    )
 
+    deduplicator = HistoryDeduplicator()
+    for item in existing_items:
+        deduplicator.add((item.agreement_id_record, item.history_type, item.history_message), item.timestamp)
+
+    for event in events:
+        content = (event.agreement_id_record, event.history_type, event.history_message)
         # If no duplicate of the event was found, add it to the database session.
-        if not duplicate_found:
+        if not deduplicator.is_duplicate(content, event.timestamp):
             session.add(event)
+            deduplicator.add(content, event.timestamp)
 
 
 def get_agreement_property_display_name(property_name: str, in_title: bool) -> str:
@@ -1356,18 +1367,6 @@ def get_agreement_property_display_name(property_name: str, in_title: bool) -> s
     )
 
 
-def is_timespan_within_one_minute(datetime_to_check: str, reference_datetime: str) -> bool:
-    """Check if two ISO format timespan strings are within one minute of each other."""
-    try:
-        datetime_to_check_dt = datetime.fromisoformat(datetime_to_check.replace("Z", "+00:00"))
-        reference_datetime_dt = datetime.fromisoformat(reference_datetime.replace("Z", "+00:00"))
-        difference = abs((datetime_to_check_dt - reference_datetime_dt).total_seconds())
-        return difference <= 60  # 60 seconds in a minute
-    except ValueError as e:
-        logger.error(f"Error parsing timespan strings: {e}")
-        return False
-
-
 def get_services_component_property_display_name(property_name: str) -> str:
     """Get the display name for a given services component property."""
     services_component_display_names = {
@@ -27,6 +27,7 @@ from models.base import BaseModel
 from models.change_requests import AgreementChangeRequest, ChangeRequestStatus
 from models.users import User
 from models.research_methodologies import ResearchMethodology
+from models.search import trigram_index
 from models.special_topics import SpecialTopic
 
 
@@ -391,6 +392,8 @@ class Agreement(BaseModel):
     __table_args__ = (
         Index("ix_agreement_name_type_lower", func.lower(name), agreement_type, unique=True),
         Index("ix_agreement_project_id", "project_id"),
+        trigram_index("ix_agreement_name_trgm", "name"),
+        trigram_index("ix_agreement_nick_name_trgm", "nick_name"),
     )
 
     @property
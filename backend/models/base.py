@@ -9,7 +9,7 @@ import sqlalchemy
 from loguru import logger
 from marshmallow import fields
 from marshmallow.exceptions import MarshmallowError
-from sqlalchemy import Column, ForeignKey, Integer, Sequence, event, func
+from sqlalchemy import Column, ForeignKey, Integer, Sequence, event, func, select
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, mapper, object_session
 from typing_extensions import Any
 
@@ -38,6 +38,12 @@ def setup_schema(base: Base) -> callable:
                     include_relationships = True
                     load_instance = True
                     include_fk = True
+                    # private columns (e.g. stored copies of hybrid properties) are not serialized
+                    exclude = tuple(
+                        attr.key
+                        for attr in class_.__mapper__.column_attrs
+                        if attr.key.startswith("_")
+                    )
 
                 schema_class_name = f"{class_.__name__}Schema"
 
@@ -87,6 +93,26 @@ from sqlalchemy_continuum import make_versioned
 # init sqlalchemy_continuum
 make_versioned(user_cls=None)
 
+# Schema instances are stateless during dump, so one instance per schema class is shared by every call.
+# The caches are keyed by the generated schema class, so schemas regenerated by setup_schema are picked up.
+_schema_cache: dict[type, marshmallow.Schema] = {}
+_column_schema_cache: dict[type, marshmallow.Schema] = {}
+_safe_user_schema: Optional[marshmallow.Schema] = None
+
+
+def get_safe_user_schema() -> Optional[marshmallow.Schema]:
+    """
+    Return a shared SafeUserSchema instance, or None if SafeUserSchema is not in the marshmallow class registry.
+    """
+    global _safe_user_schema
+    if _safe_user_schema is None:
+        try:
+            _safe_user_schema = marshmallow.class_registry.get_class("SafeUserSchema")()
+        except marshmallow.exceptions.RegistryError:
+            logger.debug("SafeUserSchema not found in marshmallow class registry")
+    return _safe_user_schema
+
+
 class BaseModel(Base):
     __versioned__ = {}
     __abstract__ = True
@@ -135,22 +161,44 @@ class BaseModel(Base):
             )
         )
 
-    def to_dict(self):
-        if not hasattr(self, "__marshmallow__"):
+    @classmethod
+    def get_schema(cls) -> marshmallow.Schema:
+        """Return the shared instance of the generated marshmallow schema of the model."""
+        if not hasattr(cls, "__marshmallow__"):
             raise MarshmallowError(
-                f"Model {self.__class__.__name__} does not have a marshmallow schema"
+                f"Model {cls.__name__} does not have a marshmallow schema"
+            )
+        schema_class = cls.__marshmallow__
+        schema = _schema_cache.get(schema_class)
+        if schema is None:
+            schema = _schema_cache[schema_class] = schema_class()
+        return schema
+
+    @classmethod
+    def get_column_schema(cls) -> marshmallow.Schema:
+        """Return a shared instance of the marshmallow schema of the model restricted to its columns."""
+        schema_class = cls.get_schema().__class__
+        schema = _column_schema_cache.get(schema_class)
+        if schema is None:
+            column_keys = [
+                attr.key
+                for attr in cls.__mapper__.column_attrs
+                if attr.key in schema_class._declared_fields
+            ]
+            schema = _column_schema_cache[schema_class] = schema_class(
+                only=column_keys
             )
-        schema = self.__marshmallow__()
-        data = schema.dump(self)
+        return schema
+
+    def to_dict(self):
+        data = self.get_schema().dump(self)
         data["display_name"] = self.display_name
 
         # SafeUserSchema is not always available in the marshmallow class registry
         # It is primarily used in the Flask API as a kluge for responses that are not
         # using custom marshmallow schemas.
-        try:
-            _safe_user_schema_class = marshmallow.class_registry.get_class("SafeUserSchema")
-
-            user_schema = _safe_user_schema_class()
+        user_schema = get_safe_user_schema()
+        if user_schema:
             data["created_by_user"] = (
                 user_schema.dump(self.created_by_user)
                 if self.created_by_user
@@ -161,11 +209,43 @@ class BaseModel(Base):
                 if self.updated_by_user
                 else None
             )
-        except marshmallow.exceptions.RegistryError:
-            logger.debug("SafeUserSchema not found in marshmallow class registry")
 
         return data
 
+    def to_column_dict(self) -> dict[str, Any]:
+        """
+        A slim variant of to_dict with only the column values of the model: no relationships, no
+        display_name and no created_by_user/updated_by_user.
+        """
+        return self.get_column_schema().dump(self)
+
+    @staticmethod
+    def to_dicts(objs: list["BaseModel"]) -> list[dict[str, Any]]:
+        """
+        Return ``[obj.to_dict() for obj in objs]``, loading the created_by/updated_by users of all the objects
+        with one query instead of one query per object.
+        """
+        from models import User
+
+        session = next(
+            (object_session(obj) for obj in objs if object_session(obj)), None
+        )
+        user_ids = {
+            user_id
+            for obj in objs
+            for user_id in (obj.created_by, obj.updated_by)
+            if user_id
+        }
+        users = []
+        if session and user_ids:
+            # to_dict looks the users up with session.get, which finds them in the identity map
+            # as long as they are referenced here
+            users = session.scalars(select(User).where(User.id.in_(user_ids))).all()
+
+        data = [obj.to_dict() for obj in objs]
+        del users
+        return data
+
     @property
     def created_by_user(self):
         from models import User
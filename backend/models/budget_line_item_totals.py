@@ -0,0 +1,142 @@
+"""Stored fees and total of budget line items."""
+
+from typing import Iterable, Optional
+
+from loguru import logger
+from sqlalchemy import or_, select, update
+from sqlalchemy.orm import Session
+
+from models import Agreement, BudgetLineItem, OpsEvent, OpsEventType
+
+
+def _stale_totals_condition():
+    return or_(
+        BudgetLineItem._fees.is_distinct_from(BudgetLineItem.computed_fees()),
+        BudgetLineItem._total.is_distinct_from(BudgetLineItem.computed_total()),
+    )
+
+
+def refresh_budget_line_item_totals(
+    session: Session,
+    agreement_ids: Optional[Iterable[int]] = None,
+    budget_line_item_ids: Optional[Iterable[int]] = None,
+) -> int:
+    """
+    Recompute the stored fees and total of budget line items whose values are out of date.
+
+    Restricted to the budget lines of ``agreement_ids`` and to ``budget_line_item_ids`` when either is given;
+    every budget line is checked when neither is. Returns the number of budget lines updated. The caller is
+    responsible for committing.
+    """
+    stmt = (
+        update(BudgetLineItem.__table__)
+        .where(_stale_totals_condition())
+        .values(
+            fees=BudgetLineItem.computed_fees(),
+            total=BudgetLineItem.computed_total(),
+            # the stored values are derived data, so refreshing them is not an update of the budget line
+            updated_on=BudgetLineItem.__table__.c.updated_on,
+        )
+    )
+
+    if agreement_ids is not None or budget_line_item_ids is not None:
+        agreement_ids = sorted({agreement_id for agreement_id in agreement_ids or [] if agreement_id is not None})
+        budget_line_item_ids = sorted({bli_id for bli_id in budget_line_item_ids or [] if bli_id is not None})
+        if not agreement_ids and not budget_line_item_ids:
+            return 0
+        stmt = stmt.where(
+            or_(
+                BudgetLineItem.agreement_id.in_(agreement_ids),
+                BudgetLineItem.id.in_(budget_line_item_ids),
+            )
+        )
+
+    updated = session.execute(stmt).rowcount
+    logger.debug(f"Refreshed the stored fees and total of {updated} budget lines")
+    return updated
+
+
+def verify_budget_line_item_totals(session: Session) -> list[dict]:
+    """
+    Compare the stored fees and total of every budget line with the computed ones.
+
+    Returns one dict per budget line whose stored values differ, with the ``expected`` (computed) and
+    ``actual`` (stored) values. An empty list means the stored values are up to date.
+    """
+    rows = session.execute(
+        select(
+            BudgetLineItem.id,
+            BudgetLineItem.computed_fees(),
+            BudgetLineItem.computed_total(),
+            BudgetLineItem._fees,
+            BudgetLineItem._total,
+        )
+        .where(_stale_totals_condition())
+        .order_by(BudgetLineItem.id)
+    ).all()
+    return [
+        {
+            "budget_line_item_id": bli_id,
+            "expected": {"fees": expected_fees, "total": expected_total},
+            "actual": {"fees": actual_fees, "total": actual_total},
+        }
+        for bli_id, expected_fees, expected_total, actual_fees, actual_total in rows
+    ]
+
+
+def get_procurement_shop_agreement_ids(session: Session, procurement_shop_id: Optional[int]) -> set[int]:
+    """Return the ids of the agreements whose procurement shop (awarding entity) is the given shop."""
+    if procurement_shop_id is None:
+        return set()
+    stmt = select(Agreement.id).where(Agreement.awarding_entity_id == procurement_shop_id)
+    return set(session.scalars(stmt).all())
+
+
+def _changed_agreement_ids(changes: dict) -> set[int]:
+    """Agreement ids before and after an ``agreement_id`` change recorded by ``generate_events_update``."""
+    agreement_change = (changes or {}).get("agreement_id") or {}
+    return {agreement_change.get("old_value"), agreement_change.get("new_value")} - {None}
+
+
+def get_affected_budget_lines(event: OpsEvent, session: Session) -> tuple[set[int], set[int]]:
+    """
+    Return the ids of the agreements and of the budget lines whose stored fees and total may be changed by the
+    event.
+    """
+    details = event.event_details or {}
+
+    match event.event_type:
+        case OpsEventType.CREATE_BLI:
+            new_bli = details.get("new_bli", {})
+            return {new_bli.get("agreement_id")} - {None}, {new_bli.get("id")} - {None}
+        case OpsEventType.UPDATE_BLI:
+            bli = details.get("bli", {})
+            agreement_ids = {bli.get("agreement_id")}
+            agreement_ids |= _changed_agreement_ids(details.get("bli_updates", {}).get("changes"))
+            return agreement_ids - {None}, {bli.get("id")} - {None}
+        case OpsEventType.UPDATE_CHANGE_REQUEST:
+            # An approved change request may re-price budget lines of the agreement
+            change_request = details.get("change_request", {})
+            agreement_ids = {change_request.get("agreement_id")} - {None}
+            return agreement_ids, {change_request.get("budget_line_item_id")} - {None}
+        case OpsEventType.UPDATE_AGREEMENT:
+            # Fees of the agreement's budget lines depend on its procurement shop
+            return {details.get("agreement_id")} - {None}, set()
+        case OpsEventType.UPDATE_PROCUREMENT_SHOP:
+            # The fee schedule of the shop changed, so re-price the budget lines of the agreements using it
+            procurement_shop_id = details.get("proc_shop_fee", {}).get("owner_id")
+            return get_procurement_shop_agreement_ids(session, procurement_shop_id), set()
+        case _:
+            return set(), set()
+
+
+def budget_line_item_totals_trigger_func(event: OpsEvent, session: Session) -> None:
+    """Refresh the stored fees and total of every budget line affected by the event. The caller commits."""
+    agreement_ids, budget_line_item_ids = get_affected_budget_lines(event, session)
+    if not agreement_ids and not budget_line_item_ids:
+        return
+    logger.debug(
+        f"{event.event_type.name} event affects the fees of agreements {sorted(agreement_ids)} "
+        f"and budget lines {sorted(budget_line_item_ids)}"
+    )
+    refresh_budget_line_item_totals(session, agreement_ids, budget_line_item_ids)
@@ -4,10 +4,11 @@ import decimal
 from datetime import date
 from decimal import Decimal
 from enum import Enum, auto
-from typing import Optional
+from typing import ClassVar, Optional
 
 from sqlalchemy import (
     Boolean,
+    Computed,
     Date,
     ForeignKey,
     Index,
@@ -16,9 +17,7 @@ from sqlalchemy import (
     Sequence,
     String,
     Text,
-    case,
     event,
-    extract,
     select,
 )
 from sqlalchemy.dialects.postgresql import ENUM
@@ -40,6 +39,7 @@ from models.change_requests import (
     ChangeRequestStatus,
     ChangeRequestType,
 )
+from models.search import trigram_index
 
 
 class BudgetLineItemStatus(str, Enum):
@@ -76,6 +76,9 @@ class BudgetLineItem(BaseModel):
     """
 
     __tablename__ = "budget_line_item"
+    # The stored fiscal year, fees and total are derived from other columns, so they are not versioned (a
+    # version row cannot copy a generated column into its own)
+    __versioned__ = {"exclude": ["_fiscal_year", "_fees", "_total"]}
 
     id: Mapped[int] = BaseModel.get_pk_column(sequence=Sequence("budget_line_item_id_seq", start=15000, increment=1))
     budget_line_item_type: Mapped[AgreementType] = mapped_column(ENUM(AgreementType), default=AgreementType.CONTRACT)
@@ -110,6 +113,11 @@ class BudgetLineItem(BaseModel):
     can: Mapped[Optional[CAN]] = relationship(CAN, back_populates="budget_line_items")
 
     amount: Mapped[Optional[decimal]] = mapped_column(Numeric(12, 2))
+    # Stored copies of fees and total, refreshed by models.budget_line_item_totals; use the fees/total hybrids
+    _fees: Mapped[Optional[decimal]] = mapped_column("fees", Numeric)
+    _total: Mapped[Optional[decimal]] = mapped_column("total", Numeric)
+    # When True the fees/total SQL expressions read the stored columns instead of computing the fees
+    use_stored_totals: ClassVar[bool] = False
 
     status: Mapped[Optional[BudgetLineItemStatus]] = mapped_column(
         ENUM(BudgetLineItemStatus), default=BudgetLineItemStatus.DRAFT
@@ -126,6 +134,17 @@ class BudgetLineItem(BaseModel):
     is_under_current_resolution: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
 
     date_needed: Mapped[Optional[date]] = mapped_column(Date)
+    # Stored copy of fiscal_year so that queries filtering on it can use an index; use the fiscal_year hybrid
+    _fiscal_year: Mapped[Optional[int]] = mapped_column(
+        "fiscal_year",
+        Integer,
+        Computed(
+            "CASE WHEN EXTRACT(MONTH FROM date_needed) >= 10 "
+            "THEN CAST(EXTRACT(YEAR FROM date_needed) AS INTEGER) + 1 "
+            "ELSE CAST(EXTRACT(YEAR FROM date_needed) AS INTEGER) END",
+            persisted=True,
+        ),
+    )
     extend_pop_to: Mapped[Optional[date]] = mapped_column(Date)
     start_date: Mapped[Optional[date]] = mapped_column(Date)
     end_date: Mapped[Optional[date]] = mapped_column(Date)
@@ -153,6 +172,10 @@ class BudgetLineItem(BaseModel):
         Index("ix_budget_line_item_can_id", "can_id"),
         Index("ix_budget_line_item_status", "status"),
         Index("ix_budget_line_item_date_needed", "date_needed"),
+        Index("ix_budget_line_item_fiscal_year_status", "fiscal_year", "status"),
+        Index("ix_budget_line_item_can_id_fiscal_year", "can_id", "fiscal_year"),
+        Index("ix_budget_line_item_total", "total"),
+        trigram_index("ix_budget_line_item_line_description_trgm", "line_description"),
     )
 
     @BaseModel.display_name.getter
@@ -198,7 +221,13 @@ class BudgetLineItem(BaseModel):
 
     @fees.expression
     def fees(cls):
-        # This provides the SQL expression equivalent
+        if cls.use_stored_totals:
+            return cls._fees
+        return cls.computed_fees()
+
+    @classmethod
+    def computed_fees(cls):
+        """The SQL expression equivalent of the fees property, computed from the procurement shop fees."""
         from sqlalchemy import and_, case, func, literal, select
         from sqlalchemy.orm import aliased
 
@@ -275,7 +304,14 @@ class BudgetLineItem(BaseModel):
 
     @total.expression
     def total(cls):
-        return cls.amount + cls.fees
+        if cls.use_stored_totals:
+            return cls._total
+        return cls.computed_total()
+
+    @classmethod
+    def computed_total(cls):
+        """The SQL expression equivalent of the total property, computed from the procurement shop fees."""
+        return cls.amount + cls.computed_fees()
 
     @hybrid_property
     def portfolio_id(self):
@@ -299,17 +335,8 @@ class BudgetLineItem(BaseModel):
 
     @fiscal_year.expression
     def fiscal_year(cls):
-        # This provides the SQL expression equivalent
-        return case(
-            (cls.date_needed.is_(None), None),
-            else_=case(
-                (
-                    extract("month", cls.date_needed) >= 10,
-                    extract("year", cls.date_needed) + 1,
-                ),
-                else_=extract("year", cls.date_needed),
-            ),
-        )
+        # The stored fiscal_year column is generated by the database from date_needed
+        return cls._fiscal_year
 
     @property
     def team_members(self):
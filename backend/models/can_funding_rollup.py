@@ -0,0 +1,318 @@
+"""Materialized CAN funding rollup."""
+
+from decimal import Decimal
+from typing import Iterable, Optional
+
+from loguru import logger
+from sqlalchemy import (
+    ForeignKey,
+    Index,
+    Integer,
+    Numeric,
+    cast,
+    delete,
+    distinct,
+    func,
+    insert,
+    literal,
+    null,
+    select,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import ENUM
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+from models import (
+    CAN,
+    BudgetLineItem,
+    BudgetLineItemStatus,
+    CANFundingBudget,
+    CANFundingReceived,
+    OpsEvent,
+    OpsEventType,
+)
+from models.base import Base
+from models.budget_line_item_totals import get_procurement_shop_agreement_ids
+
+ROLLUP_AMOUNT_COLUMNS = ("amount", "fees", "budget", "received")
+
+
+class CANFundingRollup(Base):
+    """
+    Pre-aggregated funding amounts per (can_id, fiscal_year, status).
+
+    Rows with a ``status`` hold the sum of ``amount`` and ``fees`` of the CAN's budget line items in that
+    status and fiscal year (``fiscal_year`` is NULL for budget lines without a ``date_needed``). The row with
+    a NULL ``status`` holds the CAN's funding ``budget`` and funding ``received`` for the fiscal year.
+
+    This is derived data: it is maintained by :func:`refresh_can_funding_rollup` and can always be rebuilt
+    from the source tables, so unlike ``BaseModel`` subclasses it is neither versioned nor audited.
+    """
+
+    __tablename__ = "can_funding_rollup"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    can_id: Mapped[int] = mapped_column(Integer, ForeignKey("can.id", ondelete="CASCADE"), nullable=False)
+    fiscal_year: Mapped[Optional[int]]
+    status: Mapped[Optional[BudgetLineItemStatus]] = mapped_column(
+        ENUM(BudgetLineItemStatus, name="budgetlineitemstatus", create_type=False), nullable=True
+    )
+    amount: Mapped[Decimal] = mapped_column(Numeric, nullable=False, default=0)
+    fees: Mapped[Decimal] = mapped_column(Numeric, nullable=False, default=0)
+    budget: Mapped[Decimal] = mapped_column(Numeric, nullable=False, default=0)
+    received: Mapped[Decimal] = mapped_column(Numeric, nullable=False, default=0)
+
+    __table_args__ = (
+        Index(
+            "ix_can_funding_rollup_can_id_fiscal_year_status",
+            "can_id",
+            "fiscal_year",
+            "status",
+            unique=True,
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+
+
+def _rollup_rows_query(can_ids: Optional[list[int]] = None):
+    """
+    Select the rollup rows computed from budget_line_item, can_funding_budget and can_funding_received.
+
+    Restricted to ``can_ids`` when given.
+    """
+    # Selecting from budget_line_item alone keeps the correlated subqueries of the fees expression
+    # from being correlated to anything else in the statement.
+    line_items = select(
+        BudgetLineItem.can_id.label("can_id"),
+        cast(BudgetLineItem.fiscal_year, Integer).label("fiscal_year"),
+        BudgetLineItem.status.label("status"),
+        BudgetLineItem.amount.label("amount"),
+        BudgetLineItem.fees.label("fees"),
+    ).where(
+        BudgetLineItem.can_id.isnot(None),
+        # the NULL status row holds the CAN's funding, and budget lines without a status are not reported anyway
+        BudgetLineItem.status.isnot(None),
+    )
+    budgets = select(
+        CANFundingBudget.can_id.label("can_id"),
+        CANFundingBudget.fiscal_year.label("fiscal_year"),
+        CANFundingBudget.budget.label("budget"),
+        literal(0).label("received"),
+    )
+    received = select(
+        CANFundingReceived.can_id.label("can_id"),
+        CANFundingReceived.fiscal_year.label("fiscal_year"),
+        literal(0).label("budget"),
+        CANFundingReceived.funding.label("received"),
+    )
+    if can_ids is not None:
+        line_items = line_items.where(BudgetLineItem.can_id.in_(can_ids))
+        budgets = budgets.where(CANFundingBudget.can_id.in_(can_ids))
+        received = received.where(CANFundingReceived.can_id.in_(can_ids))
+
+    line_items = line_items.subquery("rollup_line_items")
+    funding = union_all(budgets, received).subquery("rollup_funding")
+
+    line_item_rows = select(
+        line_items.c.can_id,
+        line_items.c.fiscal_year,
+        line_items.c.status,
+        func.coalesce(func.sum(line_items.c.amount), 0),
+        func.coalesce(func.sum(line_items.c.fees), 0),
+        literal(0),
+        literal(0),
+    ).group_by(line_items.c.can_id, line_items.c.fiscal_year, line_items.c.status)
+    funding_rows = select(
+        funding.c.can_id,
+        funding.c.fiscal_year,
+        null(),
+        literal(0),
+        literal(0),
+        func.coalesce(func.sum(funding.c.budget), 0),
+        func.coalesce(func.sum(funding.c.received), 0),
+    ).group_by(funding.c.can_id, funding.c.fiscal_year)
+
+    return union_all(line_item_rows, funding_rows)
+
+
+def _insert_rollup_rows(session: Session, can_ids: Optional[list[int]] = None) -> None:
+    columns = ["can_id", "fiscal_year", "status", *ROLLUP_AMOUNT_COLUMNS]
+    session.execute(insert(CANFundingRollup).from_select(columns, _rollup_rows_query(can_ids)))
+
+
+def _lock_cans(session: Session, can_ids: Optional[list[int]] = None) -> None:
+    """
+    Lock the CAN rows (in id order, to avoid deadlocks) until the caller commits.
+
+    Concurrent refreshes of the same CAN then run one after the other, so the second one deletes the rows
+    inserted by the first instead of inserting a second copy next to them.
+    """
+    stmt = select(CAN.id).order_by(CAN.id).with_for_update()
+    if can_ids is not None:
+        stmt = stmt.where(CAN.id.in_(can_ids))
+    session.execute(stmt)
+
+
+def refresh_can_funding_rollup(session: Session, can_ids: Iterable[int]) -> None:
+    """
+    Recompute the rollup rows of the given CANs from the source tables.
+
+    Idempotent: the CANs' rows are deleted and re-inserted, so replaying an event is harmless. The CAN rows
+    stay locked until the caller commits.
+    """
+    can_ids = sorted({can_id for can_id in can_ids if can_id is not None})
+    if not can_ids:
+        return
+
+    _lock_cans(session, can_ids)
+    session.execute(delete(CANFundingRollup).where(CANFundingRollup.can_id.in_(can_ids)))
+    _insert_rollup_rows(session, can_ids)
+    logger.debug(f"Refreshed CAN funding rollup for CANs {can_ids}")
+
+
+def rebuild_can_funding_rollup(session: Session) -> None:
+    """Replace the whole rollup with rows recomputed from the source tables. The caller commits."""
+    _lock_cans(session)
+    session.execute(delete(CANFundingRollup))
+    _insert_rollup_rows(session)
+
+
+def verify_can_funding_rollup(session: Session) -> list[dict]:
+    """
+    Compare the rollup with the source tables.
+
+    Returns one dict per (can_id, fiscal_year, status) key whose amounts differ, with the ``expected``
+    (recomputed) and ``actual`` (stored) amounts. An empty list means the rollup is up to date.
+    """
+
+    def by_key(rows) -> dict[tuple, tuple]:
+        totals: dict[tuple, tuple] = {}
+        for can_id, fiscal_year, status, *amounts in rows:
+            key = (can_id, fiscal_year, status)
+            previous = totals.get(key, (Decimal(0),) * len(amounts))
+            totals[key] = tuple(Decimal(p) + Decimal(a or 0) for p, a in zip(previous, amounts, strict=True))
+        return totals
+
+    expected = by_key(session.execute(_rollup_rows_query()).all())
+    actual = by_key(
+        session.execute(
+            select(
+                CANFundingRollup.can_id,
+                CANFundingRollup.fiscal_year,
+                CANFundingRollup.status,
+                *(getattr(CANFundingRollup, column) for column in ROLLUP_AMOUNT_COLUMNS),
+            )
+        ).all()
+    )
+
+    zeros = (Decimal(0),) * len(ROLLUP_AMOUNT_COLUMNS)
+    mismatches = []
+    for key in sorted(expected.keys() | actual.keys(), key=str):
+        expected_amounts = expected.get(key, zeros)
+        actual_amounts = actual.get(key, zeros)
+        if expected_amounts != actual_amounts:
+            can_id, fiscal_year, status = key
+            mismatches.append(
+                {
+                    "can_id": can_id,
+                    "fiscal_year": fiscal_year,
+                    "status": status,
+                    "expected": dict(zip(ROLLUP_AMOUNT_COLUMNS, expected_amounts, strict=True)),
+                    "actual": dict(zip(ROLLUP_AMOUNT_COLUMNS, actual_amounts, strict=True)),
+                }
+            )
+    return mismatches
+
+
+def get_agreement_can_ids(session: Session, agreement_id: Optional[int]) -> set[int]:
+    """Return the ids of the CANs of the agreement's budget lines."""
+    if agreement_id is None:
+        return set()
+    stmt = select(distinct(BudgetLineItem.can_id)).where(
+        BudgetLineItem.agreement_id == agreement_id, BudgetLineItem.can_id.isnot(None)
+    )
+    return set(session.scalars(stmt).all())
+
+
+def _orphaned_budget_can_ids(session: Session) -> set[int]:
+    """CANs whose rollup still holds a budget for a fiscal year that no longer has a can_funding_budget row."""
+    stmt = select(distinct(CANFundingRollup.can_id)).where(
+        CANFundingRollup.status.is_(None),
+        CANFundingRollup.budget != 0,
+        ~select(CANFundingBudget.id)
+        .where(
+            CANFundingBudget.can_id == CANFundingRollup.can_id,
+            CANFundingBudget.fiscal_year == CANFundingRollup.fiscal_year,
+        )
+        .exists(),
+    )
+    return set(session.scalars(stmt).all())
+
+
+def _changed_can_ids(changes: dict) -> set[int]:
+    """CAN ids before and after a ``can_id`` change recorded by ``generate_events_update``."""
+    can_change = (changes or {}).get("can_id") or {}
+    return {can_change.get("old_value"), can_change.get("new_value")} - {None}
+
+
+def get_affected_can_ids(event: OpsEvent, session: Session) -> set[int]:
+    """Return the ids of the CANs whose funding rollup may be changed by the event."""
+    details = event.event_details or {}
+
+    match event.event_type:
+        case OpsEventType.CREATE_BLI:
+            return {details.get("new_bli", {}).get("can_id")} - {None}
+        case OpsEventType.UPDATE_BLI:
+            can_ids = {details.get("bli", {}).get("can_id")}
+            can_ids |= _changed_can_ids(details.get("bli_updates", {}).get("changes"))
+            return can_ids - {None}
+        case OpsEventType.DELETE_BLI:
+            return {details.get("deleted_bli", {}).get("can_id")} - {None}
+        case OpsEventType.CREATE_CAN_FUNDING_BUDGET:
+            new_budget = details.get("new_can_funding_budget", {})
+            return {new_budget.get("can_id") or (new_budget.get("can") or {}).get("id")} - {None}
+        case OpsEventType.UPDATE_CAN_FUNDING_BUDGET:
+            return {details.get("funding_budget_updates", {}).get("owner_id")} - {None}
+        case OpsEventType.DELETE_CAN_FUNDING_BUDGET:
+            # Only the id of the deleted budget is recorded, so find the CANs it was rolled up into
+            return _orphaned_budget_can_ids(session)
+        case OpsEventType.CREATE_CAN_FUNDING_RECEIVED:
+            return {details.get("new_can_funding_received", {}).get("can_id")} - {None}
+        case OpsEventType.UPDATE_CAN_FUNDING_RECEIVED:
+            return {details.get("funding_received_updates", {}).get("owner_id")} - {None}
+        case OpsEventType.DELETE_CAN_FUNDING_RECEIVED:
+            return {details.get("deleted_can_funding_received", {}).get("can_id")} - {None}
+        case OpsEventType.UPDATE_CHANGE_REQUEST:
+            # An approved change request may move, re-price or re-status budget lines of the agreement
+            change_request = details.get("change_request", {})
+            can_ids = get_agreement_can_ids(session, change_request.get("agreement_id"))
+            bli_id = change_request.get("budget_line_item_id")
+            if bli_id is not None:
+                can_ids.add(session.scalar(select(BudgetLineItem.can_id).where(BudgetLineItem.id == bli_id)))
+            diff = change_request.get("requested_change_diff") or {}
+            can_ids |= {value for value in (diff.get("can_id") or {}).values() if isinstance(value, int)}
+            return can_ids - {None}
+        case OpsEventType.UPDATE_AGREEMENT:
+            # Fees of the agreement's budget lines depend on its procurement shop, and an edit bundle may move
+            # budget lines to other CANs or delete them, so the CANs they were on before the update are refreshed too
+            can_ids = get_agreement_can_ids(session, details.get("agreement_id"))
+            return (can_ids | set(details.get("original_can_ids") or [])) - {None}
+        case OpsEventType.DELETE_AGREEMENT:
+            # The agreement's budget lines are deleted with it
+            return set(details.get("original_can_ids") or []) - {None}
+        case OpsEventType.UPDATE_PROCUREMENT_SHOP:
+            # The fee schedule of the shop changed, so the fees of every agreement using it may change
+            procurement_shop_id = details.get("proc_shop_fee", {}).get("owner_id")
+            can_ids = set()
+            for agreement_id in get_procurement_shop_agreement_ids(session, procurement_shop_id):
+                can_ids |= get_agreement_can_ids(session, agreement_id)
+            return can_ids
+        case _:
+            return set()
+
+
+def can_funding_rollup_trigger_func(event: OpsEvent, session: Session) -> None:
+    """Refresh the funding rollup of every CAN affected by the event. The caller commits."""
+    can_ids = get_affected_can_ids(event, session)
+    logger.debug(f"{event.event_type.name} event affects the funding rollup of CANs {sorted(can_ids)}")
+    refresh_can_funding_rollup(session, can_ids)
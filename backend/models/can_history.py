@@ -3,7 +3,7 @@ from enum import Enum, auto
 from typing import List
 
 from loguru import logger
-from sqlalchemy import ForeignKey, Integer, Text
+from sqlalchemy import ForeignKey, Integer, Text, or_, select
 from sqlalchemy.dialects.postgresql import ENUM
 from sqlalchemy.orm import Mapped, Session, mapped_column
 
@@ -287,31 +287,44 @@ def create_can_update_history_event(
 
 
 def add_history_events(events: List[CANHistory], session):
-    """Add a list of CANHistory events to the database session. First check that there are not any matching events already in the database to prevent duplicates."""
-    for event in events:
-        # Query the database for existing events
-        can_history_items = session.query(CANHistory).where(CANHistory.ops_event_id == event.ops_event_id).all()
+    """Add a list of CANHistory events to the database session. First check that there are not any matching events already in the database to prevent duplicates.
+
+    An event is a duplicate of an event of the same OpsEvent with the same timestamp, type, message and fiscal year.
+    The existing events of the OpsEvents are read in one query, whatever the number of events.
+    """
+    if not events:
+        return
 
-        # Also check pending objects in the session that haven't been flushed yet
-        pending_items = [
-            obj for obj in session.new if isinstance(obj, CANHistory) and obj.ops_event_id == event.ops_event_id
-        ]
+    ops_event_ids = {event.ops_event_id for event in events}
+    ops_event_condition = CANHistory.ops_event_id.in_(ops_event_ids - {None})
+    if None in ops_event_ids:
+        ops_event_condition = or_(ops_event_condition, CANHistory.ops_event_id.is_(None))
 
-        # Combine both database and pending items
-        all_items = can_history_items + pending_items
+    # Query the database for existing events
+    existing_items = session.execute(
+        select(
+            CANHistory.ops_event_id,
+            CANHistory.timestamp,
+            CANHistory.history_type,
+            CANHistory.history_message,
+            CANHistory.fiscal_year,
+        ).where(ops_event_condition)
+    ).all()
 
-        duplicate_found = False
-        for item in all_items:
-            if (
-                item.timestamp == event.timestamp
-                and item.history_type == event.history_type
-                and item.history_message == event.history_message
-                and item.fiscal_year == event.fiscal_year
-            ):
-                # enough fields match that we're willing to say this is a duplicate.
-                duplicate_found = True
-                break
+    # Also check pending objects in the session that haven't been flushed yet
+    existing_items.extend(
+        obj for obj in session.new if isinstance(obj, CANHistory) and obj.ops_event_id in ops_event_ids
+    )
 
+    existing_contents = {_can_history_content(item) for item in existing_items}
+    for event in events:
+        content = _can_history_content(event)
         # If no duplicate of the event was found, add it to the database session.
-        if not duplicate_found:
+        if content not in existing_contents:
             session.add(event)
+            existing_contents.add(content)
+
+
+def _can_history_content(item) -> tuple:
+    """The fields that must match for two CAN history events to be duplicates."""
+    return item.ops_event_id, item.timestamp, item.history_type, item.history_message, item.fiscal_year
@@ -12,6 +12,7 @@ from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from models.base import BaseModel
 from models.portfolios import Portfolio
+from models.search import trigram_index
 
 
 class CANMethodOfTransfer(Enum):
@@ -87,6 +88,8 @@ class CAN(BaseModel):
     __table_args__ = (
         Index("ix_can_portfolio_id", "portfolio_id"),
         Index("ix_can_funding_details_id", "funding_details_id"),
+        trigram_index("ix_can_number_trgm", "number"),
+        trigram_index("ix_can_nick_name_trgm", "nick_name"),
     )
 
     @property
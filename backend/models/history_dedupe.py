@@ -0,0 +1,48 @@
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Hashable, Optional
+
+from loguru import logger
+
+
+def parse_history_timestamp(timestamp: str) -> Optional[float]:
+    """The POSIX time of an ISO format history timestamp (naive timestamps are UTC), or None if it is invalid."""
+    try:
+        timestamp_dt = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    except (AttributeError, ValueError) as e:
+        logger.error(f"Error parsing timespan strings: {e}")
+        return None
+    if timestamp_dt.tzinfo is None:
+        timestamp_dt = timestamp_dt.replace(tzinfo=timezone.utc)
+    return timestamp_dt.timestamp()
+
+
+class HistoryDeduplicator:
+    """
+    Finds history events with the same content as another event within ``window_seconds`` of it.
+
+    Events are indexed by their content (e.g. record id, history type and message) and by the
+    ``window_seconds`` bucket of their timestamp, so a lookup only compares the timestamps of events with the
+    same content in the event's bucket and the two next to it, however many events there are.
+    """
+
+    def __init__(self, window_seconds: float = 60):
+        self.window_seconds = window_seconds
+        self._buckets: dict[Hashable, dict[int, list[float]]] = defaultdict(lambda: defaultdict(list))
+
+    def add(self, content: Hashable, timestamp: str) -> None:
+        seconds = parse_history_timestamp(timestamp)
+        if seconds is not None:
+            self._buckets[content][int(seconds // self.window_seconds)].append(seconds)
+
+    def is_duplicate(self, content: Hashable, timestamp: str) -> bool:
+        seconds = parse_history_timestamp(timestamp)
+        if seconds is None or content not in self._buckets:
+            return False
+        buckets = self._buckets[content]
+        bucket = int(seconds // self.window_seconds)
+        return any(
+            abs(seconds - other) <= self.window_seconds
+            for neighbour in (bucket - 1, bucket, bucket + 1)
+            for other in buckets.get(neighbour, ())
+        )
@@ -38,6 +38,11 @@ class Notification(BaseModel):
             "recipient_id",
             text("created_on DESC"),
         ),
+        Index(
+            "idx_notification_recipient_is_read",
+            "recipient_id",
+            "is_read",
+        ),
         Index(
             "idx_notification_complete",
             "is_read",
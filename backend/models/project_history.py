@@ -1,9 +1,8 @@
-from datetime import datetime
 from enum import Enum, auto
 from typing import List, Optional
 
 from loguru import logger
-from sqlalchemy import ForeignKey, Integer, Text
+from sqlalchemy import ForeignKey, Integer, Text, select
 from sqlalchemy.dialects.postgresql import ENUM
 from sqlalchemy.orm import Mapped, Session, mapped_column
 
@@ -16,6 +15,7 @@ from models import (
     User,
 )
 from models.base import BaseModel
+from models.history_dedupe import HistoryDeduplicator
 
 
 class ProjectHistoryType(Enum):
@@ -260,44 +260,37 @@ def create_project_update_history_event(
 
 
 def add_history_events(events: List[ProjectHistory], session: Session) -> None:
-    """Add ProjectHistory events to the session, skipping any that look like duplicates of existing rows."""
+    """
+    Add ProjectHistory events to the session, skipping any that look like duplicates of existing rows: events of
+    the same project with the same type and message within one minute. The existing rows that could match are
+    read in one query.
+    """
     if not events:
         return
 
-    project_id_record = events[0].project_id_record
-    existing_items = (
-        session.query(ProjectHistory)
-        .where(ProjectHistory.project_id_record == project_id_record)
-        .all()
+    project_ids = {event.project_id_record for event in events}
+    existing_items = session.execute(
+        select(
+            ProjectHistory.project_id_record,
+            ProjectHistory.history_type,
+            ProjectHistory.history_message,
+            ProjectHistory.timestamp,
+        ).where(
+            ProjectHistory.project_id_record.in_(project_ids),
+            ProjectHistory.history_message.in_({event.history_message for event in events}),
+        )
+    ).all()
+
+    existing_items.extend(
+        item for item in session.new if isinstance(item, ProjectHistory) and item.project_id_record in project_ids
     )
 
-    for item in session.new:
-        if isinstance(item, ProjectHistory) and item.project_id_record == project_id_record:
-            existing_items.append(item)
+    deduplicator = HistoryDeduplicator()
+    for item in existing_items:
+        deduplicator.add((item.project_id_record, item.history_type, item.history_message), item.timestamp)
 
     for event in events:
-        duplicate_found = False
-        for item in existing_items:
-            if (
-                is_timespan_within_one_minute(event.timestamp, item.timestamp)
-                and item.history_type == event.history_type
-                and item.history_message == event.history_message
-            ):
-                duplicate_found = True
-                break
-
-        if not duplicate_found:
+        content = (event.project_id_record, event.history_type, event.history_message)
+        if not deduplicator.is_duplicate(content, event.timestamp):
             session.add(event)
-            existing_items.append(event)
-
-
-def is_timespan_within_one_minute(datetime_to_check: str, reference_datetime: str) -> bool:
-    """Check if two ISO format timestamp strings are within one minute of each other."""
-    try:
-        datetime_to_check_dt = datetime.fromisoformat(datetime_to_check.replace("Z", "+00:00"))
-        reference_datetime_dt = datetime.fromisoformat(reference_datetime.replace("Z", "+00:00"))
-        difference = abs((datetime_to_check_dt - reference_datetime_dt).total_seconds())
-        return difference <= 60
-    except ValueError as e:
-        logger.error(f"Error parsing timespan strings: {e}")
-        return False
+            deduplicator.add(content, event.timestamp)
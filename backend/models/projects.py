@@ -8,6 +8,7 @@ from sqlalchemy.orm import Mapped, mapped_column, object_session, relationship
 from typing_extensions import List
 
 from models.base import BaseModel
+from models.search import trigram_index
 
 
 class ResearchType(Enum):
@@ -64,7 +65,11 @@ class Project(BaseModel):
         secondaryjoin="User.id == ProjectTeamLeaders.team_lead_id",
     )
 
-    __table_args__ = (Index("ix_project_title_pattern", "title", postgresql_ops={"title": "text_pattern_ops"}),)
+    __table_args__ = (
+        Index("ix_project_title_pattern", "title", postgresql_ops={"title": "text_pattern_ops"}),
+        trigram_index("ix_project_title_trgm", "title"),
+        trigram_index("ix_project_short_title_trgm", "short_title"),
+    )
 
     @BaseModel.display_name.getter
     def display_name(self):
@@ -0,0 +1,54 @@
+"""
+Text search over the names, titles and numbers of agreements, projects, CANs and budget lines.
+
+Searches match the columns that contain the search term (case-insensitive), which the GIN trigram (pg_trgm)
+indexes of the searched columns serve instead of a sequential scan, and rank the matches by pg_trgm's
+word_similarity. The pg_trgm extension is created by the migration that adds the indexes and, for databases
+created with ``BaseModel.metadata.create_all`` (e.g. in tests), before the tables are created.
+"""
+
+from sqlalchemy import DDL, ColumnElement, Index, event, func, or_
+
+from models.base import BaseModel
+
+event.listen(
+    BaseModel.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+
+def trigram_index(name: str, column_name: str) -> Index:
+    """A GIN trigram index on a text column, serving ILIKE '%term%' and the pg_trgm similarity operators."""
+    return Index(name, column_name, postgresql_using="gin", postgresql_ops={column_name: "gin_trgm_ops"})
+
+
+def search_pattern(search_term: str) -> str:
+    """The ILIKE pattern matching values that contain search_term, with its LIKE wildcards escaped."""
+    escaped = search_term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def search_predicate(column, search_term: str) -> ColumnElement[bool]:
+    """Whether column contains search_term, ignoring case."""
+    return column.ilike(search_pattern(search_term), escape="\\")
+
+
+def fuzzy_search_predicate(columns: list, search_term: str) -> ColumnElement[bool]:
+    """
+    Whether any of the columns contains search_term, or contains a word similar to it (pg_trgm's ``%>``
+    operator, with its default word_similarity threshold of 0.6), e.g. despite a typo.
+    """
+    return or_(
+        *[search_predicate(column, search_term) for column in columns],
+        *[column.op("%>")(search_term) for column in columns],
+    )
+
+
+def search_rank(columns: list, search_term: str) -> ColumnElement[float]:
+    """
+    The relevance of a row to search_term: the highest word_similarity of search_term to its columns, between 0
+    and 1 (when a column contains search_term as a word).
+    """
+    similarities = [func.word_similarity(search_term, func.coalesce(column, "")) for column in columns]
+    return func.greatest(*similarities) if len(similarities) > 1 else similarities[0]
@@ -1,5 +1,6 @@
 import json
-from collections import namedtuple
+from collections import defaultdict, namedtuple
+from dataclasses import dataclass
 from datetime import date, datetime
 from decimal import Decimal
 from enum import Enum
@@ -7,9 +8,9 @@ from types import NoneType
 
 from deepdiff import DeepDiff, parse_path
 from loguru import logger
-from sqlalchemy import inspect
+from sqlalchemy import inspect, insert, select
 from sqlalchemy.util import IdentitySet
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Mapper, Session
 from sqlalchemy.orm.attributes import get_history
 
 from models import (
@@ -53,17 +54,50 @@ def find_relationship_by_fk(obj, col_key):
     return None
 
 
+@dataclass(frozen=True)
+class AuditMetadata:
+    """What build_audit needs to know about a mapped class, computed once per mapper."""
+
+    primary_key_names: tuple[str, ...]
+    column_keys: tuple[str, ...]
+    # (relationship key, related class name) of the many-to-many relationships audited with the object
+    relationships: tuple[tuple[str, str], ...]
+
+
+_audit_metadata_cache: dict[Mapper, AuditMetadata] = {}
+
+
+def get_audit_metadata(mapper: Mapper) -> AuditMetadata:
+    metadata = _audit_metadata_cache.get(mapper)
+    if metadata is None:
+        # limit relationships to those that aren't being logged as their own Classes
+        # and only include them on the editable side
+        relationships = tuple(
+            (
+                rel.key,
+                rel.argument if isinstance(rel.argument, str) else rel.argument.__name__,
+            )
+            for rel in mapper.relationships
+            if rel.secondary is not None and not rel.viewonly
+        )
+        metadata = AuditMetadata(
+            primary_key_names=tuple(pk.name for pk in inspect(mapper.local_table).primary_key.columns.values()),
+            column_keys=tuple(col.key for col in mapper.columns),
+            relationships=relationships,
+        )
+        _audit_metadata_cache[mapper] = metadata
+    return metadata
+
+
 def build_audit(obj, event_type: OpsDBHistoryType) -> DbRecordAudit:  # noqa: C901
-    row_key = "|".join([str(getattr(obj, pk.name)) for pk in inspect(obj.__table__).primary_key.columns.values()])
+    metadata = get_audit_metadata(obj.__mapper__)
+    row_key = "|".join([str(getattr(obj, name)) for name in metadata.primary_key_names])
 
     changes = {}
 
-    mapper = obj.__mapper__
-
     # collect changes in column values
-    auditable_columns = list(filter(lambda c: c.key in obj.__dict__, mapper.columns))
-    for col in auditable_columns:
-        key = col.key
+    auditable_columns = [key for key in metadata.column_keys if key in obj.__dict__]
+    for key in auditable_columns:
         hist = get_history(obj, key)
         if hist.has_changes():
             # this assumes columns are primitives, not lists
@@ -84,22 +118,9 @@ def build_audit(obj, event_type: OpsDBHistoryType) -> DbRecordAudit:  # noqa: C9
                 }
 
     # collect changes in relationships, such as agreement.team_members
-    # limit this to relationships that aren't being logged as their own Classes
-    # and only include them on the editable side
-    auditable_relationships = list(
-        filter(
-            lambda rel: rel.secondary is not None and not rel.viewonly,
-            mapper.relationships,
-        )
-    )
-
-    for relationship in auditable_relationships:
-        key = relationship.key
+    for key, related_class_name in metadata.relationships:
         hist = get_history(obj, key)
         if hist.has_changes():
-            related_class_name = (
-                relationship.argument if isinstance(relationship.argument, str) else relationship.argument.__name__
-            )
             changes[key] = {
                 "collection_of": related_class_name,
                 "added": convert_for_jsonb(hist.added),
@@ -109,13 +130,88 @@ def build_audit(obj, event_type: OpsDBHistoryType) -> DbRecordAudit:  # noqa: C9
     return DbRecordAudit(row_key, changes)
 
 
+def to_history_dict(obj) -> dict:
+    """
+    Column-only snapshot of an object for OpsDBHistory.event_details.
+
+    Unlike ``to_dict`` this does not run the marshmallow schema, serialize relationships or look up the
+    created_by/updated_by users. Only loaded columns are included, so no SQL is issued.
+    """
+    state = obj.__dict__
+    return {
+        key: convert_for_jsonb(state[key]) for key in get_audit_metadata(obj.__mapper__).column_keys if key in state
+    }
+
+
+def _primary_key(obj, key: str):
+    identity = inspect(obj).identity
+    return identity[0] if identity else getattr(obj, key)
+
+
+def _load_expired_columns(session: Session, objs: list) -> None:
+    """Load the expired or unloaded columns of the objects with one SELECT per class instead of one per object."""
+    by_class = defaultdict(list)
+    for obj in objs:
+        metadata = get_audit_metadata(obj.__mapper__)
+        if len(metadata.primary_key_names) == 1 and inspect(obj).unloaded.intersection(metadata.column_keys):
+            by_class[type(obj)].append(obj)
+
+    with session.no_autoflush:
+        for cls, instances in by_class.items():
+            pk = cls.__mapper__.primary_key[0]
+            # the identity of a persistent object, unlike its expired primary key attribute, is read without a refresh
+            ids = [_primary_key(obj, pk.key) for obj in instances]
+            # loading rows of instances already in the identity map fills in their expired attributes
+            session.execute(select(cls).where(pk.in_(ids))).scalars().all()
+
+
+def build_db_history_rows(
+    session: Session, objs: IdentitySet, event_type: OpsDBHistoryType, user: User | None
+) -> list[dict]:
+    """Return the ops_db_history rows (as dicts for an executemany INSERT) recording the objects' changes."""
+    objs = [obj for obj in objs if not isinstance(obj, (OpsEvent, OpsDBHistory))]  # not interested in tracking these
+    if event_type != OpsDBHistoryType.NEW:
+        # new objects were just inserted from the values at hand; server-generated defaults are left out
+        # rather than re-selected
+        _load_expired_columns(session, objs)
+
+    rows = []
+    for obj in objs:
+        db_audit = build_audit(obj, event_type)
+        if event_type == OpsDBHistoryType.UPDATED and not db_audit.changes:
+            logger.debug(
+                f"No changes found for {obj.__class__.__name__} with row_key={db_audit.row_key}, "
+                f"an OpsDBHistory record will not be created for this UPDATED event."
+            )
+            continue
+
+        rows.append(
+            {
+                "event_type": event_type,
+                "event_details": to_history_dict(obj),
+                "created_by": user.id if user else None,
+                "class_name": obj.__class__.__name__,
+                "row_key": db_audit.row_key,
+                "changes": db_audit.changes,
+            }
+        )
+    return rows
+
+
+def insert_db_history_rows(session: Session, rows: list[dict]) -> None:
+    if rows:
+        # Executed on the connection so it can run inside flush events
+        session.connection().execute(insert(OpsDBHistory.__table__), rows)
+
+
 def track_db_history_before(session: Session, user: User | None):
-    session.add_all(add_obj_to_db_history(session.deleted, OpsDBHistoryType.DELETED, user))
-    session.add_all(add_obj_to_db_history(session.dirty, OpsDBHistoryType.UPDATED, user))
+    rows = build_db_history_rows(session, session.deleted, OpsDBHistoryType.DELETED, user)
+    rows += build_db_history_rows(session, session.dirty, OpsDBHistoryType.UPDATED, user)
+    insert_db_history_rows(session, rows)
 
 
 def track_db_history_after(session: Session, user: User | None):
-    session.add_all(add_obj_to_db_history(session.new, OpsDBHistoryType.NEW, user))
+    insert_db_history_rows(session, build_db_history_rows(session, session.new, OpsDBHistoryType.NEW, user))
 
 
 def track_db_history_catch_errors(exception_context):
@@ -140,33 +236,6 @@ def track_db_history_catch_errors(exception_context):
         logger.error(f"SQLAlchemy error added to {OpsDBHistory.__tablename__} with id {ops_db.id}")
 
 
-def add_obj_to_db_history(objs: IdentitySet, event_type: OpsDBHistoryType, user: User | None):
-    result = []
-
-    for obj in objs:
-        if not isinstance(obj, (OpsEvent, OpsDBHistory)):  # not interested in tracking these
-            db_audit = build_audit(obj, event_type)
-            if event_type == OpsDBHistoryType.UPDATED and not db_audit.changes:
-                logger.debug(
-                    f"No changes found for {obj.__class__.__name__} with row_key={db_audit.row_key}, "
-                    f"an OpsDBHistory record will not be created for this UPDATED event."
-                )
-                continue
-
-            ops_db = OpsDBHistory(
-                event_type=event_type,
-                event_details=obj.to_dict(),
-                created_by=user.id if user else None,
-                class_name=obj.__class__.__name__,
-                row_key=db_audit.row_key,
-                changes=db_audit.changes,
-            )
-
-            result.append(ops_db)
-
-    return result
-
-
 def generate_events_update(old_serialized_obj, new_serialized_obj, owner_id, updated_by_id):
     deep_diff = DeepDiff(old_serialized_obj, new_serialized_obj)
     dict_of_changes = {}
@@ -3,6 +3,7 @@ import sys
 import time
 import uuid
 from contextvars import ContextVar
+from datetime import timedelta
 from urllib.parse import urlparse
 
 from authlib.integrations.flask_client import OAuth
@@ -13,26 +14,53 @@ from loguru import logger
 from sqlalchemy import event
 from sqlalchemy.orm import Session
 
-from models import OpsEventType
+from models import BudgetLineItem, OpsEventType
 from models.utils import (
     track_db_history_after,
     track_db_history_before,
     track_db_history_catch_errors,
 )
+from ops_api.ops.auth.authorization_providers import clear_user_permissions
 from ops_api.ops.auth.decorators import check_user_session_function
 from ops_api.ops.auth.exceptions import NoAuthorizationError
 from ops_api.ops.auth.extension_config import jwtMgr
+from ops_api.ops.auth.session_activity import UserSessionActivityTracker
 from ops_api.ops.db import handle_create_update_by_attrs, init_db
 from ops_api.ops.error_handlers import register_error_handlers
 from ops_api.ops.events.procurement_tracker_events import procurement_tracker_trigger
 from ops_api.ops.home_page.views import home
 from ops_api.ops.services.agreement_messages import agreement_history_trigger
+from ops_api.ops.services.budget_line_item_totals_messages import budget_line_item_totals_trigger
+from ops_api.ops.services.can_funding_rollup_messages import (
+    can_funding_rollup_trigger,
+    stored_totals_and_can_funding_rollup_trigger,
+)
 from ops_api.ops.services.can_messages import can_history_trigger
 from ops_api.ops.services.message_bus import MessageBus
 from ops_api.ops.services.project_messages import project_history_trigger
+from ops_api.ops.services.response_cache_messages import response_cache_trigger
 from ops_api.ops.urls import register_api
 from ops_api.ops.utils.api_helpers import is_deployed_system
 from ops_api.ops.utils.core import is_fake_user, is_unit_test
+from ops_api.ops.utils.event_sink import create_ops_event_sink
+from ops_api.ops.utils.json_provider import OpsJSONProvider
+from ops_api.ops.utils.notification_broker import (
+    collect_new_notifications,
+    create_notification_broker,
+    discard_pending_notifications,
+    mark_notifications_committed,
+    publish_committed_notifications,
+)
+from ops_api.ops.utils.reporting_summary import ReportingSummaryCache
+from ops_api.ops.utils.response import compress_response
+from ops_api.ops.utils.response_cache import (
+    EVENT_TYPE_TABLES,
+    collect_executed_tables,
+    collect_flushed_tables,
+    create_response_cache,
+    discard_changed_tables,
+    invalidate_committed_tables,
+)
 
 # Set the timezone to UTC
 os.environ["TZ"] = "UTC"
@@ -47,6 +75,7 @@ def create_app() -> Flask:  # noqa: C901
     log_level = "INFO" if not is_unit_test() else "DEBUG"
 
     app = Flask(__name__)
+    app.json = OpsJSONProvider(app)
 
     # logger configuration
     # Disable default Flask/Werkzeug logging
@@ -109,6 +138,18 @@ def create_app() -> Flask:  # noqa: C901
     db_session, engine = init_db(app.config)
     app.db_session = db_session
     app.engine = engine
+    app.ops_event_sink = create_ops_event_sink(app.config, engine)
+    app.notification_broker = create_notification_broker(app.config, engine)
+    reporting_summary_cache_ttl = app.config.get("REPORTING_SUMMARY_CACHE_TTL", 0)
+    app.reporting_summary_cache = (
+        ReportingSummaryCache(reporting_summary_cache_ttl) if reporting_summary_cache_ttl else None
+    )
+    app.response_cache = create_response_cache(app.config)
+    BudgetLineItem.use_stored_totals = app.config.get("USE_STORED_BLI_TOTALS", False)
+    app.user_session_tracker = UserSessionActivityTracker(
+        cache_ttl=app.config.get("USER_SESSION_CACHE_TTL", timedelta(seconds=30)),
+        flush_interval=app.config.get("USER_SESSION_ACTIVITY_FLUSH_INTERVAL", timedelta(seconds=60)),
+    )
 
     @app.teardown_appcontext
     def shutdown_session(exception=None):
@@ -130,6 +171,10 @@ def create_app() -> Flask:  # noqa: C901
                     logger.error(f"Failed to handle message bus events: {e}", exc_info=True)
                     app.db_session.rollback()
             request.message_bus.cleanup()
+        # Push the notifications committed by the request (by a service or by the commit above) to the
+        # streams of their recipients
+        if app.notification_broker:
+            publish_committed_notifications(app.notification_broker, app.db_session)
 
     @event.listens_for(db_session, "before_commit")
     def receive_before_commit(session: Session):
@@ -139,6 +184,28 @@ def create_app() -> Flask:  # noqa: C901
     def receive_after_flush(session: Session, flush_context):
         track_db_history_after(session, current_user)
 
+    if app.notification_broker:
+
+        @event.listens_for(db_session, "after_flush")
+        def receive_new_notifications(session: Session, flush_context):
+            collect_new_notifications(session)
+
+        event.listen(db_session, "after_commit", mark_notifications_committed)
+        event.listen(db_session, "after_rollback", discard_pending_notifications)
+
+    if app.response_cache:
+
+        @event.listens_for(db_session, "after_flush")
+        def receive_flushed_tables(session: Session, flush_context):
+            collect_flushed_tables(session)
+
+        @event.listens_for(db_session, "after_commit")
+        def receive_committed_tables(session: Session):
+            invalidate_committed_tables(app.response_cache, session)
+
+        event.listen(db_session, "do_orm_execute", collect_executed_tables)
+        event.listen(db_session, "after_rollback", discard_changed_tables)
+
     @event.listens_for(engine, "handle_error")
     def receive_error(exception_context):
         track_db_history_catch_errors(exception_context)
@@ -148,16 +215,23 @@ def create_app() -> Flask:  # noqa: C901
         handle_create_update_by_attrs(session)
 
     # Initialize event subscriptions once at app startup
-    initialize_event_subscriptions()
+    initialize_event_subscriptions(app)
 
     @app.before_request
     def before_request():
         request_id.set(str(uuid.uuid4())[:8])
+        clear_user_permissions()
         before_request_function(app, request)
 
     @app.after_request
     def after_request(response):
         log_response(response)
+        if app.config.get("RESPONSE_COMPRESSION"):
+            response = compress_response(
+                response,
+                app.config.get("RESPONSE_COMPRESSION_MIN_SIZE", 1024),
+                app.config.get("RESPONSE_COMPRESSION_LEVEL", 6),
+            )
         return response
 
     register_error_handlers(app)
@@ -169,7 +243,8 @@ def log_response(response):
     if request.url != request.url_root:
         req_id = request_id.get()
         with logger.contextualize(request_id=req_id):
-            body = response.get_data(as_text=True)
+            # reading a streamed response (e.g. the notification stream) would consume it
+            body = "<streamed>" if response.is_streamed else response.get_data(as_text=True)
             max_body = (
                 current_app.config.get("AZURE_BODY_LOG_MAX_BYTES")
                 if current_app.config.get("RUNNING_IN_AZURE")
@@ -210,13 +285,14 @@ def log_request():
     _log_safe(f"Request: {request_data}", max_field)
 
 
-def initialize_event_subscriptions():
+def initialize_event_subscriptions(app: Flask):
     """
     Initialize all event subscriptions once at app startup.
 
     This function sets up signal subscriptions that are process-level
     and persist across all requests. Subscriptions are configured once during
     app initialization rather than per-request to avoid redundant setup.
+    Subscriptions that maintain optional derived data are only set up when the app's config enables it.
     """
     # Subscribe to events that should generate CAN history events
     MessageBus.subscribe_globally(OpsEventType.CREATE_NEW_CAN, can_history_trigger)
@@ -251,6 +327,44 @@ def initialize_event_subscriptions():
     MessageBus.subscribe_globally(OpsEventType.CREATE_PROJECT, project_history_trigger)
     MessageBus.subscribe_globally(OpsEventType.UPDATE_PROJECT, project_history_trigger)
 
+    use_stored_totals = app.config.get("USE_STORED_BLI_TOTALS", False)
+    use_can_funding_rollup = app.config.get("USE_CAN_FUNDING_ROLLUP", False)
+
+    # Subscribe to events that change the stored fees and totals of budget lines
+    # (they are only maintained while they are read; refresh them before enabling USE_STORED_BLI_TOTALS)
+    if use_stored_totals and not use_can_funding_rollup:
+        MessageBus.subscribe_globally(OpsEventType.CREATE_BLI, budget_line_item_totals_trigger)
+        MessageBus.subscribe_globally(OpsEventType.UPDATE_BLI, budget_line_item_totals_trigger)
+        MessageBus.subscribe_globally(OpsEventType.UPDATE_CHANGE_REQUEST, budget_line_item_totals_trigger)
+        MessageBus.subscribe_globally(OpsEventType.UPDATE_AGREEMENT, budget_line_item_totals_trigger)
+        MessageBus.subscribe_globally(OpsEventType.UPDATE_PROCUREMENT_SHOP, budget_line_item_totals_trigger)
+
+    # Subscribe to events that change the amounts in the CAN funding rollup
+    # (the rollup is only maintained while it is read; rebuild it before enabling USE_CAN_FUNDING_ROLLUP).
+    # The rollup reads the stored totals when they are used, so one subscriber then refreshes both in order.
+    if use_can_funding_rollup:
+        rollup_trigger = (
+            stored_totals_and_can_funding_rollup_trigger if use_stored_totals else can_funding_rollup_trigger
+        )
+        MessageBus.subscribe_globally(OpsEventType.CREATE_BLI, rollup_trigger)
+        MessageBus.subscribe_globally(OpsEventType.UPDATE_BLI, rollup_trigger)
+        MessageBus.subscribe_globally(OpsEventType.DELETE_BLI, rollup_trigger)
+        MessageBus.subscribe_globally(OpsEventType.CREATE_CAN_FUNDING_BUDGET, rollup_trigger)
+        MessageBus.subscribe_globally(OpsEventType.UPDATE_CAN_FUNDING_BUDGET, rollup_trigger)
+        MessageBus.subscribe_globally(OpsEventType.DELETE_CAN_FUNDING_BUDGET, rollup_trigger)
+        MessageBus.subscribe_globally(OpsEventType.CREATE_CAN_FUNDING_RECEIVED, rollup_trigger)
+        MessageBus.subscribe_globally(OpsEventType.UPDATE_CAN_FUNDING_RECEIVED, rollup_trigger)
+        MessageBus.subscribe_globally(OpsEventType.DELETE_CAN_FUNDING_RECEIVED, rollup_trigger)
+        MessageBus.subscribe_globally(OpsEventType.UPDATE_CHANGE_REQUEST, rollup_trigger)
+        MessageBus.subscribe_globally(OpsEventType.UPDATE_AGREEMENT, rollup_trigger)
+        MessageBus.subscribe_globally(OpsEventType.DELETE_AGREEMENT, rollup_trigger)
+        MessageBus.subscribe_globally(OpsEventType.UPDATE_PROCUREMENT_SHOP, rollup_trigger)
+
+    # Subscribe to events whose side effects change the data of cached responses
+    if app.response_cache:
+        for event_type in EVENT_TYPE_TABLES:
+            MessageBus.subscribe_globally(event_type, response_cache_trigger)
+
 
 def before_request_function(app: Flask, request: request):
     req_id = request_id.get()
@@ -1,27 +1,65 @@
-from flask import current_app
-from flask_jwt_extended import get_jwt_identity
+from typing import Optional
+
+from flask import current_app, g, has_request_context
+from flask_jwt_extended import get_current_user, get_jwt_identity
 from sqlalchemy import select
+from sqlalchemy.orm import selectinload
 
 from models.users import User
 from ops_api.ops.auth.auth_types import Permission, PermissionType
 from ops_api.ops.auth.authorization_gateway import AuthorizationGateway
 
 
+def _get_loaded_user(oidc_id: str) -> Optional[User]:
+    """Return the user already loaded for ``current_user`` by the JWT user lookup, if it is this user."""
+    try:
+        user = get_current_user()
+    except RuntimeError:
+        # No JWT has been verified in this request
+        return None
+    # The JWT identity is the string form of the user's UUID
+    return user if user is not None and str(user.oidc_id) == str(oidc_id) else None
+
+
+def _resolve_user_permissions(oidc_id: str) -> frozenset[str]:
+    user = _get_loaded_user(oidc_id)
+    if user is None:
+        stmt = select(User).where(User.oidc_id == oidc_id).options(selectinload(User.roles))
+        users = current_app.db_session.execute(stmt).all()
+        if not users or len(users) != 1:
+            return frozenset()
+        user = users[0][0]
+
+    return frozenset(p for role in user.roles for p in role.permissions)
+
+
+def get_user_permissions(oidc_id: str) -> frozenset[str]:
+    """
+    Return the permissions granted by the roles of the user with the given OIDC id.
+
+    The permissions are resolved at most once per request and kept on ``flask.g``, so every authorization
+    check in a request shares them. Role changes take effect on the next request.
+    """
+    if not has_request_context():
+        return _resolve_user_permissions(oidc_id)
+
+    cache = g.setdefault("user_permissions", {})
+    if oidc_id not in cache:
+        cache[oidc_id] = _resolve_user_permissions(oidc_id)
+    return cache[oidc_id]
+
+
+def clear_user_permissions() -> None:
+    """Drop the cached permissions; the app context (and so ``g``) can outlive a single request, e.g. in tests."""
+    g.pop("user_permissions", None)
+
+
 class BasicAuthorizationProvider:
     def __init__(self, authorized_users: list[str] = None):
         self.authorized_users = authorized_users if authorized_users is not None else []
 
     def is_authorized(self, oidc_id: str, permission: str) -> bool:
-        stmt = select(User).where(User.oidc_id == oidc_id)
-        users = current_app.db_session.execute(stmt).all()
-        if users and len(users) == 1:
-            user = users[0][0]
-
-            user_permissions = set(p for role in user.roles for p in role.permissions)
-            if permission in user_permissions:
-                return True
-
-        return False
+        return permission in get_user_permissions(oidc_id)
 
 
 def _check_role(permission_type: PermissionType, permission: Permission) -> bool:
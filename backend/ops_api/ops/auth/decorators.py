@@ -17,6 +17,7 @@ from ops_api.ops.auth.exceptions import (
     UserInactiveError,
     UserLockedError,
 )
+from ops_api.ops.auth.session_activity import get_user_session_tracker
 from ops_api.ops.auth.utils import (
     deactivate_all_user_sessions,
     get_all_active_user_sessions,
@@ -131,7 +132,20 @@ def check_user_session_function(user: User):
     1. The user has an active user session.
     2. The access token in the request is the same as the latest user session access token.
     3. The last_accessed_at field of the latest user session is not more than a configurable threshold ago.
+
+    The latest user session is re-read from the database at most once per USER_SESSION_CACHE_TTL; in between,
+    the session cached by the UserSessionActivityTracker is used and last_active_at is written behind.
     """
+    tracker = get_user_session_tracker()
+    bearer_token = get_bearer_token()
+    access_token = bearer_token.replace("Bearer", "").strip() if bearer_token else None
+
+    tracked_session = tracker.get_cached(user.id, access_token)
+    if tracked_session and not check_last_active_at(tracked_session):
+        if "notification" not in request.endpoint:
+            tracker.record_activity(tracked_session, current_app.db_session)
+        return
+
     user_sessions = get_all_active_user_sessions(user.id, current_app.db_session)
     latest_user_session = get_latest_user_session(user.id, current_app.db_session)
 
@@ -140,23 +154,23 @@ def check_user_session_function(user: User):
         deactivate_all_user_sessions(user_sessions)
         raise InvalidUserSessionError(f"User with id={user.id} does not have an active user session")
     # Check if the access token in the request is the same as the latest user session access token
-    bearer_token = get_bearer_token()
-    if bearer_token:
-        access_token = bearer_token.replace("Bearer", "").strip()
-
-        if access_token != latest_user_session.access_token:
-            deactivate_all_user_sessions(user_sessions)
-            raise InvalidUserSessionError(f"User with id={user.id} is using an invalid access token")
+    if access_token and access_token != latest_user_session.access_token:
+        deactivate_all_user_sessions(user_sessions)
+        raise InvalidUserSessionError(f"User with id={user.id} is using an invalid access token")
+    # Activity seen by this process may not have been written yet
+    last_active_at = tracker.last_active_at(user.id, latest_user_session.id)
+    if last_active_at and last_active_at > latest_user_session.last_active_at:
+        latest_user_session.last_active_at = last_active_at
     # Check if the last_accessed_at field of the latest user session is not more than a configurable threshold ago
     if check_last_active_at(latest_user_session):
         idle_logout(user, user_sessions)
         raise InvalidUserSessionError(f"User with id={user.id} has not accessed the system for more than the threshold")
     # Update the last_accessed_at field of the latest user session (if this isn't only touching /notification)
     if "notification" not in request.endpoint:
-        # If last_accessed_at is more than 30 minutes ago, then throw an exception
         latest_user_session.last_active_at = datetime.now()
         current_app.db_session.add(latest_user_session)
         current_app.db_session.commit()
+    tracker.track(user.id, latest_user_session)
 
 
 def check_last_active_at(latest_user_session, threshold_in_seconds=None):
@@ -3,6 +3,7 @@ from typing import Optional
 from flask import current_app
 from flask_jwt_extended import JWTManager
 from sqlalchemy import select
+from sqlalchemy.orm import selectinload
 
 from models import User
 
@@ -17,5 +18,6 @@ def user_identity_lookup(user: User) -> str:
 @jwtMgr.user_lookup_loader
 def user_lookup_callback(_jwt_header: dict, jwt_data: dict) -> Optional[User]:
     identity = jwt_data["sub"]
-    stmt = select(User).where(User.oidc_id == identity)
+    # Roles are loaded up front because every @is_authorized check resolves the user's permissions from them
+    stmt = select(User).where(User.oidc_id == identity).options(selectinload(User.roles))
     return current_app.db_session.scalars(stmt).one_or_none()
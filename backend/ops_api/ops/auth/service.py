@@ -12,6 +12,7 @@ from models.events import OpsEventType
 from ops_api.ops.auth.auth_types import UserInfoDict
 from ops_api.ops.auth.authentication_gateway import AuthenticationGateway
 from ops_api.ops.auth.exceptions import AuthenticationError, InvalidUserSessionError
+from ops_api.ops.auth.session_activity import get_user_session_tracker
 from ops_api.ops.auth.utils import (
     _get_token_and_user_data_from_internal_auth,
     deactivate_all_user_sessions,
@@ -74,6 +75,7 @@ def logout() -> dict[str, str]:
 
         user_sessions = get_all_active_user_sessions(current_user.id, current_app.db_session)
         deactivate_all_user_sessions(user_sessions)
+        get_user_session_tracker().forget([current_user.id])
 
         return {"message": f"User: {current_user.email} Logged out"}
 
@@ -106,6 +108,8 @@ def refresh() -> dict[str, str]:
     latest_user_session.last_active_at = datetime.now()
     current_app.db_session.add(latest_user_session)
     current_app.db_session.commit()
+    # The cached session holds the superseded access token
+    get_user_session_tracker().forget([current_user.id])
 
     return {"access_token": access_token}
 
@@ -0,0 +1,117 @@
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from flask import current_app
+from loguru import logger
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from models import UserSession
+
+
+@dataclass
+class TrackedUserSession:
+    """What is known in this process about a user's latest UserSession."""
+
+    user_session_id: int
+    access_token: str
+    last_active_at: datetime
+    validated_at: datetime
+
+
+class UserSessionActivityTracker:
+    """
+    Per-process cache of validated user sessions with write-behind ``last_active_at`` updates.
+
+    A user's latest session is validated against the database at most once per ``cache_ttl``; in between,
+    requests are validated from the cached session. Activity is recorded in memory and the pending
+    ``last_active_at`` values of all sessions are written with one batched UPDATE at most once per
+    ``flush_interval``.
+
+    Idle timeouts are checked against the most recent activity seen by this process, and the database
+    value is topped up with it before a session is re-validated, so the idle-timeout semantics are
+    unchanged. Sessions deactivated by another process are noticed within ``cache_ttl``.
+    """
+
+    def __init__(self, cache_ttl: timedelta, flush_interval: timedelta) -> None:
+        self.cache_ttl = cache_ttl
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._sessions: dict[int, TrackedUserSession] = {}
+        self._pending: dict[int, datetime] = {}
+        self._last_flush = datetime.now()
+
+    def get_cached(self, user_id: int, access_token: Optional[str]) -> Optional[TrackedUserSession]:
+        """
+        Return the cached session of the user if it was validated less than ``cache_ttl`` ago and belongs to
+        ``access_token`` (when given). The caller still checks it for an idle timeout.
+        """
+        with self._lock:
+            tracked = self._sessions.get(user_id)
+        if tracked is None or datetime.now() - tracked.validated_at > self.cache_ttl:
+            return None
+        if access_token and access_token != tracked.access_token:
+            return None
+        return tracked
+
+    def track(self, user_id: int, user_session: UserSession) -> None:
+        """Cache a user session that has just been validated against the database."""
+        with self._lock:
+            self._sessions[user_id] = TrackedUserSession(
+                user_session_id=user_session.id,
+                access_token=user_session.access_token,
+                last_active_at=user_session.last_active_at,
+                validated_at=datetime.now(),
+            )
+            # The session has just been read (and possibly written), so nothing is pending for it
+            self._pending.pop(user_session.id, None)
+
+    def last_active_at(self, user_id: int, user_session_id: int) -> Optional[datetime]:
+        """Return the most recent activity seen by this process for the user session, if any."""
+        with self._lock:
+            tracked = self._sessions.get(user_id)
+        if tracked is None or tracked.user_session_id != user_session_id:
+            return None
+        return tracked.last_active_at
+
+    def record_activity(self, tracked: TrackedUserSession, session: Session) -> None:
+        """Record activity on a cached session and flush the pending activity if it is due."""
+        now = datetime.now()
+        with self._lock:
+            tracked.last_active_at = now
+            self._pending[tracked.user_session_id] = now
+            due = now - self._last_flush >= self.flush_interval
+        if due:
+            self.flush(session)
+
+    def flush(self, session: Session) -> None:
+        """Write the pending ``last_active_at`` values with one batched UPDATE and commit."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = datetime.now()
+        if not pending:
+            return
+
+        session.execute(
+            update(UserSession),
+            [
+                {"id": user_session_id, "last_active_at": last_active_at}
+                for user_session_id, last_active_at in pending.items()
+            ],
+        )
+        session.commit()
+        logger.debug(f"Flushed last_active_at for {len(pending)} user sessions")
+
+    def forget(self, user_ids: Iterable[int]) -> None:
+        """Drop the cached sessions of the users, e.g. after their sessions have been deactivated."""
+        with self._lock:
+            for user_id in user_ids:
+                tracked = self._sessions.pop(user_id, None)
+                if tracked is not None:
+                    self._pending.pop(tracked.user_session_id, None)
+
+
+def get_user_session_tracker() -> UserSessionActivityTracker:
+    return current_app.user_session_tracker
@@ -21,6 +21,7 @@ from sqlalchemy.orm import Session, selectinload
 from models import OpsEventType, User, UserSession
 from ops_api.ops.auth.auth_types import UserInfoDict
 from ops_api.ops.auth.exceptions import PrivateKeyError
+from ops_api.ops.auth.session_activity import get_user_session_tracker
 
 
 def create_oauth_jwt(
@@ -214,6 +215,7 @@ def deactivate_all_user_sessions(user_sessions):
         session.last_active_at = datetime.now()
         current_app.db_session.add(session)
     current_app.db_session.commit()
+    get_user_session_tracker().forget({session.user_id for session in user_sessions})
 
 
 def get_request_ip_address() -> str:
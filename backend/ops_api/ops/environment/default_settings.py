@@ -64,10 +64,20 @@ AUTHLIB_OAUTH_CLIENTS = {
 STORAGE_ACCOUNT_NAME = "timstoragetesting"
 STORAGE_ACCOUNT_KEY = os.getenv("AZURE_STORAGE_ACCOUNT_KEY")
 
-JSONIFY_PRETTYPRINT_REGULAR = True
+# JSON responses are compact unless DEBUG is on (see utils/json_provider.py). When RESPONSE_COMPRESSION is
+# True, JSON responses of at least RESPONSE_COMPRESSION_MIN_SIZE bytes are sent brotli or gzip compressed to
+# clients that accept it. Set per-environment via the RESPONSE_COMPRESSION env var; default OFF, e.g. where a
+# proxy in front of the API already compresses responses.
+RESPONSE_COMPRESSION = os.getenv("RESPONSE_COMPRESSION", "false").lower() == "true"
+RESPONSE_COMPRESSION_MIN_SIZE = 1024  # bytes
+RESPONSE_COMPRESSION_LEVEL = 6  # gzip level (1-9) or brotli quality (0-11)
 
 # User Session Variables
 USER_SESSION_EXPIRATION = timedelta(minutes=28)  # See ADR 29
+# How long a validated user session is trusted before it is re-read from the database, and how often the
+# last_active_at of recently active sessions is written back (see UserSessionActivityTracker)
+USER_SESSION_CACHE_TTL = timedelta(seconds=30)
+USER_SESSION_ACTIVITY_FLUSH_INTERVAL = timedelta(seconds=60)
 
 FAKE_USER_OIDC_IDS = [
     "00000000-0000-1111-a111-000000000018",
@@ -98,6 +108,52 @@ RUNNING_IN_AZURE = "environment/azure" in (os.getenv("OPS_CONFIG") or "")
 # Default OFF everywhere so behavior is unchanged unless explicitly enabled.
 SKIP_CR_FOR_DRAFT_PLANNED = os.getenv("SKIP_CR_FOR_DRAFT_PLANNED", "false").lower() == "true"
 
+# When True, CAN and portfolio funding amounts are read from the can_funding_rollup table
+# (maintained by MessageBus subscribers) instead of being aggregated from the budget lines.
+# Run data_tools/src/rebuild_can_funding_rollup.py before enabling it in an environment.
+# Set per-environment via the USE_CAN_FUNDING_ROLLUP env var; default OFF.
+USE_CAN_FUNDING_ROLLUP = os.getenv("USE_CAN_FUNDING_ROLLUP", "false").lower() == "true"
+
+# When True, the fees and total of budget lines are read from their stored columns (maintained by
+# MessageBus subscribers) instead of being computed from the procurement shop fees in every query.
+# Run data_tools/src/refresh_budget_line_item_totals.py before enabling it and nightly after that.
+# Set per-environment via the USE_STORED_BLI_TOTALS env var; default OFF.
+USE_STORED_BLI_TOTALS = os.getenv("USE_STORED_BLI_TOTALS", "false").lower() == "true"
+
+# When True, OpsEvents without MessageBus subscribers are queued and bulk-inserted by a background
+# writer instead of being committed during the request. Events that cannot be inserted (or that do not
+# fit in the queue) are appended to OPS_EVENT_SPILL_PATH and replayed when the next writer starts.
+# Set per-environment via the ASYNC_OPS_EVENT_WRITER env var; default OFF.
+ASYNC_OPS_EVENT_WRITER = os.getenv("ASYNC_OPS_EVENT_WRITER", "false").lower() == "true"
+OPS_EVENT_SPILL_PATH = os.getenv("OPS_EVENT_SPILL_PATH")
+OPS_EVENT_QUEUE_SIZE = 10000
+OPS_EVENT_BATCH_SIZE = 500
+OPS_EVENT_FLUSH_INTERVAL = 1.0  # seconds
+
+# Seconds a computed /reporting-summary/ result is served from a per-process cache (keyed by fiscal year
+# and portfolios) before it is recomputed. Set per-environment via the REPORTING_SUMMARY_CACHE_TTL env var;
+# default 0 (OFF).
+REPORTING_SUMMARY_CACHE_TTL = float(os.getenv("REPORTING_SUMMARY_CACHE_TTL", "0"))
+
+# How new notifications are pushed to the /notifications/stream/ Server-Sent Events endpoint:
+# "postgres" (LISTEN/NOTIFY, for any number of API processes), "memory" (a single process, e.g. tests)
+# or empty to disable the stream and leave clients polling /notifications/.
+# Set per-environment via the NOTIFICATION_BROKER env var; default OFF.
+NOTIFICATION_BROKER = os.getenv("NOTIFICATION_BROKER", "")
+NOTIFICATION_STREAM_BUFFER_SIZE = 100  # notifications buffered per connected stream
+NOTIFICATION_STREAM_HEARTBEAT = 15.0  # seconds between keep-alive comments
+NOTIFICATION_STREAM_MAX_DURATION = 300.0  # seconds before a stream is closed and the client reconnects
+# Each connected stream holds one gunicorn thread for up to NOTIFICATION_STREAM_MAX_DURATION, so cap the streams of a
+# process below its thread count (--threads 4 in Dockerfile.ops-api); further streams get a 503 and keep polling.
+NOTIFICATION_STREAM_MAX_CONNECTIONS = int(os.getenv("NOTIFICATION_STREAM_MAX_CONNECTIONS", "2"))
+
+# Where the responses of read-heavy lookup and filter option endpoints are cached: "redis" (shared by every
+# API process; needs RESPONSE_CACHE_REDIS_URL), "memory" (a per-process LRU, e.g. tests)
+# or empty to disable caching. Set per-environment via the RESPONSE_CACHE_BACKEND env var; default OFF.
+RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "")
+RESPONSE_CACHE_REDIS_URL = os.getenv("RESPONSE_CACHE_REDIS_URL", "redis://localhost:6379/0")
+RESPONSE_CACHE_MAX_ENTRIES = 1024  # responses kept by the "memory" backend
+
 # CSRF Protection
 # This is the prefix for the Host header in the cloud environment.
 HOST_HEADER_PREFIX = "localhost"
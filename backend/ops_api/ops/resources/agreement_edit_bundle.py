@@ -9,6 +9,7 @@ from ops_api.ops.auth.decorators import is_authorized
 from ops_api.ops.base_views import BaseItemAPI
 from ops_api.ops.schemas.agreement_edit_bundle import AgreementEditBundleRequestSchema
 from ops_api.ops.services.agreement_edit_bundle import AgreementEditBundleService
+from ops_api.ops.services.can_funding_rollup_messages import record_original_can_ids
 from ops_api.ops.services.ops_service import ValidationError
 from ops_api.ops.utils.events import OpsEventHandler
 from ops_api.ops.utils.response import make_response_with_headers
@@ -41,6 +42,7 @@ class AgreementEditBundleAPI(BaseItemAPI):
                 logger.exception(f"Invalid edit-bundle payload for agreement_id={id}")
                 raise
 
+            record_original_can_ids(meta, id)
             service = AgreementEditBundleService(current_app.db_session)
 
             try:
@@ -19,6 +19,7 @@ from models import (
     IaaAgreement,
     OpsEventType,
 )
+from models.search import search_predicate
 from models.utils import generate_agreement_events_update
 from models.utils.fiscal_year import get_current_fiscal_year
 from ops_api.ops.auth.auth_types import Permission, PermissionType
@@ -42,10 +43,25 @@ from ops_api.ops.services.agreements import AgreementsService, resolve_fiscal_ye
 from ops_api.ops.services.budget_line_items import (
     get_bli_is_editable_meta_data_for_agreements,
 )
+from ops_api.ops.services.can_funding_rollup_messages import record_original_can_ids
+from ops_api.ops.services.editability import EditabilityService
 from ops_api.ops.services.ops_service import OpsService, ValidationError
 from ops_api.ops.utils.errors import error_simulator
 from ops_api.ops.utils.events import OpsEventHandler
 from ops_api.ops.utils.response import make_response_with_headers
+from ops_api.ops.utils.response_cache import cached_response, only_my_requested
+
+# The tables the agreement filter options are built from, including those of the user association of only_my
+AGREEMENT_FILTER_OPTION_TABLES = [
+    "agreement",
+    "agreement_team_members",
+    "budget_line_item",
+    "can",
+    "portfolio",
+    "portfolio_team_leaders",
+    "division",
+    "project",
+]
 
 
 @dataclass
@@ -95,6 +111,7 @@ class AgreementItemAPI(BaseItemAPI):
 
         with OpsEventHandler(OpsEventType.UPDATE_AGREEMENT) as meta:
             meta.metadata.update({"agreement_id": id})
+            record_original_can_ids(meta, id)
 
             try:
                 agreement, status_code = _update(id, message_prefix, meta, partial=False)
@@ -111,6 +128,7 @@ class AgreementItemAPI(BaseItemAPI):
 
         with OpsEventHandler(OpsEventType.UPDATE_AGREEMENT) as meta:
             meta.metadata.update({"agreement_id": id})
+            record_original_can_ids(meta, id)
 
             try:
                 agreement, status_code = _update(id, message_prefix, meta, partial=True)
@@ -130,6 +148,7 @@ class AgreementItemAPI(BaseItemAPI):
             meta.metadata.update({"agreement_id": id})
             service: OpsService[Agreement] = AgreementsService(current_app.db_session)
             agreement: Agreement = service.get(id)
+            record_original_can_ids(meta, agreement.id)
 
             try:
                 service.delete(agreement.id)
@@ -175,6 +194,13 @@ class AgreementListAPI(BaseListAPI):
             effective_fy = resolve_fiscal_year(fiscal_year_filters)
             schema_context = {"fiscal_year": effective_fy}
 
+            # the editability of every agreement and budget line on the page is read in a fixed number of queries
+            budget_line_items = [bli for agreement in agreements for bli in agreement.budget_line_items]
+            editability = EditabilityService(current_app.db_session, current_user).load(
+                [bli.id for bli in budget_line_items],
+                [agreement.id for agreement in agreements] + [bli.agreement_id for bli in budget_line_items],
+            )
+
             agreement_response = []
 
             for agreement in agreements:
@@ -183,6 +209,7 @@ class AgreementListAPI(BaseListAPI):
                     agreement,
                     AGREEMENT_LIST_TYPE_TO_RESPONSE_MAPPING,
                     context=schema_context,
+                    editability=editability,
                 )
 
                 agreement_response.append(serialized_agreement)
@@ -357,6 +384,7 @@ class AgreementListFilterOptionAPI(BaseItemAPI):
         self._response_schema = AgreementListFilterOptionResponseSchema()
 
     @is_authorized(PermissionType.GET, Permission.AGREEMENT)
+    @cached_response(ttl=60, tables=AGREEMENT_FILTER_OPTION_TABLES, per_user=only_my_requested)
     def get(self) -> Response:
         """Get filter options for agreements."""
         data = self._get_schema.load(request.args.to_dict(flat=False))
@@ -375,7 +403,7 @@ def __get_search_clause(agreement_cls, query, search):
                 query = query.where(agreement_cls.name.is_(None))
             else:
                 # Use ilike for case-insensitive search
-                query = query.where(agreement_cls.name.ilike(f"%{search_term}%"))
+                query = query.where(search_predicate(agreement_cls.name, search_term))
     return query
 
 
@@ -424,14 +452,19 @@ def _update(id: int, message_prefix: str, meta: OpsEventHandler, partial: bool =
 
 
 def _serialize_agreement_with_meta(
-    service: AgreementsService, agreement: Agreement, schema_mapping: dict[AgreementType, Any], context: dict = None
+    service: AgreementsService,
+    agreement: Agreement,
+    schema_mapping: dict[AgreementType, Any],
+    context: dict = None,
+    editability: Optional[EditabilityService] = None,
 ) -> dict:
     """
     Serialize an agreement with its metadata.
 
     Note: The schema includes a _meta field, but we populate it manually here
     because we need to compute isEditable based on the current user's permissions
-    and the agreement's awarded state.
+    and the agreement's awarded state. ``editability`` may be an EditabilityService
+    already loaded for the agreement and its budget lines (e.g. for a page of agreements).
     """
     schema_type = schema_mapping.get(agreement.agreement_type)
     if schema_type is None:
@@ -442,12 +475,16 @@ def _serialize_agreement_with_meta(
     serialized_agreement = schema.dump(agreement)
 
     # Add _meta to each budget line item
-    get_bli_is_editable_meta_data_for_agreements(serialized_agreement)
+    get_bli_is_editable_meta_data_for_agreements(serialized_agreement, editability)
 
     # Add _meta to the agreement itself
+    if editability is not None:
+        is_editable = editability.is_agreement_editable(agreement.id)
+    else:
+        is_editable = service._is_editable(agreement, current_user)
     meta_schema = MetaSchema()
     data_for_meta = {
-        "isEditable": service._is_editable(agreement, current_user),
+        "isEditable": is_editable,
         "immutable_awarded_fields": agreement.immutable_awarded_fields,
     }
     serialized_agreement["_meta"] = meta_schema.dump(data_for_meta)
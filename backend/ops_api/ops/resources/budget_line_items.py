@@ -25,23 +25,26 @@ from ops_api.ops.schemas.budget_line_items import (
     QueryParametersSchema,
 )
 from ops_api.ops.schemas.change_requests import GenericChangeRequestResponseSchema
-from ops_api.ops.services.budget_line_items import (
-    BudgetLineItemService,
-    batch_load_change_requests_in_review,
-    get_change_requests_for_bli,
-    get_is_editable_meta_data,
-)
+from ops_api.ops.services.budget_line_items import BudgetLineItemService, get_is_editable_meta_data
+from ops_api.ops.services.editability import EditabilityService
 from ops_api.ops.services.ops_service import OpsService
-from ops_api.ops.utils.agreements_helpers import associated_with_agreement
-from ops_api.ops.utils.budget_line_items_helpers import (
-    compute_bli_editable,
-    compute_bli_is_deletable,
-    get_bli_locked_message,
-)
 from ops_api.ops.utils.events import OpsEventHandler
 from ops_api.ops.utils.response import make_response_with_headers
+from ops_api.ops.utils.response_cache import cached_response, only_my_requested
 from ops_api.ops.utils.users import is_super_user
 
+# The tables the budget line filter options are built from, including those of the user association of only_my
+BLI_FILTER_OPTION_TABLES = [
+    "budget_line_item",
+    "agreement",
+    "agreement_team_members",
+    "can",
+    "portfolio",
+    "portfolio_team_leaders",
+    "division",
+    "procurement_shop_fee",
+]
+
 
 class BudgetLineItemsItemAPI(BaseItemAPI):
     def __init__(self, model: BaseModel):
@@ -154,10 +157,12 @@ class BudgetLineItemsListAPI(BaseListAPI):
         limit = data.get("limit", None)[0]
         offset = data.get("offset", None)[0]
 
-        bli_dict = {bli.id: bli for bli in budget_line_items}
-        bli_ids = list(bli_dict.keys())
-        agreement_ids = [bli.agreement_id for bli in budget_line_items]
-        change_requests_data = batch_load_change_requests_in_review(current_app.db_session, bli_ids, agreement_ids)
+        # get_list loads the agreements' procurement trackers and steps, which the editability locks walk
+        editability = EditabilityService(current_app.db_session, current_user).load(
+            [bli.id for bli in budget_line_items],
+            [bli.agreement_id for bli in budget_line_items],
+            budget_line_items=budget_line_items,
+        )
 
         list_schema = BudgetLineItemListResponseSchema(many=True)
         cr_schema = GenericChangeRequestResponseSchema(many=True)
@@ -175,27 +180,17 @@ class BudgetLineItemsListAPI(BaseListAPI):
             "total_obligated_amount": totals["total_obligated_amount"],
             "total_overcome_by_events_amount": totals["total_overcome_by_events_amount"],
         }
-        is_budget_team = "BUDGET_TEAM" in (role.name for role in current_user.roles)
-        is_super = is_super_user(current_user, current_app)
-        user_agreement_associations = {}
 
         serialized_blis = list_schema.dump(budget_line_items)
         for serialized_bli in serialized_blis:
             bli_id = serialized_bli.get("id")
             agreement_id = serialized_bli.get("agreement_id")
-            change_requests = get_change_requests_for_bli(bli_id, agreement_id, change_requests_data)
-            in_review = change_requests is not None
-            serialized_bli["in_review"] = in_review
+            change_requests = editability.change_requests_in_review(bli_id, agreement_id)
+            serialized_bli["in_review"] = change_requests is not None
             serialized_bli["change_requests_in_review"] = cr_schema.dump(change_requests) if change_requests else None
-            serialized_bli["_meta"] = _list_item_meta(
-                serialized_bli,
-                bli_dict.get(bli_id),
-                data_for_meta,
-                meta_schema,
-                is_budget_team,
-                is_super,
-                user_agreement_associations,
-            )
+            meta = meta_schema.dump(data_for_meta)
+            meta.update(editability.budget_line_item_meta(bli_id, agreement_id))
+            serialized_bli["_meta"] = meta
 
         logger.debug("Serialization complete")
         return make_response_with_headers(serialized_blis)
@@ -212,39 +207,6 @@ class BudgetLineItemsListAPI(BaseListAPI):
                 return make_response_with_headers(new_bli_dict, 201)
 
 
-def _list_item_meta(
-    serialized_bli: dict,
-    budget_line_item: BudgetLineItem | None,
-    data_for_meta: dict,
-    meta_schema: MetaSchema,
-    is_budget_team: bool,
-    is_super: bool,
-    user_agreement_associations: dict,
-) -> dict:
-    """Build _meta for a single BLI in the list response (pagination + isEditable/isDeletable)."""
-    meta = meta_schema.dump(data_for_meta)
-    in_review = serialized_bli.get("in_review", False)
-    if is_budget_team:
-        is_associated = True
-    elif serialized_bli.get("agreement_id"):
-        agreement_id = serialized_bli["agreement_id"]
-        if agreement_id not in user_agreement_associations:
-            user_agreement_associations[agreement_id] = associated_with_agreement(agreement_id)
-        is_associated = user_agreement_associations[agreement_id]
-    else:
-        is_associated = False
-
-    if is_associated:
-        meta["isEditable"] = compute_bli_editable(budget_line_item, in_review, is_super)
-        meta["isDeletable"] = compute_bli_is_deletable(budget_line_item, in_review, is_super)
-        meta["lockedMessage"] = get_bli_locked_message(budget_line_item, in_review, is_super)
-    else:
-        meta["isEditable"] = False
-        meta["isDeletable"] = False
-        meta["lockedMessage"] = None
-    return meta
-
-
 class BudgetLineItemsListFilterOptionAPI(BaseItemAPI):
     def __init__(self, model: BaseModel):
         super().__init__(model)
@@ -252,6 +214,7 @@ class BudgetLineItemsListFilterOptionAPI(BaseItemAPI):
         self._response_schema = BudgetLineItemListFilterOptionResponseSchema()
 
     @is_authorized(PermissionType.GET, Permission.BUDGET_LINE_ITEM)
+    @cached_response(ttl=60, tables=BLI_FILTER_OPTION_TABLES, per_user=only_my_requested)
     def get(self) -> Response:
         request_schema = BLIFiltersQueryParametersSchema()
         data = request_schema.load(request.args.to_dict(flat=False))
@@ -24,6 +24,7 @@ from ops_api.ops.services.cans import CANService
 from ops_api.ops.utils.errors import error_simulator
 from ops_api.ops.utils.events import OpsEventHandler
 from ops_api.ops.utils.response import make_response_with_headers
+from ops_api.ops.utils.response_cache import cached_response
 
 
 class ListAPIRequest(Schema):
@@ -190,6 +191,7 @@ class CANListFilterOptionAPI(BaseItemAPI):
         self._response_schema = CANListFilterOptionResponseSchema()
 
     @is_authorized(PermissionType.GET, Permission.CAN)
+    @cached_response(ttl=60, tables=["can", "can_funding_details", "can_funding_budget", "portfolio"])
     def get(self) -> Response:
         data = self._get_schema.load(request.args.to_dict(flat=False))
         service = CANService(current_app.db_session)
@@ -4,6 +4,7 @@ from models.base import BaseModel
 from ops_api.ops.auth.auth_types import Permission, PermissionType
 from ops_api.ops.auth.decorators import is_authorized
 from ops_api.ops.base_views import BaseItemAPI, BaseListAPI
+from ops_api.ops.utils.response_cache import cached_response
 
 
 class DivisionsItemAPI(BaseItemAPI):
@@ -20,5 +21,6 @@ class DivisionsListAPI(BaseListAPI):
         super().__init__(model)
 
     @is_authorized(PermissionType.GET, Permission.DIVISION)
+    @cached_response(ttl=300, tables=["division"])
     def get(self) -> Response:
         return super().get()
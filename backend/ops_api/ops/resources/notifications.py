@@ -1,13 +1,18 @@
 from __future__ import annotations
 
-from datetime import date
+import base64
+import hashlib
+import json
+import time
+from datetime import date, datetime
 from typing import Optional, cast
 
 from flask import Response, current_app, request
 from flask_jwt_extended import current_user
 from loguru import logger
-from marshmallow import Schema, fields
-from sqlalchemy import and_, or_, select
+from marshmallow import Schema, ValidationError, fields
+from marshmallow.validate import Range
+from sqlalchemy import and_, func, or_, select, tuple_
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import InstrumentedAttribute, contains_eager, selectinload
 
@@ -32,6 +37,7 @@ from ops_api.ops.schemas.procurement_tracker_steps import (
     ProcurementTrackerStepNotificationSchema,
 )
 from ops_api.ops.utils.events import OpsEventHandler
+from ops_api.ops.utils.notification_broker import RESYNC, NotificationBroker, NotificationSubscription
 from ops_api.ops.utils.query_helpers import QueryHelper
 from ops_api.ops.utils.response import make_response_with_headers
 
@@ -74,6 +80,30 @@ class ListAPIRequest(Schema):
     oidc_id = fields.Str(required=False)
     is_read = fields.Bool(required=False)
     agreement_id = fields.Int(required=False)
+    # When limit or cursor is given, the response is a page: {"data": [...], "next_cursor": "..."}
+    limit = fields.Int(required=False, validate=Range(min=1, max=100, error="Limit must be between 1 and 100"))
+    cursor = fields.Str(required=False)
+
+
+class UnreadCountResponseSchema(Schema):
+    unread_count = fields.Int(required=True)
+
+
+DEFAULT_PAGE_SIZE = 25
+
+
+def encode_cursor(notification: Notification) -> str:
+    """Encode the (created_on, id) position of a notification as an opaque cursor."""
+    created_on = notification.created_on.isoformat() if notification.created_on else ""
+    return base64.urlsafe_b64encode(f"{created_on}|{notification.id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[Optional[datetime], int]:
+    try:
+        created_on, notification_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return (datetime.fromisoformat(created_on) if created_on else None), int(notification_id)
+    except ValueError as e:
+        raise ValidationError({"cursor": ["Invalid cursor"]}) from e
 
 
 class NotificationItemAPI(BaseItemAPI):
@@ -180,62 +210,47 @@ class NotificationListAPI(BaseListAPI):
         self._response_schema_collection = NotificationResponseSchema(many=True)
 
     @staticmethod
-    def _get_query(
+    def _filter(
+        stmt,
         user_id: Optional[int] = None,
         oidc_id: Optional[str] = None,
         is_read: Optional[bool] = None,
         agreement_id: Optional[int] = None,
+        join_related: bool = False,
     ):
+        """
+        Join the recipient to ``stmt`` and restrict it to the notifications matching the filters.
+
+        The change request and procurement tracker step of each notification are outer joined too when filtering by
+        agreement or when ``join_related`` is set.
+        """
+        stmt = stmt.join(User, Notification.recipient_id == User.id, isouter=True)
+
+        if agreement_id or join_related:
+            stmt = stmt.outerjoin(
+                AgreementChangeRequest,
+                and_(
+                    Notification.id == ChangeRequestNotification.id,
+                    ChangeRequestNotification.change_request_id == AgreementChangeRequest.id,
+                ),
+            ).outerjoin(
+                ProcurementTrackerStep,
+                and_(
+                    Notification.id == PreAwardApprovalNotification.id,
+                    PreAwardApprovalNotification.procurement_tracker_step_id == ProcurementTrackerStep.id,
+                ),
+            )
+
         if agreement_id:
             # Query for both ChangeRequestNotifications and PreAwardApprovalNotifications
-            stmt = (
-                select(Notification)
-                .join(
-                    User,
-                    Notification.recipient_id == User.id,
-                    isouter=True,
-                )
-                .outerjoin(
-                    AgreementChangeRequest,
-                    and_(
-                        Notification.id == ChangeRequestNotification.id,
-                        ChangeRequestNotification.change_request_id == AgreementChangeRequest.id,
-                    ),
-                )
-                .outerjoin(
-                    ProcurementTrackerStep,
-                    and_(
-                        Notification.id == PreAwardApprovalNotification.id,
-                        PreAwardApprovalNotification.procurement_tracker_step_id == ProcurementTrackerStep.id,
-                    ),
-                )
-                .outerjoin(
-                    ProcurementTracker,
-                    ProcurementTrackerStep.procurement_tracker_id == ProcurementTracker.id,
+            stmt = stmt.outerjoin(
+                ProcurementTracker,
+                ProcurementTrackerStep.procurement_tracker_id == ProcurementTracker.id,
+            ).where(
+                or_(
+                    AgreementChangeRequest.agreement_id == agreement_id,
+                    ProcurementTracker.agreement_id == agreement_id,
                 )
-                .where(
-                    or_(
-                        AgreementChangeRequest.agreement_id == agreement_id,
-                        ProcurementTracker.agreement_id == agreement_id,
-                    )
-                )
-                .options(
-                    contains_eager(Notification.recipient),
-                    selectinload(ChangeRequestNotification.change_request),
-                    selectinload(PreAwardApprovalNotification.procurement_tracker_step),
-                )
-                .order_by(Notification.created_on.desc())
-            )
-        else:
-            stmt = (
-                select(Notification)
-                .join(User, Notification.recipient_id == User.id, isouter=True)
-                .options(
-                    contains_eager(Notification.recipient),
-                    selectinload(ChangeRequestNotification.change_request),
-                    selectinload(PreAwardApprovalNotification.procurement_tracker_step),
-                )
-                .order_by(Notification.created_on.desc())
             )
 
         query_helper = QueryHelper(stmt)
@@ -254,12 +269,187 @@ class NotificationListAPI(BaseListAPI):
         stmt = query_helper.get_stmt()
         return stmt
 
+    @classmethod
+    def _get_query(
+        cls,
+        user_id: Optional[int] = None,
+        oidc_id: Optional[str] = None,
+        is_read: Optional[bool] = None,
+        agreement_id: Optional[int] = None,
+    ):
+        stmt = cls._filter(select(Notification), user_id, oidc_id, is_read, agreement_id)
+        return stmt.options(
+            contains_eager(Notification.recipient),
+            selectinload(ChangeRequestNotification.change_request),
+            selectinload(PreAwardApprovalNotification.procurement_tracker_step),
+        ).order_by(Notification.created_on.desc(), Notification.id.desc())
+
+    @classmethod
+    def _get_etag(
+        cls,
+        user_id: Optional[int] = None,
+        oidc_id: Optional[str] = None,
+        is_read: Optional[bool] = None,
+        agreement_id: Optional[int] = None,
+    ) -> str:
+        """
+        Compute the ETag of the notifications matching the filters from one aggregate query.
+
+        updated_on is set with clock_timestamp() on every update, so the ETag changes when a notification, or the
+        change request or procurement tracker step nested in it, is updated, and the count changes when one is
+        added or deleted.
+        """
+        stmt = cls._filter(
+            select(
+                func.count(Notification.id),
+                func.max(Notification.updated_on),
+                func.max(AgreementChangeRequest.updated_on),
+                func.max(ProcurementTrackerStep.updated_on),
+            ).select_from(Notification),
+            user_id,
+            oidc_id,
+            is_read,
+            agreement_id,
+            join_related=True,
+        )
+        aggregate = current_app.db_session.execute(stmt).one()
+        return hashlib.sha256(repr(tuple(aggregate)).encode()).hexdigest()
+
+    @staticmethod
+    def _apply_cursor(stmt, cursor: str):
+        """Restrict the query to the notifications after the cursor in (created_on DESC, id DESC) order."""
+        created_on, notification_id = decode_cursor(cursor)
+        if created_on is None:
+            # NULL created_on sorts first in DESC order
+            return stmt.where(
+                or_(
+                    and_(Notification.created_on.is_(None), Notification.id < notification_id),
+                    Notification.created_on.isnot(None),
+                )
+            )
+        return stmt.where(tuple_(Notification.created_on, Notification.id) < tuple_(created_on, notification_id))
+
     @is_authorized(PermissionType.GET, Permission.NOTIFICATION)
     def get(self) -> Response:
         request_data: ListAPIRequest = self._get_input_schema.load(request.args)
+        limit = request_data.pop("limit", None)
+        cursor = request_data.pop("cursor", None)
+
+        # a request whose If-None-Match matches gets an empty 304 without running the list query; the ETag covers
+        # the filtered notifications, and the limit and cursor are part of the URL it is cached under
+        etag = self._get_etag(**request_data)
+        if request.if_none_match.contains_weak(etag):
+            response = make_response_with_headers("", 304)
+            response.set_etag(etag)
+            response.headers["Cache-Control"] = "private, no-cache"
+            return response
+
         stmt = self._get_query(**request_data)
-        result = current_app.db_session.execute(stmt).all()
-        return make_response_with_headers(self._response_schema_collection.dump([item[0] for item in result]))
+
+        if limit is None and cursor is None:
+            result = current_app.db_session.execute(stmt).all()
+            response = make_response_with_headers(self._response_schema_collection.dump([item[0] for item in result]))
+        else:
+            limit = limit or DEFAULT_PAGE_SIZE
+            if cursor:
+                stmt = self._apply_cursor(stmt, cursor)
+            notifications = [item[0] for item in current_app.db_session.execute(stmt.limit(limit + 1)).all()]
+            page = notifications[:limit]
+            next_cursor = encode_cursor(page[-1]) if len(notifications) > limit else None
+            response = make_response_with_headers(
+                {"data": self._response_schema_collection.dump(page), "next_cursor": next_cursor}
+            )
+
+        response.set_etag(etag)
+        # let clients cache the response but always revalidate it with If-None-Match
+        response.headers["Cache-Control"] = "private, no-cache"
+        return response
+
+
+class NotificationUnreadCountAPI(BaseListAPI):
+    def __init__(self, model):
+        super().__init__(model)
+        self._response_schema = UnreadCountResponseSchema()
+
+    @is_authorized(PermissionType.GET, Permission.NOTIFICATION)
+    def get(self) -> Response:
+        """Count the unread notifications of the current user (served by idx_notification_recipient_is_read)."""
+        stmt = select(func.count(Notification.id)).where(
+            Notification.recipient_id == current_user.id,
+            Notification.is_read.is_(False),
+        )
+        unread_count = current_app.db_session.scalar(stmt)
+        return make_response_with_headers(self._response_schema.dump({"unread_count": unread_count}))
+
+
+def notification_stream(
+    broker: NotificationBroker,
+    subscription: NotificationSubscription,
+    heartbeat: float = 15.0,
+    max_duration: float = 300.0,
+):
+    """
+    Yield the Server-Sent Events for the notifications published to the subscription's recipient.
+
+    A comment is sent every ``heartbeat`` seconds without notifications to keep proxies from closing the
+    connection, and the stream ends after ``max_duration`` seconds so that connections are rebalanced; the
+    client reconnects after the ``retry`` delay.
+    """
+    try:
+        yield f"retry: {int(heartbeat * 1000)}\n\n"
+        deadline = time.monotonic() + max_duration
+        while (remaining := deadline - time.monotonic()) > 0:
+            payload = subscription.get(timeout=min(heartbeat, remaining))
+            if payload is None:
+                yield ": keep-alive\n\n"
+            elif payload is RESYNC:
+                # notifications were dropped, so the client re-fetches the list
+                yield "event: resync\ndata: {}\n\n"
+            else:
+                yield f"id: {payload['id']}\nevent: notification\ndata: {json.dumps(payload)}\n\n"
+    finally:
+        broker.unsubscribe(subscription)
+
+
+class NotificationStreamAPI(BaseListAPI):
+    @is_authorized(PermissionType.GET, Permission.NOTIFICATION)
+    def get(self) -> Response:
+        """
+        Stream the new notifications of the current user as Server-Sent Events.
+
+        Responds 204 when no NOTIFICATION_BROKER is configured, which tells the client to stop reconnecting and
+        keep polling /notifications/, and 503 when NOTIFICATION_STREAM_MAX_CONNECTIONS streams are already
+        connected to this process.
+        """
+        broker = current_app.notification_broker
+        if not broker:
+            return make_response_with_headers("", 204)
+
+        max_duration = current_app.config.get("NOTIFICATION_STREAM_MAX_DURATION", 300.0)
+        subscription = broker.subscribe(current_user.id)
+        if subscription is None:
+            # a connected stream ends within max_duration seconds
+            response = make_response_with_headers("", 503)
+            response.headers["Retry-After"] = str(int(max_duration))
+            return response
+
+        stream = notification_stream(
+            broker,
+            subscription,
+            heartbeat=current_app.config.get("NOTIFICATION_STREAM_HEARTBEAT", 15.0),
+            max_duration=max_duration,
+        )
+        # the stream only reads from the broker, so end the transaction of the auth queries and give the
+        # connection back to the pool instead of holding it until the stream ends
+        current_app.db_session.commit()
+        current_app.db_session.remove()
+        response = Response(stream, mimetype="text/event-stream")
+        # the generator's finally does not run when the client disconnects before the first event is sent
+        response.call_on_close(lambda: broker.unsubscribe(subscription))
+        response.headers["Cache-Control"] = "no-cache"
+        # don't let nginx buffer the events
+        response.headers["X-Accel-Buffering"] = "no"
+        return response
 
 
 def is_acknowledging(notification: Notification | None):
@@ -134,4 +134,4 @@ class PortfolioCansAPI(BaseItemAPI):
             )
 
         sorted_cans = self._sort_by_appropriation_year(cans)
-        return make_response_with_headers([can.to_dict() for can in sorted_cans])
+        return make_response_with_headers(CAN.to_dicts(sorted_cans))
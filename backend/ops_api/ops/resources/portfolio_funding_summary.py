@@ -1,5 +1,6 @@
 from flask import Response, current_app, request
 from sqlalchemy import select
+from sqlalchemy.orm import selectinload
 
 from models import Portfolio
 from models.base import BaseModel
@@ -13,7 +14,7 @@ from ops_api.ops.schemas.portfolio_funding_summary import (
     ResponseListSchema,
     ResponseSchema,
 )
-from ops_api.ops.utils.portfolios import get_total_funding
+from ops_api.ops.utils.portfolios import get_total_funding_by_portfolio
 from ops_api.ops.utils.response import make_response_with_headers
 
 
@@ -51,7 +52,8 @@ class PortfolioFundingSummaryItemAPI(BaseItemAPI):
         portfolio = self._get_item(id)
 
         response_schema = ResponseSchema()
-        portfolio_funding_summary = response_schema.dump(get_total_funding(portfolio, fiscal_year))
+        funding = get_total_funding_by_portfolio([portfolio.id], fiscal_year)[portfolio.id]
+        portfolio_funding_summary = response_schema.dump(funding)
         return make_response_with_headers(portfolio_funding_summary)
 
 
@@ -131,16 +133,18 @@ class PortfolioFundingSummaryListAPI(BaseListAPI):
         fiscal_year, portfolio_ids, budget_min, budget_max, available_pct_ranges = self._parse_request_params(data)
 
         # Get all portfolios (or filtered by IDs if specified)
+        stmt = select(Portfolio).options(selectinload(Portfolio.division)).order_by(Portfolio.id)
         if portfolio_ids:
-            stmt = select(Portfolio).where(Portfolio.id.in_(portfolio_ids))
-            portfolios = current_app.db_session.execute(stmt).scalars().all()
-        else:
-            portfolios = self._get_all_items()
+            stmt = stmt.where(Portfolio.id.in_(portfolio_ids))
+        portfolios = current_app.db_session.execute(stmt).scalars().all()
+
+        # Funding for every portfolio is computed with a fixed number of aggregate queries
+        funding_by_portfolio = get_total_funding_by_portfolio([portfolio.id for portfolio in portfolios], fiscal_year)
 
         # Build response with funding for each portfolio
         portfolio_summaries = []
         for portfolio in portfolios:
-            funding = get_total_funding(portfolio, fiscal_year)
+            funding = funding_by_portfolio[portfolio.id]
 
             # Apply filters
             total_amount = funding["total_funding"]["amount"]
@@ -13,6 +13,19 @@ from ops_api.ops.auth.decorators import is_authorized
 from ops_api.ops.base_views import BaseItemAPI, BaseListAPI
 from ops_api.ops.schemas.portfolios import PortfolioListRequestSchema
 from ops_api.ops.utils.response import make_response_with_headers
+from ops_api.ops.utils.response_cache import cached_response
+
+# The tables the portfolio list is built from, including those of the project_id filter
+PORTFOLIO_LIST_TABLES = [
+    "portfolio",
+    "portfolio_team_leaders",
+    "portfolio_url",
+    "division",
+    "ops_user",
+    "can",
+    "budget_line_item",
+    "agreement",
+]
 
 
 class PortfolioItemAPI(BaseItemAPI):
@@ -49,6 +62,7 @@ class PortfolioListAPI(BaseListAPI):
         super().__init__(model)
 
     @is_authorized(PermissionType.GET, Permission.PORTFOLIO)
+    @cached_response(ttl=300, tables=PORTFOLIO_LIST_TABLES)
     def get(self) -> Response:
         schema = PortfolioListRequestSchema()
         data = schema.load(request.args)
@@ -73,12 +87,10 @@ class PortfolioListAPI(BaseListAPI):
 
         result = current_app.db_session.scalars(stmt).all()
 
-        portfolio_response: List[dict] = []
-        for portfolio in result:
+        portfolio_response: List[dict] = Portfolio.to_dicts(result)
+        for portfolio, project_dict in zip(result, portfolio_response, strict=True):
             additional_fields = add_additional_fields_to_portfolio_response(portfolio)
-            project_dict = portfolio.to_dict()
             project_dict.update(additional_fields)
-            portfolio_response.append(project_dict)
 
         return make_response_with_headers(portfolio_response)
 
@@ -11,6 +11,7 @@ from ops_api.ops.schemas.procurement_shops import ProcurementShopSchema
 from ops_api.ops.services.ops_service import OpsService
 from ops_api.ops.services.procurement_shops import ProcurementShopService
 from ops_api.ops.utils.response import make_response_with_headers
+from ops_api.ops.utils.response_cache import cached_response
 
 
 class ProcurementShopsItemAPI(BaseItemAPI):  # type: ignore [misc]
@@ -36,6 +37,7 @@ class ProcurementShopsListAPI(BaseListAPI):  # type: ignore [misc]
         super().__init__(model)
 
     @is_authorized(PermissionType.GET, Permission.AGREEMENT)
+    @cached_response(ttl=300, tables=["procurement_shop", "procurement_shop_fee"])
     def get(self) -> Response:
         schema = ProcurementShopSchema(many=True)
         service: OpsService[ProcurementShop] = ProcurementShopService(current_app.db_session)
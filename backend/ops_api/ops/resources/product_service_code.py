@@ -6,6 +6,7 @@ from models.base import BaseModel
 from ops_api.ops.auth.auth_types import Permission, PermissionType
 from ops_api.ops.auth.decorators import is_authorized
 from ops_api.ops.base_views import BaseItemAPI, BaseListAPI
+from ops_api.ops.utils.response_cache import cached_response
 
 
 class ProductServiceCodeItemAPI(BaseItemAPI):
@@ -22,5 +23,6 @@ class ProductServiceCodeListAPI(BaseListAPI):
         super().__init__(model)
 
     @is_authorized(PermissionType.GET, Permission.AGREEMENT)
+    @cached_response(ttl=300, tables=["product_service_code"])
     def get(self) -> Response:
         return super().get()
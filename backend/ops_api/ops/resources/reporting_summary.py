@@ -7,7 +7,7 @@ from ops_api.ops.auth.decorators import is_authorized
 from ops_api.ops.base_views import BaseListAPI
 from ops_api.ops.resources.portfolio_funding_summary import _extract_first_or_default
 from ops_api.ops.schemas.reporting_summary import RequestSchema, ResponseSchema
-from ops_api.ops.utils.reporting_summary import get_agreement_spending_by_type, get_reporting_counts
+from ops_api.ops.utils.reporting_summary import get_reporting_summary
 from ops_api.ops.utils.response import make_response_with_headers
 
 
@@ -21,8 +21,11 @@ class ReportingSummaryListAPI(BaseListAPI):
         data = schema.load(request.args.to_dict(flat=False))
         fiscal_year = _extract_first_or_default(data.get("fiscal_year"), get_current_fiscal_year())
         portfolio_ids = data.get("portfolio_ids")
-        spending = get_agreement_spending_by_type(current_app.db_session, fiscal_year, portfolio_ids=portfolio_ids)
-        counts = get_reporting_counts(current_app.db_session, fiscal_year, portfolio_ids=portfolio_ids)
-        result = {"spending": spending, "counts": counts}
+        result = get_reporting_summary(
+            current_app.db_session,
+            fiscal_year,
+            portfolio_ids=portfolio_ids,
+            cache=current_app.reporting_summary_cache,
+        )
         response_schema = ResponseSchema()
         return make_response_with_headers(response_schema.dump(result))
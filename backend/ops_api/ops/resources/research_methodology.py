@@ -11,6 +11,7 @@ from ops_api.ops.schemas.research_methodology import (
 from ops_api.ops.services.research_methodology import ResearchMethodologyService
 from ops_api.ops.utils.errors import error_simulator
 from ops_api.ops.utils.response import make_response_with_headers
+from ops_api.ops.utils.response_cache import cached_response
 
 
 class ResearchMethodologyItemAPI(BaseItemAPI):
@@ -30,6 +31,7 @@ class ResearchMethodologyListAPI(BaseListAPI):
         super().__init__(model)
 
     @is_authorized(PermissionType.GET, Permission.AGREEMENT)
+    @cached_response(ttl=300, tables=["research_methodology"])
     @jwt_required()
     @error_simulator
     def get(self) -> Response:
@@ -0,0 +1,42 @@
+from flask import Response, current_app, request
+from flask_jwt_extended import jwt_required
+
+from models.base import BaseModel
+from ops_api.ops.auth.auth_types import Permission, PermissionType
+from ops_api.ops.auth.authorization_providers import _check_role
+from ops_api.ops.base_views import BaseListAPI
+from ops_api.ops.schemas.search import SearchRequestSchema, SearchResponseSchema
+from ops_api.ops.services.search import SearchService
+from ops_api.ops.utils.errors import error_simulator
+from ops_api.ops.utils.response import make_response_with_headers
+
+# the permission a user needs to see the hits of each type
+SEARCH_TYPE_PERMISSIONS = {
+    "agreement": Permission.AGREEMENT,
+    "project": Permission.RESEARCH_PROJECT,
+    "can": Permission.CAN,
+    "budget_line_item": Permission.BUDGET_LINE_ITEM,
+}
+
+
+class SearchListAPI(BaseListAPI):
+    def __init__(self, model: BaseModel):
+        super().__init__(model)
+
+    @jwt_required()
+    @error_simulator
+    def get(self) -> Response:
+        """Search the requested types the user may read; 403 when the user may read none of them."""
+        data = SearchRequestSchema().load(request.args.to_dict(flat=False))
+        search_term = data["q"][0]
+        types = [
+            search_type
+            for search_type in dict.fromkeys(data["type"])
+            if _check_role(PermissionType.GET, SEARCH_TYPE_PERMISSIONS[search_type])
+        ]
+        if not types:
+            return make_response_with_headers({}, 403)
+
+        service = SearchService(current_app.db_session)
+        results = service.search(search_term, types, limit=data["limit"][0])
+        return make_response_with_headers(SearchResponseSchema().dump({"q": search_term, "results": results}))
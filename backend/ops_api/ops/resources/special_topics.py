@@ -11,6 +11,7 @@ from ops_api.ops.schemas.special_topics import (
 from ops_api.ops.services.special_topics import SpecialTopicsService
 from ops_api.ops.utils.errors import error_simulator
 from ops_api.ops.utils.response import make_response_with_headers
+from ops_api.ops.utils.response_cache import cached_response
 
 
 class SpecialTopicsItemAPI(BaseItemAPI):
@@ -30,6 +31,7 @@ class SpecialTopicsListAPI(BaseListAPI):
         super().__init__(model)
 
     @is_authorized(PermissionType.GET, Permission.AGREEMENT)
+    @cached_response(ttl=300, tables=["special_topics"])
     @jwt_required()
     @error_simulator
     def get(self) -> Response:
@@ -182,9 +182,12 @@ class ProjectListResponse(Schema):
 
     @pre_dump
     def extract_metadata(self, data, **kwargs):
-        """Extract fields from project_list_metadata property and map to schema fields."""
+        """Extract fields from project_list_metadata property and map to schema fields.
+
+        ProjectsService.get_list computes these fields in the database and sets them as ``list_metadata``.
+        """
         if hasattr(data, "project_list_metadata"):
-            metadata = data.project_list_metadata
+            metadata = getattr(data, "list_metadata", None) or data.project_list_metadata
 
             # Map total to project_total (convert Decimal to int)
             data.project_total = metadata["total"] if metadata["total"] is not None else None
@@ -0,0 +1,37 @@
+from marshmallow import EXCLUDE, Schema, fields
+from marshmallow.validate import Length, OneOf, Range
+
+SEARCH_TYPES = ["agreement", "project", "can", "budget_line_item"]
+
+
+class SearchRequestSchema(Schema):
+    class Meta:
+        unknown = EXCLUDE  # Exclude unknown fields
+
+    q = fields.List(
+        fields.String(validate=Length(min=1, error="Search term must not be empty")),
+        required=True,
+        validate=Length(equal=1, error="Exactly one search term is required"),
+    )
+    type = fields.List(fields.String(validate=OneOf(SEARCH_TYPES)), load_default=SEARCH_TYPES)
+    limit = fields.List(
+        fields.Integer(
+            validate=Range(min=1, max=50, error="Limit must be between 1 and 50"),
+        ),
+        load_default=[10],
+        dump_default=[10],
+        required=False,
+    )
+
+
+class SearchHitSchema(Schema):
+    type = fields.String(required=True)
+    id = fields.Integer(required=True)
+    name = fields.String(allow_none=True)
+    nick_name = fields.String(allow_none=True)
+    rank = fields.Float(required=True)
+
+
+class SearchResponseSchema(Schema):
+    q = fields.String(required=True)
+    results = fields.List(fields.Nested(SearchHitSchema), required=True)
@@ -6,26 +6,24 @@ from typing import Any, List, Optional, Sequence, Type
 from flask import current_app
 from flask_jwt_extended import get_current_user
 from loguru import logger
-from sqlalchemy import Select, distinct, func, or_, select, union
+from sqlalchemy import Select, case, distinct, extract, func, literal, null, or_, select, union
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm import Session, aliased, selectinload, with_polymorphic
 
 from models import (
     CAN,
     AaAgreement,
     Agreement,
     AgreementSortCondition,
-    AgreementTeamMembers,
     BudgetLineItem,
     BudgetLineItemStatus,
     ChangeRequestType,
     ContractAgreement,
-    Division,
     GrantAgreement,
     GrantNumber,
     OpsEventType,
     Portfolio,
-    PortfolioTeamLeaders,
+    ProcurementAction,
     ProcurementShop,
     Project,
     ResearchMethodology,
@@ -34,8 +32,11 @@ from models import (
     User,
     Vendor,
 )
-from models.agreements import AgreementType
+from models.agreements import AgreementClassification, AgreementType
+from models.procurement_action import AwardType, ProcurementActionStatus
 from models.procurement_tracker import ProcurementTrackerStatus
+from models.search import search_predicate
+from models.utils import fiscal_year as fiscal_year_utils
 from models.utils.fiscal_year import get_current_fiscal_year
 from ops_api.ops.schemas.agreements import AgreementListFilterOptionResponseSchema
 from ops_api.ops.services.change_requests import ChangeRequestService
@@ -45,7 +46,11 @@ from ops_api.ops.services.ops_service import (
     ResourceNotFoundError,
     ValidationError,
 )
-from ops_api.ops.utils.agreements_helpers import associated_with_agreement, is_agreement_name_unique_violation
+from ops_api.ops.utils.agreements_helpers import (
+    associated_with_agreement,
+    get_user_association_conditions,
+    is_agreement_name_unique_violation,
+)
 from ops_api.ops.utils.budget_line_items_helpers import create_budget_line_item_instance
 from ops_api.ops.utils.events import OpsEventHandler
 from ops_api.ops.validation.agreement_validator import AgreementValidator
@@ -537,6 +542,11 @@ class AgreementsService(OpsService[Agreement]):
         # Import helper functions from resources
         filters = AgreementFilters.parse_filters(data)
 
+        # The procurement dashboard metrics walk every BLI/tracker of the filtered set, so that
+        # mode keeps the in-memory path. The plain list is filtered, sorted and paged in SQL.
+        if not include_procurement:
+            return self._get_list_paginated_in_db(agreement_classes, data, filters)
+
         # Collect all agreements across types using existing resource helpers
         all_results = []
         for agreement_cls in agreement_classes:
@@ -595,6 +605,66 @@ class AgreementsService(OpsService[Agreement]):
 
         return paginated_results, metadata
 
+    def _get_list_paginated_in_db(
+        self,
+        agreement_classes: list[Type[Agreement]],
+        data: dict[str, Any],
+        filters: AgreementFilters,
+    ) -> tuple[list[Agreement], dict[str, Any]]:
+        """
+        Get a page of agreements with filtering, sorting, counting and summary totals done in SQL.
+
+        Only the agreements on the requested page are loaded as ORM objects, so the cost of a
+        page does not grow with the number of agreements matching the filters.
+        """
+        filtered_ids = _build_filtered_agreement_ids_query(agreement_classes, data)
+
+        if filters.only_my and True in filters.only_my:
+            filtered_ids = self._apply_user_association_filter(filtered_ids, get_current_user())
+
+        if filters.award_type:
+            filtered_ids = filtered_ids.where(award_type_expression(Agreement.id).in_(filters.award_type))
+
+        filtered_ids_subquery = filtered_ids.cte("filtered_agreement_ids")
+
+        total_count = self.db_session.scalar(select(func.count()).select_from(filtered_ids_subquery))
+        totals = _compute_agreement_totals_in_db(self.db_session, filtered_ids_subquery)
+
+        limit_value = filters.limit[0] if filters.limit else total_count
+        offset_value = filters.offset[0] if filters.offset else 0
+
+        sort_condition = filters.sort_conditions[0] if filters.sort_conditions else None
+        sort_descending = filters.sort_descending[0] if filters.sort_descending else False
+
+        page_query = _build_sorted_agreement_ids_query(
+            agreement_classes, filtered_ids_subquery, sort_condition, sort_descending, filters.fiscal_year
+        )
+        page_ids = self.db_session.scalars(page_query.offset(offset_value).limit(limit_value)).all()
+
+        agreements_by_id = {}
+        if page_ids:
+            agreement_poly = with_polymorphic(Agreement, agreement_classes)
+            page_agreements = self.db_session.scalars(
+                select(agreement_poly)
+                .where(agreement_poly.id.in_(page_ids))
+                .options(selectinload(agreement_poly.budget_line_items))
+            ).all()
+            agreements_by_id = {agreement.id: agreement for agreement in page_agreements}
+
+        paginated_results = [agreements_by_id[agreement_id] for agreement_id in page_ids]
+
+        metadata = {
+            "count": total_count,
+            "limit": limit_value,
+            "offset": offset_value,
+            "totals": totals,
+            "procurement_overview": None,
+            "procurement_step_summary": None,
+            "procurement_days_in_step": None,
+        }
+
+        return paginated_results, metadata
+
     def _handle_proc_shop_change(self, agreement: Agreement, new_value: int, commit: bool = True) -> int | None:
         if agreement.awarding_entity_id == new_value:
             return None  # No change needed
@@ -778,63 +848,11 @@ class AgreementsService(OpsService[Agreement]):
         - User has BUDGET_TEAM or SYSTEM_OWNER role
         - User is a super user
         """
-        from ops_api.ops.utils.users import is_super_user  # late import to avoid circular dependency
-
-        # Check for privileged roles first - these users see ALL agreements
-        user_role_names = [role.name for role in user.roles]
-        if "BUDGET_TEAM" in user_role_names or "SYSTEM_OWNER" in user_role_names or is_super_user(user, current_app):
+        conditions = get_user_association_conditions(user)
+        if conditions is None:
             # User has access to all agreements, no filtering needed
             return query
 
-        # Build conditions for user association (any one of these grants access)
-        conditions = []
-
-        # 1. User created the agreement
-        conditions.append(Agreement.created_by == user.id)
-
-        # 2. User is project officer
-        conditions.append(Agreement.project_officer_id == user.id)
-
-        # 3. User is alternate project officer
-        conditions.append(Agreement.alternate_project_officer_id == user.id)
-
-        # 4. User is a direct team member
-        team_member_subquery = select(AgreementTeamMembers.agreement_id).where(AgreementTeamMembers.user_id == user.id)
-        conditions.append(Agreement.id.in_(team_member_subquery))
-
-        # 5. User is a portfolio team leader
-        portfolio_leader_subquery = (
-            select(Agreement.id)
-            .join(BudgetLineItem, Agreement.id == BudgetLineItem.agreement_id)
-            .join(CAN, BudgetLineItem.can_id == CAN.id)
-            .join(Portfolio, CAN.portfolio_id == Portfolio.id)
-            .join(PortfolioTeamLeaders, Portfolio.id == PortfolioTeamLeaders.portfolio_id)
-            .where(PortfolioTeamLeaders.team_lead_id == user.id)
-        )
-        conditions.append(Agreement.id.in_(portfolio_leader_subquery))
-
-        # 6. User is a division director
-        division_director_subquery = (
-            select(Agreement.id)
-            .join(BudgetLineItem, Agreement.id == BudgetLineItem.agreement_id)
-            .join(CAN, BudgetLineItem.can_id == CAN.id)
-            .join(Portfolio, CAN.portfolio_id == Portfolio.id)
-            .join(Division, Portfolio.division_id == Division.id)
-            .where(Division.division_director_id == user.id)
-        )
-        conditions.append(Agreement.id.in_(division_director_subquery))
-
-        # 7. User is a deputy division director
-        deputy_division_director_subquery = (
-            select(Agreement.id)
-            .join(BudgetLineItem, Agreement.id == BudgetLineItem.agreement_id)
-            .join(CAN, BudgetLineItem.can_id == CAN.id)
-            .join(Portfolio, CAN.portfolio_id == Portfolio.id)
-            .join(Division, Portfolio.division_id == Division.id)
-            .where(Division.deputy_division_director_id == user.id)
-        )
-        conditions.append(Agreement.id.in_(deputy_division_director_subquery))
-
         # Apply all conditions with OR (user needs to match ANY condition)
         query = query.where(or_(*conditions))
 
@@ -1262,9 +1280,8 @@ def _apply_agreement_filters(
                     # Use exact case-insensitive match
                     name_conditions.append(func.lower(agreement_cls.name) == func.lower(name))
                 else:
-                    # Use ilike for case-insensitive partial match
-                    pattern = f"%{name}%"
-                    name_conditions.append(func.lower(agreement_cls.name).like(func.lower(pattern), escape="\\"))
+                    # Use ilike for case-insensitive partial match (served by the name trigram index)
+                    name_conditions.append(search_predicate(agreement_cls.name, name))
 
         if name_conditions:
             query = query.where(or_(*name_conditions))
@@ -1311,7 +1328,7 @@ def _apply_search_filter(
             if not search_term:
                 query = query.where(agreement_cls.name.is_(None))
             else:
-                query = query.where(agreement_cls.name.ilike(f"%{search_term}%"))
+                query = query.where(search_predicate(agreement_cls.name, search_term))
 
     return query
 
@@ -1404,3 +1421,270 @@ def _get_next_obligated_bli(budget_line_items):
             if not next_bli or bli.date_needed < next_bli.date_needed:
                 next_bli = bli
     return next_bli
+
+
+def _fiscal_year_of(date_column):
+    """SQL equivalent of ``date_to_fiscal_year`` for a date column or expression."""
+    return case(
+        (extract("month", date_column) >= 10, extract("year", date_column) + 1),
+        else_=extract("year", date_column),
+    )
+
+
+def award_type_expression(agreement_id):
+    """
+    SQL equivalent of ``Agreement.award_type`` correlated to ``agreement_id``.
+
+    Evaluates to NULL when the agreement has no non-DRAFT BLIs, CONTINUING when the
+    NEW_AWARD procurement action was awarded in an earlier fiscal year, and NEW otherwise.
+    """
+    bli = aliased(BudgetLineItem)
+    procurement_action = aliased(ProcurementAction)
+
+    has_non_draft_blis = (
+        select(literal(1))
+        .where(
+            bli.agreement_id == agreement_id,
+            bli.status.isnot(None),
+            bli.status != BudgetLineItemStatus.DRAFT,
+        )
+        .exists()
+    )
+
+    award_date = (
+        select(procurement_action.date_awarded_obligated)
+        .where(
+            procurement_action.agreement_id == agreement_id,
+            procurement_action.status.in_([ProcurementActionStatus.AWARDED, ProcurementActionStatus.CERTIFIED]),
+            procurement_action.award_type == AwardType.NEW_AWARD,
+        )
+        .order_by(procurement_action.created_on.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+
+    return case(
+        (~has_non_draft_blis, null()),
+        (award_date.is_(None), AgreementClassification.NEW.name),
+        # looked up through the module so that tests can patch models.utils.fiscal_year.get_current_fiscal_year
+        (_fiscal_year_of(award_date) >= fiscal_year_utils.get_current_fiscal_year(), AgreementClassification.NEW.name),
+        else_=AgreementClassification.CONTINUING.name,
+    )
+
+
+def _build_filtered_agreement_ids_query(agreement_classes: list[Type[Agreement]], data: dict[str, Any]) -> Select:
+    """Select the ids of all agreements (of any of the given types) matching the request filters."""
+    per_type_queries = []
+    for agreement_cls in agreement_classes:
+        query = (
+            select(agreement_cls.id.label("id"))
+            .join(BudgetLineItem, BudgetLineItem.agreement_id == agreement_cls.id, isouter=True)
+            .join(CAN, BudgetLineItem.can_id == CAN.id, isouter=True)
+        )
+        per_type_queries.append(_apply_filters(query, agreement_cls, data))
+
+    matching_ids = union(*per_type_queries).subquery()
+    return select(Agreement.id).where(Agreement.id.in_(select(matching_ids.c.id)))
+
+
+def _agreement_total_subquery(agreement_ids):
+    """Per-agreement total (amount + fees) of non-DRAFT (or OBE) BLIs, matching ``Agreement.agreement_total``."""
+    return (
+        select(
+            BudgetLineItem.agreement_id.label("agreement_id"),
+            func.sum(func.coalesce(BudgetLineItem.amount, 0) + func.coalesce(BudgetLineItem.fees, 0)).label("total"),
+        )
+        .where(BudgetLineItem.agreement_id.in_(select(agreement_ids.c.id)))
+        .where(
+            or_(
+                BudgetLineItem.is_obe.is_(True),
+                BudgetLineItem.status.is_(None),
+                BudgetLineItem.status != BudgetLineItemStatus.DRAFT,
+            )
+        )
+        .group_by(BudgetLineItem.agreement_id)
+        .subquery()
+    )
+
+
+def _compute_agreement_totals_in_db(session: Session, agreement_ids) -> dict[str, Any]:
+    """Compute the same summary-card totals as ``_compute_agreement_totals`` with a single GROUP BY."""
+    agreement_totals = _agreement_total_subquery(agreement_ids)
+    award_type = award_type_expression(Agreement.id).label("award_type")
+
+    stmt = (
+        select(
+            Agreement.agreement_type,
+            award_type,
+            func.count(Agreement.id).label("agreement_count"),
+            func.coalesce(func.sum(agreement_totals.c.total), 0).label("total"),
+        )
+        .outerjoin(agreement_totals, agreement_totals.c.agreement_id == Agreement.id)
+        .where(Agreement.id.in_(select(agreement_ids.c.id)))
+        .group_by(Agreement.agreement_type, award_type)
+    )
+
+    totals = {
+        "total_contract_amount": Decimal("0"),
+        "total_partner_amount": Decimal("0"),
+        "total_grant_amount": Decimal("0"),
+        "total_direct_obligation_amount": Decimal("0"),
+        "total_agreements_count": 0,
+        "type_counts": {},
+        "new_count": 0,
+        "new_type_counts": {},
+        "continuing_count": 0,
+        "continuing_type_counts": {},
+    }
+
+    for ag_type, award, agreement_count, ag_total in session.execute(stmt).all():
+        ag_total = Decimal(ag_total)
+
+        if ag_type == AgreementType.CONTRACT:
+            totals["total_contract_amount"] += ag_total
+        elif ag_type in (AgreementType.AA, AgreementType.IAA):
+            totals["total_partner_amount"] += ag_total
+        elif ag_type == AgreementType.GRANT:
+            totals["total_grant_amount"] += ag_total
+        elif ag_type == AgreementType.DIRECT_OBLIGATION:
+            totals["total_direct_obligation_amount"] += ag_total
+
+        type_key = ag_type.name
+        totals["total_agreements_count"] += agreement_count
+        totals["type_counts"][type_key] = totals["type_counts"].get(type_key, 0) + agreement_count
+
+        if award == AgreementClassification.NEW.name:
+            totals["new_count"] += agreement_count
+            totals["new_type_counts"][type_key] = totals["new_type_counts"].get(type_key, 0) + agreement_count
+        elif award == AgreementClassification.CONTINUING.name:
+            totals["continuing_count"] += agreement_count
+            totals["continuing_type_counts"][type_key] = (
+                totals["continuing_type_counts"].get(type_key, 0) + agreement_count
+            )
+
+    # Convert Decimals to floats for JSON serialization
+    for key in [
+        "total_contract_amount",
+        "total_partner_amount",
+        "total_grant_amount",
+        "total_direct_obligation_amount",
+    ]:
+        totals[key] = float(totals[key])
+
+    return totals
+
+
+def _next_budget_line_subquery(agreement_ids):
+    """The next upcoming non-DRAFT BLI per agreement (earliest date_needed on or after today)."""
+    ranked = (
+        select(
+            BudgetLineItem.agreement_id.label("agreement_id"),
+            BudgetLineItem.date_needed.label("date_needed"),
+            (func.coalesce(BudgetLineItem.amount, 0) + func.coalesce(BudgetLineItem.fees, 0)).label("total"),
+            func.row_number()
+            .over(
+                partition_by=BudgetLineItem.agreement_id,
+                order_by=(BudgetLineItem.date_needed, BudgetLineItem.id),
+            )
+            .label("rank"),
+        )
+        .where(BudgetLineItem.agreement_id.in_(select(agreement_ids.c.id)))
+        .where(or_(BudgetLineItem.status.is_(None), BudgetLineItem.status != BudgetLineItemStatus.DRAFT))
+        .where(BudgetLineItem.date_needed >= func.current_date())
+        .subquery()
+    )
+    return select(ranked.c.agreement_id, ranked.c.date_needed, ranked.c.total).where(ranked.c.rank == 1).subquery()
+
+
+def _services_component_dates_subquery(agreement_ids):
+    """Earliest period_start and latest period_end across each agreement's services components."""
+    return (
+        select(
+            ServicesComponent.agreement_id.label("agreement_id"),
+            func.min(ServicesComponent.period_start).label("start_date"),
+            func.max(ServicesComponent.period_end).label("end_date"),
+        )
+        .where(ServicesComponent.agreement_id.in_(select(agreement_ids.c.id)))
+        .group_by(ServicesComponent.agreement_id)
+        .subquery()
+    )
+
+
+def _fy_obligated_subquery(agreement_ids, fiscal_year: int):
+    """Per-agreement sum of (amount + fees) for OBLIGATED BLIs in ``fiscal_year``."""
+    return (
+        select(
+            BudgetLineItem.agreement_id.label("agreement_id"),
+            func.sum(func.coalesce(BudgetLineItem.amount, 0) + func.coalesce(BudgetLineItem.fees, 0)).label("total"),
+        )
+        .where(BudgetLineItem.agreement_id.in_(select(agreement_ids.c.id)))
+        .where(BudgetLineItem.status == BudgetLineItemStatus.OBLIGATED)
+        .where(BudgetLineItem.fiscal_year == fiscal_year)
+        .group_by(BudgetLineItem.agreement_id)
+        .subquery()
+    )
+
+
+def _build_sorted_agreement_ids_query(
+    agreement_classes: list[Type[Agreement]],
+    agreement_ids,
+    sort_condition: Optional[AgreementSortCondition],
+    sort_descending: bool,
+    fiscal_years=None,
+) -> Select:
+    """
+    Select the filtered agreement ids ordered the same way ``_sort_agreements`` orders loaded agreements.
+
+    Ties (and unsorted lists) fall back to the in-memory order: agreement type in the order of
+    ``agreement_classes``, then id. Text keys use the "C" collation so they order by code point,
+    as Python string comparison does.
+    """
+    query = select(Agreement.id).where(Agreement.id.in_(select(agreement_ids.c.id)))
+
+    match sort_condition:
+        case AgreementSortCondition.AGREEMENT:
+            sort_key = func.lower(Agreement.name).collate("C")
+        case AgreementSortCondition.PROJECT:
+            query = query.outerjoin(Project, Project.id == Agreement.project_id)
+            sort_key = func.coalesce(Project.title, "TBD").collate("C")
+        case AgreementSortCondition.TYPE:
+            sort_key = case(*[(Agreement.agreement_type == t, str(t)) for t in AgreementType], else_="").collate("C")
+        case AgreementSortCondition.AGREEMENT_TOTAL:
+            agreement_totals = _agreement_total_subquery(agreement_ids)
+            query = query.outerjoin(agreement_totals, agreement_totals.c.agreement_id == Agreement.id)
+            sort_key = func.coalesce(agreement_totals.c.total, 0)
+        case AgreementSortCondition.NEXT_BUDGET_LINE:
+            next_bli = _next_budget_line_subquery(agreement_ids)
+            query = query.outerjoin(next_bli, next_bli.c.agreement_id == Agreement.id)
+            sort_key = func.coalesce(next_bli.c.total, 0)
+        case AgreementSortCondition.NEXT_OBLIGATE_BY:
+            next_bli = _next_budget_line_subquery(agreement_ids)
+            query = query.outerjoin(next_bli, next_bli.c.agreement_id == Agreement.id)
+            sort_key = func.coalesce(next_bli.c.date_needed, func.current_date())
+        case AgreementSortCondition.START:
+            sc_dates = _services_component_dates_subquery(agreement_ids)
+            query = query.outerjoin(sc_dates, sc_dates.c.agreement_id == Agreement.id)
+            sort_key = func.coalesce(sc_dates.c.start_date, date.max)
+        case AgreementSortCondition.END:
+            sc_dates = _services_component_dates_subquery(agreement_ids)
+            query = query.outerjoin(sc_dates, sc_dates.c.agreement_id == Agreement.id)
+            sort_key = func.coalesce(sc_dates.c.end_date, date.max)
+        case AgreementSortCondition.FY_OBLIGATED:
+            fy_obligated = _fy_obligated_subquery(agreement_ids, resolve_fiscal_year(fiscal_years))
+            query = query.outerjoin(fy_obligated, fy_obligated.c.agreement_id == Agreement.id)
+            sort_key = func.coalesce(fy_obligated.c.total, 0)
+        case _:
+            sort_key = None
+
+    type_order = case(
+        *[
+            (Agreement.agreement_type == agreement_cls.__mapper__.polymorphic_identity, position)
+            for position, agreement_cls in enumerate(agreement_classes)
+        ],
+        else_=len(agreement_classes),
+    )
+
+    if sort_key is not None:
+        query = query.order_by(sort_key.desc() if sort_descending else sort_key.asc())
+
+    return query.order_by(type_order, Agreement.id)
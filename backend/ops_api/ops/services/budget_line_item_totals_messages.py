@@ -0,0 +1,15 @@
+from loguru import logger
+from sqlalchemy.orm import Session
+
+from models import OpsEvent, budget_line_item_totals_trigger_func
+
+
+def budget_line_item_totals_trigger(
+    event: OpsEvent,
+    session: Session,
+):
+    try:
+        # The subscriber does not commit; the outer transaction will handle the commit
+        budget_line_item_totals_trigger_func(event, session)
+    except Exception as e:
+        logger.error(f"Error in budget_line_item_totals_trigger: {e}")
@@ -7,7 +7,7 @@ from typing import Any, Optional, Tuple
 from flask import current_app
 from flask_jwt_extended import current_user, get_current_user
 from loguru import logger
-from sqlalchemy import Select, String, case, cast, func, select
+from sqlalchemy import Integer, Select, String, case, cast, func, or_, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import joinedload, selectinload
 
@@ -22,6 +22,7 @@ from models import (
     BudgetLineItemChangeRequest,
     BudgetLineItemStatus,
     BudgetLineSortCondition,
+    CANFundingDetails,
     ChangeRequestStatus,
     ChangeRequestType,
     GrantNumber,
@@ -35,6 +36,7 @@ from ops_api.ops.schemas.budget_line_items import (
     BudgetLineItemListFilterOptionResponseSchema,
 )
 from ops_api.ops.services.change_requests import ChangeRequestService
+from ops_api.ops.services.editability import EditabilityService
 from ops_api.ops.services.ops_service import (
     AuthorizationError,
     ResourceNotFoundError,
@@ -43,16 +45,14 @@ from ops_api.ops.services.ops_service import (
 from ops_api.ops.utils.agreements_helpers import (
     CLIN_NUMBER_AGREEMENT_UNIQUE_CONSTRAINT,
     associated_with_agreement,
-    check_user_association,
+    get_user_association_conditions,
     is_unique_violation,
 )
 from ops_api.ops.utils.api_helpers import validate_and_prepare_change_data
 from ops_api.ops.utils.budget_line_items_helpers import (
     bli_associated_with_agreement,
     compute_bli_editable,
-    compute_bli_is_deletable,
     create_budget_line_item_instance,
-    get_bli_locked_message,
     is_award_approval_requested,
     is_bli_editable,
     is_post_pre_award_locked,
@@ -219,14 +219,35 @@ class BudgetLineItemService:
     def get_list(self, data: dict | None) -> type[list[BudgetLineItem], dict | None]:
         """
         Get a list of Budget Line Items, optionally filtered.
+
+        Filtering, the fee-inclusive totals, the count and the paging are all done in SQL,
+        so only the budget line items on the requested page are loaded.
         """
         # Create filters object from request data
         filters = BudgetLineItemFilters.parse_filters(data or {})
 
-        # Start with explicit select_from and eager load all relationships needed for serialization
+        logger.debug("Beginning bli queries")
+        filtered_ids = self._build_filtered_ids_query(filters).cte("filtered_budget_line_item_ids")
+
+        # Compute fees/total once per filtered BLI. Selecting from budget_line_item alone keeps the
+        # correlated subqueries of the fees expression from being correlated to any joined tables.
+        priced = select(
+            BudgetLineItem.id.label("id"),
+            BudgetLineItem.amount.label("amount"),
+            BudgetLineItem.status.label("status"),
+            BudgetLineItem.is_obe.label("is_obe"),
+            BudgetLineItem.fees.label("fees"),
+            BudgetLineItem.total.label("total"),
+        ).where(BudgetLineItem.id.in_(select(filtered_ids.c.id)))
+        priced = self._apply_budget_total_range_filter(priced, filters).cte("priced_budget_line_items")
+
+        count = self.db_session.scalar(select(func.count()).select_from(priced))
+        totals = _get_totals_with_or_without_fees(self.db_session, priced, filters.include_fees)
+
+        # Eager load all relationships needed for serialization of the page
         query = (
             select(BudgetLineItem)
-            .select_from(BudgetLineItem)
+            .join(priced, priced.c.id == BudgetLineItem.id)
             .options(
                 # Eager load agreement and its nested relationships
                 selectinload(BudgetLineItem.agreement).options(
@@ -248,98 +269,72 @@ class BudgetLineItemService:
                 joinedload(BudgetLineItem.services_component),
             )
         )
-        agreement_already_joined = False
-
-        # Determine which joins are needed upfront
-        needs_agreement_join = bool(filters.agreement_types or filters.agreement_names)
 
-        # Apply sorting (which may add joins)
         if filters.sort_conditions:
-            query, agreement_already_joined = self.create_sort_query(
+            query, _ = self.create_sort_query(
                 query,
                 filters.sort_conditions[0],
                 filters.sort_descending[0] if filters.sort_descending else False,
+                priced=priced,
             )
         else:
             # The default behavior when no sort condition is specified is to sort by agreement name
             query = query.join(Agreement, Agreement.id == BudgetLineItem.agreement_id, isouter=True).order_by(
                 Agreement.name, BudgetLineItem.service_component_name_for_sort
             )
-            agreement_already_joined = True
-
-        # Add Agreement join if needed for filtering and not already joined
-        if needs_agreement_join and not agreement_already_joined:
-            query = query.join(Agreement, Agreement.id == BudgetLineItem.agreement_id, isouter=True)
-
-        # Now apply all filter conditions
-        query = self.filter_query(query, filters)
-
-        logger.debug("Beginning bli queries")
-        # it would be better to use count() here, but SQLAlchemy should cache this anyway and
-        # the where clauses are not forming correct SQL
-        all_results = self.db_session.scalars(query).all()
 
-        # Apply Python-level filters
-        results = self._apply_python_filters(all_results, filters)
+        # Break ties on id so that consecutive pages never overlap
+        query = query.order_by(BudgetLineItem.id)
 
-        # Calculate count and totals after all Python-level filters are applied
-        count = len(results)
-        totals = _get_totals_with_or_without_fees(results, filters.include_fees)
-
-        # slice the results if limit and offset are provided
+        # page the results if limit and offset are provided
         if filters.limit and filters.offset:
-            limit_value = int(filters.limit[0])
-            offset_value = int(filters.offset[0])
-            results = results[offset_value : offset_value + limit_value]
+            query = query.offset(int(filters.offset[0])).limit(int(filters.limit[0]))
+
+        results = self.db_session.scalars(query).all()
 
         logger.debug("BLI queries complete")
 
         return results, {"count": count, "totals": totals}
 
-    def _apply_python_filters(self, all_results, filters):
-        """Apply Python-level filters to budget line items."""
-        # Filter by user association if only_my is enabled
-        if filters.only_my and True in filters.only_my:
-            user = get_current_user()
-            results = [bli for bli in all_results if check_user_association(bli.agreement, user)]
-        else:
-            results = all_results
+    def _build_filtered_ids_query(self, filters: BudgetLineItemFilters) -> Select:
+        """Select the ids of all budget line items matching the filters (except the total range)."""
+        query = select(BudgetLineItem.id)
 
-        # Apply budget line total range filter
-        results = self._apply_budget_total_range_filter(results, filters)
+        if filters.agreement_types or filters.agreement_names:
+            query = query.join(Agreement, Agreement.id == BudgetLineItem.agreement_id, isouter=True)
 
-        # Apply CAN active period filter
-        results = self._apply_can_active_period_python_filter(results, filters)
+        query = self.filter_query(query, filters)
 
-        return results
+        # Filter by user association if only_my is enabled
+        if filters.only_my and True in filters.only_my:
+            conditions = get_user_association_conditions(get_current_user())
+            if conditions is not None:
+                associated_agreement_ids = select(Agreement.id).where(or_(*conditions)).correlate(None)
+                query = query.where(BudgetLineItem.agreement_id.in_(associated_agreement_ids))
 
-    def _apply_budget_total_range_filter(self, results, filters):
-        """Apply budget line total range filter in Python to avoid correlation issues."""
-        if not (filters.budget_line_total_min or filters.budget_line_total_max):
-            return results
+        return query
 
+    def _apply_budget_total_range_filter(self, query, filters):
+        """Apply budget line total range filter to a query selecting from budget_line_item alone."""
         min_total = filters.budget_line_total_min[0] if filters.budget_line_total_min else None
         max_total = filters.budget_line_total_max[0] if filters.budget_line_total_max else None
 
-        filtered_results = []
-        for bli in results:
-            budget_line_total = bli.total or 0
-            if min_total is not None and budget_line_total < min_total:
-                continue
-            if max_total is not None and budget_line_total > max_total:
-                continue
-            filtered_results.append(bli)
+        budget_line_total = func.coalesce(BudgetLineItem.total, 0)
+        if min_total is not None:
+            query = query.where(budget_line_total >= min_total)
+        if max_total is not None:
+            query = query.where(budget_line_total <= max_total)
 
-        return filtered_results
+        return query
 
-    def _apply_can_active_period_python_filter(self, results, filters):
-        """Apply CAN active period filter in Python to avoid correlation issues with joins."""
-        if not filters.can_active_periods:
-            return results
+    def _apply_can_active_period_filter(self, query, can_active_periods):
+        """Apply CAN active period filter (the active period is the 11th character of the fund code)."""
+        if not can_active_periods:
+            return query
 
         # Extract numeric periods from filter values like "1 Year"
         target_periods = set()
-        for period in filters.can_active_periods:
+        for period in can_active_periods:
             try:
                 if isinstance(period, str):
                     period_num = int(period.split()[0])
@@ -350,14 +345,16 @@ class BudgetLineItemService:
                 continue
 
         if not target_periods:
-            return results
-
-        filtered_results = []
-        for bli in results:
-            if bli.can and bli.can.active_period in target_periods:
-                filtered_results.append(bli)
-
-        return filtered_results
+            return query
+
+        can_ids = (
+            select(CAN.id)
+            .join(CANFundingDetails, CAN.funding_details_id == CANFundingDetails.id)
+            .where(func.length(CANFundingDetails.fund_code) == 14)
+            .where(func.substr(CANFundingDetails.fund_code, 11, 1).in_([str(p) for p in target_periods]))
+            .correlate(None)
+        )
+        return query.where(BudgetLineItem.can_id.in_(can_ids))
 
     def _obe_status_filter(self, query, status_list: list[str]):
         statuses = [status for status in status_list if status != "Overcome by Events"]
@@ -385,14 +382,14 @@ class BudgetLineItemService:
         """
         query = self._apply_fiscal_year_filter(query, filters.fiscal_years)
         query = self._apply_status_filters(query, filters.budget_line_statuses, filters.enable_obe)
-        query = self._apply_portfolio_filter(query, filters.portfolios, filters.sort_conditions)
+        query = self._apply_portfolio_filter(query, filters.portfolios)
         query = self._apply_can_filter(query, filters.can_ids)
         query = self._apply_agreement_filter(query, filters.agreement_ids)
         query = self._apply_status_filter(query, filters.statuses, filters.enable_obe)
         query = self._apply_agreement_type_filter(query, filters.agreement_types)
         query = self._apply_agreement_name_filter(query, filters.agreement_names)
-        # Note: budget_line_total_range and can_active_period filters are applied in Python
-        # after fetching results to avoid SQLAlchemy correlation issues
+        query = self._apply_can_active_period_filter(query, filters.can_active_periods)
+        # Note: the budget_line_total range filter is applied where fees/total are computed (see get_list)
         query = self._apply_obe_exclusion_filter(query, filters.enable_obe)
 
         return query
@@ -412,16 +409,11 @@ class BudgetLineItemService:
                 query = query.where(BudgetLineItem.status.in_(budget_line_statuses))
         return query
 
-    def _apply_portfolio_filter(self, query, portfolios, sort_conditions):
-        """Apply portfolio filter with sort condition consideration."""
+    def _apply_portfolio_filter(self, query, portfolios):
+        """Apply portfolio filter if provided."""
         if portfolios:
-            if sort_conditions and (
-                BudgetLineSortCondition.CAN_NUMBER in sort_conditions
-                or BudgetLineSortCondition.PORTFOLIO in sort_conditions
-            ):
-                query = query.where(CAN.portfolio_id.in_(portfolios))
-            else:
-                query = query.where(BudgetLineItem.portfolio_id.in_(portfolios))
+            portfolio_can_ids = select(CAN.id).where(CAN.portfolio_id.in_(portfolios)).correlate(None)
+            query = query.where(BudgetLineItem.can_id.in_(portfolio_can_ids))
         return query
 
     def _apply_can_filter(self, query, can_ids):
@@ -477,9 +469,17 @@ class BudgetLineItemService:
         query: Select[Tuple[BudgetLineItem]],
         sort_condition: BudgetLineSortCondition,
         sort_descending: bool,
+        priced=None,
     ):
-        """Create a sorted query. Returns tuple of (query, agreement_joined)."""
+        """
+        Create a sorted query. Returns tuple of (query, agreement_joined).
+
+        When ``priced`` (a selectable with precomputed ``fees``/``total`` columns joined to the
+        query) is given, the TOTAL and FEE sorts use it instead of re-evaluating the fee expression.
+        """
         agreement_joined = False
+        total = priced.c.total if priced is not None else BudgetLineItem.total
+        fees = priced.c.fees if priced is not None else BudgetLineItem.fees
         match sort_condition:
             case BudgetLineSortCondition.ID_NUMBER:
                 query = (
@@ -526,17 +526,9 @@ class BudgetLineItemService:
                     .order_by(Portfolio.abbreviation.desc() if sort_descending else Portfolio.abbreviation)
                 )
             case BudgetLineSortCondition.TOTAL:
-                query = (
-                    query.order_by(BudgetLineItem.total.desc())
-                    if sort_descending
-                    else query.order_by(BudgetLineItem.total)
-                )
+                query = query.order_by(total.desc()) if sort_descending else query.order_by(total)
             case BudgetLineSortCondition.FEE:
-                query = (
-                    query.order_by(BudgetLineItem.fees.desc())
-                    if sort_descending
-                    else query.order_by(BudgetLineItem.fees)
-                )
+                query = query.order_by(fees.desc()) if sort_descending else query.order_by(fees)
             case BudgetLineSortCondition.STATUS:
                 # Construct a specific order for budget line statuses in sort that is not alphabetical.
                 when_list = {
@@ -1114,67 +1106,82 @@ class BudgetLineItemService:
     def get_filter_options(self, data: dict | None) -> dict[str, Array]:
         """
         Get filter options for the Budget Line Item list.
+
+        Each option is a DISTINCT or GROUP BY query over the visible budget lines, so neither the memory used nor
+        the number of queries grows with the number of budget lines.
         """
         only_my = data.get("only_my", [])
         enable_obe = data.get("enable_obe", [])
 
-        query = (
-            select(BudgetLineItem)
-            .distinct()
-            .options(
-                selectinload(BudgetLineItem.agreement).selectinload(Agreement.team_members),
-                selectinload(BudgetLineItem.agreement)
-                .selectinload(Agreement.budget_line_items)
-                .selectinload(BudgetLineItem.can)
-                .selectinload(CAN.portfolio),
-                selectinload(BudgetLineItem.can).selectinload(CAN.portfolio),
-            )
-        )
-        logger.debug("Beginning bli queries")
-        all_results = self.db_session.scalars(query).all()
-
+        visible_ids = select(BudgetLineItem.id)
         if only_my and True in only_my:
             # filter out BLIs not associated with the current user
-            user = get_current_user()
-            results = [bli for bli in all_results if check_user_association(bli.agreement, user)]
-        else:
-            results = all_results
-
-        fiscal_years = {result.fiscal_year for result in results if result.fiscal_year}
-        budget_line_statuses = {result.status for result in results if result.status}
-        has_obe = any(result.is_obe for result in results)
-
-        portfolio_dict = {
-            result.can.portfolio.id: {
-                "id": result.can.portfolio.id,
-                "name": result.can.portfolio.name,
-            }
-            for result in results
-            if result.can and result.can.portfolio
-        }
+            conditions = get_user_association_conditions(get_current_user())
+            if conditions is not None:
+                associated_agreement_ids = select(Agreement.id).where(or_(*conditions)).correlate(None)
+                visible_ids = visible_ids.where(BudgetLineItem.agreement_id.in_(associated_agreement_ids))
+        is_visible = BudgetLineItem.id.in_(visible_ids.scalar_subquery())
+
+        logger.debug("Beginning bli filter option queries")
+
+        # Statuses, fiscal years, OBE and the total range in one query grouped by (status, fiscal year)
+        budget_line_total = func.coalesce(BudgetLineItem.amount, 0) + func.coalesce(BudgetLineItem.fees, 0)
+        status_rows = self.db_session.execute(
+            select(
+                BudgetLineItem.status,
+                BudgetLineItem.fiscal_year.label("fiscal_year"),
+                func.bool_or(BudgetLineItem.is_obe.is_(True)).label("has_obe"),
+                func.min(budget_line_total).label("min_total"),
+                func.max(budget_line_total).label("max_total"),
+            )
+            .where(is_visible)
+            .group_by(BudgetLineItem.status, BudgetLineItem.fiscal_year)
+        ).all()
 
-        portfolios = list(portfolio_dict.values())
+        fiscal_years = {row.fiscal_year for row in status_rows if row.fiscal_year}
+        budget_line_statuses = {row.status for row in status_rows if row.status}
+        has_obe = any(row.has_obe for row in status_rows)
+        group_mins = [row.min_total for row in status_rows if row.min_total is not None]
+        group_maxes = [row.max_total for row in status_rows if row.max_total is not None]
+
+        portfolio_rows = self.db_session.execute(
+            select(Portfolio.id, Portfolio.name)
+            .join(CAN, CAN.portfolio_id == Portfolio.id)
+            .join(BudgetLineItem, BudgetLineItem.can_id == CAN.id)
+            .where(is_visible)
+            .distinct()
+        ).all()
+        portfolios = [{"id": portfolio_id, "name": name} for portfolio_id, name in portfolio_rows]
 
-        # Collect agreement types
-        agreement_types = {
-            result.agreement.agreement_type
-            for result in results
-            if result.agreement and result.agreement.agreement_type
-        }
+        agreement_rows = self.db_session.execute(
+            select(Agreement.id, Agreement.name, Agreement.agreement_type)
+            .join(BudgetLineItem, BudgetLineItem.agreement_id == Agreement.id)
+            .where(is_visible)
+            .distinct()
+        ).all()
+        agreement_types = {agreement_type for _, _, agreement_type in agreement_rows if agreement_type}
+        agreement_names = [{"id": agreement_id, "name": name} for agreement_id, name, _ in agreement_rows if name]
 
-        # Collect agreement names (display_name)
-        agreement_name_dict = {
-            result.agreement.id: {
-                "id": result.agreement.id,
-                "name": result.agreement.display_name,
-            }
-            for result in results
-            if result.agreement and result.agreement.display_name
-        }
-        agreement_names = list(agreement_name_dict.values())
+        # SQL equivalent of CANFundingDetails.active_period
+        active_period = case(
+            (
+                func.length(CANFundingDetails.fund_code) == 14,
+                cast(func.substr(CANFundingDetails.fund_code, 11, 1), Integer),
+            ),
+            else_=None,
+        )
+        can_active_periods = set(
+            self.db_session.scalars(
+                select(active_period)
+                .select_from(BudgetLineItem)
+                .join(CAN, CAN.id == BudgetLineItem.can_id)
+                .join(CANFundingDetails, CANFundingDetails.id == CAN.funding_details_id)
+                .where(is_visible)
+                .distinct()
+            ).all()
+        ) - {None, 0}
 
-        # Collect CAN active periods
-        can_active_periods = {result.can.active_period for result in results if result.can and result.can.active_period}
+        logger.debug("BLI filter option queries complete")
 
         budget_line_statuses_list = [status.name for status in budget_line_statuses]
         if has_obe and (enable_obe and True in enable_obe):
@@ -1189,20 +1196,9 @@ class BudgetLineItemService:
             "Overcome by Events",
         ]
 
-        # Calculate budget line total range (amount + fees) in a single pass
-        budget_line_total_min = None
-        budget_line_total_max = None
-        for result in results:
-            total = result.total
-            if total is not None:
-                if budget_line_total_min is None or total < budget_line_total_min:
-                    budget_line_total_min = total
-                if budget_line_total_max is None or total > budget_line_total_max:
-                    budget_line_total_max = total
-
         # Default to 0 if no results with totals
-        budget_line_total_min = budget_line_total_min if budget_line_total_min is not None else 0
-        budget_line_total_max = budget_line_total_max if budget_line_total_max is not None else 0
+        budget_line_total_min = min(group_mins) if group_mins else 0
+        budget_line_total_max = max(group_maxes) if group_maxes else 0
 
         filters = {
             "fiscal_years": sorted(fiscal_years, reverse=True),
@@ -1219,76 +1215,42 @@ class BudgetLineItemService:
         return filter_options
 
 
-def _get_totals_with_or_without_fees(all_results, include_fees):
-    if include_fees and True in include_fees:
-        total_amount = sum([result.amount + result.fees for result in all_results if result.amount])
-        total_draft_amount = sum(
-            [
-                result.amount + result.fees
-                for result in all_results
-                if result.amount and result.status == BudgetLineItemStatus.DRAFT
-            ]
-        )
-        total_planned_amount = sum(
-            [
-                result.amount + result.fees
-                for result in all_results
-                if result.amount and result.status in (BudgetLineItemStatus.PLANNED, BudgetLineItemStatus.PLANNED_MOD)
-            ]
-        )
-        total_in_execution_amount = sum(
-            [
-                result.amount + result.fees
-                for result in all_results
-                if result.amount and result.status == BudgetLineItemStatus.IN_EXECUTION
-            ]
-        )
-        total_obligated_amount = sum(
-            [
-                result.amount + result.fees
-                for result in all_results
-                if result.amount and result.status == BudgetLineItemStatus.OBLIGATED
-            ]
-        )
-        total_overcome_by_events_amount = sum(
-            [result.amount + result.fees for result in all_results if result.amount and result.is_obe]
-        )
-    else:
-        total_amount = sum([result.amount for result in all_results if result.amount])
-        total_draft_amount = sum(
-            [result.amount for result in all_results if result.amount and result.status == BudgetLineItemStatus.DRAFT]
-        )
-        total_planned_amount = sum(
-            [
-                result.amount
-                for result in all_results
-                if result.amount and result.status in (BudgetLineItemStatus.PLANNED, BudgetLineItemStatus.PLANNED_MOD)
-            ]
-        )
-        total_in_execution_amount = sum(
-            [
-                result.amount
-                for result in all_results
-                if result.amount and result.status == BudgetLineItemStatus.IN_EXECUTION
-            ]
-        )
-        total_obligated_amount = sum(
-            [
-                result.amount
-                for result in all_results
-                if result.amount and result.status == BudgetLineItemStatus.OBLIGATED
-            ]
-        )
-        total_overcome_by_events_amount = sum(
-            [result.amount + result.fees for result in all_results if result.amount and result.is_obe]
-        )
+def _get_totals_with_or_without_fees(session, priced, include_fees):
+    """
+    Sum the filtered budget line items by status with a single aggregate query.
+
+    ``priced`` is a selectable with ``amount``, ``fees``, ``status`` and ``is_obe`` columns.
+    Overcome-by-events totals always include fees.
+    """
+    amount = func.coalesce(priced.c.amount, 0)
+    amount_with_fees = amount + func.coalesce(priced.c.fees, 0)
+    line_total = amount_with_fees if include_fees and True in include_fees else amount
+
+    def _sum(value, condition=None):
+        if condition is not None:
+            value = case((condition, value), else_=0)
+        return func.coalesce(func.sum(value), 0)
+
+    stmt = select(
+        _sum(line_total).label("total_amount"),
+        _sum(line_total, priced.c.status == BudgetLineItemStatus.DRAFT).label("total_draft_amount"),
+        _sum(
+            line_total,
+            priced.c.status.in_([BudgetLineItemStatus.PLANNED, BudgetLineItemStatus.PLANNED_MOD]),
+        ).label("total_planned_amount"),
+        _sum(line_total, priced.c.status == BudgetLineItemStatus.IN_EXECUTION).label("total_in_execution_amount"),
+        _sum(line_total, priced.c.status == BudgetLineItemStatus.OBLIGATED).label("total_obligated_amount"),
+        _sum(amount_with_fees, priced.c.is_obe.is_(True)).label("total_overcome_by_events_amount"),
+    )
+    totals = session.execute(stmt).one()
+
     return {
-        "total_amount": total_amount,
-        "total_draft_amount": total_draft_amount,
-        "total_in_execution_amount": total_in_execution_amount,
-        "total_obligated_amount": total_obligated_amount,
-        "total_planned_amount": total_planned_amount,
-        "total_overcome_by_events_amount": total_overcome_by_events_amount,
+        "total_amount": totals.total_amount,
+        "total_draft_amount": totals.total_draft_amount,
+        "total_in_execution_amount": totals.total_in_execution_amount,
+        "total_obligated_amount": totals.total_obligated_amount,
+        "total_planned_amount": totals.total_planned_amount,
+        "total_overcome_by_events_amount": totals.total_overcome_by_events_amount,
     }
 
 
@@ -1302,92 +1264,40 @@ def update_budget_line_item(data: dict[str, Any], id: int):
     return budget_line_item
 
 
-def get_is_editable_meta_data(serialized_bli):
-    # add Meta data to the response
-    meta_schema = MetaSchema()
-    data_for_meta = {
-        "isEditable": False,
-        "isDeletable": False,
-        "lockedMessage": None,
-    }
+def get_is_editable_meta_data(serialized_bli, editability: Optional[EditabilityService] = None):
+    """
+    Build the _meta of a serialized budget line for the current user.
 
-    is_budget_team = "BUDGET_TEAM" in (role.name for role in current_user.roles)
-    is_super = is_super_user(current_user, current_app)
-    # Eager-load the agreement's procurement trackers and their steps so the editability
-    # checks (is_pre_award_in_review and is_post_pre_award_locked walk tracker.steps) don't
-    # trigger per-attribute lazy-loads. Mirrors get_list and
-    # get_bli_is_editable_meta_data_for_agreements.
-    budget_line_item = current_app.db_session.get(
-        BudgetLineItem,
-        serialized_bli.get("id"),
-        options=[
-            selectinload(BudgetLineItem.agreement)
-            .selectinload(Agreement.procurement_trackers)
-            .selectinload(ProcurementTracker.steps)
-        ],
-    )
-    in_review = budget_line_item.in_review if budget_line_item else False
-
-    if is_budget_team:
-        # if the user has the BUDGET_TEAM role, they can edit all budget line items
-        is_associated = True
-    elif serialized_bli.get("agreement_id"):
-        is_associated = bli_associated_with_agreement(serialized_bli.get("id"))
-    else:
-        is_associated = False
-
-    if is_associated:
-        data_for_meta["isEditable"] = compute_bli_editable(budget_line_item, in_review, is_super)
-        data_for_meta["isDeletable"] = compute_bli_is_deletable(budget_line_item, in_review, is_super)
-        data_for_meta["lockedMessage"] = get_bli_locked_message(budget_line_item, in_review, is_super)
-
-    meta = meta_schema.dump(data_for_meta)
-
-    return meta
-
-
-def get_bli_is_editable_meta_data_for_agreements(serialized_agreement):
-    bli_ids = [bli["id"] for bli in serialized_agreement["budget_line_items"] if bli.get("id")]
-
-    # Eager-load the agreement's procurement_trackers (and their steps) so the editability
-    # checks (is_pre_award_in_review and is_post_pre_award_locked walk tracker.steps) do not
-    # lazy-load per BLI (consistent with get_list).
-    budget_line_items = (
-        current_app.db_session.query(BudgetLineItem)
-        .filter(BudgetLineItem.id.in_(bli_ids))
-        .options(
-            selectinload(BudgetLineItem.agreement)
-            .selectinload(Agreement.procurement_trackers)
-            .selectinload(ProcurementTracker.steps)
-        )
-        .all()
-    )
-    bli_dict = {bli.id: bli for bli in budget_line_items}
+    ``editability`` may be an EditabilityService already loaded for the budget line (e.g. for a whole page);
+    otherwise one is loaded for this budget line alone.
+    """
+    bli_id = serialized_bli.get("id")
+    agreement_id = serialized_bli.get("agreement_id")
+    if editability is None:
+        editability = EditabilityService(current_app.db_session, current_user).load([bli_id], [agreement_id])
 
-    is_budget_team = "BUDGET_TEAM" in (role.name for role in current_user.roles)
-    is_super = is_super_user(current_user, current_app)
+    meta_schema = MetaSchema()
+    return meta_schema.dump(editability.budget_line_item_meta(bli_id, agreement_id))
 
-    for bli in serialized_agreement["budget_line_items"]:
-        bli_id = bli.get("id")
 
-        budget_line_item = bli_dict.get(bli_id)
-        in_review = budget_line_item.in_review if budget_line_item else False
+def get_bli_is_editable_meta_data_for_agreements(
+    serialized_agreement, editability: Optional[EditabilityService] = None
+):
+    """
+    Add the _meta of each budget line of a serialized agreement for the current user.
 
-        if is_budget_team:
-            is_associated = True
-        elif bli.get("agreement_id"):
-            is_associated = bli_associated_with_agreement(bli_id)
-        else:
-            is_associated = False
+    ``editability`` may be an EditabilityService already loaded for the agreement's budget lines (e.g. for a page
+    of agreements); otherwise one is loaded for this agreement alone.
+    """
+    serialized_blis = serialized_agreement["budget_line_items"]
+    if editability is None:
+        editability = EditabilityService(current_app.db_session, current_user).load(
+            [bli.get("id") for bli in serialized_blis],
+            [bli.get("agreement_id") for bli in serialized_blis],
+        )
 
-        if is_associated:
-            bli["_meta"] = {
-                "isEditable": compute_bli_editable(budget_line_item, in_review, is_super),
-                "isDeletable": compute_bli_is_deletable(budget_line_item, in_review, is_super),
-                "lockedMessage": get_bli_locked_message(budget_line_item, in_review, is_super),
-            }
-        else:
-            bli["_meta"] = {"isEditable": False, "isDeletable": False, "lockedMessage": None}
+    for bli in serialized_blis:
+        bli["_meta"] = editability.budget_line_item_meta(bli.get("id"), bli.get("agreement_id"))
 
 
 def batch_load_change_requests_in_review(db_session, bli_ids: list[int], agreement_ids: list[int]) -> dict:
@@ -0,0 +1,50 @@
+from flask import current_app
+from loguru import logger
+from sqlalchemy.orm import Session
+
+from models import (
+    OpsEvent,
+    budget_line_item_totals_trigger_func,
+    can_funding_rollup_trigger_func,
+    get_agreement_can_ids,
+)
+from ops_api.ops.utils.events import OpsEventHandler
+
+
+def can_funding_rollup_trigger(
+    event: OpsEvent,
+    session: Session,
+):
+    try:
+        # The subscriber does not commit; the outer transaction will handle the commit
+        can_funding_rollup_trigger_func(event, session)
+    except Exception as e:
+        logger.error(f"Error in can_funding_rollup_trigger: {e}")
+
+
+def stored_totals_and_can_funding_rollup_trigger(
+    event: OpsEvent,
+    session: Session,
+):
+    """
+    Refresh the stored fees and totals of the budget lines and then the CAN funding rollup, which reads them.
+
+    Blinker does not call the receivers of a signal in a set order, so the two refreshes are one subscriber
+    when both USE_STORED_BLI_TOTALS and USE_CAN_FUNDING_ROLLUP are enabled.
+    """
+    try:
+        # The subscriber does not commit; the outer transaction will handle the commit
+        budget_line_item_totals_trigger_func(event, session)
+        can_funding_rollup_trigger_func(event, session)
+    except Exception as e:
+        logger.error(f"Error in stored_totals_and_can_funding_rollup_trigger: {e}")
+
+
+def record_original_can_ids(meta: OpsEventHandler, agreement_id: int) -> None:
+    """
+    Record the CANs of the agreement's budget lines in the event before the agreement is updated or deleted,
+    so can_funding_rollup_trigger also refreshes the CANs that budget lines are moved off or deleted from.
+    """
+    if current_app.config.get("USE_CAN_FUNDING_ROLLUP", False):
+        can_ids = get_agreement_can_ids(current_app.db_session, agreement_id)
+        meta.metadata.update({"original_can_ids": sorted(can_ids)})
@@ -13,7 +13,7 @@ from models.portfolios import Portfolio
 from ops_api.ops.schemas.cans import CANListFilterOptionResponseSchema
 from ops_api.ops.services.ops_service import ResourceNotFoundError
 from ops_api.ops.utils.cans import (
-    calculate_can_funding,
+    calculate_cans_funding,
     filter_active_cans,
     get_carry_forward_label,
     get_expiration_date,
@@ -29,6 +29,14 @@ CAN_EAGER_LOAD_OPTIONS = (
     selectinload(CAN.portfolio),
 )
 
+# Eager-loading options for funding endpoints, whose amounts come from calculate_cans_funding and
+# therefore only need the relationships used to describe each CAN.
+CAN_FUNDING_DETAIL_LOAD_OPTIONS = (
+    selectinload(CAN.funding_budgets),
+    selectinload(CAN.funding_details),
+    selectinload(CAN.portfolio),
+)
+
 
 class CANService:
     def __init__(self, db_session=None):
@@ -351,8 +359,7 @@ class CANService:
         filter_response_schema = CANListFilterOptionResponseSchema()
         return filter_response_schema.dump(filters)
 
-    @staticmethod
-    def _sort_results(results, fiscal_year, sort_condition, sort_descending):
+    def _sort_results(self, results, fiscal_year, sort_condition, sort_descending):
         match sort_condition:
             case CANSortCondition.CAN_NAME:
                 return sorted(results, key=lambda can: can.number, reverse=sort_descending)
@@ -367,9 +374,10 @@ class CANService:
             case CANSortCondition.OBLIGATE_BY:
                 return sorted(results, key=lambda can: can.obligate_by, reverse=sort_descending)
             case CANSortCondition.FY_BUDGET:
+                funding = calculate_cans_funding(self.db_session, [can.id for can in results], fiscal_year)
                 decorated_results = [
                     (
-                        calculate_can_funding(can, fiscal_year).get("total_funding"),
+                        funding[can.id]["total_funding"],
                         i,
                         can,
                     )
@@ -391,9 +399,10 @@ class CANService:
                 decorated_results.sort(reverse=sort_descending)
                 return [can for _, _, can in decorated_results]
             case CANSortCondition.AVAILABLE_BUDGET:
+                funding = calculate_cans_funding(self.db_session, [can.id for can in results], fiscal_year)
                 decorated_results = [
                     (
-                        calculate_can_funding(can, fiscal_year).get("available_funding"),
+                        funding[can.id]["available_funding"],
                         i,
                         can,
                     )
@@ -413,10 +422,6 @@ class CANService:
         else:
             return sum([c.funding for c in can.funding_received]) or 0
 
-    @staticmethod
-    def get_can_available_budget(can: CAN, fiscal_year: Optional[int] = None):
-        return calculate_can_funding(can, fiscal_year).get("available_funding")
-
     @staticmethod
     def _get_query(search=None):
         """
@@ -543,12 +548,12 @@ class CANService:
 
     def get_can_funding(self, id: int, fiscal_year: Optional[int] = None) -> dict:
         """Get funding summary for a single CAN."""
-        stmt = select(CAN).where(CAN.id == id).options(*CAN_EAGER_LOAD_OPTIONS)
+        stmt = select(CAN).where(CAN.id == id).options(*CAN_FUNDING_DETAIL_LOAD_OPTIONS)
         can = self.db_session.scalar(stmt)
         if not can:
             raise ResourceNotFoundError("CAN", id)
 
-        funding = calculate_can_funding(can, fiscal_year)
+        funding = calculate_cans_funding(self.db_session, [can.id], fiscal_year)[can.id]
 
         # Build funding_by_fiscal_year from funding_budgets
         fy_map: dict[int, float] = {}
@@ -658,13 +663,14 @@ class CANService:
         """
         transfer, fy_budget = self._validate_aggregate_params(transfer, fy_budget)
 
-        stmt = select(CAN).options(*CAN_EAGER_LOAD_OPTIONS)
+        stmt = select(CAN).options(*CAN_FUNDING_DETAIL_LOAD_OPTIONS)
         stmt = self._apply_aggregate_filters(stmt, fiscal_year, active_period, transfer, portfolio, fy_budget)
         filtered_cans = self.db_session.execute(stmt).scalars().unique().all()
 
-        # Aggregate funding and build per-CAN detail in a single pass, using
-        # calculate_can_funding directly to avoid the overhead of can.to_dict()
-        # (which serializes every relationship and triggers N+1 on CAN.projects).
+        # Funding amounts for every CAN come from one aggregate query; the per-CAN detail
+        # is built without can.to_dict() (which serializes every relationship and
+        # triggers N+1 on CAN.projects).
+        funding_by_can = calculate_cans_funding(self.db_session, [can.id for can in filtered_cans], fiscal_year)
         totals = {
             "total_funding": 0.0,
             "available_funding": 0.0,
@@ -679,7 +685,7 @@ class CANService:
         }
         cans_detail = []
         for can in filtered_cans:
-            amounts = calculate_can_funding(can, fiscal_year)
+            amounts = funding_by_can[can.id]
             for key in totals:
                 totals[key] += float(amounts.get(key, 0))
             cans_detail.append(
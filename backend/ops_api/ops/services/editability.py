@@ -0,0 +1,123 @@
+"""Batched ``_meta`` editability of agreements and budget line items for the current user.
+
+The list endpoints serialize a whole page of agreements or budget lines; computing the editability of each one
+separately re-queried the budget line with its procurement trackers, its change requests in review and the
+user's association with its agreement. ``EditabilityService.load`` reads all of that for the page in a fixed
+number of queries, after which the ``*_meta`` methods do no database work.
+"""
+
+from typing import Iterable, Optional
+
+from flask import current_app
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session, selectinload
+
+from models import Agreement, BudgetLineItem, ProcurementTracker, User
+from ops_api.ops.utils.agreements_helpers import get_user_association_conditions
+from ops_api.ops.utils.budget_line_items_helpers import (
+    compute_bli_editable,
+    compute_bli_is_deletable,
+    get_bli_locked_message,
+)
+from ops_api.ops.utils.users import is_super_user
+
+
+class EditabilityService:
+    """Computes ``_meta.isEditable`` (and related flags) of agreements and budget lines for one user."""
+
+    def __init__(self, db_session: Session, user: User):
+        self.db_session = db_session
+        self.user = user
+        self.is_budget_team = "BUDGET_TEAM" in (role.name for role in user.roles)
+        self.is_super = is_super_user(user, current_app)
+        self._budget_line_items: dict[int, BudgetLineItem] = {}
+        self._associated_agreement_ids: set[int] = set()
+        self._change_requests: dict = {"bli_change_requests": {}, "agreement_change_requests": {}}
+
+    def load(
+        self,
+        budget_line_item_ids: Iterable[int],
+        agreement_ids: Iterable[Optional[int]],
+        budget_line_items: Optional[Iterable[BudgetLineItem]] = None,
+    ) -> "EditabilityService":
+        """
+        Read what the editability of the budget lines and agreements depends on.
+
+        ``budget_line_items`` may be passed when the caller has already loaded them with their agreement's
+        procurement trackers and steps; otherwise they are loaded here.
+        """
+        # imported here because services/budget_line_items.py imports this module
+        from ops_api.ops.services.budget_line_items import batch_load_change_requests_in_review
+
+        budget_line_item_ids = sorted({bli_id for bli_id in budget_line_item_ids if bli_id is not None})
+        agreement_ids = sorted({agreement_id for agreement_id in agreement_ids if agreement_id is not None})
+
+        if budget_line_items is None:
+            # Eager-load the agreement's procurement trackers and their steps, which the locks walk
+            budget_line_items = (
+                self.db_session.scalars(
+                    select(BudgetLineItem)
+                    .where(BudgetLineItem.id.in_(budget_line_item_ids))
+                    .options(
+                        selectinload(BudgetLineItem.agreement)
+                        .selectinload(Agreement.procurement_trackers)
+                        .selectinload(ProcurementTracker.steps)
+                    )
+                ).all()
+                if budget_line_item_ids
+                else []
+            )
+        self._budget_line_items.update({bli.id: bli for bli in budget_line_items})
+
+        self._change_requests = batch_load_change_requests_in_review(
+            self.db_session, budget_line_item_ids, agreement_ids
+        )
+        self._associated_agreement_ids |= self._load_associated_agreement_ids(agreement_ids)
+        return self
+
+    def _load_associated_agreement_ids(self, agreement_ids: list[int]) -> set[int]:
+        """The agreements the user is associated with (see check_user_association)."""
+        if not agreement_ids:
+            return set()
+        stmt = select(Agreement.id).where(Agreement.id.in_(agreement_ids))
+        conditions = get_user_association_conditions(self.user)
+        if conditions is not None:
+            stmt = stmt.where(or_(*conditions))
+        return set(self.db_session.scalars(stmt).all())
+
+    def is_associated_with_agreement(self, agreement_id: Optional[int]) -> bool:
+        return agreement_id in self._associated_agreement_ids
+
+    def change_requests_in_review(self, budget_line_item_id: int, agreement_id: Optional[int]) -> Optional[list]:
+        """The budget line's and its agreement's change requests in review, or None when there are none."""
+        from ops_api.ops.services.budget_line_items import get_change_requests_for_bli
+
+        return get_change_requests_for_bli(budget_line_item_id, agreement_id, self._change_requests)
+
+    def is_in_review(self, budget_line_item_id: int, agreement_id: Optional[int]) -> bool:
+        return self.change_requests_in_review(budget_line_item_id, agreement_id) is not None
+
+    def budget_line_item_meta(self, budget_line_item_id: int, agreement_id: Optional[int]) -> dict:
+        """isEditable, isDeletable and lockedMessage of a budget line."""
+        if self.is_budget_team:
+            # if the user has the BUDGET_TEAM role, they can edit all budget line items
+            is_associated = True
+        elif agreement_id:
+            is_associated = self.is_associated_with_agreement(agreement_id)
+        else:
+            is_associated = False
+
+        if not is_associated:
+            return {"isEditable": False, "isDeletable": False, "lockedMessage": None}
+
+        budget_line_item = self._budget_line_items.get(budget_line_item_id)
+        in_review = self.is_in_review(budget_line_item_id, agreement_id)
+        return {
+            "isEditable": compute_bli_editable(budget_line_item, in_review, self.is_super),
+            "isDeletable": compute_bli_is_deletable(budget_line_item, in_review, self.is_super),
+            "lockedMessage": get_bli_locked_message(budget_line_item, in_review, self.is_super),
+        }
+
+    def is_agreement_editable(self, agreement_id: int) -> bool:
+        """Whether the user can edit the agreement (see AgreementsService._is_editable)."""
+        return bool(self.user.is_superuser) or self.is_associated_with_agreement(agreement_id)
@@ -67,6 +67,15 @@ class MessageBus:
         ops_signal = signal(event_type.name)
         ops_signal.connect(callback)
 
+    @classmethod
+    def has_subscribers(cls, event_type: OpsEventType) -> bool:
+        """
+        Return True if any callback is subscribed to the event type.
+
+        :param event_type: The event type to check.
+        """
+        return bool(signal(event_type.name).receivers)
+
     def subscribe(self, event_type: OpsEventType, callback: MessageBusSubscriber):
         """
         Subscribe to an event type with a callback function.
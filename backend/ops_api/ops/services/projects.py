@@ -4,8 +4,8 @@ from typing import Any, Optional, Sequence
 
 from flask_jwt_extended import get_current_user
 from loguru import logger
-from sqlalchemy import distinct, or_, select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import and_, case, distinct, func, literal, or_, select
+from sqlalchemy.orm import selectinload, with_polymorphic
 
 from models import (
     CAN,
@@ -18,6 +18,7 @@ from models import (
     ProjectSortCondition,
     ProjectType,
     ResearchProject,
+    ServicesComponent,
     User,
 )
 from ops_api.ops.services.ops_service import AuthorizationError, OpsService, ResourceNotFoundError, ValidationError
@@ -50,6 +51,18 @@ class ProjectFilters:
         )
 
 
+def _counted_in_project_totals():
+    """Budget lines counted in project totals: OBE budget lines and budget lines that are not DRAFT."""
+    return or_(
+        BudgetLineItem.is_obe.is_(True),
+        BudgetLineItem.status.is_distinct_from(BudgetLineItemStatus.DRAFT),
+    )
+
+
+def _bli_total():
+    return func.coalesce(BudgetLineItem.amount, 0) + func.coalesce(BudgetLineItem.fees, 0)
+
+
 class ProjectsService(OpsService[Project]):
     def __init__(self, db_session):
         self.db_session = db_session
@@ -243,8 +256,8 @@ class ProjectsService(OpsService[Project]):
         self.db_session.commit()
 
     @staticmethod
-    def _get_research_projects_query(filters: ProjectFilters):
-        """Build query for research projects with filtering.
+    def _get_filtered_projects_query(filters: ProjectFilters):
+        """Build a query of the ids and types of the projects matching the filters.
 
         Args:
             filters: ProjectFilters object containing filter parameters
@@ -252,20 +265,11 @@ class ProjectsService(OpsService[Project]):
         Returns:
             SQLAlchemy select statement
         """
-        # Base query with all necessary eager loading
-        stmt = (
-            select(ResearchProject)
-            .distinct(ResearchProject.id)
-            .options(
-                selectinload(ResearchProject.agreements).selectinload(Agreement.services_components),
-                selectinload(ResearchProject.agreements)
-                .selectinload(Agreement.budget_line_items)
-                .selectinload(BudgetLineItem.can),
-                selectinload(ResearchProject.agreements).selectinload(Agreement.special_topics),
-                selectinload(ResearchProject.agreements).selectinload(Agreement.research_methodologies),
-                selectinload(ResearchProject.agreements).selectinload(Agreement.team_members),
-            )
-        )
+        stmt = select(Project.id, Project.project_type)
+
+        # If project types are specified, only include the specified types
+        if filters.project_type:
+            stmt = stmt.where(Project.project_type.in_(filters.project_type))
 
         # For filtering, we use EXISTS subqueries to ensure each filter can match different
         # related records. This prevents the issue where a single joined row must satisfy
@@ -280,7 +284,7 @@ class ProjectsService(OpsService[Project]):
                 .select_from(Agreement)
                 .join(BudgetLineItem)
                 .join(CAN)
-                .where(Agreement.project_id == ResearchProject.id)
+                .where(Agreement.project_id == Project.id)
                 .where(CAN.portfolio_id.in_(filters.portfolio_id))
                 .exists()
             )
@@ -292,7 +296,7 @@ class ProjectsService(OpsService[Project]):
                 select(1)
                 .select_from(Agreement)
                 .join(BudgetLineItem)
-                .where(Agreement.project_id == ResearchProject.id)
+                .where(Agreement.project_id == Project.id)
                 .where(BudgetLineItem.fiscal_year.in_(filters.fiscal_year))
                 .exists()
             )
@@ -302,8 +306,8 @@ class ProjectsService(OpsService[Project]):
         if filters.project_search:
             where_clauses.append(
                 or_(
-                    ResearchProject.title.in_(filters.project_search),
-                    ResearchProject.short_title.in_(filters.project_search),
+                    Project.title.in_(filters.project_search),
+                    Project.short_title.in_(filters.project_search),
                 )
             )
 
@@ -312,7 +316,7 @@ class ProjectsService(OpsService[Project]):
             agreement_subquery = (
                 select(1)
                 .select_from(Agreement)
-                .where(Agreement.project_id == ResearchProject.id)
+                .where(Agreement.project_id == Project.id)
                 .where(
                     or_(Agreement.name.in_(filters.agreement_search), Agreement.nick_name.in_(filters.agreement_search))
                 )
@@ -324,95 +328,151 @@ class ProjectsService(OpsService[Project]):
         if where_clauses:
             stmt = stmt.where(*where_clauses)
 
-        logger.debug(f"SQL: {stmt}")
-
         return stmt
 
     @staticmethod
-    def _get_administrative_and_support_projects_query(filters: ProjectFilters):
-        """Build query for administrative and support projects with filtering.
-
-        Args:
-            filters: ProjectFilters object containing filter parameters
-
-        Returns:
-            SQLAlchemy select statement
+    def _get_project_totals_query(filters: ProjectFilters, sort_fiscal_year: int | None):
+        """Build a query aggregating the budget lines of each project.
+
+        Only budget lines counted in project totals (OBE or non-DRAFT) are aggregated. Returns one row per
+        project with:
+        - total: amount + fees of the budget lines (the sum of the agreement totals)
+        - sort_fy_total: amount + fees of the budget lines in sort_fiscal_year
+        - scoped_amount: the amount counted in the summary; when filtering by fiscal year or portfolio, only the
+          budget lines with a fiscal year that match those filters are counted
         """
-        # Base query with all necessary eager loading
+        bli_total = _bli_total()
+
+        sort_fy_amount = literal(0)
+        if sort_fiscal_year:
+            sort_fy_amount = case((BudgetLineItem.fiscal_year == sort_fiscal_year, bli_total), else_=0)
+
+        scoped_amount = bli_total
+        if filters.fiscal_year or filters.portfolio_id:
+            scoped = [BudgetLineItem.fiscal_year.isnot(None)]
+            if filters.fiscal_year:
+                scoped.append(BudgetLineItem.fiscal_year.in_(filters.fiscal_year))
+            if filters.portfolio_id:
+                # Scope amounts to only BLIs whose CAN belongs to the filtered portfolio(s)
+                scoped.append(CAN.portfolio_id.in_(filters.portfolio_id))
+            scoped_amount = case((and_(*scoped), bli_total), else_=0)
+
         stmt = (
-            select(AdministrativeAndSupportProject)
-            .distinct(AdministrativeAndSupportProject.id)
-            .options(
-                selectinload(AdministrativeAndSupportProject.agreements).selectinload(Agreement.services_components),
-                selectinload(AdministrativeAndSupportProject.agreements)
-                .selectinload(Agreement.budget_line_items)
-                .selectinload(BudgetLineItem.can),
-                selectinload(AdministrativeAndSupportProject.agreements).selectinload(Agreement.special_topics),
-                selectinload(AdministrativeAndSupportProject.agreements).selectinload(Agreement.research_methodologies),
-                selectinload(AdministrativeAndSupportProject.agreements).selectinload(Agreement.team_members),
+            select(
+                Agreement.project_id.label("project_id"),
+                func.sum(bli_total).label("total"),
+                func.sum(sort_fy_amount).label("sort_fy_total"),
+                func.sum(scoped_amount).label("scoped_amount"),
             )
+            .select_from(BudgetLineItem)
+            .join(Agreement, BudgetLineItem.agreement_id == Agreement.id)
+            .where(Agreement.project_id.isnot(None))
+            .where(_counted_in_project_totals())
+            .group_by(Agreement.project_id)
         )
-
-        # For filtering, we use EXISTS subqueries to ensure each filter can match different
-        # related records. This prevents the issue where a single joined row must satisfy
-        # multiple conditions across different tables (e.g., one agreement for fiscal year
-        # and a different agreement for agreement name).
-        where_clauses = []
-
-        # Apply portfolio filter using EXISTS subquery
         if filters.portfolio_id:
-            portfolio_subquery = (
-                select(1)
-                .select_from(Agreement)
-                .join(BudgetLineItem)
-                .join(CAN)
-                .where(Agreement.project_id == AdministrativeAndSupportProject.id)
-                .where(CAN.portfolio_id.in_(filters.portfolio_id))
-                .exists()
-            )
-            where_clauses.append(portfolio_subquery)
+            stmt = stmt.outerjoin(CAN, BudgetLineItem.can_id == CAN.id)
+        return stmt
 
-        # Apply fiscal year filter using EXISTS subquery
-        if filters.fiscal_year:
-            fy_subquery = (
-                select(1)
-                .select_from(Agreement)
-                .join(BudgetLineItem)
-                .where(Agreement.project_id == AdministrativeAndSupportProject.id)
-                .where(BudgetLineItem.fiscal_year.in_(filters.fiscal_year))
-                .exists()
+    @staticmethod
+    def _get_project_dates_query():
+        """Build a query of the earliest period_start and latest period_end of the services components of each
+        project."""
+        return (
+            select(
+                Agreement.project_id.label("project_id"),
+                func.min(ServicesComponent.period_start).label("project_start"),
+                func.max(ServicesComponent.period_end).label("project_end"),
             )
-            where_clauses.append(fy_subquery)
+            .select_from(ServicesComponent)
+            .join(Agreement, ServicesComponent.agreement_id == Agreement.id)
+            .where(Agreement.project_id.isnot(None))
+            .group_by(Agreement.project_id)
+        )
 
-        # Apply project search filter on project title (OR logic, exact match on title/short title)
-        if filters.project_search:
-            where_clauses.append(
-                or_(
-                    AdministrativeAndSupportProject.title.in_(filters.project_search),
-                    AdministrativeAndSupportProject.short_title.in_(filters.project_search),
-                )
-            )
+    @staticmethod
+    def _get_sort_order(sort_field, sort_descending: bool, projects, totals, dates) -> list:
+        """
+        Build the ORDER BY of the project list.
 
-        # Apply agreement search filter using EXISTS subquery
-        if filters.agreement_search:
-            agreement_subquery = (
-                select(1)
-                .select_from(Agreement)
-                .where(Agreement.project_id == AdministrativeAndSupportProject.id)
-                .where(
-                    or_(Agreement.name.in_(filters.agreement_search), Agreement.nick_name.in_(filters.agreement_search))
-                )
-                .exists()
+        Projects without a start or end date sort last in both directions. Ties are broken the way the list was
+        ordered before sorting: research projects first, then by id.
+        """
+        try:
+            sort_condition = ProjectSortCondition(sort_field) if sort_field else None
+        except ValueError:
+            # Invalid sort_field, default to id
+            sort_condition = None
+
+        match sort_condition:
+            case ProjectSortCondition.TITLE:
+                sort_column = func.lower(func.coalesce(Project.title, ""))
+            case ProjectSortCondition.PROJECT_TYPE:
+                # the enum sorts in declaration order, the same as the ProjectType values
+                sort_column = Project.project_type
+            case ProjectSortCondition.PROJECT_START:
+                sort_column = dates.c.project_start
+            case ProjectSortCondition.PROJECT_END:
+                sort_column = dates.c.project_end
+            case ProjectSortCondition.FY_TOTAL:
+                sort_column = func.coalesce(totals.c.sort_fy_total, 0)
+            case ProjectSortCondition.PROJECT_TOTAL:
+                sort_column = func.coalesce(totals.c.total, 0)
+            case _:
+                return [Project.id.desc() if sort_descending else Project.id]
+
+        order = sort_column.desc() if sort_descending else sort_column.asc()
+        if sort_condition in (ProjectSortCondition.PROJECT_START, ProjectSortCondition.PROJECT_END):
+            order = order.nulls_last()
+        return [order, case((projects.c.project_type == ProjectType.RESEARCH, 0), else_=1), Project.id]
+
+    def _get_list_metadata(self, project_ids: list[int], totals, dates) -> dict[int, dict[str, Any]]:
+        """
+        Compute the project_list_metadata fields rendered by the list endpoint for the given projects only.
+        """
+        list_metadata: dict[int, dict[str, Any]] = {
+            project_id: {
+                "total": Decimal("0"),
+                "total_by_fiscal_year": {},
+                "project_start": None,
+                "project_end": None,
+                "agreement_name_list": [],
+            }
+            for project_id in project_ids
+        }
+
+        summary_stmt = (
+            select(Project.id, totals.c.total, dates.c.project_start, dates.c.project_end)
+            .outerjoin(totals, totals.c.project_id == Project.id)
+            .outerjoin(dates, dates.c.project_id == Project.id)
+            .where(Project.id.in_(project_ids))
+        )
+        for project_id, total, project_start, project_end in self.db_session.execute(summary_stmt):
+            list_metadata[project_id].update(
+                {"total": total or Decimal("0"), "project_start": project_start, "project_end": project_end}
             )
-            where_clauses.append(agreement_subquery)
 
-        # Apply all where clauses
-        if where_clauses:
-            stmt = stmt.where(*where_clauses)
+        bli_total = _bli_total()
+        fiscal_year_stmt = (
+            select(Agreement.project_id, BudgetLineItem.fiscal_year, func.sum(bli_total))
+            .join(Agreement, BudgetLineItem.agreement_id == Agreement.id)
+            .where(Agreement.project_id.in_(project_ids))
+            .where(_counted_in_project_totals())
+            .where(BudgetLineItem.fiscal_year.isnot(None))
+            .group_by(Agreement.project_id, BudgetLineItem.fiscal_year)
+        )
+        for project_id, fiscal_year, total in self.db_session.execute(fiscal_year_stmt):
+            list_metadata[project_id]["total_by_fiscal_year"][fiscal_year] = total
 
-        logger.debug(f"SQL: {stmt}")
+        agreement_stmt = (
+            select(Agreement.project_id, Agreement.id, Agreement.name, Agreement.nick_name)
+            .where(Agreement.project_id.in_(project_ids))
+            .order_by(Agreement.id)
+        )
+        for project_id, agreement_id, name, nick_name in self.db_session.execute(agreement_stmt):
+            list_metadata[project_id]["agreement_name_list"].append({"id": agreement_id, "name": nick_name or name})
 
-        return stmt
+        return list_metadata
 
     def get(self, id: int) -> Project:
         """
@@ -484,86 +544,21 @@ class ProjectsService(OpsService[Project]):
 
         return project.get_project_funding(fiscal_year)
 
-    @staticmethod
-    def _get_project_sort_key(
-        project: Project,
-        sort_field: str | None,
-        sort_fiscal_year: int | None,
-        metadata_cache: dict,
-        sort_descending: bool = False,
-    ) -> Any:
-        """
-        Generate a sort key for a project based on the sort field.
-
-        Args:
-            project: The project to generate a sort key for
-            sort_field: The field to sort by (must match ProjectSortCondition enum values)
-            sort_fiscal_year: The fiscal year to use when sorting by FY_TOTAL
-            metadata_cache: Dictionary mapping project IDs to their project_list_metadata results
-            sort_descending: Whether the sort is descending (affects None handling for date fields)
-
-        Returns:
-            A sortable key value
-        """
-        if not sort_field:
-            return project.id
-
-        try:
-            sort_condition = ProjectSortCondition(sort_field)
-        except ValueError:
-            # Invalid sort_field, default to id
-            return project.id
-
-        if sort_condition == ProjectSortCondition.TITLE:
-            return (project.title or "").lower()
-        elif sort_condition == ProjectSortCondition.PROJECT_TYPE:
-            return project.project_type.value if project.project_type else ""
-        elif sort_condition == ProjectSortCondition.PROJECT_START:
-            metadata = metadata_cache[project.id]
-            # Handle None values by sorting them last
-            # When descending, invert the boolean so None still comes last after reversal
-            is_none = metadata["project_start"] is None
-            return (is_none if not sort_descending else not is_none, metadata["project_start"])
-        elif sort_condition == ProjectSortCondition.PROJECT_END:
-            metadata = metadata_cache[project.id]
-            # Handle None values by sorting them last
-            # When descending, invert the boolean so None still comes last after reversal
-            is_none = metadata["project_end"] is None
-            return (is_none if not sort_descending else not is_none, metadata["project_end"])
-        elif sort_condition == ProjectSortCondition.FY_TOTAL:
-            metadata = metadata_cache[project.id]
-            # Get fiscal year total, defaulting to 0 if not present
-            fy_total = metadata["total_by_fiscal_year"].get(sort_fiscal_year, 0) if sort_fiscal_year else 0
-            return fy_total
-        elif sort_condition == ProjectSortCondition.PROJECT_TOTAL:
-            metadata = metadata_cache[project.id]
-            return metadata["total"]
-        else:
-            return project.id
-
-    @staticmethod
-    def _compute_scoped_amount(project: Project, portfolio_ids: set[int], fiscal_years: set[int] | None) -> Decimal:
-        """Compute the total BLI amount for a project scoped to the given portfolio(s) and optional fiscal years."""
-        total = Decimal("0")
-        for agreement in project.agreements:
-            for bli in agreement.budget_line_items:
-                if (bli.is_obe or bli.status != BudgetLineItemStatus.DRAFT) and bli.fiscal_year is not None:
-                    if bli.can and bli.can.portfolio_id in portfolio_ids:
-                        if fiscal_years is None or bli.fiscal_year in fiscal_years:
-                            total += (bli.amount or Decimal("0")) + (bli.fees or Decimal("0"))
-        return total
-
     def get_list(self, data: dict[str, Any] | None = None) -> tuple[Sequence[Project], dict[str, Any]]:
         """
         Get list of projects with optional filtering and pagination.
 
+        Sorting, pagination and the summary are computed in the database, so only the projects of the
+        requested page are loaded. Each returned project has a ``list_metadata`` attribute with the
+        project_list_metadata fields rendered by ProjectListResponse.
+
         Args:
             data: Dictionary containing filter parameters (all as lists) including limit and offset
 
         Returns:
-            Tuple of (research_projects, administrative_and_support_projects, metadata)
-            where metadata includes count, limit, and offset
+            Tuple of (projects, metadata) where metadata includes count, limit, offset and summary
         """
+        data = data or {}
         filters = ProjectFilters.parse_filters(data)
 
         # Extract first value from sort parameter lists (only first value is used)
@@ -576,67 +571,24 @@ class ProjectsService(OpsService[Project]):
         sort_fiscal_year_list = data.get("sort_fiscal_year", [])
         sort_fiscal_year = sort_fiscal_year_list[0] if sort_fiscal_year_list else None
 
-        research_projects = []
-        administrative_and_support_projects = []
-
-        # If no project types specified, query both types
-        # If project types specified, only query the specified types
-        should_query_research = not filters.project_type or ProjectType.RESEARCH in filters.project_type
-        should_query_admin = not filters.project_type or ProjectType.ADMINISTRATIVE_AND_SUPPORT in filters.project_type
-
-        if should_query_research:
-            research_stmt = ProjectsService._get_research_projects_query(filters)
-            value = research_stmt.compile(compile_kwargs={"literal_binds": True})
-            logger.debug(f"Compiled SQL for research projects: {value}")
-            research_projects = list(self.db_session.scalars(research_stmt).all())
-
-        if should_query_admin:
-            administrative_and_support_stmt = ProjectsService._get_administrative_and_support_projects_query(filters)
-            administrative_and_support_projects = list(self.db_session.scalars(administrative_and_support_stmt).all())
-
-        # Combine results for pagination
-        all_projects = research_projects + administrative_and_support_projects
-
-        # Memoize project_list_metadata to prevent repeat calculations
-        metadata_cache = {}
-        for project in all_projects:
-            metadata_cache[project.id] = project.project_list_metadata
-
-        # Sort projects using the extracted sort key function
-        sorted_projects = sorted(
-            all_projects,
-            key=lambda p: self._get_project_sort_key(p, sort_field, sort_fiscal_year, metadata_cache, sort_descending),
-            reverse=sort_descending,
-        )
-
-        # Calculate total count before pagination
-        total_count = len(sorted_projects)
+        projects = self._get_filtered_projects_query(filters).subquery("filtered_projects")
+        totals = self._get_project_totals_query(filters, sort_fiscal_year).subquery("project_totals")
+        dates = self._get_project_dates_query().subquery("project_dates")
 
         # Compute summary over full filtered set
-        selected_fiscal_years = set(filters.fiscal_year) if filters.fiscal_year else None
-        portfolio_id_set = set(filters.portfolio_id) if filters.portfolio_id else None
-
+        summary_stmt = (
+            select(projects.c.project_type, func.count(), func.sum(func.coalesce(totals.c.scoped_amount, 0)))
+            .select_from(projects)
+            .outerjoin(totals, totals.c.project_id == projects.c.id)
+            .group_by(projects.c.project_type)
+        )
         projects_by_type = {t.name: 0 for t in ProjectType}
         amounts_by_type = {t.name: Decimal("0") for t in ProjectType}
+        for project_type, project_count, amount in self.db_session.execute(summary_stmt):
+            projects_by_type[project_type.name] = project_count
+            amounts_by_type[project_type.name] = Decimal(amount or 0)
 
-        for project in all_projects:
-            type_name = project.project_type.name
-            projects_by_type[type_name] += 1
-
-            if portfolio_id_set:
-                # Scope amounts to only BLIs whose CAN belongs to the filtered portfolio(s)
-                amounts_by_type[type_name] += self._compute_scoped_amount(
-                    project, portfolio_id_set, selected_fiscal_years
-                )
-            else:
-                pm = metadata_cache[project.id]
-                if selected_fiscal_years:
-                    for fy in selected_fiscal_years:
-                        if fy in pm["total_by_fiscal_year"]:
-                            amounts_by_type[type_name] += pm["total_by_fiscal_year"][fy]
-                else:
-                    amounts_by_type[type_name] += pm["total"]
-
+        total_count = sum(projects_by_type.values())
         total_amount = sum(amounts_by_type.values())
         summary = {
             "total_projects": total_count,
@@ -654,7 +606,29 @@ class ProjectsService(OpsService[Project]):
         limit_value = filters.limit[0] if filters.limit else 10
         offset_value = filters.offset[0] if filters.offset else 0
 
-        paginated_projects = sorted_projects[offset_value : offset_value + limit_value]
+        page_stmt = (
+            select(Project.id)
+            .join(projects, projects.c.id == Project.id)
+            .outerjoin(totals, totals.c.project_id == Project.id)
+            .outerjoin(dates, dates.c.project_id == Project.id)
+            .order_by(*self._get_sort_order(sort_field, sort_descending, projects, totals, dates))
+            .limit(limit_value)
+            .offset(offset_value)
+        )
+        page_ids = list(self.db_session.scalars(page_stmt).all())
+
+        paginated_projects: list[Project] = []
+        if page_ids:
+            project_entity = with_polymorphic(Project, [ResearchProject, AdministrativeAndSupportProject])
+            projects_by_id = {
+                project.id: project
+                for project in self.db_session.scalars(select(project_entity).where(project_entity.id.in_(page_ids)))
+            }
+            list_metadata = self._get_list_metadata(page_ids, totals, dates)
+            for project_id in page_ids:
+                project = projects_by_id[project_id]
+                project.list_metadata = list_metadata[project_id]
+                paginated_projects.append(project)
 
         metadata = {
             "count": total_count,
@@ -0,0 +1,16 @@
+from loguru import logger
+from sqlalchemy.orm import Session
+
+from models import OpsEvent
+from ops_api.ops.utils.response_cache import response_cache_trigger_func
+
+
+def response_cache_trigger(
+    event: OpsEvent,
+    session: Session,
+):
+    try:
+        # The cached responses are invalidated when the outer transaction commits
+        response_cache_trigger_func(event, session)
+    except Exception as e:
+        logger.error(f"Error in response_cache_trigger: {e}")
@@ -0,0 +1,69 @@
+from typing import Any
+
+from sqlalchemy import case, func, null, or_, select
+
+from models import CAN, Agreement, BudgetLineItem, Project
+from models.search import fuzzy_search_predicate, search_rank
+
+# the model and searched columns of each type: the name (the display name of a hit) and the nick name, if any
+SEARCH_COLUMNS = {
+    "agreement": (Agreement, Agreement.name, Agreement.nick_name),
+    "project": (Project, Project.title, Project.short_title),
+    "can": (CAN, CAN.number, CAN.nick_name),
+    "budget_line_item": (BudgetLineItem, BudgetLineItem.line_description, None),
+}
+
+# the largest value of an id column (a Postgres integer)
+MAX_ID = 2**31 - 1
+
+
+class SearchService:
+    def __init__(self, db_session):
+        """
+        Initialize the SearchService.
+
+        :param db_session:  The SQLAlchemy session to use for database operations.
+        """
+        self.db_session = db_session
+
+    def search(self, search_term: str, types: list[str], limit: int = 10) -> list[dict[str, Any]]:
+        """
+        Search the names of agreements, projects, CANs and budget lines for search_term.
+
+        Each type is searched with one query, served by the trigram indexes of its columns (see models/search.py),
+        for the rows containing search_term or a word similar to it. The best ``limit`` hits of each type are
+        merged and the best ``limit`` of them returned, most relevant first.
+
+        :param search_term: The text to search for.
+        :param types: The types to search, e.g. ["agreement", "can"].
+        :param limit: The maximum number of hits to return.
+
+        :return: A list of hits: {"type", "id", "name", "nick_name", "rank"}.
+        """
+        hits = []
+        for search_type in types:
+            stmt = self._search_stmt(search_type, search_term, limit)
+            for id, name, nick_name, rank in self.db_session.execute(stmt):
+                hits.append({"type": search_type, "id": id, "name": name, "nick_name": nick_name, "rank": float(rank)})
+
+        hits.sort(key=lambda hit: hit["rank"], reverse=True)
+        return hits[:limit]
+
+    @staticmethod
+    def _search_stmt(search_type: str, search_term: str, limit: int):
+        model, name_column, nick_name_column = SEARCH_COLUMNS[search_type]
+        columns = [column for column in (name_column, nick_name_column) if column is not None]
+        predicate = fuzzy_search_predicate(columns, search_term)
+        rank = search_rank(columns, search_term)
+        # budget lines are usually referred to by their id; isdecimal() (unlike isdigit()) rejects the digits
+        # int() cannot parse, such as "²"
+        if search_type == "budget_line_item" and search_term.isdecimal() and int(search_term) <= MAX_ID:
+            predicate = or_(predicate, model.id == int(search_term))
+            rank = func.greatest(rank, case((model.id == int(search_term), 1.0), else_=0.0))
+        rank = rank.label("rank")
+        return (
+            select(model.id, name_column, nick_name_column if nick_name_column is not None else null(), rank)
+            .where(predicate)
+            .order_by(rank.desc(), model.id)
+            .limit(limit)
+        )
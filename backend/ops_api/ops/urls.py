@@ -41,6 +41,8 @@ from ops_api.ops.views import (
     LOOKUP_RESEARCH_TYPE_LIST_API_VIEW_FUNC,
     NOTIFICATIONS_ITEM_API_VIEW_FUNC,
     NOTIFICATIONS_LIST_API_VIEW_FUNC,
+    NOTIFICATIONS_STREAM_API_VIEW_FUNC,
+    NOTIFICATIONS_UNREAD_COUNT_API_VIEW_FUNC,
     PORTFOLIO_CANS_API_VIEW_FUNC,
     PORTFOLIO_FUNDING_SUMMARY_ITEM_API_VIEW_FUNC,
     PORTFOLIO_FUNDING_SUMMARY_LIST_API_VIEW_FUNC,
@@ -70,6 +72,7 @@ from ops_api.ops.views import (
     REPORTING_SUMMARY_LIST_API_VIEW_FUNC,
     RESEARCH_METHODOLOGY_ITEM_API_VIEW_FUNC,
     RESEARCH_METHODOLOGY_LIST_API_VIEW_FUNC,
+    SEARCH_LIST_API_VIEW_FUNC,
     SERVICES_COMPONENT_ITEM_API_VIEW_FUNC,
     SERVICES_COMPONENT_LIST_API_VIEW_FUNC,
     SPECIAL_TOPICS_ITEM_API_VIEW_FUNC,
@@ -248,6 +251,10 @@ def register_api(api_bp: Blueprint) -> None:
         "/reporting-summary/",
         view_func=REPORTING_SUMMARY_LIST_API_VIEW_FUNC,
     )
+    api_bp.add_url_rule(
+        "/search/",
+        view_func=SEARCH_LIST_API_VIEW_FUNC,
+    )
 
     api_bp.add_url_rule(
         "/projects/<int:id>",
@@ -324,6 +331,14 @@ def register_api(api_bp: Blueprint) -> None:
         "/notifications/<int:id>",
         view_func=NOTIFICATIONS_ITEM_API_VIEW_FUNC,
     )
+    api_bp.add_url_rule(
+        "/notifications/unread-count/",
+        view_func=NOTIFICATIONS_UNREAD_COUNT_API_VIEW_FUNC,
+    )
+    api_bp.add_url_rule(
+        "/notifications/stream/",
+        view_func=NOTIFICATIONS_STREAM_API_VIEW_FUNC,
+    )
 
     api_bp.add_url_rule(
         "/services-components/<int:id>",
@@ -2,10 +2,19 @@ from typing import Any
 
 from flask import current_app
 from flask_jwt_extended import get_current_user
-from sqlalchemy import inspect
+from sqlalchemy import inspect, select
 from sqlalchemy.exc import IntegrityError
 
-from models import Agreement, User
+from models import (
+    CAN,
+    Agreement,
+    AgreementTeamMembers,
+    BudgetLineItem,
+    Division,
+    Portfolio,
+    PortfolioTeamLeaders,
+    User,
+)
 from ops_api.ops.services.ops_service import ResourceNotFoundError
 from ops_api.ops.utils.users import is_super_user
 
@@ -67,6 +76,63 @@ def associated_with_agreement(id: int) -> bool:
     return check_user_association(agreement, user)
 
 
+def get_user_association_conditions(user: User) -> list | None:
+    """
+    Build SQL conditions (to be OR-ed together) matching the agreements the user is associated with.
+
+    Mirrors check_user_association(). Returns None when the user's role (BUDGET_TEAM, SYSTEM_OWNER
+    or super user) grants access to every agreement, so no filtering is needed.
+    """
+    user_role_names = [role.name for role in user.roles]
+    if "BUDGET_TEAM" in user_role_names or "SYSTEM_OWNER" in user_role_names or is_super_user(user, current_app):
+        return None
+
+    # User created the agreement, is the project officer or the alternate project officer
+    conditions = [
+        Agreement.created_by == user.id,
+        Agreement.project_officer_id == user.id,
+        Agreement.alternate_project_officer_id == user.id,
+    ]
+
+    # User is a direct team member
+    team_member_subquery = select(AgreementTeamMembers.agreement_id).where(AgreementTeamMembers.user_id == user.id)
+    conditions.append(Agreement.id.in_(team_member_subquery))
+
+    # User is a portfolio team leader
+    portfolio_leader_subquery = (
+        select(Agreement.id)
+        .join(BudgetLineItem, Agreement.id == BudgetLineItem.agreement_id)
+        .join(CAN, BudgetLineItem.can_id == CAN.id)
+        .join(Portfolio, CAN.portfolio_id == Portfolio.id)
+        .join(PortfolioTeamLeaders, Portfolio.id == PortfolioTeamLeaders.portfolio_id)
+        .where(PortfolioTeamLeaders.team_lead_id == user.id)
+    )
+    conditions.append(Agreement.id.in_(portfolio_leader_subquery))
+
+    # User is a division director or deputy division director
+    division_director_subquery = (
+        select(Agreement.id)
+        .join(BudgetLineItem, Agreement.id == BudgetLineItem.agreement_id)
+        .join(CAN, BudgetLineItem.can_id == CAN.id)
+        .join(Portfolio, CAN.portfolio_id == Portfolio.id)
+        .join(Division, Portfolio.division_id == Division.id)
+        .where(Division.division_director_id == user.id)
+    )
+    conditions.append(Agreement.id.in_(division_director_subquery))
+
+    deputy_division_director_subquery = (
+        select(Agreement.id)
+        .join(BudgetLineItem, Agreement.id == BudgetLineItem.agreement_id)
+        .join(CAN, BudgetLineItem.can_id == CAN.id)
+        .join(Portfolio, CAN.portfolio_id == Portfolio.id)
+        .join(Division, Portfolio.division_id == Division.id)
+        .where(Division.deputy_division_director_id == user.id)
+    )
+    conditions.append(Agreement.id.in_(deputy_division_director_subquery))
+
+    return conditions
+
+
 def check_user_association(agreement: Agreement, user: User) -> bool:
     """
     Check if the user is associated with, and so should be able to modify, the agreement.
@@ -1,7 +1,12 @@
 from decimal import Decimal
 from typing import Iterable, List, Optional, TypedDict
 
-from models import CAN, BudgetLineItemStatus
+from flask import current_app
+from sqlalchemy import Integer, case, cast, func, or_, select
+from sqlalchemy.orm import Session
+
+from models import CAN, BudgetLineItem, BudgetLineItemStatus, CANFundingRollup
+from models.cans import CANFundingBudget, CANFundingDetails, CANFundingReceived
 
 
 def is_can_active_for_year(can: CAN, fiscal_year: int) -> bool:
@@ -147,6 +152,32 @@ class CanFundingAmounts(TypedDict):
     total_funding: float
 
 
+def _build_funding_amounts(
+    carry_forward_funding,
+    new_funding,
+    received_funding,
+    planned_funding,
+    obligated_funding,
+    in_execution_funding,
+    in_draft_funding,
+) -> CanFundingAmounts:
+    total_funding = carry_forward_funding + new_funding
+    available_funding = total_funding - sum([planned_funding, obligated_funding, in_execution_funding]) or 0
+
+    return {
+        "available_funding": available_funding,
+        "carry_forward_funding": carry_forward_funding,
+        "received_funding": received_funding,
+        "expected_funding": total_funding - received_funding,
+        "in_draft_funding": in_draft_funding,
+        "in_execution_funding": in_execution_funding,
+        "new_funding": new_funding,
+        "obligated_funding": obligated_funding,
+        "planned_funding": planned_funding,
+        "total_funding": total_funding,
+    }
+
+
 def calculate_can_funding(can: CAN, fiscal_year: Optional[int] = None) -> CanFundingAmounts:
     """
     Calculate funding amounts for a CAN without serializing the CAN object.
@@ -192,21 +223,136 @@ def calculate_can_funding(can: CAN, fiscal_year: Optional[int] = None) -> CanFun
             or 0
         )
 
-    total_funding = carry_forward_funding + new_funding
-    available_funding = total_funding - sum([planned_funding, obligated_funding, in_execution_funding]) or 0
+    return _build_funding_amounts(
+        carry_forward_funding,
+        new_funding,
+        received_funding,
+        planned_funding,
+        obligated_funding,
+        in_execution_funding,
+        in_draft_funding,
+    )
 
-    return {
-        "available_funding": available_funding,
-        "carry_forward_funding": carry_forward_funding,
-        "received_funding": received_funding,
-        "expected_funding": total_funding - received_funding,
-        "in_draft_funding": in_draft_funding,
-        "in_execution_funding": in_execution_funding,
-        "new_funding": new_funding,
-        "obligated_funding": obligated_funding,
-        "planned_funding": planned_funding,
-        "total_funding": total_funding,
-    }
+
+def _funding_sources(can_ids: list[int]):
+    """
+    Return (line_items, received, budgets) subqueries for the given CANs.
+
+    ``line_items`` has ``can_id``, ``fiscal_year``, ``status`` and ``amount`` columns, ``received`` has ``can_id``,
+    ``fiscal_year`` and ``received`` and ``budgets`` has ``can_id``, ``fiscal_year`` and ``budget``. They are read
+    from the CAN funding rollup when ``USE_CAN_FUNDING_ROLLUP`` is enabled and from the source tables otherwise.
+    """
+    if current_app.config.get("USE_CAN_FUNDING_ROLLUP", False):
+        rollup_rows = select(CANFundingRollup).where(CANFundingRollup.can_id.in_(can_ids))
+        line_items = rollup_rows.where(CANFundingRollup.status.isnot(None)).with_only_columns(
+            CANFundingRollup.can_id, CANFundingRollup.fiscal_year, CANFundingRollup.status, CANFundingRollup.amount
+        )
+        funding_rows = rollup_rows.where(CANFundingRollup.status.is_(None))
+        received = funding_rows.with_only_columns(
+            CANFundingRollup.can_id, CANFundingRollup.fiscal_year, CANFundingRollup.received
+        )
+        budgets = funding_rows.with_only_columns(
+            CANFundingRollup.can_id, CANFundingRollup.fiscal_year, CANFundingRollup.budget
+        )
+    else:
+        line_items = select(
+            BudgetLineItem.can_id.label("can_id"),
+            BudgetLineItem.fiscal_year.label("fiscal_year"),
+            BudgetLineItem.status.label("status"),
+            BudgetLineItem.amount.label("amount"),
+        ).where(BudgetLineItem.can_id.in_(can_ids), BudgetLineItem.amount.isnot(None))
+        received = select(
+            CANFundingReceived.can_id.label("can_id"),
+            CANFundingReceived.fiscal_year.label("fiscal_year"),
+            CANFundingReceived.funding.label("received"),
+        ).where(CANFundingReceived.can_id.in_(can_ids))
+        budgets = select(
+            CANFundingBudget.can_id.label("can_id"),
+            CANFundingBudget.fiscal_year.label("fiscal_year"),
+            CANFundingBudget.budget.label("budget"),
+        ).where(CANFundingBudget.can_id.in_(can_ids))
+
+    return line_items.subquery("line_items"), received.subquery("received"), budgets.subquery("budgets")
+
+
+def calculate_cans_funding(
+    session: Session, can_ids: Iterable[int], fiscal_year: Optional[int] = None
+) -> dict[int, CanFundingAmounts]:
+    """
+    Calculate funding amounts for many CANs with a single aggregate query.
+
+    Set-based equivalent of :func:`calculate_can_funding`: budget line item sums by status, funding received
+    and the new/carry-forward classification of funding budgets are grouped per CAN in the database, so no
+    CAN relationships need to be loaded. Returns a dict keyed by CAN id; ids that do not exist are omitted.
+    """
+    can_ids = list(can_ids)
+    if not can_ids:
+        return {}
+
+    line_items, received, budgets = _funding_sources(can_ids)
+
+    def status_sum(*statuses):
+        return func.sum(case((line_items.c.status.in_(statuses), line_items.c.amount), else_=0))
+
+    bli_stmt = select(
+        line_items.c.can_id,
+        status_sum(BudgetLineItemStatus.PLANNED, BudgetLineItemStatus.PLANNED_MOD).label("planned"),
+        status_sum(BudgetLineItemStatus.OBLIGATED).label("obligated"),
+        status_sum(BudgetLineItemStatus.IN_EXECUTION).label("in_execution"),
+        status_sum(BudgetLineItemStatus.DRAFT).label("in_draft"),
+    )
+
+    received_stmt = select(received.c.can_id, func.sum(received.c.received).label("received"))
+
+    # CANFundingDetails.active_period in SQL: NULL unless the fund code is well-formed
+    active_period = case(
+        (func.length(CANFundingDetails.fund_code) == 14, cast(func.substr(CANFundingDetails.fund_code, 11, 1), Integer))
+    )
+    is_new = or_(active_period == 1, CANFundingDetails.fiscal_year == budgets.c.fiscal_year)
+    if fiscal_year:
+        # CAN.classify_funding: budgets appropriated after the requested year are excluded
+        is_carry_forward = CANFundingDetails.fiscal_year < fiscal_year
+    else:
+        is_carry_forward = CANFundingDetails.fiscal_year != budgets.c.fiscal_year
+
+    # Only CANs with funding details classify their budgets, hence the inner joins
+    budget_stmt = (
+        select(
+            budgets.c.can_id,
+            func.sum(case((is_new, budgets.c.budget), else_=0)).label("new"),
+            func.sum(case((is_new, 0), (is_carry_forward, budgets.c.budget), else_=0)).label("carry_forward"),
+        )
+        .join(CAN, CAN.id == budgets.c.can_id)
+        .join(CANFundingDetails, CAN.funding_details_id == CANFundingDetails.id)
+    )
+
+    if fiscal_year:
+        bli_stmt = bli_stmt.where(line_items.c.fiscal_year == fiscal_year)
+        received_stmt = received_stmt.where(received.c.fiscal_year == fiscal_year)
+        budget_stmt = budget_stmt.where(budgets.c.fiscal_year == fiscal_year)
+
+    bli_totals = bli_stmt.group_by(line_items.c.can_id).subquery("bli_totals")
+    received_totals = received_stmt.group_by(received.c.can_id).subquery("received_totals")
+    budget_totals = budget_stmt.group_by(budgets.c.can_id).subquery("budget_totals")
+
+    stmt = (
+        select(
+            CAN.id,
+            func.coalesce(budget_totals.c.carry_forward, 0),
+            func.coalesce(budget_totals.c.new, 0),
+            func.coalesce(received_totals.c.received, 0),
+            func.coalesce(bli_totals.c.planned, 0),
+            func.coalesce(bli_totals.c.obligated, 0),
+            func.coalesce(bli_totals.c.in_execution, 0),
+            func.coalesce(bli_totals.c.in_draft, 0),
+        )
+        .outerjoin(bli_totals, bli_totals.c.can_id == CAN.id)
+        .outerjoin(received_totals, received_totals.c.can_id == CAN.id)
+        .outerjoin(budget_totals, budget_totals.c.can_id == CAN.id)
+        .where(CAN.id.in_(can_ids))
+    )
+
+    return {can_id: _build_funding_amounts(*amounts) for can_id, *amounts in session.execute(stmt).all()}
 
 
 def get_carry_forward_label(can: CAN) -> str:
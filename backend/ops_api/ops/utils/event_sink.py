@@ -0,0 +1,208 @@
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Optional, Protocol
+
+from flask import Config
+from loguru import logger
+from sqlalchemy import Engine, insert
+from sqlalchemy.orm import Session
+
+from models.events import OpsEvent, OpsEventStatus, OpsEventType
+
+
+class OpsEventSink(Protocol):
+    """
+    Somewhere OpsEvents recorded by OpsEventHandler are written to instead of being committed in the request.
+    """
+
+    def write(self, event: OpsEvent) -> None: ...
+
+    def close(self) -> None: ...
+
+
+def _event_row(event: OpsEvent) -> dict:
+    return {
+        "event_type": event.event_type,
+        "event_status": event.event_status,
+        "event_details": event.event_details,
+        "created_by": event.created_by,
+        "created_on": datetime.now(),
+    }
+
+
+def _row_to_json(row: dict) -> str:
+    return json.dumps(
+        {
+            **row,
+            "event_type": row["event_type"].name,
+            "event_status": row["event_status"].name,
+            "created_on": row["created_on"].isoformat(),
+        },
+        default=str,
+    )
+
+
+def _row_from_json(line: str) -> dict:
+    row = json.loads(line)
+    return {
+        **row,
+        "event_type": OpsEventType[row["event_type"]],
+        "event_status": OpsEventStatus[row["event_status"]],
+        "created_on": datetime.fromisoformat(row["created_on"]),
+    }
+
+
+class BatchingOpsEventSink:
+    """
+    Queue events in memory and bulk-insert them from a background thread.
+
+    Events are inserted in batches of up to ``batch_size`` at least every ``flush_interval`` seconds. When the
+    queue is full or a batch cannot be inserted, the events are appended to ``spill_path`` (one JSON object per
+    line) and re-inserted when the next writer starts. ``close`` drains the queue and is registered to run at
+    interpreter exit.
+
+    Events written here are never given an id in the request, so events that MessageBus subscribers need must
+    keep being committed by OpsEventHandler. Bulk inserts also skip the ops_event_version rows.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        max_queue_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        spill_path: Optional[str] = None,
+    ) -> None:
+        self.engine = engine
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.spill_path = spill_path
+        self._queue: queue.Queue[dict] = queue.Queue(maxsize=max_queue_size)
+        self._spill_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="ops-event-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, event: OpsEvent) -> None:
+        row = _event_row(event)
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            logger.warning("OpsEvent queue is full; spilling event to disk.")
+            self._spill([row])
+
+    def close(self, timeout: Optional[float] = 30.0) -> None:
+        """Stop the writer once every queued event has been inserted (or spilled)."""
+        self._stopped.set()
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        try:
+            self._replay_spill()
+        except Exception as e:
+            # keep the writer running, or every event written from now on piles up in the queue
+            logger.error(f"Error replaying spilled OpsEvents: {e}")
+        while not self._stopped.is_set() or not self._queue.empty():
+            batch = self._next_batch()
+            if batch:
+                self._insert(batch)
+
+    def _next_batch(self) -> list[dict]:
+        batch: list[dict] = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return batch
+
+    def _insert(self, rows: list[dict]) -> bool:
+        try:
+            with Session(self.engine) as session:
+                session.execute(insert(OpsEvent), rows)
+                session.commit()
+            logger.debug(f"Inserted {len(rows)} OpsEvents")
+            return True
+        except Exception as e:
+            logger.error(f"Error inserting {len(rows)} OpsEvents; spilling them to disk: {e}")
+            self._spill(rows)
+            return False
+
+    def _spill(self, rows: list[dict]) -> None:
+        if not self.spill_path:
+            logger.error(f"No OPS_EVENT_SPILL_PATH configured; dropping {len(rows)} OpsEvents.")
+            return
+        with self._spill_lock, open(self.spill_path, "a", encoding="utf-8") as spill_file:
+            spill_file.writelines(f"{_row_to_json(row)}\n" for row in rows)
+
+    def _keep_unreplayed(self, path: str, suffix: str) -> None:
+        """Move a spill file that could not be replayed out of the way, so that it is neither replayed nor overwritten."""
+        kept_path = f"{self.spill_path}.{suffix}-{datetime.now():%Y%m%d%H%M%S%f}"
+        os.replace(path, kept_path)
+        logger.error(f"Kept spilled OpsEvents that could not be replayed in {kept_path}")
+
+    def _read_spilled_rows(self, path: str) -> list[dict]:
+        rows = []
+        with open(path, encoding="utf-8") as replay_file:
+            for line_number, line in enumerate(replay_file, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    rows.append(_row_from_json(line))
+                except (ValueError, KeyError, TypeError) as e:
+                    # e.g. the last line of a file appended to when the process crashed
+                    logger.error(f"Skipping unreadable spilled OpsEvent on line {line_number} of {path}: {e}")
+        return rows
+
+    def _replay_spill(self) -> None:
+        """Insert the events spilled by a previous writer."""
+        if not self.spill_path:
+            return
+
+        replay_path = f"{self.spill_path}.replay"
+        if os.path.exists(replay_path):
+            # a previous replay did not finish, so some of its events may already be inserted
+            self._keep_unreplayed(replay_path, "unfinished")
+        if not os.path.exists(self.spill_path):
+            return
+
+        with self._spill_lock:
+            os.replace(self.spill_path, replay_path)
+
+        try:
+            rows = self._read_spilled_rows(replay_path)
+        except (OSError, ValueError) as e:
+            logger.error(f"Error reading spilled OpsEvents from {replay_path}: {e}")
+            self._keep_unreplayed(replay_path, "unreadable")
+            return
+        logger.info(f"Replaying {len(rows)} spilled OpsEvents")
+
+        for start in range(0, len(rows), self.batch_size):
+            # Failed batches are spilled again by _insert
+            self._insert(rows[start : start + self.batch_size])
+        os.remove(replay_path)
+
+
+def create_ops_event_sink(config: Config, engine: Engine) -> Optional[OpsEventSink]:
+    """Return the configured event sink, or None to commit every event during the request."""
+    if not config.get("ASYNC_OPS_EVENT_WRITER", False):
+        return None
+
+    sink = BatchingOpsEventSink(
+        engine,
+        max_queue_size=config.get("OPS_EVENT_QUEUE_SIZE", 10000),
+        batch_size=config.get("OPS_EVENT_BATCH_SIZE", 500),
+        flush_interval=config.get("OPS_EVENT_FLUSH_INTERVAL", 1.0),
+        spill_path=config.get("OPS_EVENT_SPILL_PATH"),
+    )
+    atexit.register(sink.close)
+    return sink
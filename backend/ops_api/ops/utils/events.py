@@ -9,6 +9,7 @@ from werkzeug.exceptions import UnsupportedMediaType
 
 from models.events import OpsEvent, OpsEventStatus, OpsEventType
 from ops_api.ops.auth.utils import get_request_ip_address
+from ops_api.ops.services.message_bus import MessageBus
 
 
 class OpsEventHandler:
@@ -59,10 +60,15 @@ class OpsEventHandler:
             created_by=current_user_id,
         )
 
-        with Session(current_app.engine) as session:
-            session.add(event)
-            session.commit()
-            logger.info(f"EVENT: {event.to_dict()}")
+        # MessageBus subscribers need the persisted event (e.g. its id) when the request's bus is handled
+        if current_app.ops_event_sink and not MessageBus.has_subscribers(self.event_type):
+            current_app.ops_event_sink.write(event)
+            logger.info(f"EVENT: {self.event_type.name} {event_status.name} created_by={current_user_id}")
+        else:
+            with Session(current_app.engine) as session:
+                session.add(event)
+                session.commit()
+                logger.info(f"EVENT: {event.to_dict()}")
 
         if isinstance(exc_val, Exception):
             logger.error(f"EVENT ({exc_type}): {exc_val}")
@@ -0,0 +1,250 @@
+import atexit
+import json
+import queue
+import select
+import threading
+from typing import Optional, Protocol
+
+from flask import Config
+from loguru import logger
+from sqlalchemy import Engine, func
+from sqlalchemy import select as sa_select
+from sqlalchemy.orm import Session
+
+from models import Notification
+
+# Published to a subscription in place of its queued notifications when its buffer overflows, telling the
+# client to re-fetch its notifications instead.
+RESYNC = {"event": "resync"}
+
+NOTIFICATION_CHANNEL = "ops_notification"
+
+_PENDING_KEY = "pending_notifications"
+_COMMITTED_KEY = "committed_notifications"
+
+
+def notification_payload(notification: Notification) -> dict:
+    """The attributes of a new notification that are pushed to its recipient."""
+    notification_type = notification.notification_type
+    return {
+        "id": notification.id,
+        "recipient_id": notification.recipient_id,
+        "notification_type": notification_type.name if notification_type else None,
+        "title": notification.title,
+    }
+
+
+def collect_new_notifications(session: Session) -> None:
+    """Remember the notifications inserted by a flush until the transaction ends (an after_flush listener)."""
+    payloads = [notification_payload(obj) for obj in session.new if isinstance(obj, Notification)]
+    if payloads:
+        session.info.setdefault(_PENDING_KEY, []).extend(payloads)
+
+
+def mark_notifications_committed(session: Session) -> None:
+    """Queue the notifications of a committed transaction for publishing (an after_commit listener)."""
+    payloads = session.info.pop(_PENDING_KEY, [])
+    if payloads:
+        session.info.setdefault(_COMMITTED_KEY, []).extend(payloads)
+
+
+def discard_pending_notifications(session: Session) -> None:
+    """Forget the notifications of a rolled back transaction (an after_rollback listener)."""
+    session.info.pop(_PENDING_KEY, None)
+
+
+def publish_committed_notifications(broker: "NotificationBroker", session: Session) -> None:
+    """Publish the notifications committed by the session since the last call."""
+    payloads = session.info.pop(_COMMITTED_KEY, [])
+    if payloads:
+        logger.debug(f"Publishing {len(payloads)} new notifications")
+        broker.publish(payloads)
+
+
+class NotificationSubscription:
+    """
+    A bounded buffer of the notifications published to one recipient while a stream is connected.
+
+    When the client reads slower than notifications arrive and the buffer fills up, the buffered notifications
+    are dropped and replaced with ``RESYNC``.
+    """
+
+    def __init__(self, recipient_id: int, buffer_size: int = 100) -> None:
+        self.recipient_id = recipient_id
+        self._queue: queue.Queue[dict] = queue.Queue(maxsize=buffer_size)
+
+    def put(self, payload: dict) -> None:
+        try:
+            self._queue.put_nowait(payload)
+        except queue.Full:
+            logger.warning(f"Notification buffer of user {self.recipient_id} is full; asking the client to resync.")
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            self._queue.put_nowait(RESYNC)
+
+    def get(self, timeout: Optional[float] = None) -> Optional[dict]:
+        """Return the next payload, or None when nothing is published within ``timeout`` seconds."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class NotificationBroker(Protocol):
+    """
+    Delivers the notifications committed by a request to the streams of their recipients.
+    """
+
+    def publish(self, payloads: list[dict]) -> None: ...
+
+    def subscribe(self, recipient_id: int) -> Optional[NotificationSubscription]: ...
+
+    def unsubscribe(self, subscription: NotificationSubscription) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class InProcessNotificationBroker:
+    """
+    Deliver notifications to the streams connected to this process.
+
+    Only suitable for a single process (and for tests); use ``PostgresNotificationBroker`` when the API runs in
+    several processes or containers.
+
+    Each connected stream holds a worker thread, so at most ``max_subscriptions`` streams (0 for no limit) are
+    connected to the process at a time.
+    """
+
+    def __init__(self, buffer_size: int = 100, max_subscriptions: int = 0) -> None:
+        self.buffer_size = buffer_size
+        self.max_subscriptions = max_subscriptions
+        self._subscriptions: dict[int, set[NotificationSubscription]] = {}
+        self._subscription_count = 0
+        self._lock = threading.Lock()
+
+    def publish(self, payloads: list[dict]) -> None:
+        for payload in payloads:
+            self._deliver(payload)
+
+    def _deliver(self, payload: dict) -> None:
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(payload.get("recipient_id"), ()))
+        for subscription in subscriptions:
+            subscription.put(payload)
+
+    def subscribe(self, recipient_id: int) -> Optional[NotificationSubscription]:
+        """Return a new subscription, or None when ``max_subscriptions`` streams are already connected."""
+        subscription = NotificationSubscription(recipient_id, self.buffer_size)
+        with self._lock:
+            if self.max_subscriptions and self._subscription_count >= self.max_subscriptions:
+                return None
+            self._subscriptions.setdefault(recipient_id, set()).add(subscription)
+            self._subscription_count += 1
+        return subscription
+
+    def unsubscribe(self, subscription: NotificationSubscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.recipient_id, set())
+            if subscription in subscriptions:
+                subscriptions.discard(subscription)
+                self._subscription_count -= 1
+            if not subscriptions:
+                self._subscriptions.pop(subscription.recipient_id, None)
+
+    def close(self) -> None:
+        with self._lock:
+            self._subscriptions.clear()
+            self._subscription_count = 0
+
+
+class PostgresNotificationBroker(InProcessNotificationBroker):
+    """
+    Deliver notifications to the streams connected to every API process with Postgres LISTEN/NOTIFY.
+
+    ``publish`` sends one NOTIFY per notification; a background thread of each process LISTENs on a dedicated
+    connection and hands the payloads to the streams connected to that process.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        buffer_size: int = 100,
+        max_subscriptions: int = 0,
+        channel: str = NOTIFICATION_CHANNEL,
+        poll_interval: float = 5.0,
+    ) -> None:
+        super().__init__(buffer_size, max_subscriptions)
+        self.engine = engine
+        self.channel = channel
+        self.poll_interval = poll_interval
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="ops-notification-listener", daemon=True)
+        self._thread.start()
+
+    def publish(self, payloads: list[dict]) -> None:
+        if not payloads:
+            return
+        try:
+            with self.engine.connect() as conn:
+                for payload in payloads:
+                    conn.execute(sa_select(func.pg_notify(self.channel, json.dumps(payload, default=str))))
+                conn.commit()
+        except Exception as e:
+            # the notifications are committed, so clients still get them when they next fetch the list
+            logger.error(f"Error publishing {len(payloads)} notifications: {e}")
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        self._stopped.set()
+        self._thread.join(timeout)
+        super().close()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                self._listen()
+            except Exception as e:
+                logger.error(f"Notification listener lost its connection; reconnecting: {e}")
+                self._stopped.wait(self.poll_interval)
+
+    def _listen(self) -> None:
+        raw_connection = self.engine.raw_connection()
+        try:
+            dbapi_connection = raw_connection.driver_connection
+            dbapi_connection.autocommit = True
+            channel = self.engine.dialect.identifier_preparer.quote(self.channel)
+            with dbapi_connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {channel}")
+            while not self._stopped.is_set():
+                readable, _, _ = select.select([dbapi_connection], [], [], self.poll_interval)
+                if not readable:
+                    continue
+                dbapi_connection.poll()
+                while dbapi_connection.notifies:
+                    notify = dbapi_connection.notifies.pop(0)
+                    self._deliver(json.loads(notify.payload))
+        finally:
+            # the connection has a LISTEN registered, so do not return it to the pool
+            raw_connection.invalidate()
+
+
+def create_notification_broker(config: Config, engine: Engine) -> Optional[NotificationBroker]:
+    """Return the configured notification broker, or None when notifications are only fetched by polling."""
+    broker_type = (config.get("NOTIFICATION_BROKER") or "").lower()
+    buffer_size = config.get("NOTIFICATION_STREAM_BUFFER_SIZE", 100)
+    max_subscriptions = config.get("NOTIFICATION_STREAM_MAX_CONNECTIONS", 0)
+
+    broker: NotificationBroker
+    if broker_type == "memory":
+        broker = InProcessNotificationBroker(buffer_size, max_subscriptions)
+    elif broker_type == "postgres":
+        broker = PostgresNotificationBroker(engine, buffer_size, max_subscriptions)
+    elif not broker_type:
+        return None
+    else:
+        raise ValueError(f"Unknown NOTIFICATION_BROKER {broker_type}")
+
+    atexit.register(broker.close)
+    return broker
@@ -2,7 +2,7 @@ from decimal import Decimal
 from typing import TypedDict
 
 from flask import current_app
-from sqlalchemy import and_, select
+from sqlalchemy import Integer, case, cast, func, or_, select
 
 from models import (
     CAN,
@@ -10,7 +10,7 @@ from models import (
     BudgetLineItemStatus,
     CANFundingBudget,
     CANFundingDetails,
-    Portfolio,
+    CANFundingRollup,
 )
 
 
@@ -100,73 +100,144 @@ def _get_new_funding_total(portfolio_id: int, fiscal_year: int) -> Decimal:
 
 
 def _get_budget_line_item_total_by_status(portfolio_id: int, fiscal_year: int, status: BudgetLineItemStatus) -> Decimal:
-    stmt = (
-        select(BudgetLineItem).join(CAN).where(and_(CAN.portfolio_id == portfolio_id, BudgetLineItem.status == status))
-    )
-
-    blis = current_app.db_session.execute(stmt).scalars().all()
-
-    return sum([bli.total for bli in blis if bli.total and bli.fiscal_year == fiscal_year]) or Decimal(0)
+    return _get_budget_line_item_total_by_statuses(portfolio_id, fiscal_year, [status])
 
 
 def _get_budget_line_item_total_by_statuses(
     portfolio_id: int, fiscal_year: int, statuses: list[BudgetLineItemStatus]
 ) -> Decimal:
-    stmt = (
-        select(BudgetLineItem)
-        .join(CAN)
-        .where(and_(CAN.portfolio_id == portfolio_id, BudgetLineItem.status.in_(statuses)))
-    )
+    totals = _get_budget_line_item_totals_by_portfolio([portfolio_id], fiscal_year)
+    return sum(totals.get((portfolio_id, status), Decimal(0)) for status in statuses) or Decimal(0)
 
-    blis = current_app.db_session.execute(stmt).scalars().all()
 
-    return sum([bli.total for bli in blis if bli.total and bli.fiscal_year == fiscal_year]) or Decimal(0)
+def _get_budget_totals_by_portfolio(
+    portfolio_ids: list[int], fiscal_year: int
+) -> dict[int, tuple[Decimal, Decimal, Decimal]]:
+    """
+    Return (total, carry-forward, new) funding budget sums per portfolio for the fiscal year.
 
-
-def get_total_funding(
-    portfolio: Portfolio,
-    fiscal_year: int,
-) -> TotalFunding:
-    """Get the portfolio total funding for the given fiscal year."""
-    total_funding = _get_total_fiscal_year_funding(
-        portfolio_id=portfolio.id,
-        fiscal_year=fiscal_year,
+    Uses the same budget selection as ``_get_all_budgets`` and the same new/carry-forward split as
+    ``_get_all_new_funding_budgets`` and ``_get_all_carry_forward_budgets``.
+    """
+    active_period = case(
+        (func.length(CANFundingDetails.fund_code) == 14, cast(func.substr(CANFundingDetails.fund_code, 11, 1), Integer))
     )
+    is_new = or_(active_period == 1, CANFundingDetails.fiscal_year == fiscal_year)
+    budget = func.coalesce(CANFundingBudget.budget, 0)
 
-    carry_forward_funding = _get_carry_forward_total(
-        portfolio_id=portfolio.id,
-        fiscal_year=fiscal_year,
+    stmt = (
+        select(
+            CAN.portfolio_id,
+            func.sum(budget),
+            func.sum(case((is_new, 0), else_=budget)),
+            func.sum(case((is_new, budget), else_=0)),
+        )
+        .select_from(CANFundingBudget)
+        .join(CAN, CAN.id == CANFundingBudget.can_id)
+        .join(CANFundingDetails, CAN.funding_details_id == CANFundingDetails.id)
+        .where(CAN.portfolio_id.in_(portfolio_ids))
+        .where(CANFundingBudget.fiscal_year == fiscal_year)
+        .where(CANFundingDetails.fiscal_year <= fiscal_year)
+        .where(CANFundingDetails.obligate_by >= fiscal_year)
+        .group_by(CAN.portfolio_id)
     )
 
-    new_funding = _get_new_funding_total(
-        portfolio_id=portfolio.id,
-        fiscal_year=fiscal_year,
-    )
+    return {
+        portfolio_id: (total, carry_forward, new)
+        for portfolio_id, total, carry_forward, new in current_app.db_session.execute(stmt).all()
+    }
 
-    draft_funding = _get_budget_line_item_total_by_status(
-        portfolio_id=portfolio.id,
-        fiscal_year=fiscal_year,
-        status=BudgetLineItemStatus.DRAFT,
-    )
 
-    planned_funding = _get_budget_line_item_total_by_statuses(
-        portfolio_id=portfolio.id,
-        fiscal_year=fiscal_year,
-        statuses=[BudgetLineItemStatus.PLANNED, BudgetLineItemStatus.PLANNED_MOD],
+def _get_budget_line_item_totals_by_portfolio(
+    portfolio_ids: list[int], fiscal_year: int
+) -> dict[tuple[int, BudgetLineItemStatus], Decimal]:
+    """Return the sum of BLI totals (amount plus fees) per (portfolio, status) for the fiscal year."""
+    if current_app.config.get("USE_CAN_FUNDING_ROLLUP", False):
+        stmt = (
+            select(
+                CAN.portfolio_id,
+                CANFundingRollup.status,
+                func.sum(CANFundingRollup.amount + CANFundingRollup.fees),
+            )
+            .join(CAN, CAN.id == CANFundingRollup.can_id)
+            .where(CAN.portfolio_id.in_(portfolio_ids))
+            .where(CANFundingRollup.fiscal_year == fiscal_year)
+            .where(CANFundingRollup.status.isnot(None))
+            .group_by(CAN.portfolio_id, CANFundingRollup.status)
+        )
+        return {
+            (portfolio_id, status): total or Decimal(0)
+            for portfolio_id, status, total in current_app.db_session.execute(stmt).all()
+        }
+
+    # Selecting from budget_line_item alone keeps the correlated subqueries of the fees expression
+    # from being correlated to the CAN join below.
+    line_totals = (
+        select(
+            BudgetLineItem.can_id.label("can_id"),
+            BudgetLineItem.status.label("status"),
+            BudgetLineItem.total.label("total"),
+        )
+        .where(BudgetLineItem.can_id.in_(select(CAN.id).where(CAN.portfolio_id.in_(portfolio_ids))))
+        .where(BudgetLineItem.fiscal_year == fiscal_year)
+        .cte("portfolio_budget_line_item_totals")
     )
 
-    obligated_funding = _get_budget_line_item_total_by_status(
-        portfolio_id=portfolio.id,
-        fiscal_year=fiscal_year,
-        status=BudgetLineItemStatus.OBLIGATED,
+    stmt = (
+        select(CAN.portfolio_id, line_totals.c.status, func.sum(line_totals.c.total))
+        .join(CAN, CAN.id == line_totals.c.can_id)
+        .group_by(CAN.portfolio_id, line_totals.c.status)
     )
 
-    in_execution_funding = _get_budget_line_item_total_by_status(
-        portfolio_id=portfolio.id,
-        fiscal_year=fiscal_year,
-        status=BudgetLineItemStatus.IN_EXECUTION,
-    )
+    return {
+        (portfolio_id, status): total or Decimal(0)
+        for portfolio_id, status, total in current_app.db_session.execute(stmt).all()
+    }
+
+
+def get_total_funding_by_portfolio(portfolio_ids: list[int], fiscal_year: int) -> dict[int, TotalFunding]:
+    """
+    Get the total funding for many portfolios for the given fiscal year.
+
+    Runs one aggregate query over the funding budgets and one over the budget line items regardless of the number
+    of portfolios.
+    """
+    if not portfolio_ids:
+        return {}
 
+    budget_totals = _get_budget_totals_by_portfolio(portfolio_ids, fiscal_year)
+    bli_totals = _get_budget_line_item_totals_by_portfolio(portfolio_ids, fiscal_year)
+
+    def bli_total(portfolio_id: int, *statuses: BudgetLineItemStatus) -> Decimal:
+        return sum(bli_totals.get((portfolio_id, status), Decimal(0)) for status in statuses) or Decimal(0)
+
+    results = {}
+    for portfolio_id in portfolio_ids:
+        total_funding, carry_forward_funding, new_funding = budget_totals.get(
+            portfolio_id, (Decimal(0), Decimal(0), Decimal(0))
+        )
+        results[portfolio_id] = _build_total_funding(
+            total_funding=total_funding,
+            carry_forward_funding=carry_forward_funding,
+            new_funding=new_funding,
+            draft_funding=bli_total(portfolio_id, BudgetLineItemStatus.DRAFT),
+            planned_funding=bli_total(portfolio_id, BudgetLineItemStatus.PLANNED, BudgetLineItemStatus.PLANNED_MOD),
+            obligated_funding=bli_total(portfolio_id, BudgetLineItemStatus.OBLIGATED),
+            in_execution_funding=bli_total(portfolio_id, BudgetLineItemStatus.IN_EXECUTION),
+        )
+
+    return results
+
+
+def _build_total_funding(
+    total_funding: Decimal,
+    carry_forward_funding: Decimal,
+    new_funding: Decimal,
+    draft_funding: Decimal,
+    planned_funding: Decimal,
+    obligated_funding: Decimal,
+    in_execution_funding: Decimal,
+) -> TotalFunding:
     total_accounted_for = (
         sum(
             (
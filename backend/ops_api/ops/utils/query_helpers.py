@@ -3,6 +3,8 @@ from typing import Any, cast
 from sqlalchemy import ColumnElement, Select, and_, or_
 from sqlalchemy.orm import InstrumentedAttribute
 
+from models.search import search_predicate
+
 
 class QueryHelper:
     def __init__(self, stmt: Select[Any]):
@@ -10,7 +12,7 @@ class QueryHelper:
         self.where_clauses: list[Any] = []
 
     def add_search(self, column: InstrumentedAttribute, search_term: str):
-        self.where_clauses.append(column.ilike(f"%{search_term}%"))
+        self.where_clauses.append(search_predicate(column, search_term))
 
     def add_column_equals(self, column: InstrumentedAttribute, value: str):
         self.where_clauses.append(column == value)
@@ -27,7 +29,7 @@ class QueryHelper:
                 # Empty string means return no results
                 self.return_none()
             elif search_term:
-                self.where_clauses.append(column.ilike(f"%{search_term}%"))
+                self.where_clauses.append(search_predicate(column, search_term))
 
     def add_search_list_multi_column(self, columns: list[InstrumentedAttribute], search_terms: list[str]):
         """Add search filters for multiple terms across multiple columns.
@@ -50,7 +52,7 @@ class QueryHelper:
                 # Create OR condition across all columns for this search term
                 # When multiple search terms are used, each term creates a separate WHERE condition
                 # that gets ANDed together, but each evaluates independently across joined rows
-                column_conditions = [column.ilike(f"%{search_term}%") for column in columns]
+                column_conditions = [search_predicate(column, search_term) for column in columns]
                 self.where_clauses.append(or_(*column_conditions))
 
     def return_none(self):
@@ -1,10 +1,14 @@
+import threading
+import time
 from decimal import Decimal
+from typing import Any, Optional
 
-from sqlalchemy import and_, func, select
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
 
 from models import CAN, Agreement, AgreementType, BudgetLineItem, BudgetLineItemStatus, Project
 from models.agreements import AgreementClassification
+from ops_api.ops.services.agreements import award_type_expression
 
 SPENDING_STATUSES = [
     BudgetLineItemStatus.PLANNED,
@@ -34,7 +38,8 @@ def _find_bucket_type(agreement_type):
 
 
 def _accumulate_agreement_spending(agreement, fiscal_year, totals, portfolio_ids=None):
-    """Accumulate BLI spending from a single agreement into totals."""
+    """Accumulate BLI spending from a single loaded agreement into totals (the in-memory equivalent of
+    the query in get_agreement_spending_by_type)."""
     bucket_type = _find_bucket_type(agreement.agreement_type)
     if bucket_type is None:
         return
@@ -54,32 +59,52 @@ def _accumulate_agreement_spending(agreement, fiscal_year, totals, portfolio_ids
             totals[bucket_type][key] += bli.total or Decimal(0)
 
 
+def _bli_total():
+    """SQL equivalent of ``BudgetLineItem.total`` (amount + fees, treating a missing amount as 0)."""
+    return func.coalesce(BudgetLineItem.amount, 0) + func.coalesce(BudgetLineItem.fees, 0)
+
+
+def _bucket_totals_by_award_type(rows) -> dict:
+    """Sum (agreement_type, award_type, value) rows into the spending buckets, split into new and continuing."""
+    totals = {config["type"]: {"new": Decimal(0), "continuing": Decimal(0)} for config in AGREEMENT_TYPE_CONFIG}
+    for agreement_type, award_type, value in rows:
+        bucket_type = _find_bucket_type(agreement_type)
+        if bucket_type is None or award_type is None:
+            continue
+        key = "new" if award_type == AgreementClassification.NEW.name else "continuing"
+        totals[bucket_type][key] += value or 0
+    return totals
+
+
 def get_agreement_spending_by_type(session: Session, fiscal_year: int, portfolio_ids=None) -> dict:
     """Get agreement spending grouped by agreement type for a given fiscal year."""
-    stmt = (
-        select(Agreement)
-        .join(Agreement.budget_line_items)
-        .where(
-            and_(
-                BudgetLineItem.fiscal_year == fiscal_year,
-                BudgetLineItem.status.in_(SPENDING_STATUSES),
-            )
+    # Spending (amount + fees) of each agreement's BLIs in the FY; BLIs without a CAN are not counted
+    agreement_spending = (
+        select(
+            Agreement.agreement_type.label("agreement_type"),
+            award_type_expression(Agreement.id).label("award_type"),
+            func.sum(_bli_total()).label("spending"),
         )
-        .options(
-            joinedload(Agreement.budget_line_items).joinedload(BudgetLineItem.can),
-            joinedload(Agreement.procurement_actions),
+        .select_from(BudgetLineItem)
+        .join(Agreement, BudgetLineItem.agreement_id == Agreement.id)
+        .join(CAN, BudgetLineItem.can_id == CAN.id)
+        .where(
+            BudgetLineItem.fiscal_year == fiscal_year,
+            BudgetLineItem.status.in_(SPENDING_STATUSES),
         )
-        .distinct()
+        .group_by(Agreement.id)
     )
+    if portfolio_ids:
+        agreement_spending = agreement_spending.where(CAN.portfolio_id.in_(portfolio_ids))
+    agreement_spending = agreement_spending.subquery()
 
-    stmt = _apply_portfolio_filter(stmt, portfolio_ids)
-
-    agreements = session.execute(stmt).unique().scalars().all()
-
-    totals = {config["type"]: {"new": Decimal(0), "continuing": Decimal(0)} for config in AGREEMENT_TYPE_CONFIG}
+    stmt = select(
+        agreement_spending.c.agreement_type,
+        agreement_spending.c.award_type,
+        func.sum(agreement_spending.c.spending),
+    ).group_by(agreement_spending.c.agreement_type, agreement_spending.c.award_type)
 
-    for agreement in agreements:
-        _accumulate_agreement_spending(agreement, fiscal_year, totals, portfolio_ids)
+    totals = _bucket_totals_by_award_type(session.execute(stmt).all())
 
     total_spending = sum(t["new"] + t["continuing"] for t in totals.values())
 
@@ -150,40 +175,35 @@ def get_reporting_counts(session: Session, fiscal_year: int, portfolio_ids=None)
     projects = {"total": project_total, "types": project_types}
 
     # --- Agreements: count by grouped type (non-DRAFT BLIs in FY) ---
-    stmt = (
-        select(Agreement)
-        .join(Agreement.budget_line_items)
-        .where(
-            and_(
-                BudgetLineItem.fiscal_year == fiscal_year,
-                BudgetLineItem.status != BudgetLineItemStatus.DRAFT,
-                BudgetLineItem.status.isnot(None),
-            )
-        )
-        .options(
-            joinedload(Agreement.budget_line_items),
-            joinedload(Agreement.procurement_actions),
+    agreement_ids_stmt = select(BudgetLineItem.agreement_id).where(
+        BudgetLineItem.fiscal_year == fiscal_year,
+        BudgetLineItem.status != BudgetLineItemStatus.DRAFT,
+        BudgetLineItem.status.isnot(None),
+    )
+    agreement_ids_stmt = _apply_portfolio_filter(agreement_ids_stmt, portfolio_ids)
+    agreement_awards = (
+        select(
+            Agreement.agreement_type.label("agreement_type"),
+            award_type_expression(Agreement.id).label("award_type"),
         )
-        .distinct()
+        .where(Agreement.id.in_(agreement_ids_stmt))
+        .subquery()
     )
-    stmt = _apply_portfolio_filter(stmt, portfolio_ids)
-    agreements_list = session.execute(stmt).unique().scalars().all()
+    agreement_award_counts = session.execute(
+        select(agreement_awards.c.agreement_type, agreement_awards.c.award_type, func.count()).group_by(
+            agreement_awards.c.agreement_type, agreement_awards.c.award_type
+        )
+    ).all()
 
     agreement_counts = {config["type"]: 0 for config in AGREEMENT_TYPE_CONFIG}
-    new_counts = {config["type"]: 0 for config in AGREEMENT_TYPE_CONFIG}
-    continuing_counts = {config["type"]: 0 for config in AGREEMENT_TYPE_CONFIG}
+    for agreement_type, _, count in agreement_award_counts:
+        bucket_type = _find_bucket_type(agreement_type)
+        if bucket_type is not None:
+            agreement_counts[bucket_type] += count
 
-    for agreement in agreements_list:
-        bucket_type = _find_bucket_type(agreement.agreement_type)
-        if bucket_type is None:
-            continue
-        agreement_counts[bucket_type] += 1
-
-        classification = agreement.award_type
-        if classification == AgreementClassification.NEW.name:
-            new_counts[bucket_type] += 1
-        elif classification == AgreementClassification.CONTINUING.name:
-            continuing_counts[bucket_type] += 1
+    award_counts = _bucket_totals_by_award_type(agreement_award_counts)
+    new_counts = {bucket_type: int(counts["new"]) for bucket_type, counts in award_counts.items()}
+    continuing_counts = {bucket_type: int(counts["continuing"]) for bucket_type, counts in award_counts.items()}
 
     agreements = _build_type_list(agreement_counts)
     new_agreements = _build_type_list(new_counts)
@@ -212,3 +232,66 @@ def get_reporting_counts(session: Session, fiscal_year: int, portfolio_ids=None)
         "continuing_agreements": continuing_agreements,
         "budget_lines": budget_lines,
     }
+
+
+def get_reporting_summary(
+    session: Session, fiscal_year: int, portfolio_ids=None, cache: Optional["ReportingSummaryCache"] = None
+) -> dict:
+    """Get the spending and counts of the reporting summary, from the cache when one is given."""
+    if cache:
+        summary = cache.get(fiscal_year, portfolio_ids)
+        if summary is not None:
+            return summary
+
+    summary = {
+        "spending": get_agreement_spending_by_type(session, fiscal_year, portfolio_ids=portfolio_ids),
+        "counts": get_reporting_counts(session, fiscal_year, portfolio_ids=portfolio_ids),
+    }
+    if cache:
+        cache.set(fiscal_year, portfolio_ids, summary)
+    return summary
+
+
+class ReportingSummaryCache:
+    """
+    Per-process cache of reporting summaries keyed by (fiscal_year, portfolio_ids).
+
+    Summaries are served for ``ttl`` seconds after they are computed, so changes to budget lines and agreements
+    show up in the reporting summary after at most ``ttl`` seconds. At most ``max_entries`` summaries are kept;
+    the oldest is evicted first.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 256) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: dict[tuple, tuple[float, dict]] = {}
+
+    @staticmethod
+    def _key(fiscal_year: int, portfolio_ids) -> tuple:
+        return fiscal_year, tuple(sorted(set(portfolio_ids or [])))
+
+    def get(self, fiscal_year: int, portfolio_ids=None) -> Optional[dict[str, Any]]:
+        key = self._key(fiscal_year, portfolio_ids)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            computed_at, summary = entry
+            if time.monotonic() - computed_at > self.ttl:
+                del self._entries[key]
+                return None
+            return summary
+
+    def set(self, fiscal_year: int, portfolio_ids, summary: dict[str, Any]) -> None:
+        key = self._key(fiscal_year, portfolio_ids)
+        with self._lock:
+            self._entries.pop(key, None)
+            while len(self._entries) >= self.max_entries:
+                # dicts keep insertion order, so the first entry is the oldest
+                del self._entries[next(iter(self._entries))]
+            self._entries[key] = (time.monotonic(), summary)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
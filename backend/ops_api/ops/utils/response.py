@@ -1,6 +1,11 @@
 from __future__ import annotations
 
-from flask import Response, make_response
+import gzip
+
+import brotli
+from flask import Response, make_response, request
+
+COMPRESSIBLE_MIMETYPES = {"application/json"}
 
 
 def make_response_with_headers(data: str | dict | list | None = None, status_code: int = 200) -> Response:
@@ -10,3 +15,41 @@ def make_response_with_headers(data: str | dict | list | None = None, status_cod
     # Will evaluate the continued need of this then refactor.
     # response.headers.add("Access-Control-Allow-Origin", current_app.config.get("OPS_FRONTEND_URL"))
     return response
+
+
+def compress_response(response: Response, min_size: int, level: int) -> Response:
+    """
+    Compress a JSON response with brotli or gzip, if the client accepts it and the body is at least ``min_size``
+    bytes. ``level`` is the gzip level (1-9) or brotli quality (0-11).
+
+    The ETag of a compressed response is made weak, since the compressed bytes differ from those it was computed
+    from. Streamed responses (e.g. the notification stream) are left alone.
+    """
+    if (
+        response.direct_passthrough
+        or response.is_streamed
+        or response.status_code < 200
+        or response.status_code in (204, 206, 304)
+        or "Content-Encoding" in response.headers
+        or response.mimetype not in COMPRESSIBLE_MIMETYPES
+    ):
+        return response
+
+    response.vary.add("Accept-Encoding")
+    encoding = request.accept_encodings.best_match(["br", "gzip"])
+    if encoding is None:
+        return response
+
+    data = response.get_data()
+    if len(data) < min_size:
+        return response
+
+    if encoding == "br":
+        response.set_data(brotli.compress(data, quality=min(level, 11)))
+    else:
+        response.set_data(gzip.compress(data, compresslevel=level))
+    response.headers["Content-Encoding"] = encoding
+    etag, is_weak = response.get_etag()
+    if etag and not is_weak:
+        response.set_etag(etag, weak=True)
+    return response
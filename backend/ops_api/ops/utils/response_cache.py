@@ -0,0 +1,315 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Callable, Iterable, Optional, Protocol, Union
+
+import redis
+from flask import Config, Response, current_app, request
+from flask_jwt_extended import current_user
+from loguru import logger
+from sqlalchemy import inspect
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from models import OpsEvent, OpsEventType
+
+# The tables read by the cached endpoints; writes to any other table never invalidate a cached response.
+WATCHED_TABLES: set[str] = set()
+
+# Tables changed by the side effects of an event, for writes that are not made through the request's session
+EVENT_TYPE_TABLES: dict[OpsEventType, tuple[str, ...]] = {
+    OpsEventType.CREATE_BLI: ("budget_line_item",),
+    OpsEventType.UPDATE_BLI: ("budget_line_item",),
+    OpsEventType.DELETE_BLI: ("budget_line_item",),
+    OpsEventType.CREATE_NEW_AGREEMENT: ("agreement",),
+    OpsEventType.UPDATE_AGREEMENT: ("agreement", "budget_line_item"),
+    OpsEventType.DELETE_AGREEMENT: ("agreement", "budget_line_item"),
+    OpsEventType.UPDATE_CHANGE_REQUEST: ("agreement", "budget_line_item"),
+    OpsEventType.CREATE_NEW_CAN: ("can",),
+    OpsEventType.UPDATE_CAN: ("can",),
+    OpsEventType.DELETE_CAN: ("can",),
+    OpsEventType.CREATE_CAN_FUNDING_BUDGET: ("can_funding_budget",),
+    OpsEventType.UPDATE_CAN_FUNDING_BUDGET: ("can_funding_budget",),
+    OpsEventType.DELETE_CAN_FUNDING_BUDGET: ("can_funding_budget",),
+    OpsEventType.CREATE_CAN_FUNDING_DETAILS: ("can_funding_details",),
+    OpsEventType.UPDATE_CAN_FUNDING_DETAILS: ("can_funding_details",),
+    OpsEventType.DELETE_CAN_FUNDING_DETAILS: ("can_funding_details",),
+    OpsEventType.CREATE_PROJECT: ("project",),
+    OpsEventType.UPDATE_PROJECT: ("project",),
+    OpsEventType.CREATE_PORTFOLIO_URL: ("portfolio_url",),
+    OpsEventType.UPDATE_PORTFOLIO_URL: ("portfolio_url",),
+    OpsEventType.DELETE_PORTFOLIO_URL: ("portfolio_url",),
+    OpsEventType.CREATE_PROCUREMENT_SHOP: ("procurement_shop", "procurement_shop_fee"),
+    OpsEventType.UPDATE_PROCUREMENT_SHOP: ("procurement_shop", "procurement_shop_fee", "budget_line_item"),
+    OpsEventType.DELETE_PROCUREMENT_SHOP: ("procurement_shop", "procurement_shop_fee"),
+}
+
+_CHANGED_TABLES_KEY = "response_cache_changed_tables"
+
+
+class ResponseCacheBackend(Protocol):
+    """
+    Stores cached responses and the version counter of every watched table.
+    """
+
+    def get(self, key: str) -> Optional[str]: ...
+
+    def set(self, key: str, value: str, ttl: float) -> None: ...
+
+    def get_versions(self, tables: list[str]) -> list[int]: ...
+
+    def incr_versions(self, tables: list[str]) -> None: ...
+
+    def clear(self) -> None: ...
+
+
+class InProcessLRUBackend:
+    """
+    Per-process cache of at most ``max_entries`` responses; the least recently used is evicted first.
+
+    Only suitable for a single process (and for tests): a write handled by one process does not invalidate the
+    responses cached by the others. Use ``RedisResponseCacheBackend`` when the API runs in several processes.
+    """
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        # kept apart from the entries so a table version is never evicted (and reset) while responses built
+        # from an older version of the table are still cached
+        self._versions: dict[str, int] = {}
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_versions(self, tables: list[str]) -> list[int]:
+        with self._lock:
+            return [self._versions.get(table, 0) for table in tables]
+
+    def incr_versions(self, tables: list[str]) -> None:
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+
+
+class RedisResponseCacheBackend:
+    """
+    Cache shared by every API process in Redis (or any server speaking the Redis protocol).
+
+    Responses expire with the Redis key TTL; table versions never expire, so an invalidation made by one
+    process is seen by all of them.
+    """
+
+    def __init__(self, client, prefix: str = "ops:response-cache:") -> None:
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "RedisResponseCacheBackend":
+        return cls(redis.Redis.from_url(url, decode_responses=True), **kwargs)
+
+    def get(self, key: str) -> Optional[str]:
+        return self.client.get(f"{self.prefix}response:{key}")
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        self.client.set(f"{self.prefix}response:{key}", value, px=max(int(ttl * 1000), 1))
+
+    def get_versions(self, tables: list[str]) -> list[int]:
+        if not tables:
+            return []
+        return [int(version or 0) for version in self.client.mget([f"{self.prefix}version:{t}" for t in tables])]
+
+    def incr_versions(self, tables: list[str]) -> None:
+        for table in tables:
+            self.client.incr(f"{self.prefix}version:{table}")
+
+    def clear(self) -> None:
+        for key in self.client.scan_iter(match=f"{self.prefix}*"):
+            self.client.delete(key)
+
+
+class ResponseCache:
+    """
+    Cache of the responses of read-heavy GET endpoints (see ``cached_response``).
+
+    Every watched table has a version counter and the cache key of a response includes the versions of the
+    tables it was built from, so bumping the version of a table (``invalidate``) makes every response that
+    read it a miss without having to find and delete those responses.
+    """
+
+    def __init__(self, backend: ResponseCacheBackend) -> None:
+        self.backend = backend
+
+    def key(self, endpoint_key: str, tables: Iterable[str]) -> str:
+        tables = sorted(tables)
+        versions = self.backend.get_versions(tables)
+        raw_key = json.dumps([endpoint_key, dict(zip(tables, versions, strict=True))])
+        return hashlib.sha256(raw_key.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Response]:
+        value = self.backend.get(key)
+        if value is None:
+            return None
+        cached = json.loads(value)
+        return Response(cached["body"], status=200, mimetype=cached["mimetype"])
+
+    def set(self, key: str, response: Response, ttl: float) -> None:
+        value = json.dumps({"body": response.get_data(as_text=True), "mimetype": response.mimetype})
+        self.backend.set(key, value, ttl)
+
+    def invalidate(self, *tables: str) -> None:
+        tables = sorted(set(tables) & WATCHED_TABLES)
+        if tables:
+            logger.debug(f"Invalidating cached responses built from {tables}")
+            self.backend.incr_versions(tables)
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+
+def only_my_requested() -> bool:
+    """True when the request asks for the current user's items only, which makes the response user-specific."""
+    return "only_my" in request.args
+
+
+def _permission_scope(per_user: bool) -> list:
+    """The part of the cache key identifying who may see the response: the user's roles (and id)."""
+    scope: list = sorted(role.name for role in current_user.roles) if current_user else []
+    if per_user:
+        scope.append(current_user.id if current_user else None)
+    return scope
+
+
+def cached_response(ttl: float, tables: Iterable[str], per_user: Union[bool, Callable[[], bool]] = False):
+    """
+    Serve a GET endpoint from ``current_app.response_cache`` for up to ``ttl`` seconds.
+
+    ``tables`` are the tables the response is built from; a committed write to any of them invalidates it.
+    Responses are shared by users with the same roles unless ``per_user`` is true (or returns true for the
+    request). Use it below ``is_authorized``, so the user is authorized before a cached response is returned.
+    """
+    tables = tuple(tables)
+    WATCHED_TABLES.update(tables)
+
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            cache: Optional[ResponseCache] = getattr(current_app, "response_cache", None)
+            if cache is None or request.method != "GET":
+                return f(*args, **kwargs)
+
+            is_per_user = per_user() if callable(per_user) else per_user
+            endpoint_key = json.dumps(
+                [
+                    request.endpoint,
+                    kwargs,
+                    sorted(request.args.items(multi=True)),
+                    _permission_scope(is_per_user),
+                ],
+                default=str,
+            )
+            try:
+                key = cache.key(endpoint_key, tables)
+                response = cache.get(key)
+            except Exception as e:
+                logger.error(f"Error reading the response cache: {e}")
+                return f(*args, **kwargs)
+
+            if response is not None:
+                response.headers["X-Cache"] = "HIT"
+                return response
+
+            response = f(*args, **kwargs)
+            if isinstance(response, Response) and response.status_code == 200 and not response.is_streamed:
+                try:
+                    cache.set(key, response, ttl)
+                except Exception as e:
+                    logger.error(f"Error writing the response cache: {e}")
+                response.headers["X-Cache"] = "MISS"
+            return response
+
+        return decorated
+
+    return decorator
+
+
+def add_changed_tables(session: Session, tables: Iterable[str]) -> None:
+    """Remember tables changed in the current transaction, to invalidate their responses when it commits."""
+    session.info.setdefault(_CHANGED_TABLES_KEY, set()).update(tables)
+
+
+def collect_flushed_tables(session: Session) -> None:
+    """Remember the tables of the objects written by a flush (an after_flush listener)."""
+    objects = [*session.new, *session.dirty, *session.deleted]
+    add_changed_tables(session, {table.name for obj in objects for table in inspect(obj).mapper.tables})
+
+
+def collect_executed_tables(orm_execute_state: ORMExecuteState) -> None:
+    """Remember the table of an INSERT, UPDATE or DELETE statement run by the session (a do_orm_execute listener)."""
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None and getattr(table, "name", None):
+            add_changed_tables(orm_execute_state.session, {table.name})
+
+
+def invalidate_committed_tables(cache: ResponseCache, session: Session) -> None:
+    """Invalidate the responses built from the tables changed by a committed transaction (on after_commit)."""
+    tables = session.info.pop(_CHANGED_TABLES_KEY, set())
+    if not tables:
+        return
+    try:
+        cache.invalidate(*tables)
+    except Exception as e:
+        logger.error(f"Error invalidating cached responses of {sorted(tables)}: {e}")
+
+
+def discard_changed_tables(session: Session) -> None:
+    """Forget the tables changed by a rolled back transaction (an after_rollback listener)."""
+    session.info.pop(_CHANGED_TABLES_KEY, None)
+
+
+def response_cache_trigger_func(event: OpsEvent, session: Session) -> None:
+    """Invalidate, when the request's transaction commits, the responses built from tables changed by the event."""
+    tables = EVENT_TYPE_TABLES.get(event.event_type)
+    if tables:
+        add_changed_tables(session, tables)
+
+
+def create_response_cache(config: Config) -> Optional[ResponseCache]:
+    """Return the configured response cache, or None when responses are not cached."""
+    backend_type = (config.get("RESPONSE_CACHE_BACKEND") or "").lower()
+
+    backend: ResponseCacheBackend
+    if backend_type == "memory":
+        backend = InProcessLRUBackend(config.get("RESPONSE_CACHE_MAX_ENTRIES", 1024))
+    elif backend_type == "redis":
+        backend = RedisResponseCacheBackend.from_url(config.get("RESPONSE_CACHE_REDIS_URL"))
+    elif not backend_type:
+        return None
+    else:
+        raise ValueError(f"Unknown RESPONSE_CACHE_BACKEND {backend_type}")
+
+    return ResponseCache(backend)
@@ -78,7 +78,12 @@ from ops_api.ops.resources.change_requests import (
 from ops_api.ops.resources.divisions import DivisionsItemAPI, DivisionsListAPI
 from ops_api.ops.resources.grant_number import GrantNumberItemAPI, GrantNumberListAPI
 from ops_api.ops.resources.health_check import HealthCheckAPI
-from ops_api.ops.resources.notifications import NotificationItemAPI, NotificationListAPI
+from ops_api.ops.resources.notifications import (
+    NotificationItemAPI,
+    NotificationListAPI,
+    NotificationStreamAPI,
+    NotificationUnreadCountAPI,
+)
 from ops_api.ops.resources.portfolio_cans import PortfolioCansAPI
 from ops_api.ops.resources.portfolio_funding_summary import (
     PortfolioFundingSummaryItemAPI,
@@ -125,6 +130,7 @@ from ops_api.ops.resources.research_methodology import (
     ResearchMethodologyListAPI,
 )
 from ops_api.ops.resources.research_type import ResearchTypeListAPI
+from ops_api.ops.resources.search import SearchListAPI
 from ops_api.ops.resources.services_component import (
     ServicesComponentItemAPI,
     ServicesComponentListAPI,
@@ -245,6 +251,9 @@ PORTFOLIO_FUNDING_SUMMARY_LIST_API_VIEW_FUNC = PortfolioFundingSummaryListAPI.as
 )
 REPORTING_SUMMARY_LIST_API_VIEW_FUNC = ReportingSummaryListAPI.as_view("reporting-summary-list", Agreement)
 
+# SEARCH ENDPOINTS
+SEARCH_LIST_API_VIEW_FUNC = SearchListAPI.as_view("search-list", Agreement)
+
 # FUNDING BUDGET ENDPOINTS
 CAN_FUNDING_BUDGET_ITEM_API_VIEW_FUNC = CANFundingBudgetItemAPI.as_view("can-funding-budget-item", CANFundingBudget)
 CAN_FUNDING_BUDGET_LIST_API_VIEW_FUNC = CANFundingBudgetListAPI.as_view("can-funding-budget-group", CANFundingBudget)
@@ -281,6 +290,10 @@ HEALTH_CHECK_VIEW_FUNC = HealthCheckAPI.as_view("health-check")
 # NOTIFICATIONS ENDPOINTS
 NOTIFICATIONS_ITEM_API_VIEW_FUNC = NotificationItemAPI.as_view("notifications-item", Notification)
 NOTIFICATIONS_LIST_API_VIEW_FUNC = NotificationListAPI.as_view("notifications-group", Notification)
+NOTIFICATIONS_UNREAD_COUNT_API_VIEW_FUNC = NotificationUnreadCountAPI.as_view(
+    "notifications-unread-count", Notification
+)
+NOTIFICATIONS_STREAM_API_VIEW_FUNC = NotificationStreamAPI.as_view("notifications-stream", Notification)
 
 # ServicesComponent ENDPOINTS
 SERVICES_COMPONENT_ITEM_API_VIEW_FUNC = ServicesComponentItemAPI.as_view("services-component-item", ServicesComponent)
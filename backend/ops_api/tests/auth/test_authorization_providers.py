@@ -0,0 +1,67 @@
+from flask import url_for
+from sqlalchemy import select
+
+from models.users import User
+from ops_api.ops.auth import authorization_providers
+from ops_api.ops.auth.authorization_providers import (
+    BasicAuthorizationProvider,
+    clear_user_permissions,
+    get_user_permissions,
+)
+
+UNIT_TEST_OIDC_ID = "00000000-0000-1111-a111-000000000004"
+
+
+def _expected_permissions(loaded_db, oidc_id: str) -> frozenset[str]:
+    user = loaded_db.scalars(select(User).where(User.oidc_id == oidc_id)).one()
+    return frozenset(p for role in user.roles for p in role.permissions)
+
+
+def test_get_user_permissions(app, loaded_db):
+    with app.test_request_context():
+        permissions = get_user_permissions(UNIT_TEST_OIDC_ID)
+
+    assert permissions
+    assert permissions == _expected_permissions(loaded_db, UNIT_TEST_OIDC_ID)
+
+
+def test_get_user_permissions_unknown_user(app, loaded_db):
+    with app.test_request_context():
+        assert get_user_permissions("00000000-0000-0000-0000-000000000000") == frozenset()
+
+
+def test_get_user_permissions_resolved_once_per_request(app, loaded_db, mocker):
+    spy = mocker.spy(authorization_providers, "_resolve_user_permissions")
+
+    with app.test_request_context():
+        provider = BasicAuthorizationProvider()
+        provider.is_authorized(UNIT_TEST_OIDC_ID, "GET_AGREEMENT")
+        provider.is_authorized(UNIT_TEST_OIDC_ID, "PUT_AGREEMENT")
+        get_user_permissions(UNIT_TEST_OIDC_ID)
+        assert spy.call_count == 1
+
+        clear_user_permissions()
+        get_user_permissions(UNIT_TEST_OIDC_ID)
+        assert spy.call_count == 2
+
+
+def test_basic_authorization_provider(app, loaded_db):
+    with app.test_request_context():
+        provider = BasicAuthorizationProvider()
+        permissions = get_user_permissions(UNIT_TEST_OIDC_ID)
+
+        assert all(provider.is_authorized(UNIT_TEST_OIDC_ID, permission) for permission in permissions)
+        assert provider.is_authorized(UNIT_TEST_OIDC_ID, "NOT_A_PERMISSION") is False
+
+
+def test_permissions_resolved_once_per_api_request(auth_client, app_ctx, mocker):
+    spy = mocker.spy(authorization_providers, "_resolve_user_permissions")
+
+    response = auth_client.get(url_for("api.agreements-group"))
+    assert response.status_code == 200
+    assert spy.call_count == 1
+
+    # A new request resolves the permissions again, so role changes are picked up
+    response = auth_client.get(url_for("api.agreements-group"))
+    assert response.status_code == 200
+    assert spy.call_count == 2
@@ -0,0 +1,150 @@
+from datetime import datetime, timedelta
+
+import pytest
+from flask_jwt_extended import verify_jwt_in_request
+
+from ops_api.ops.auth.decorators import check_user_session_function
+from ops_api.ops.auth.exceptions import InvalidUserSessionError
+from ops_api.ops.auth.service import logout, refresh
+from ops_api.ops.auth.session_activity import UserSessionActivityTracker
+
+
+@pytest.fixture()
+def user_session(mocker):
+    user_session = mocker.MagicMock()
+    user_session.id = 1
+    user_session.is_active = True
+    user_session.access_token = "access-token"  # noqa: S105
+    user_session.last_active_at = datetime.now()
+    return user_session
+
+
+@pytest.fixture()
+def tracker():
+    return UserSessionActivityTracker(cache_ttl=timedelta(minutes=1), flush_interval=timedelta(minutes=1))
+
+
+def test_get_cached(tracker, user_session):
+    assert tracker.get_cached(503, "access-token") is None
+
+    tracker.track(503, user_session)
+
+    tracked = tracker.get_cached(503, "access-token")
+    assert tracked.user_session_id == user_session.id
+    assert tracked.last_active_at == user_session.last_active_at
+    assert tracker.get_cached(503, None) == tracked
+    assert tracker.get_cached(503, "another-token") is None
+    assert tracker.get_cached(504, "access-token") is None
+
+
+def test_get_cached_expires(user_session):
+    tracker = UserSessionActivityTracker(cache_ttl=timedelta(0), flush_interval=timedelta(minutes=1))
+    tracker.track(503, user_session)
+
+    assert tracker.get_cached(503, "access-token") is None
+
+
+def test_record_activity_is_written_behind(tracker, user_session, mocker):
+    session = mocker.MagicMock()
+    tracker.track(503, user_session)
+    tracked = tracker.get_cached(503, "access-token")
+
+    tracker.record_activity(tracked, session)
+
+    assert not session.execute.called
+    assert tracker.last_active_at(503, user_session.id) == tracked.last_active_at
+    assert tracked.last_active_at > user_session.last_active_at
+
+
+def test_flush_batches_pending_activity(user_session, mocker):
+    tracker = UserSessionActivityTracker(cache_ttl=timedelta(minutes=1), flush_interval=timedelta(0))
+    other_session = mocker.MagicMock(id=2, access_token="other-token", last_active_at=datetime.now())  # noqa: S106
+    session = mocker.MagicMock()
+    tracker.track(503, user_session)
+    tracker.track(504, other_session)
+
+    tracker.record_activity(tracker.get_cached(503, None), mocker.MagicMock())
+    tracker.record_activity(tracker.get_cached(504, None), session)
+
+    assert session.execute.call_count == 1
+    _, params = session.execute.call_args.args
+    assert {param["id"] for param in params} == {other_session.id}
+    session.commit.assert_called_once()
+
+    session.reset_mock()
+    tracker.flush(session)
+    assert not session.execute.called
+
+
+def test_forget(tracker, user_session):
+    tracker.track(503, user_session)
+    tracker.forget([503])
+
+    assert tracker.get_cached(503, None) is None
+    assert tracker.last_active_at(503, user_session.id) is None
+
+
+def test_check_user_session_validates_from_cache(app, app_ctx, user_session, mocker):
+    mock_get_latest_user_session = mocker.patch(
+        "ops_api.ops.auth.decorators.get_latest_user_session", return_value=user_session
+    )
+    mocker.patch("ops_api.ops.auth.decorators.get_all_active_user_sessions", return_value=[user_session])
+    mocker.patch("ops_api.ops.auth.decorators.get_bearer_token", return_value="Bearer access-token")
+    mock_db_session = mocker.patch("flask.current_app.db_session")
+    user = mocker.MagicMock(id=503)
+
+    with app.test_request_context("/api/v1/agreements/"):
+        verify_jwt_in_request(optional=True)
+        check_user_session_function(user)
+        check_user_session_function(user)
+        check_user_session_function(user)
+
+    assert mock_get_latest_user_session.call_count == 1
+    assert mock_db_session.commit.call_count == 1
+
+
+def test_check_user_session_revalidates_idle_cached_session(app, app_ctx, user_session, mocker):
+    user_session.last_active_at = datetime.now() - timedelta(minutes=31)
+    app.user_session_tracker.track(503, user_session)
+
+    mock_get_latest_user_session = mocker.patch(
+        "ops_api.ops.auth.decorators.get_latest_user_session", return_value=user_session
+    )
+    mocker.patch("ops_api.ops.auth.decorators.get_all_active_user_sessions", return_value=[])
+    mocker.patch("ops_api.ops.auth.decorators.get_bearer_token", return_value="Bearer access-token")
+    mock_idle_logout = mocker.patch("ops_api.ops.auth.decorators.idle_logout")
+    user = mocker.MagicMock(id=503)
+
+    with app.test_request_context("/api/v1/agreements/"):
+        verify_jwt_in_request(optional=True)
+        with pytest.raises(InvalidUserSessionError):
+            check_user_session_function(user)
+
+    assert mock_get_latest_user_session.call_count == 1
+    mock_idle_logout.assert_called_once()
+
+
+def test_refresh_forgets_cached_session(app, app_ctx, user_session, mocker):
+    app.user_session_tracker.track(503, user_session)
+    mocker.patch("ops_api.ops.auth.service.current_user", mocker.MagicMock(id=503, roles=[]))
+    mocker.patch("ops_api.ops.auth.service.get_latest_user_session", return_value=user_session)
+    mocker.patch("ops_api.ops.auth.service.is_token_expired", return_value=True)
+    mocker.patch("ops_api.ops.auth.service.create_access_token", return_value="new-access-token")
+    mocker.patch("flask.current_app.db_session")
+
+    assert refresh() == {"access_token": "new-access-token"}  # noqa: S105
+    assert app.user_session_tracker.get_cached(503, "access-token") is None
+    assert app.user_session_tracker.get_cached(503, None) is None
+
+
+def test_logout_forgets_cached_session(app, app_ctx, user_session, mocker):
+    app.user_session_tracker.track(503, user_session)
+    mocker.patch("ops_api.ops.auth.service.OpsEventHandler")
+    mocker.patch("ops_api.ops.auth.service.get_jwt_identity", return_value="00000000-0000-1111-a111-000000000018")
+    mocker.patch("ops_api.ops.auth.service.current_user", mocker.MagicMock(id=503, email="user@example.com"))
+    mocker.patch("ops_api.ops.auth.service.get_all_active_user_sessions", return_value=[])
+    mocker.patch("flask.current_app.db_session")
+
+    logout()
+
+    assert app.user_session_tracker.get_cached(503, None) is None
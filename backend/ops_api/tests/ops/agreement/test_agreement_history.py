@@ -1,6 +1,6 @@
 from datetime import datetime, timedelta
 
-from sqlalchemy import select
+from sqlalchemy import event, select
 
 from models import (
     AgreementHistory,
@@ -1653,6 +1653,74 @@ def test_add_history_events_deduplicates_with_different_ops_event_ids(loaded_db,
     loaded_db.commit()
 
 
+def test_add_history_events_deduplicates_across_minute_boundaries(loaded_db, app_ctx):
+    """Events less than a minute apart are duplicates even when they fall in different minutes."""
+    event1 = AgreementHistory(
+        agreement_id=1,
+        agreement_id_record=1,
+        history_title="Test Event",
+        history_message="Boundary message",
+        timestamp="2024-10-01T12:00:30.000000Z",
+        history_type=AgreementHistoryType.AGREEMENT_UPDATED,
+    )
+    event2 = AgreementHistory(
+        agreement_id=1,
+        agreement_id_record=1,
+        history_title="Test Event",
+        history_message="Boundary message",
+        timestamp="2024-10-01T12:01:25.000000Z",
+        history_type=AgreementHistoryType.AGREEMENT_UPDATED,
+    )
+    event3 = AgreementHistory(
+        agreement_id=1,
+        agreement_id_record=1,
+        history_title="Test Event",
+        history_message="Boundary message",
+        timestamp="2024-10-01T12:02:26.000000Z",
+        history_type=AgreementHistoryType.AGREEMENT_UPDATED,
+    )
+
+    add_history_events([event1, event2, event3], loaded_db)
+
+    assert event1 in loaded_db.new
+    assert event2 not in loaded_db.new
+    assert event3 in loaded_db.new, "more than a minute after the added event is not a duplicate"
+    loaded_db.rollback()
+
+
+def test_add_history_events_reads_existing_events_once(loaded_db, app_ctx):
+    """The existing events are read in one query however many events are added."""
+    statements = []
+
+    def count_statement(conn, clauseelement, multiparams, params, execution_options):
+        statements.append(clauseelement)
+
+    events = [
+        AgreementHistory(
+            agreement_id=agreement_id,
+            agreement_id_record=agreement_id,
+            history_title="Test Event",
+            history_message=f"Batched message {i}",
+            timestamp=timestamp,
+            history_type=AgreementHistoryType.AGREEMENT_UPDATED,
+        )
+        for agreement_id in (1, 2)
+        for i in range(15)
+    ]
+
+    loaded_db.flush()
+    connection = loaded_db.connection()
+    event.listen(connection, "before_execute", count_statement)
+    try:
+        add_history_events(events, loaded_db)
+    finally:
+        event.remove(connection, "before_execute", count_statement)
+
+    assert len(statements) == 1
+    assert all(history_event in loaded_db.new for history_event in events)
+    loaded_db.rollback()
+
+
 class TestGetProjectDisplayName:
     def test_returns_none_string_when_project_is_none(self):
         assert get_project_display_name(None) == "None"
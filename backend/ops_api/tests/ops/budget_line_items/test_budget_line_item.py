@@ -714,6 +714,30 @@ def test_budget_line_item_fiscal_year(
     ), "test_bli_new_previous_fiscal_year.date_needed == 2042-09-01"
 
 
+def test_budget_line_item_stored_fiscal_year(
+    loaded_db,
+    test_bli_new,
+    test_bli_new_previous_year,
+    test_bli_new_no_need_by_date,
+    app_ctx,
+):
+    stmt = select(BudgetLineItem.id).where(
+        BudgetLineItem.id.in_([test_bli_new.id, test_bli_new_previous_year.id, test_bli_new_no_need_by_date.id])
+    )
+    assert set(loaded_db.scalars(stmt.where(BudgetLineItem.fiscal_year == 2043))) == {
+        test_bli_new.id,
+        test_bli_new_previous_year.id,
+    }
+    assert set(loaded_db.scalars(stmt.where(BudgetLineItem.fiscal_year.is_(None)))) == {test_bli_new_no_need_by_date.id}
+
+    # the stored column follows date_needed
+    test_bli_new.date_needed = datetime.date(2043, 10, 1)
+    loaded_db.commit()
+    assert test_bli_new._fiscal_year == 2044
+    assert set(loaded_db.scalars(stmt.where(BudgetLineItem.fiscal_year == 2044))) == {test_bli_new.id}
+    assert "_fiscal_year" not in test_bli_new.to_dict()
+
+
 def test_budget_line_item_portfolio_id_null(auth_client, loaded_db, test_bli_new_no_can, app_ctx):
     assert test_bli_new_no_can.portfolio_id is None
     response = auth_client.get(f"/api/v1/budget-line-items/{test_bli_new_no_can.id}")
@@ -2957,6 +2981,83 @@ def test_get_budget_line_items_filter_by_can_active_period_with_null_cans(auth_c
         assert item["can_id"] is not None, "BLIs with null CAN should be filtered out"
 
 
+def test_get_budget_line_items_pages_are_disjoint_and_complete(auth_client, loaded_db, app_ctx):
+    """
+    Test that paging in SQL returns consecutive, non-overlapping pages that together cover the filtered set.
+    """
+    query_string = {"sort_conditions": "TOTAL", "sort_descending": True, "enable_obe": True, "portfolio": 1}
+
+    response = auth_client.get(url_for("api.budget-line-items-group"), query_string={**query_string, "limit": 50})
+    assert response.status_code == 200
+    total_count = response.json[0]["_meta"]["total_count"]
+
+    seen_ids = []
+    for offset in range(0, total_count, 10):
+        page = auth_client.get(
+            url_for("api.budget-line-items-group"),
+            query_string={**query_string, "limit": 10, "offset": offset},
+        )
+        assert page.status_code == 200
+        assert all(item["_meta"]["total_count"] == total_count for item in page.json)
+        seen_ids.extend(item["id"] for item in page.json)
+
+    assert len(seen_ids) == len(set(seen_ids)) == total_count
+
+
+@pytest.fixture()
+def large_budget_lines(loaded_db, test_can):
+    """Two budget lines above the 4,500,000,000 total range minimum (more than any seeded one) and one below it."""
+    blis = [
+        ContractBudgetLineItem(
+            line_description=f"Total Range {amount}",
+            agreement_id=1,
+            can_id=test_can.id,
+            amount=amount,
+            status=BudgetLineItemStatus.PLANNED,
+            date_needed=datetime.date(2043, 1, 1),
+            created_by=1,
+        )
+        for amount in (5_000_000_000, 6_000_000_000, 4_000_000)
+    ]
+    loaded_db.add_all(blis)
+    loaded_db.commit()
+
+    yield blis
+
+    loaded_db.rollback()
+    for bli in blis:
+        loaded_db.delete(bli)
+    loaded_db.commit()
+
+
+def test_get_budget_line_items_total_range_filter_applies_to_count_and_totals(
+    auth_client, loaded_db, large_budget_lines, app_ctx
+):
+    """
+    Test that the budget line total range filter is reflected in the SQL count and totals.
+    """
+    response = auth_client.get(
+        url_for("api.budget-line-items-group"),
+        query_string={
+            "budget_line_total_min": 4_500_000_000,
+            "include_fees": True,
+            "enable_obe": True,
+            "limit": 50,
+            "offset": 0,
+        },
+    )
+
+    assert response.status_code == 200
+    assert sorted(item["id"] for item in response.json) == [large_budget_lines[0].id, large_budget_lines[1].id]
+
+    meta = response.json[0]["_meta"]
+    expected_total = sum(item["amount"] + (item["fees"] or 0) for item in response.json)
+    assert meta["total_count"] == 2
+    assert meta["total_amount"] == pytest.approx(expected_total)
+    assert meta["total_planned_amount"] == pytest.approx(expected_total)
+    assert meta["total_amount"] >= 11_000_000_000
+
+
 def test_get_budget_line_items_sort_by_agreement_type(auth_client, loaded_db, app_ctx):
     """
     Test sorting budget line items by agreement type.
@@ -0,0 +1,138 @@
+"""
+Tests of the SQL budget line filter options, which are computed with a fixed number of queries however many
+budget lines there are, and a benchmark showing that their memory use and latency do not grow with the number
+of budget lines (run it with ``pytest -m benchmark -s`` to see the logged measurements).
+"""
+
+import time
+import tracemalloc
+
+import pytest
+from loguru import logger
+from sqlalchemy import event, func, select
+
+from models import BudgetLineItem, BudgetLineItemStatus, ContractBudgetLineItem, User
+from ops_api.ops.services.budget_line_items import BudgetLineItemService
+from ops_api.ops.utils.agreements_helpers import check_user_association
+
+EXTRA_BUDGET_LINE_COUNT = 20
+BENCHMARK_BUDGET_LINE_COUNT = 1000
+
+
+def _filter_options_from_objects(session, user, only_my, enable_obe):
+    """The filter options computed from the loaded budget lines, as the service used to."""
+    blis = session.scalars(select(BudgetLineItem)).all()
+    if only_my:
+        blis = [bli for bli in blis if check_user_association(bli.agreement, user)]
+
+    statuses = {bli.status.name for bli in blis if bli.status}
+    if enable_obe and any(bli.is_obe for bli in blis):
+        statuses.add("Overcome by Events")
+    totals = [bli.total for bli in blis]
+    return {
+        "fiscal_years": sorted({bli.fiscal_year for bli in blis if bli.fiscal_year}, reverse=True),
+        "statuses": statuses,
+        "portfolios": sorted(
+            {(bli.can.portfolio.id, bli.can.portfolio.name) for bli in blis if bli.can and bli.can.portfolio}
+        ),
+        "budget_line_total_range": (min(totals, default=0), max(totals, default=0)),
+        "agreement_types": sorted(
+            {bli.agreement.agreement_type.name for bli in blis if bli.agreement and bli.agreement.agreement_type}
+        ),
+        "agreement_names": sorted(
+            {(bli.agreement.id, bli.agreement.display_name) for bli in blis if bli.agreement and bli.agreement.name}
+        ),
+        "can_active_periods": sorted({bli.can.active_period for bli in blis if bli.can and bli.can.active_period}),
+    }
+
+
+@pytest.mark.parametrize("user_id", [503, 521, 522])
+@pytest.mark.parametrize("only_my", [False, True])
+def test_filter_options_match_the_budget_lines(loaded_db, app_ctx, mocker, user_id, only_my):
+    user = loaded_db.get(User, user_id)
+    mocker.patch("ops_api.ops.services.budget_line_items.get_current_user", return_value=user)
+
+    options = BudgetLineItemService(loaded_db).get_filter_options({"only_my": [only_my], "enable_obe": [True]})
+    expected = _filter_options_from_objects(loaded_db, user, only_my, enable_obe=True)
+
+    assert options["fiscal_years"] == expected["fiscal_years"]
+    assert set(options["statuses"]) == expected["statuses"]
+    assert sorted((p["id"], p["name"]) for p in options["portfolios"]) == expected["portfolios"]
+    assert options["agreement_types"] == expected["agreement_types"]
+    assert sorted((a["id"], a["name"]) for a in options["agreement_names"]) == expected["agreement_names"]
+    assert options["can_active_periods"] == expected["can_active_periods"]
+    expected_min, expected_max = expected["budget_line_total_range"]
+    assert options["budget_line_total_range"]["min"] == pytest.approx(float(expected_min))
+    assert options["budget_line_total_range"]["max"] == pytest.approx(float(expected_max))
+
+
+def _count_filter_option_statements(session):
+    statements = []
+
+    def count_statement(conn, clauseelement, multiparams, params, execution_options):
+        statements.append(clauseelement)
+
+    connection = session.connection()
+    event.listen(connection, "before_execute", count_statement)
+    try:
+        BudgetLineItemService(session).get_filter_options({"only_my": [False], "enable_obe": [True]})
+    finally:
+        event.remove(connection, "before_execute", count_statement)
+    return len(statements)
+
+
+def _add_budget_lines(session, can, count):
+    session.add_all(
+        ContractBudgetLineItem(
+            line_description=f"Filter Option Budget Line {i}",
+            agreement_id=1,
+            can_id=can.id,
+            amount=1000 + i,
+            status=BudgetLineItemStatus.PLANNED,
+        )
+        for i in range(count)
+    )
+    session.commit()
+    session.expunge_all()
+
+
+def test_filter_options_do_not_grow_with_budget_lines(loaded_db, test_can, app_ctx):
+    statements_before = _count_filter_option_statements(loaded_db)
+
+    _add_budget_lines(loaded_db, test_can, EXTRA_BUDGET_LINE_COUNT)
+
+    # the budget lines are never loaded, so no query is issued per budget line
+    assert _count_filter_option_statements(loaded_db) == statements_before
+
+
+def _measure_filter_options(session):
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        BudgetLineItemService(session).get_filter_options({"only_my": [False], "enable_obe": [True]})
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak, elapsed
+
+
+@pytest.mark.benchmark
+def test_filter_options_benchmark(loaded_db, test_can, app_ctx):
+    budget_line_count = loaded_db.scalar(select(func.count(BudgetLineItem.id)))
+    # warm up the compiled statement cache, so both measurements only execute the queries
+    _measure_filter_options(loaded_db)
+    peak_before, elapsed_before = _measure_filter_options(loaded_db)
+
+    _add_budget_lines(loaded_db, test_can, BENCHMARK_BUDGET_LINE_COUNT)
+
+    peak_after, elapsed_after = _measure_filter_options(loaded_db)
+
+    logger.info(
+        f"BLI filter options with {budget_line_count} budget lines: {elapsed_before * 1000:.1f} ms, "
+        f"peak {peak_before} bytes; with {BENCHMARK_BUDGET_LINE_COUNT} more: {elapsed_after * 1000:.1f} ms, "
+        f"peak {peak_after} bytes"
+    )
+    # the budget lines are never loaded, so neither the memory used nor the latency follows their number
+    assert peak_after < peak_before * 1.5
+    assert elapsed_after < elapsed_before * 2
@@ -0,0 +1,112 @@
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func, select
+
+from models import Agreement, BudgetLineItem, OpsEvent, OpsEventStatus, OpsEventType
+from models.budget_line_item_totals import (
+    budget_line_item_totals_trigger_func,
+    get_affected_budget_lines,
+    refresh_budget_line_item_totals,
+    verify_budget_line_item_totals,
+)
+
+
+@pytest.fixture()
+def stored_totals(loaded_db):
+    refresh_budget_line_item_totals(loaded_db)
+    loaded_db.commit()
+    yield
+
+
+def test_refresh_matches_computed_totals(loaded_db, stored_totals, test_bli):
+    assert verify_budget_line_item_totals(loaded_db) == []
+
+    loaded_db.refresh(test_bli)
+    assert test_bli._fees == pytest.approx(test_bli.fees)
+    assert test_bli._total == pytest.approx(test_bli.total)
+
+
+def test_refresh_only_writes_out_of_date_rows(loaded_db, stored_totals, test_bli):
+    assert refresh_budget_line_item_totals(loaded_db) == 0
+
+    test_bli.amount = test_bli.amount + 1000
+    loaded_db.commit()
+    updated_on = test_bli.updated_on
+
+    assert [mismatch["budget_line_item_id"] for mismatch in verify_budget_line_item_totals(loaded_db)] == [test_bli.id]
+    assert refresh_budget_line_item_totals(loaded_db, budget_line_item_ids=[test_bli.id]) == 1
+    loaded_db.commit()
+
+    assert verify_budget_line_item_totals(loaded_db) == []
+    loaded_db.refresh(test_bli)
+    # refreshing derived values is not an update of the budget line
+    assert test_bli.updated_on == updated_on
+
+
+def test_refresh_is_restricted_to_agreements(loaded_db, stored_totals, test_bli):
+    test_bli.amount = test_bli.amount + 1000
+    loaded_db.commit()
+
+    other_agreement_id = loaded_db.scalar(select(func.max(Agreement.id)).where(Agreement.id != test_bli.agreement_id))
+    assert refresh_budget_line_item_totals(loaded_db, agreement_ids=[other_agreement_id]) == 0
+    assert refresh_budget_line_item_totals(loaded_db, agreement_ids=[test_bli.agreement_id]) == 1
+    assert refresh_budget_line_item_totals(loaded_db, agreement_ids=[], budget_line_item_ids=[]) == 0
+
+
+def test_stored_totals_are_used_when_enabled(loaded_db, stored_totals, mocker):
+    computed = loaded_db.execute(
+        select(BudgetLineItem.id, BudgetLineItem.fees, BudgetLineItem.total).order_by(BudgetLineItem.id)
+    ).all()
+
+    mocker.patch.object(BudgetLineItem, "use_stored_totals", True)
+    stmt = select(BudgetLineItem.id, BudgetLineItem.fees, BudgetLineItem.total).order_by(BudgetLineItem.id)
+    assert "procurement_shop_fee" not in str(stmt)
+
+    stored = loaded_db.execute(stmt).all()
+    assert [row.id for row in stored] == [row.id for row in computed]
+    for stored_row, computed_row in zip(stored, computed, strict=True):
+        assert Decimal(stored_row.fees or 0) == pytest.approx(Decimal(computed_row.fees or 0))
+        assert Decimal(stored_row.total or 0) == pytest.approx(Decimal(computed_row.total or 0))
+
+
+def test_procurement_shop_fee_change_affects_agreements_using_the_shop(loaded_db):
+    procurement_shop_id, agreement_id = loaded_db.execute(
+        select(Agreement.awarding_entity_id, Agreement.id).where(Agreement.awarding_entity_id.isnot(None)).limit(1)
+    ).one()
+    event = OpsEvent(
+        event_type=OpsEventType.UPDATE_PROCUREMENT_SHOP,
+        event_status=OpsEventStatus.SUCCESS,
+        event_details={"proc_shop_fee": {"owner_id": procurement_shop_id, "changes": {}}},
+    )
+
+    agreement_ids, budget_line_item_ids = get_affected_budget_lines(event, loaded_db)
+
+    assert agreement_id in agreement_ids
+    assert budget_line_item_ids == set()
+
+
+def test_trigger_refreshes_updated_budget_line(loaded_db, stored_totals, test_bli):
+    test_bli.amount = test_bli.amount + 1000
+    loaded_db.commit()
+
+    event = OpsEvent(
+        event_type=OpsEventType.UPDATE_BLI,
+        event_status=OpsEventStatus.SUCCESS,
+        event_details={
+            "bli": {"id": test_bli.id, "agreement_id": test_bli.agreement_id},
+            "bli_updates": {"changes": {"amount": {"old_value": 0, "new_value": float(test_bli.amount)}}},
+        },
+    )
+    assert get_affected_budget_lines(event, loaded_db) == ({test_bli.agreement_id}, {test_bli.id})
+
+    budget_line_item_totals_trigger_func(event, loaded_db)
+    loaded_db.commit()
+
+    assert verify_budget_line_item_totals(loaded_db) == []
+
+
+def test_unrelated_event_affects_no_budget_lines(loaded_db):
+    event = OpsEvent(event_type=OpsEventType.LOGIN_ATTEMPT, event_status=OpsEventStatus.SUCCESS, event_details={})
+
+    assert get_affected_budget_lines(event, loaded_db) == (set(), set())
@@ -13,9 +13,13 @@ from models import (
     GrantAgreement,
     GrantBudgetLineItem,
 )
+from ops_api.ops.utils import reporting_summary
 from ops_api.ops.utils.reporting_summary import (
+    AGREEMENT_TYPE_CONFIG,
+    ReportingSummaryCache,
     _accumulate_agreement_spending,
     get_agreement_spending_by_type,
+    get_reporting_summary,
 )
 
 
@@ -194,6 +198,48 @@ def test_get_agreement_spending_with_portfolio_ids(app, db_with_agreement_spendi
     assert type_map["GRANT"]["total"] > 0
 
 
+@pytest.mark.parametrize("fiscal_year", [2023, 2024, 2025])
+def test_get_agreement_spending_matches_agreement_properties(app, db_with_agreement_spending_data, fiscal_year):
+    """The grouped SQL totals match accumulating the award_type and total properties of every agreement."""
+    from models import Agreement
+
+    totals = {config["type"]: {"new": Decimal(0), "continuing": Decimal(0)} for config in AGREEMENT_TYPE_CONFIG}
+    for agreement in app.db_session.query(Agreement).all():
+        _accumulate_agreement_spending(agreement, fiscal_year, totals)
+
+    result = get_agreement_spending_by_type(app.db_session, fiscal_year)
+
+    type_map = {at["type"]: at for at in result["agreement_types"]}
+    for bucket_type, bucket in totals.items():
+        assert type_map[bucket_type]["new"] == pytest.approx(float(bucket["new"]))
+        assert type_map[bucket_type]["continuing"] == pytest.approx(float(bucket["continuing"]))
+
+
+def test_reporting_summary_cache(app, db_with_agreement_spending_data, app_ctx, mocker):
+    cache = ReportingSummaryCache(ttl=60)
+    spending_spy = mocker.spy(reporting_summary, "get_agreement_spending_by_type")
+
+    summary = get_reporting_summary(app.db_session, 2025, portfolio_ids=[2, 1], cache=cache)
+    assert get_reporting_summary(app.db_session, 2025, portfolio_ids=[1, 2], cache=cache) is summary
+    assert spending_spy.call_count == 1
+
+    get_reporting_summary(app.db_session, 2024, portfolio_ids=[1, 2], cache=cache)
+    assert spending_spy.call_count == 2
+
+    cache.ttl = 0
+    assert cache.get(2025, [1, 2]) is None
+
+
+def test_reporting_summary_cache_evicts_oldest_entry():
+    cache = ReportingSummaryCache(ttl=60, max_entries=2)
+    for fiscal_year in [2023, 2024, 2025]:
+        cache.set(fiscal_year, None, {"fiscal_year": fiscal_year})
+
+    assert cache.get(2023) is None
+    assert cache.get(2024) == {"fiscal_year": 2024}
+    assert cache.get(2025) == {"fiscal_year": 2025}
+
+
 def test_get_agreement_spending_with_nonexistent_portfolio_id(app, db_with_agreement_spending_data, app_ctx):
     result = get_agreement_spending_by_type(app.db_session, 2025, portfolio_ids=[999999])
 
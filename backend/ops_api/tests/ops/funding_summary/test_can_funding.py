@@ -5,8 +5,10 @@ from typing import Type
 import pytest
 from flask import url_for
 from flask.testing import FlaskClient
+from sqlalchemy import select
 
 from models.cans import CAN
+from ops_api.ops.utils.cans import calculate_can_funding, calculate_cans_funding
 
 
 class TestCANFundingSingleEndpoint:
@@ -198,6 +200,43 @@ class TestCANsFundingAggregateEndpoint:
         assert response.status_code == 400
 
 
+class TestCalculateCansFunding:
+    """Parity tests for the set-based funding calculation against calculate_can_funding."""
+
+    @pytest.mark.parametrize("fiscal_year", [None, 2021, 2022, 2023, 2024, 2025, 2044])
+    def test_matches_calculate_can_funding_for_every_can(self, loaded_db, fiscal_year) -> None:
+        cans = loaded_db.execute(select(CAN)).scalars().all()
+
+        funding_by_can = calculate_cans_funding(loaded_db, [can.id for can in cans], fiscal_year)
+
+        assert set(funding_by_can) == {can.id for can in cans}
+        for can in cans:
+            expected = calculate_can_funding(can, fiscal_year)
+            actual = funding_by_can[can.id]
+            assert actual.keys() == expected.keys()
+            for key, value in expected.items():
+                assert float(actual[key]) == pytest.approx(float(value)), f"CAN {can.id} {key}"
+
+    def test_no_can_ids(self, loaded_db) -> None:
+        assert calculate_cans_funding(loaded_db, [], 2023) == {}
+
+    def test_unknown_can_ids_are_omitted(self, loaded_db, test_can: CAN) -> None:
+        funding_by_can = calculate_cans_funding(loaded_db, [test_can.id, 99999], 2023)
+        assert list(funding_by_can) == [test_can.id]
+
+    def test_aggregate_endpoint_matches_calculate_can_funding(self, auth_client: FlaskClient, loaded_db) -> None:
+        response = auth_client.get(url_for("api.can-funding-aggregate"), query_string={"fiscal_year": 2023})
+        assert response.status_code == 200
+
+        can_ids = [can["id"] for can in response.json["cans"]]
+        cans = loaded_db.execute(select(CAN).where(CAN.id.in_(can_ids))).scalars().all()
+        expected_total = sum(float(calculate_can_funding(can, 2023)["total_funding"]) for can in cans)
+        expected_available = sum(float(calculate_can_funding(can, 2023)["available_funding"]) for can in cans)
+
+        assert response.json["funding"]["total_funding"] == pytest.approx(expected_total)
+        assert response.json["funding"]["available_funding"] == pytest.approx(expected_available)
+
+
 class TestCANFundingErrorCases:
     """Tests for error handling and edge cases."""
 
@@ -0,0 +1,204 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import select
+
+from models import (
+    CAN,
+    BudgetLineItem,
+    BudgetLineItemStatus,
+    CANFundingReceived,
+    CANFundingRollup,
+    ContractBudgetLineItem,
+    OpsEvent,
+    OpsEventStatus,
+    OpsEventType,
+    Portfolio,
+)
+from models.budget_line_item_totals import refresh_budget_line_item_totals, verify_budget_line_item_totals
+from models.can_funding_rollup import (
+    can_funding_rollup_trigger_func,
+    get_affected_can_ids,
+    rebuild_can_funding_rollup,
+    refresh_can_funding_rollup,
+    verify_can_funding_rollup,
+)
+from ops_api.ops.services.can_funding_rollup_messages import (
+    record_original_can_ids,
+    stored_totals_and_can_funding_rollup_trigger,
+)
+from ops_api.ops.utils.cans import calculate_cans_funding
+from ops_api.ops.utils.events import OpsEventHandler
+from ops_api.ops.utils.portfolios import get_total_funding_by_portfolio
+
+
+@pytest.fixture()
+def rollup(loaded_db):
+    rebuild_can_funding_rollup(loaded_db)
+    loaded_db.commit()
+    yield
+
+
+def test_rebuild_matches_source_tables(loaded_db, rollup):
+    assert verify_can_funding_rollup(loaded_db) == []
+
+
+def test_refresh_after_direct_change(loaded_db, rollup, test_can):
+    loaded_db.add(CANFundingReceived(can_id=test_can.id, fiscal_year=2023, funding=12345))
+    loaded_db.commit()
+
+    mismatches = verify_can_funding_rollup(loaded_db)
+    assert [mismatch["can_id"] for mismatch in mismatches] == [test_can.id]
+
+    refresh_can_funding_rollup(loaded_db, [test_can.id])
+    loaded_db.commit()
+
+    assert verify_can_funding_rollup(loaded_db) == []
+
+
+def test_refresh_keeps_one_row_per_key(loaded_db, rollup, test_can):
+    loaded_db.add(ContractBudgetLineItem(agreement_id=1, can_id=test_can.id, amount=777, date_needed=date(2043, 1, 1)))
+    loaded_db.commit()
+
+    refresh_can_funding_rollup(loaded_db, [test_can.id])
+    refresh_can_funding_rollup(loaded_db, [test_can.id])
+    loaded_db.commit()
+
+    keys = loaded_db.execute(
+        select(CANFundingRollup.fiscal_year, CANFundingRollup.status).where(CANFundingRollup.can_id == test_can.id)
+    ).all()
+    assert len(keys) == len(set(keys))
+    # the budget line without a status is not rolled up into the CAN's funding row
+    assert (2043, None) not in keys
+    assert verify_can_funding_rollup(loaded_db) == []
+
+
+def test_trigger_refreshes_can_of_new_budget_line(loaded_db, rollup, test_can):
+    bli = ContractBudgetLineItem(
+        agreement_id=1,
+        can_id=test_can.id,
+        amount=4321,
+        date_needed=date(2043, 1, 1),
+        status=BudgetLineItemStatus.PLANNED,
+    )
+    loaded_db.add(bli)
+    loaded_db.commit()
+
+    event = OpsEvent(
+        event_type=OpsEventType.CREATE_BLI,
+        event_status=OpsEventStatus.SUCCESS,
+        event_details={"new_bli": {"id": bli.id, "can_id": test_can.id}},
+    )
+    assert get_affected_can_ids(event, loaded_db) == {test_can.id}
+
+    can_funding_rollup_trigger_func(event, loaded_db)
+    loaded_db.commit()
+
+    assert verify_can_funding_rollup(loaded_db) == []
+
+
+def test_stored_totals_are_refreshed_before_the_rollup(loaded_db, test_bli, mocker):
+    mocker.patch.object(BudgetLineItem, "use_stored_totals", True)
+    refresh_budget_line_item_totals(loaded_db)
+    rebuild_can_funding_rollup(loaded_db)
+    test_bli.amount = test_bli.amount + 1000
+    loaded_db.commit()
+
+    event = OpsEvent(
+        event_type=OpsEventType.UPDATE_BLI,
+        event_status=OpsEventStatus.SUCCESS,
+        event_details={
+            "bli": {"id": test_bli.id, "agreement_id": test_bli.agreement_id, "can_id": test_bli.can_id},
+            "bli_updates": {"changes": {"amount": {"old_value": 0, "new_value": float(test_bli.amount)}}},
+        },
+    )
+    stored_totals_and_can_funding_rollup_trigger(event, loaded_db)
+    loaded_db.commit()
+
+    # the rollup was computed from the refreshed stored total of the budget line
+    assert verify_budget_line_item_totals(loaded_db) == []
+    assert verify_can_funding_rollup(loaded_db) == []
+
+
+def test_trigger_refreshes_old_and_new_can_of_moved_budget_line(loaded_db, test_bli):
+    event = OpsEvent(
+        event_type=OpsEventType.UPDATE_BLI,
+        event_status=OpsEventStatus.SUCCESS,
+        event_details={
+            "bli": {"id": test_bli.id, "can_id": 501},
+            "bli_updates": {"changes": {"can_id": {"old_value": 500, "new_value": 501}}},
+        },
+    )
+
+    assert get_affected_can_ids(event, loaded_db) == {500, 501}
+
+
+def test_trigger_refreshes_original_cans_of_updated_agreement(loaded_db, test_bli):
+    event = OpsEvent(
+        event_type=OpsEventType.UPDATE_AGREEMENT,
+        event_status=OpsEventStatus.SUCCESS,
+        event_details={"agreement_id": test_bli.agreement_id, "original_can_ids": [500]},
+    )
+
+    assert get_affected_can_ids(event, loaded_db) == {500, test_bli.can_id}
+
+
+def test_trigger_refreshes_original_cans_of_deleted_agreement(loaded_db):
+    event = OpsEvent(
+        event_type=OpsEventType.DELETE_AGREEMENT,
+        event_status=OpsEventStatus.SUCCESS,
+        event_details={"agreement_id": 1, "original_can_ids": [500, 501]},
+    )
+
+    assert get_affected_can_ids(event, loaded_db) == {500, 501}
+
+
+def test_record_original_can_ids(app, loaded_db, app_ctx, test_bli):
+    meta = OpsEventHandler(OpsEventType.UPDATE_AGREEMENT)
+
+    record_original_can_ids(meta, test_bli.agreement_id)
+    assert "original_can_ids" not in meta.metadata
+
+    app.config["USE_CAN_FUNDING_ROLLUP"] = True
+    try:
+        record_original_can_ids(meta, test_bli.agreement_id)
+    finally:
+        app.config["USE_CAN_FUNDING_ROLLUP"] = False
+    assert test_bli.can_id in meta.metadata["original_can_ids"]
+
+
+def test_unrelated_event_affects_no_cans(loaded_db):
+    event = OpsEvent(event_type=OpsEventType.LOGIN_ATTEMPT, event_status=OpsEventStatus.SUCCESS, event_details={})
+
+    assert get_affected_can_ids(event, loaded_db) == set()
+
+
+@pytest.mark.parametrize("fiscal_year", [None, 2023, 2024, 2043])
+def test_calculate_cans_funding_reads_rollup(app, loaded_db, rollup, fiscal_year):
+    can_ids = loaded_db.scalars(select(CAN.id)).all()
+    expected = calculate_cans_funding(loaded_db, can_ids, fiscal_year)
+
+    app.config["USE_CAN_FUNDING_ROLLUP"] = True
+    try:
+        actual = calculate_cans_funding(loaded_db, can_ids, fiscal_year)
+    finally:
+        app.config["USE_CAN_FUNDING_ROLLUP"] = False
+
+    assert actual.keys() == expected.keys()
+    for can_id, funding in expected.items():
+        for key, value in funding.items():
+            assert float(actual[can_id][key]) == pytest.approx(float(value)), f"CAN {can_id} {key}"
+
+
+@pytest.mark.parametrize("fiscal_year", [2023, 2024, 2043])
+def test_portfolio_funding_reads_rollup(app, loaded_db, rollup, fiscal_year):
+    portfolio_ids = loaded_db.scalars(select(Portfolio.id)).all()
+    expected = get_total_funding_by_portfolio(portfolio_ids, fiscal_year)
+
+    app.config["USE_CAN_FUNDING_ROLLUP"] = True
+    try:
+        actual = get_total_funding_by_portfolio(portfolio_ids, fiscal_year)
+    finally:
+        app.config["USE_CAN_FUNDING_ROLLUP"] = False
+
+    assert actual == expected
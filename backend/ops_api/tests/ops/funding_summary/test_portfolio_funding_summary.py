@@ -15,15 +15,17 @@ from models import (
     Portfolio,
 )
 from ops_api.ops.utils.portfolios import (
+    _build_total_funding,
     _get_all_budgets,
     _get_all_carry_forward_budgets,
     _get_all_new_funding_budgets,
     _get_budget_line_item_total_by_status,
+    _get_budget_line_item_total_by_statuses,
     _get_carry_forward_total,
     _get_new_funding_total,
     _get_total_fiscal_year_funding,
     get_percentage,
-    get_total_funding,
+    get_total_funding_by_portfolio,
 )
 
 
@@ -273,27 +275,49 @@ def test_get_budget_line_item_total_by_status(loaded_db):
     )
 
 
-@pytest.fixture
-def mock_portfolio():
-    return Portfolio(name="Test Portfolio", abbreviation="TP", status="IN_PROCESS", division_id=1)
+@pytest.mark.parametrize("fiscal_year", [2021, 2023, 2024, 2027, 2043])
+def test_get_total_funding_by_portfolio_matches_per_portfolio_totals(loaded_db, fiscal_year):
+    portfolios = loaded_db.execute(select(Portfolio).order_by(Portfolio.id)).scalars().all()
 
+    result = get_total_funding_by_portfolio([portfolio.id for portfolio in portfolios], fiscal_year)
 
-@patch("ops_api.ops.utils.portfolios._get_total_fiscal_year_funding", return_value=100000)
-@patch("ops_api.ops.utils.portfolios._get_carry_forward_total", return_value=5000)
-@patch("ops_api.ops.utils.portfolios._get_new_funding_total", return_value=5000)
-@patch("ops_api.ops.utils.portfolios._get_budget_line_item_total_by_statuses", return_value=30000)
-@patch(
-    "ops_api.ops.utils.portfolios._get_budget_line_item_total_by_status",
-    side_effect=lambda portfolio_id, fiscal_year, status: {
-        BudgetLineItemStatus.DRAFT: 10000,
-        BudgetLineItemStatus.OBLIGATED: 20000,
-        BudgetLineItemStatus.IN_EXECUTION: 5000,
-    }.get(status),
-)
-def test_get_total_funding_all_values(
-    mock_total_funding, mock_carry_forward, mock_budget_line_items, mock_statuses, mock_portfolio
-):
-    result = get_total_funding(mock_portfolio, 2025)
+    assert list(result) == [portfolio.id for portfolio in portfolios]
+    for portfolio in portfolios:
+        expected = {
+            "total_funding": _get_total_fiscal_year_funding(portfolio.id, fiscal_year),
+            "carry_forward_funding": _get_carry_forward_total(portfolio.id, fiscal_year),
+            "new_funding": _get_new_funding_total(portfolio.id, fiscal_year),
+            "draft_funding": _get_budget_line_item_total_by_status(
+                portfolio.id, fiscal_year, BudgetLineItemStatus.DRAFT
+            ),
+            "planned_funding": _get_budget_line_item_total_by_statuses(
+                portfolio.id, fiscal_year, [BudgetLineItemStatus.PLANNED, BudgetLineItemStatus.PLANNED_MOD]
+            ),
+            "obligated_funding": _get_budget_line_item_total_by_status(
+                portfolio.id, fiscal_year, BudgetLineItemStatus.OBLIGATED
+            ),
+            "in_execution_funding": _get_budget_line_item_total_by_status(
+                portfolio.id, fiscal_year, BudgetLineItemStatus.IN_EXECUTION
+            ),
+        }
+        for key, amount in expected.items():
+            assert result[portfolio.id][key]["amount"] == pytest.approx(float(amount)), f"{portfolio.id} {key}"
+
+
+def test_get_total_funding_by_portfolio_no_portfolios(loaded_db):
+    assert get_total_funding_by_portfolio([], 2023) == {}
+
+
+def test_build_total_funding_all_values():
+    result = _build_total_funding(
+        total_funding=Decimal(100000),
+        carry_forward_funding=Decimal(5000),
+        new_funding=Decimal(5000),
+        draft_funding=Decimal(10000),
+        planned_funding=Decimal(30000),
+        obligated_funding=Decimal(20000),
+        in_execution_funding=Decimal(5000),
+    )
 
     assert result["total_funding"]["amount"] == 100000
     assert result["carry_forward_funding"]["amount"] == 5000
@@ -305,18 +329,16 @@ def test_get_total_funding_all_values(
     assert result["new_funding"]["amount"] == 5000
 
 
-@patch("ops_api.ops.utils.portfolios._get_total_fiscal_year_funding", return_value=0)
-@patch("ops_api.ops.utils.portfolios._get_carry_forward_total", return_value=0)
-@patch("ops_api.ops.utils.portfolios._get_new_funding_total", return_value=0)
-@patch("ops_api.ops.utils.portfolios._get_budget_line_item_total_by_statuses", return_value=0)
-@patch(
-    "ops_api.ops.utils.portfolios._get_budget_line_item_total_by_status",
-    side_effect=lambda portfolio_id, fiscal_year, status: 0,
-)
-def test_get_total_funding_zero_values(
-    mock_total_funding, mock_carry_forward, mock_budget_line_items, mock_statuses, mock_portfolio
-):
-    result = get_total_funding(mock_portfolio, 2025)
+def test_build_total_funding_zero_values():
+    result = _build_total_funding(
+        total_funding=Decimal(0),
+        carry_forward_funding=Decimal(0),
+        new_funding=Decimal(0),
+        draft_funding=Decimal(0),
+        planned_funding=Decimal(0),
+        obligated_funding=Decimal(0),
+        in_execution_funding=Decimal(0),
+    )
 
     assert result["total_funding"]["amount"] == 0
     assert result["carry_forward_funding"]["amount"] == 0
@@ -328,22 +350,16 @@ def test_get_total_funding_zero_values(
     assert result["new_funding"]["amount"] == 0
 
 
-@patch("ops_api.ops.utils.portfolios._get_total_fiscal_year_funding", return_value=100000)
-@patch("ops_api.ops.utils.portfolios._get_carry_forward_total", return_value=10000)
-@patch("ops_api.ops.utils.portfolios._get_new_funding_total", return_value=90000)
-@patch("ops_api.ops.utils.portfolios._get_budget_line_item_total_by_statuses", return_value=20000)
-@patch(
-    "ops_api.ops.utils.portfolios._get_budget_line_item_total_by_status",
-    side_effect=lambda portfolio_id, fiscal_year, status: {
-        BudgetLineItemStatus.DRAFT: 10000,
-        BudgetLineItemStatus.OBLIGATED: 15000,
-        BudgetLineItemStatus.IN_EXECUTION: 5000,
-    }.get(status),
-)
-def test_get_total_funding_percentage(
-    mock_total_funding, mock_carry_forward, mock_budget_line_items, mock_statuses, mock_portfolio
-):
-    result = get_total_funding(mock_portfolio, 2025)
+def test_build_total_funding_percentage():
+    result = _build_total_funding(
+        total_funding=Decimal(100000),
+        carry_forward_funding=Decimal(10000),
+        new_funding=Decimal(90000),
+        draft_funding=Decimal(10000),
+        planned_funding=Decimal(20000),
+        obligated_funding=Decimal(15000),
+        in_execution_funding=Decimal(5000),
+    )
 
     assert result["draft_funding"]["percent"] == "10.0"
     assert result["planned_funding"]["percent"] == "20.0"
@@ -0,0 +1,150 @@
+"""
+Tests of the batched OpsDBHistory generation, and a benchmark of its per-object overhead against the per-object
+ORM path it replaced (run it with ``pytest -m benchmark -s`` to see the logged timings).
+"""
+
+import time
+
+import pytest
+from loguru import logger
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from models import CAN, BudgetLineItemStatus, GrantBudgetLineItem, OpsDBHistory, OpsDBHistoryType
+from models.utils import build_audit, build_db_history_rows, insert_db_history_rows
+
+OBJECT_COUNT = 50
+REPEAT = 5
+
+
+def _create_blis(loaded_db, can: CAN) -> list[GrantBudgetLineItem]:
+    blis = [
+        GrantBudgetLineItem(
+            line_description=f"History Batching {i}",
+            agreement_id=1,
+            can_id=can.id,
+            amount=1000 + i,
+            status=BudgetLineItemStatus.PLANNED,
+        )
+        for i in range(OBJECT_COUNT)
+    ]
+    loaded_db.add_all(blis)
+    loaded_db.commit()
+    return blis
+
+
+def test_db_history_loads_expired_objects_with_one_select(loaded_db, test_can, app_ctx):
+    blis = _create_blis(loaded_db, test_can)
+    # the commit expired the budget lines; setting an attribute does not load them
+    for i, bli in enumerate(blis):
+        bli.line_description = f"History Batching {i} (updated)"
+
+    selects = []
+
+    def record_selects(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            selects.append(statement)
+
+    engine = loaded_db.get_bind()
+    event.listen(engine, "before_cursor_execute", record_selects)
+    try:
+        with loaded_db.no_autoflush:
+            rows = build_db_history_rows(loaded_db, blis, OpsDBHistoryType.UPDATED, None)
+    finally:
+        event.remove(engine, "before_cursor_execute", record_selects)
+
+    # one SELECT for all the budget lines rather than one refresh per budget line
+    assert len(selects) == 1
+    assert len(rows) == OBJECT_COUNT
+    assert all(row["changes"]["line_description"]["new"].endswith("(updated)") for row in rows)
+    assert all(row["event_details"]["amount"] >= 1000 for row in rows)
+    loaded_db.rollback()
+
+
+def test_db_history_is_inserted_with_one_statement(loaded_db, test_can, app_ctx):
+    blis = _create_blis(loaded_db, test_can)
+    for bli in blis:
+        bli.line_description = f"{bli.line_description} (updated)"
+
+    history_inserts = []
+
+    def record_history_inserts(conn, clauseelement, multiparams, params, execution_options):
+        if getattr(clauseelement, "table", None) is OpsDBHistory.__table__:
+            rows = [row for row in multiparams if row.get("class_name") == "GrantBudgetLineItem"]
+            if rows:
+                history_inserts.append(rows)
+
+    connection = loaded_db.connection()
+    event.listen(connection, "before_execute", record_history_inserts)
+    try:
+        loaded_db.commit()
+    finally:
+        event.remove(connection, "before_execute", record_history_inserts)
+
+    # one executemany for all the updated budget lines
+    assert len(history_inserts) == 1
+    assert len(history_inserts[0]) == OBJECT_COUNT
+
+    row_keys = [str(bli.id) for bli in blis]
+    history = loaded_db.scalars(
+        select(OpsDBHistory).where(
+            OpsDBHistory.class_name == "GrantBudgetLineItem",
+            OpsDBHistory.event_type == OpsDBHistoryType.UPDATED,
+            OpsDBHistory.row_key.in_(row_keys),
+        )
+    ).all()
+    assert len(history) == OBJECT_COUNT
+    assert all(h.event_details["line_description"].endswith("(updated)") for h in history)
+
+
+def _per_object_history(objs, event_type: OpsDBHistoryType) -> list[OpsDBHistory]:
+    """The OpsDBHistory objects the session hooks used to add for each flushed object, with full to_dict details."""
+    result = []
+    for obj in objs:
+        db_audit = build_audit(obj, event_type)
+        if event_type == OpsDBHistoryType.UPDATED and not db_audit.changes:
+            continue
+        result.append(
+            OpsDBHistory(
+                event_type=event_type,
+                event_details=obj.to_dict(),
+                class_name=obj.__class__.__name__,
+                row_key=db_audit.row_key,
+                changes=db_audit.changes,
+            )
+        )
+    return result
+
+
+@pytest.mark.benchmark
+def test_db_history_per_object_overhead(loaded_db, test_can, app_ctx):
+    blis = _create_blis(loaded_db, test_can)
+    for bli in blis:
+        bli.line_description = f"{bli.line_description} (updated)"
+
+    # the history rows of the old path are flushed by a session of their own, so the budget lines stay dirty
+    history_session = Session(bind=loaded_db.connection())
+    with loaded_db.no_autoflush:
+        # warm up the compiled statement caches of both paths
+        history_session.add_all(_per_object_history(blis, OpsDBHistoryType.UPDATED))
+        history_session.flush()
+        insert_db_history_rows(loaded_db, build_db_history_rows(loaded_db, blis, OpsDBHistoryType.UPDATED, None))
+
+        started = time.perf_counter()
+        for _ in range(REPEAT):
+            history_session.add_all(_per_object_history(blis, OpsDBHistoryType.UPDATED))
+            history_session.flush()
+        per_object = (time.perf_counter() - started) / (REPEAT * OBJECT_COUNT)
+
+        started = time.perf_counter()
+        for _ in range(REPEAT):
+            insert_db_history_rows(loaded_db, build_db_history_rows(loaded_db, blis, OpsDBHistoryType.UPDATED, None))
+        batched = (time.perf_counter() - started) / (REPEAT * OBJECT_COUNT)
+    history_session.close()
+
+    logger.info(
+        f"OpsDBHistory overhead per flushed object: per-object to_dict path {per_object * 1000:.3f} ms, "
+        f"batched insert {batched * 1000:.3f} ms ({per_object / batched:.1f}x)"
+    )
+    assert batched < per_object
+    loaded_db.rollback()
@@ -11,7 +11,7 @@ from models.procurement_tracker import (
     ProcurementTrackerStepStatus,
     ProcurementTrackerStepType,
 )
-from ops_api.ops.resources.notifications import RecipientSchema
+from ops_api.ops.resources.notifications import NotificationListAPI, RecipientSchema
 
 
 def test_notification_retrieve(loaded_db, app_ctx):
@@ -418,3 +418,100 @@ def test_pre_award_notification_includes_step_with_approval_status(auth_client,
     loaded_db.delete(notification)
     loaded_db.delete(step)
     loaded_db.commit()
+
+
+@pytest.fixture()
+def admin_notifications(loaded_db, test_admin_user, app_ctx):
+    notifications = [
+        Notification(title=f"Paged Notification {i}", is_read=i == 0, recipient_id=test_admin_user.id) for i in range(3)
+    ]
+    loaded_db.add_all(notifications)
+    loaded_db.commit()
+
+    yield notifications
+
+    for notification in notifications:
+        loaded_db.delete(notification)
+    loaded_db.commit()
+
+
+def test_notifications_get_pages(auth_client, admin_notifications, test_admin_user, app_ctx):
+    response = auth_client.get(url_for("api.notifications-group", user_id=test_admin_user.id))
+    all_ids = [item["id"] for item in response.json]
+    assert len(all_ids) >= 3
+
+    paged_ids = []
+    cursor = None
+    while True:
+        params = {"user_id": test_admin_user.id, "limit": 2} | ({"cursor": cursor} if cursor else {})
+        response = auth_client.get(url_for("api.notifications-group", **params))
+        assert response.status_code == 200
+        assert len(response.json["data"]) <= 2
+        paged_ids.extend(item["id"] for item in response.json["data"])
+        cursor = response.json["next_cursor"]
+        if cursor is None:
+            break
+
+    assert paged_ids == all_ids
+
+
+def test_notifications_get_invalid_cursor(auth_client, app_ctx):
+    response = auth_client.get(url_for("api.notifications-group", cursor="not-a-cursor"))
+
+    assert response.status_code == 400
+
+
+def test_notifications_get_not_modified(auth_client, loaded_db, admin_notifications, test_admin_user, app_ctx, mocker):
+    url = url_for("api.notifications-group", user_id=test_admin_user.id)
+    response = auth_client.get(url)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    get_query = mocker.spy(NotificationListAPI, "_get_query")
+    response = auth_client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.data == b""
+    # only the aggregate ETag query runs
+    get_query.assert_not_called()
+
+    admin_notifications[1].is_read = True
+    loaded_db.commit()
+
+    response = auth_client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_notifications_get_not_modified_tracks_change_request(
+    auth_client, loaded_db, change_request_notification, app_ctx
+):
+    url = url_for(
+        "api.notifications-group",
+        agreement_id=change_request_notification.change_request.agreement_id,
+        oidc_id=str(change_request_notification.recipient.oidc_id),
+    )
+    response = auth_client.get(url)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    change_request_notification.change_request.status = ChangeRequestStatus.REJECTED
+    loaded_db.commit()
+
+    response = auth_client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json[0]["change_request"]["status"] == "REJECTED"
+
+
+def test_notifications_unread_count(auth_client, loaded_db, admin_notifications, test_admin_user, app_ctx):
+    db_count = (
+        loaded_db.query(Notification)
+        .filter(Notification.recipient_id == test_admin_user.id, Notification.is_read.is_(False))
+        .count()
+    )
+    assert db_count >= 2
+
+    response = auth_client.get(url_for("api.notifications-unread-count"))
+
+    assert response.status_code == 200
+    assert response.json == {"unread_count": db_count}
@@ -0,0 +1,164 @@
+import json
+
+import pytest
+from flask import url_for
+from sqlalchemy import event
+
+from models import Notification, NotificationType
+from ops_api.ops.resources.notifications import notification_stream
+from ops_api.ops.services.notifications import NotificationService
+from ops_api.ops.utils.notification_broker import (
+    RESYNC,
+    InProcessNotificationBroker,
+    collect_new_notifications,
+    create_notification_broker,
+    discard_pending_notifications,
+    mark_notifications_committed,
+    publish_committed_notifications,
+)
+
+
+def _payload(notification_id, recipient_id):
+    return {"id": notification_id, "recipient_id": recipient_id, "notification_type": "NOTIFICATION", "title": "t"}
+
+
+@pytest.fixture()
+def tracked_db(loaded_db):
+    def receive_after_flush(session, flush_context):
+        collect_new_notifications(session)
+
+    event.listen(loaded_db, "after_flush", receive_after_flush)
+    event.listen(loaded_db, "after_commit", mark_notifications_committed)
+    event.listen(loaded_db, "after_rollback", discard_pending_notifications)
+    yield loaded_db
+    event.remove(loaded_db, "after_flush", receive_after_flush)
+    event.remove(loaded_db, "after_commit", mark_notifications_committed)
+    event.remove(loaded_db, "after_rollback", discard_pending_notifications)
+
+
+def test_create_notification_broker_disabled_by_default(app):
+    assert create_notification_broker({}, app.engine) is None
+    assert app.notification_broker is None
+
+
+def test_notifications_are_delivered_to_their_recipient():
+    broker = InProcessNotificationBroker()
+    subscription = broker.subscribe(503)
+    other_subscription = broker.subscribe(504)
+
+    broker.publish([_payload(1, 503), _payload(2, 505)])
+
+    assert subscription.get(timeout=0) == _payload(1, 503)
+    assert subscription.get(timeout=0) is None
+    assert other_subscription.get(timeout=0) is None
+
+    broker.unsubscribe(subscription)
+    broker.publish([_payload(3, 503)])
+    assert subscription.get(timeout=0) is None
+
+
+def test_full_buffer_asks_the_client_to_resync():
+    broker = InProcessNotificationBroker(buffer_size=2)
+    subscription = broker.subscribe(503)
+
+    broker.publish([_payload(notification_id, 503) for notification_id in range(3)])
+
+    assert subscription.get(timeout=0) is RESYNC
+    assert subscription.get(timeout=0) is None
+
+
+def test_subscriptions_are_capped_per_process():
+    broker = InProcessNotificationBroker(max_subscriptions=2)
+    subscription = broker.subscribe(503)
+    assert broker.subscribe(504) is not None
+    assert broker.subscribe(505) is None
+
+    broker.unsubscribe(subscription)
+    broker.unsubscribe(subscription)
+    assert broker.subscribe(505) is not None
+    assert broker.subscribe(506) is None
+
+
+def test_notifications_are_published_after_commit(tracked_db, test_admin_user, app_ctx):
+    broker = InProcessNotificationBroker()
+    subscription = broker.subscribe(test_admin_user.id)
+    service = NotificationService(tracked_db)
+
+    notification = service.create({"title": "Approval Request", "recipient_id": test_admin_user.id}, commit=False)
+    publish_committed_notifications(broker, tracked_db)
+    assert subscription.get(timeout=0) is None
+
+    tracked_db.commit()
+    publish_committed_notifications(broker, tracked_db)
+    assert subscription.get(timeout=0) == {
+        "id": notification.id,
+        "recipient_id": test_admin_user.id,
+        "notification_type": NotificationType.NOTIFICATION.name,
+        "title": "Approval Request",
+    }
+
+    tracked_db.delete(notification)
+    tracked_db.commit()
+
+
+def test_rolled_back_notifications_are_not_published(tracked_db, test_admin_user, app_ctx):
+    broker = InProcessNotificationBroker()
+    subscription = broker.subscribe(test_admin_user.id)
+
+    tracked_db.add(Notification(title="Rolled back", recipient_id=test_admin_user.id))
+    tracked_db.flush()
+    tracked_db.rollback()
+    publish_committed_notifications(broker, tracked_db)
+
+    assert subscription.get(timeout=0) is None
+
+
+def test_notification_stream_events():
+    broker = InProcessNotificationBroker(buffer_size=1)
+    stream = notification_stream(broker, broker.subscribe(503), heartbeat=0.01, max_duration=5)
+
+    assert next(stream) == "retry: 10\n\n"
+    assert next(stream) == ": keep-alive\n\n"
+
+    broker.publish([_payload(1, 503)])
+    assert next(stream) == f"id: 1\nevent: notification\ndata: {json.dumps(_payload(1, 503))}\n\n"
+
+    broker.publish([_payload(2, 503), _payload(3, 503)])
+    assert next(stream) == "event: resync\ndata: {}\n\n"
+
+    stream.close()
+    broker.publish([_payload(4, 503)])
+    assert broker._subscriptions == {}
+
+
+def test_notification_stream_disabled(auth_client, app_ctx):
+    response = auth_client.get(url_for("api.notifications-stream"))
+    assert response.status_code == 204
+
+
+def test_notification_stream(auth_client, app, app_ctx, mocker):
+    mocker.patch.object(app, "notification_broker", InProcessNotificationBroker())
+    mocker.patch.dict(app.config, {"NOTIFICATION_STREAM_HEARTBEAT": 0.01, "NOTIFICATION_STREAM_MAX_DURATION": 0.05})
+
+    remove_session = mocker.spy(app.db_session, "remove")
+
+    response = auth_client.get(url_for("api.notifications-stream"))
+
+    # the view gives the connection of its session back to the pool before streaming
+    remove_session.assert_called()
+    assert response.status_code == 200
+    assert response.mimetype == "text/event-stream"
+    assert response.headers["Cache-Control"] == "no-cache"
+    assert response.get_data(as_text=True).startswith("retry: 10\n\n: keep-alive\n\n")
+
+
+def test_notification_stream_over_capacity(auth_client, app, app_ctx, mocker):
+    broker = InProcessNotificationBroker(max_subscriptions=1)
+    broker.subscribe(503)
+    mocker.patch.object(app, "notification_broker", broker)
+    mocker.patch.dict(app.config, {"NOTIFICATION_STREAM_MAX_DURATION": 300.0})
+
+    response = auth_client.get(url_for("api.notifications-stream"))
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "300"
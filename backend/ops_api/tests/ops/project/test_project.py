@@ -764,6 +764,39 @@ def test_project_list_metadata_serialization(auth_client, loaded_db):
     assert "2023" in project_data["fiscal_year_totals"] and "2024" in project_data["fiscal_year_totals"].keys()
 
 
+def test_project_list_matches_project_list_metadata(loaded_db, app_ctx):
+    """The list metadata computed in the database matches the project_list_metadata property."""
+    projects, metadata = ProjectsService(loaded_db).get_list({"limit": [200]})
+    assert len(projects) == metadata["count"] == loaded_db.query(Project).count()
+
+    amounts_by_type = {t.name: Decimal("0") for t in ProjectType}
+    for project in projects:
+        expected = project.project_list_metadata
+        actual = project.list_metadata
+        # fees are divided in the database, so compare the amounts approximately
+        assert actual["total"] == pytest.approx(expected["total"])
+        assert actual["total_by_fiscal_year"] == pytest.approx(expected["total_by_fiscal_year"])
+        for key in ["project_start", "project_end", "agreement_name_list"]:
+            assert actual[key] == expected[key], (project.id, key)
+        amounts_by_type[project.project_type.name] += expected["total"]
+
+    for type_name, amount in amounts_by_type.items():
+        assert metadata["summary"]["amounts_by_type"][type_name]["amount"] == pytest.approx(float(amount))
+
+
+def test_project_list_pages_in_the_database(loaded_db, app_ctx):
+    """Consecutive pages of the list are disjoint and follow the unpaginated order."""
+    service = ProjectsService(loaded_db)
+    sort = {"sort_field": ["project_total"], "sort_descending": [True]}
+    all_projects, _ = service.get_list({**sort, "limit": [200]})
+    first_page, _ = service.get_list({**sort, "limit": [2], "offset": [0]})
+    second_page, _ = service.get_list({**sort, "limit": [2], "offset": [2]})
+
+    assert [p.id for p in first_page + second_page] == [p.id for p in all_projects[:4]]
+    totals = [p.list_metadata["total"] for p in all_projects]
+    assert totals == sorted(totals, reverse=True)
+
+
 def test_project_list_metadata_agreement_name_list_property(loaded_db, test_project):
     """
     Test that the project_list_metadata property returns agreement_name_list correctly.
@@ -0,0 +1,149 @@
+from decimal import Decimal
+
+import pytest
+from flask import url_for
+
+from models import CAN, AgreementType, BudgetLineItemStatus, ContractAgreement, ContractBudgetLineItem, ResearchProject
+from models.search import search_pattern
+from ops_api.ops.auth.auth_types import Permission
+from ops_api.ops.services.search import SearchService
+
+
+@pytest.fixture()
+def search_data(loaded_db, app_ctx):
+    project = ResearchProject(title="Xylophone Acoustics Research", short_title="XAR", description="Test project")
+    loaded_db.add(project)
+    loaded_db.commit()
+
+    agreement = ContractAgreement(
+        name="Xylophone Acoustics Evaluation",
+        nick_name="XAE",
+        agreement_type=AgreementType.CONTRACT,
+        project_id=project.id,
+    )
+    can = CAN(number="G99XYLO", nick_name="Xylophone CAN", portfolio_id=1)
+    loaded_db.add_all([agreement, can])
+    loaded_db.commit()
+
+    bli = ContractBudgetLineItem(
+        line_description="Xylophone maintenance",
+        amount=Decimal("1000"),
+        status=BudgetLineItemStatus.DRAFT,
+        agreement_id=agreement.id,
+        can_id=can.id,
+    )
+    loaded_db.add(bli)
+    loaded_db.commit()
+
+    yield {"project": project, "agreement": agreement, "can": can, "bli": bli}
+
+    loaded_db.delete(bli)
+    loaded_db.delete(agreement)
+    loaded_db.delete(can)
+    loaded_db.delete(project)
+    loaded_db.commit()
+
+
+@pytest.mark.parametrize(
+    "search_term,expected",
+    [
+        ("contract", "%contract%"),
+        ("100%", "%100\\%%"),
+        ("FY_2025", "%FY\\_2025%"),
+        ("a\\b", "%a\\\\b%"),
+    ],
+)
+def test_search_pattern(search_term, expected):
+    assert search_pattern(search_term) == expected
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_search_returns_typed_hits(auth_client, search_data):
+    response = auth_client.get(url_for("api.search-list"), query_string={"q": "xylophone", "limit": 50})
+    assert response.status_code == 200
+    assert response.json["q"] == "xylophone"
+
+    hits = {(hit["type"], hit["id"]) for hit in response.json["results"]}
+    assert ("agreement", search_data["agreement"].id) in hits
+    assert ("project", search_data["project"].id) in hits
+    assert ("can", search_data["can"].id) in hits
+    assert ("budget_line_item", search_data["bli"].id) in hits
+
+    ranks = [hit["rank"] for hit in response.json["results"]]
+    assert ranks == sorted(ranks, reverse=True)
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_search_filters_types(auth_client, search_data):
+    response = auth_client.get(
+        url_for("api.search-list"), query_string={"q": "xylophone", "type": ["agreement", "can"], "limit": 50}
+    )
+    assert response.status_code == 200
+    assert {hit["type"] for hit in response.json["results"]} == {"agreement", "can"}
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_search_only_returns_permitted_types(auth_client, search_data, mocker):
+    # a user who may only read CANs
+    mocker.patch(
+        "ops_api.ops.resources.search._check_role",
+        side_effect=lambda permission_type, permission: permission == Permission.CAN,
+    )
+
+    response = auth_client.get(url_for("api.search-list"), query_string={"q": "xylophone"})
+    assert response.status_code == 200
+    assert {hit["type"] for hit in response.json["results"]} == {"can"}
+
+    response = auth_client.get(url_for("api.search-list"), query_string={"q": "xylophone", "type": "agreement"})
+    assert response.status_code == 403
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_search_requires_a_readable_type(no_perms_auth_client):
+    response = no_perms_auth_client.get(url_for("api.search-list"), query_string={"q": "xylophone"})
+    assert response.status_code == 403
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_search_matches_typo(loaded_db, search_data):
+    hits = SearchService(loaded_db).search("xylophon", ["agreement"], limit=50)
+    assert search_data["agreement"].id in [hit["id"] for hit in hits]
+
+    hits = SearchService(loaded_db).search("xylofone", ["can"], limit=50)
+    assert search_data["can"].id in [hit["id"] for hit in hits]
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_search_budget_line_item_by_id(loaded_db, search_data):
+    hits = SearchService(loaded_db).search(str(search_data["bli"].id), ["budget_line_item"], limit=5)
+    assert hits[0]["id"] == search_data["bli"].id
+    assert hits[0]["rank"] == 1.0
+
+
+@pytest.mark.usefixtures("app_ctx")
+@pytest.mark.parametrize("search_term", ["²", "99999999999"])
+def test_search_budget_line_item_by_invalid_id(auth_client, search_term):
+    # neither is a valid id, so only the descriptions are searched
+    response = auth_client.get(url_for("api.search-list"), query_string={"q": search_term, "type": "budget_line_item"})
+    assert response.status_code == 200
+    assert all(hit["rank"] < 1.0 for hit in response.json["results"])
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_search_escapes_wildcards(loaded_db, search_data):
+    assert SearchService(loaded_db).search("%", ["agreement", "project", "can"], limit=50) == []
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_search_validation(auth_client):
+    assert auth_client.get(url_for("api.search-list")).status_code == 400
+    assert auth_client.get(url_for("api.search-list"), query_string={"q": ""}).status_code == 400
+    assert auth_client.get(url_for("api.search-list"), query_string={"q": "x", "type": "vendor"}).status_code == 400
+    assert auth_client.get(url_for("api.search-list"), query_string={"q": "x", "limit": 51}).status_code == 400
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_agreements_search_uses_search_predicate(auth_client, search_data):
+    response = auth_client.get(url_for("api.agreements-group"), query_string={"search": "acoustics evaluation"})
+    assert response.status_code == 200
+    assert search_data["agreement"].id in [agreement["id"] for agreement in response.json["data"]]
@@ -8,6 +8,7 @@ from models import (
     AaAgreement,
     Agreement,
     AgreementReason,
+    AgreementSortCondition,
     AgreementType,
     AwardType,
     BudgetLineItem,
@@ -30,6 +31,14 @@ from ops_api.ops.services.agreements import (
     _compute_days_in_procurement_step,
     _compute_procurement_overview,
     _compute_procurement_step_summary,
+    agreement_total_sort,
+    end_date_sort,
+    fy_obligated_sort,
+    next_budget_line_sort,
+    next_obligate_by_sort,
+    project_sort,
+    resolve_fiscal_year,
+    start_date_sort,
 )
 from ops_api.ops.services.ops_service import ValidationError
 
@@ -613,6 +622,101 @@ class TestAgreementsAwardTypeFilter:
         assert meta_no_filter["count"] == meta_empty_filter["count"]
 
 
+class TestAgreementsDatabasePagination:
+    """Parity tests between the SQL-paged list and the in-memory (include_procurement) path."""
+
+    agreement_classes = [
+        ContractAgreement,
+        GrantAgreement,
+        IaaAgreement,
+        DirectAgreement,
+        AaAgreement,
+    ]
+
+    sort_keys = {
+        AgreementSortCondition.AGREEMENT: lambda a: a.name.casefold(),
+        AgreementSortCondition.PROJECT: project_sort,
+        AgreementSortCondition.TYPE: lambda a: str(a.agreement_type),
+        AgreementSortCondition.AGREEMENT_TOTAL: agreement_total_sort,
+        AgreementSortCondition.NEXT_BUDGET_LINE: next_budget_line_sort,
+        AgreementSortCondition.NEXT_OBLIGATE_BY: next_obligate_by_sort,
+        AgreementSortCondition.START: start_date_sort,
+        AgreementSortCondition.END: end_date_sort,
+        AgreementSortCondition.FY_OBLIGATED: lambda a: fy_obligated_sort(a, resolve_fiscal_year(None)),
+    }
+
+    @pytest.mark.parametrize("sort_descending", [False, True])
+    @pytest.mark.parametrize("sort_condition", list(AgreementSortCondition))
+    def test_sorted_page_matches_in_memory_sort(self, loaded_db, app_ctx, sort_condition, sort_descending):
+        service = AgreementsService(loaded_db)
+        data = {
+            "sort_conditions": [sort_condition],
+            "sort_descending": [sort_descending],
+            "limit": [100],
+            "offset": [0],
+        }
+
+        results, metadata = service.get_list(self.agreement_classes, dict(data))
+        expected, expected_metadata = service.get_list(self.agreement_classes, dict(data), include_procurement=True)
+
+        sort_key = self.sort_keys[sort_condition]
+        assert metadata["count"] == expected_metadata["count"]
+        assert [sort_key(a) for a in results] == [sort_key(a) for a in expected]
+
+    def test_unsorted_page_matches_in_memory_order(self, loaded_db, app_ctx):
+        service = AgreementsService(loaded_db)
+        data = {"limit": [25], "offset": [5]}
+
+        results, _ = service.get_list(self.agreement_classes, dict(data))
+        expected, _ = service.get_list(self.agreement_classes, dict(data), include_procurement=True)
+
+        assert [a.id for a in results] == [a.id for a in expected]
+
+    @pytest.mark.parametrize(
+        "filters",
+        [
+            {},
+            {"fiscal_year": [2043]},
+            {"portfolio": [1]},
+            {"budget_line_status": [BudgetLineItemStatus.PLANNED.name]},
+            {"award_type": ["NEW"]},
+        ],
+    )
+    def test_count_and_totals_match_in_memory(self, loaded_db, app_ctx, filters):
+        service = AgreementsService(loaded_db)
+        data = {**filters, "limit": [10], "offset": [0]}
+
+        _, metadata = service.get_list(self.agreement_classes, dict(data))
+        _, expected_metadata = service.get_list(self.agreement_classes, dict(data), include_procurement=True)
+
+        assert metadata["count"] == expected_metadata["count"]
+        totals, expected_totals = metadata["totals"], expected_metadata["totals"]
+        for key in [
+            "total_contract_amount",
+            "total_partner_amount",
+            "total_grant_amount",
+            "total_direct_obligation_amount",
+        ]:
+            assert totals[key] == pytest.approx(expected_totals[key])
+        for key in [
+            "total_agreements_count",
+            "type_counts",
+            "new_count",
+            "new_type_counts",
+            "continuing_count",
+            "continuing_type_counts",
+        ]:
+            assert totals[key] == expected_totals[key]
+
+    def test_only_loads_requested_page(self, loaded_db, app_ctx):
+        service = AgreementsService(loaded_db)
+
+        results, metadata = service.get_list(self.agreement_classes, {"limit": [3], "offset": [0]})
+
+        assert len(results) == min(3, metadata["count"])
+        assert metadata["procurement_overview"] is None
+
+
 class TestAgreementsAtomicCreation:
     """Test suite for atomic agreement creation with nested entities"""
 
@@ -0,0 +1,86 @@
+import pytest
+from flask import current_app
+from sqlalchemy import event, select
+
+from models import Agreement, BudgetLineItem, User
+from ops_api.ops.services.editability import EditabilityService
+from ops_api.ops.utils.agreements_helpers import check_user_association
+from ops_api.ops.utils.budget_line_items_helpers import (
+    compute_bli_editable,
+    compute_bli_is_deletable,
+    get_bli_locked_message,
+)
+from ops_api.ops.utils.users import is_super_user
+
+
+def _budget_line_item_meta(budget_line_item, user):
+    """The _meta of a budget line computed one budget line at a time, as the list endpoints used to."""
+    is_budget_team = "BUDGET_TEAM" in (role.name for role in user.roles)
+    agreement = budget_line_item.agreement
+    if not is_budget_team and not (agreement and check_user_association(agreement, user)):
+        return {"isEditable": False, "isDeletable": False, "lockedMessage": None}
+
+    is_super = is_super_user(user, current_app)
+    in_review = budget_line_item.in_review
+    return {
+        "isEditable": compute_bli_editable(budget_line_item, in_review, is_super),
+        "isDeletable": compute_bli_is_deletable(budget_line_item, in_review, is_super),
+        "lockedMessage": get_bli_locked_message(budget_line_item, in_review, is_super),
+    }
+
+
+@pytest.mark.parametrize("user_id", [503, 521, 522, 523])
+def test_budget_line_item_meta_matches_per_item_computation(loaded_db, app_ctx, user_id):
+    user = loaded_db.get(User, user_id)
+    budget_line_items = loaded_db.scalars(select(BudgetLineItem).order_by(BudgetLineItem.id)).all()
+
+    editability = EditabilityService(loaded_db, user).load(
+        [bli.id for bli in budget_line_items], [bli.agreement_id for bli in budget_line_items]
+    )
+
+    for bli in budget_line_items:
+        assert editability.budget_line_item_meta(bli.id, bli.agreement_id) == _budget_line_item_meta(bli, user)
+        assert editability.is_in_review(bli.id, bli.agreement_id) == bli.in_review
+
+
+@pytest.mark.parametrize("user_id", [503, 521, 522, 523])
+def test_agreement_editability_matches_per_item_computation(loaded_db, app_ctx, user_id):
+    user = loaded_db.get(User, user_id)
+    agreements = loaded_db.scalars(select(Agreement).order_by(Agreement.id)).all()
+
+    editability = EditabilityService(loaded_db, user).load([], [agreement.id for agreement in agreements])
+
+    for agreement in agreements:
+        expected = bool(user.is_superuser) or check_user_association(agreement, user)
+        assert editability.is_agreement_editable(agreement.id) == expected
+
+
+def _count_load_statements(session, user_id, budget_line_item_ids, agreement_ids):
+    statements = []
+
+    def count_statement(conn, clauseelement, multiparams, params, execution_options):
+        statements.append(clauseelement)
+
+    session.expunge_all()
+    user = session.get(User, user_id)
+    editability = EditabilityService(session, user)
+    connection = session.connection()
+    event.listen(connection, "before_execute", count_statement)
+    try:
+        editability.load(budget_line_item_ids, agreement_ids)
+        for bli_id, agreement_id in zip(budget_line_item_ids, agreement_ids, strict=True):
+            editability.budget_line_item_meta(bli_id, agreement_id)
+    finally:
+        event.remove(connection, "before_execute", count_statement)
+    return len(statements)
+
+
+def test_queries_do_not_grow_with_the_page(loaded_db, app_ctx):
+    rows = loaded_db.execute(select(BudgetLineItem.id, BudgetLineItem.agreement_id).order_by(BudgetLineItem.id)).all()
+    budget_line_item_ids = [row.id for row in rows]
+    agreement_ids = [row.agreement_id for row in rows]
+
+    small_page = _count_load_statements(loaded_db, 521, budget_line_item_ids[:2], agreement_ids[:2])
+    large_page = _count_load_statements(loaded_db, 521, budget_line_item_ids[:50], agreement_ids[:50])
+
+    assert large_page == small_page
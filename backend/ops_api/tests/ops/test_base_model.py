@@ -0,0 +1,56 @@
+from sqlalchemy import event, select
+
+from models import CAN, BudgetLineItem, CANFundingBudget, User
+
+
+def test_schema_instances_are_cached(app_ctx):
+    assert CAN.get_schema() is CAN.get_schema()
+    assert CAN.get_column_schema() is CAN.get_column_schema()
+    assert CAN.get_schema() is not BudgetLineItem.get_schema()
+
+
+def test_to_column_dict(loaded_db, test_can, app_ctx):
+    data = test_can.to_column_dict()
+    full_data = test_can.to_dict()
+
+    assert data["id"] == test_can.id
+    assert data["number"] == test_can.number
+    assert data["portfolio_id"] == test_can.portfolio_id
+    assert "portfolio" not in data
+    assert "budget_line_items" not in data
+    assert "created_by_user" not in data
+    assert all(data[key] == full_data[key] for key in data)
+
+
+def test_to_dicts_loads_users_in_one_query(loaded_db, app_ctx):
+    users = loaded_db.scalars(select(User).order_by(User.id).limit(2)).all()
+    budgets = loaded_db.scalars(select(CANFundingBudget).order_by(CANFundingBudget.id).limit(4)).all()
+    for budget in budgets:
+        budget.created_by = users[0].id
+        budget.updated_by = users[1].id
+    loaded_db.flush()
+    expected = [budget.to_dict() for budget in budgets]
+    budget_ids = [budget.id for budget in budgets]
+
+    loaded_db.expunge_all()
+    budgets = loaded_db.scalars(
+        select(CANFundingBudget).where(CANFundingBudget.id.in_(budget_ids)).order_by(CANFundingBudget.id)
+    ).all()
+
+    user_queries = []
+
+    def record_user_queries(conn, cursor, statement, parameters, context, executemany):
+        if "FROM ops_user" in statement:
+            user_queries.append(statement)
+
+    connection = loaded_db.connection()
+    event.listen(connection, "before_cursor_execute", record_user_queries)
+    try:
+        data = CANFundingBudget.to_dicts(budgets)
+    finally:
+        event.remove(connection, "before_cursor_execute", record_user_queries)
+
+    assert data == expected
+    assert len(user_queries) == 1
+
+    loaded_db.rollback()
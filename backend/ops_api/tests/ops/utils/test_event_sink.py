@@ -0,0 +1,126 @@
+import json
+
+import pytest
+
+from models.events import OpsEvent, OpsEventStatus, OpsEventType
+from ops_api.ops.utils.event_sink import BatchingOpsEventSink, create_ops_event_sink
+from ops_api.ops.utils.events import OpsEventHandler
+
+
+def _event(event_type=OpsEventType.GET_AGREEMENT):
+    return OpsEvent(
+        event_type=event_type,
+        event_status=OpsEventStatus.SUCCESS,
+        event_details={"request.json": {"name": "test"}},
+        created_by=503,
+    )
+
+
+@pytest.fixture()
+def mock_session(mocker):
+    mock_cm = mocker.patch("ops_api.ops.utils.event_sink.Session")
+    mock_session = mocker.MagicMock()
+    mock_cm.return_value.__enter__.return_value = mock_session
+    return mock_session
+
+
+def test_create_ops_event_sink_disabled_by_default(app):
+    assert create_ops_event_sink({}, app.engine) is None
+    assert app.ops_event_sink is None
+
+
+def test_events_are_bulk_inserted(mock_session, mocker):
+    sink = BatchingOpsEventSink(mocker.MagicMock(), batch_size=10, flush_interval=0.1)
+
+    for _ in range(3):
+        sink.write(_event())
+    sink.close()
+
+    inserted = [row for call in mock_session.execute.call_args_list for row in call.args[1]]
+    assert len(inserted) == 3
+    assert all(row["event_type"] == OpsEventType.GET_AGREEMENT for row in inserted)
+    assert all(row["created_by"] == 503 for row in inserted)
+    assert mock_session.commit.called
+
+
+def test_failed_inserts_are_spilled_and_replayed(mock_session, mocker, tmp_path):
+    spill_path = tmp_path / "ops_events.jsonl"
+    mock_session.execute.side_effect = Exception("database is down")
+
+    sink = BatchingOpsEventSink(mocker.MagicMock(), flush_interval=0.1, spill_path=str(spill_path))
+    sink.write(_event())
+    sink.write(_event(OpsEventType.LOGIN_ATTEMPT))
+    sink.close()
+
+    spilled = [json.loads(line) for line in spill_path.read_text().splitlines()]
+    assert [row["event_type"] for row in spilled] == ["GET_AGREEMENT", "LOGIN_ATTEMPT"]
+
+    mock_session.execute.side_effect = None
+    mock_session.execute.reset_mock()
+    BatchingOpsEventSink(mocker.MagicMock(), flush_interval=0.1, spill_path=str(spill_path)).close()
+
+    replayed = mock_session.execute.call_args.args[1]
+    assert [row["event_type"] for row in replayed] == [OpsEventType.GET_AGREEMENT, OpsEventType.LOGIN_ATTEMPT]
+    assert replayed[0]["event_details"] == {"request.json": {"name": "test"}}
+    assert not spill_path.exists()
+
+
+def test_unreadable_spilled_lines_are_skipped(mock_session, mocker, tmp_path):
+    spill_path = tmp_path / "ops_events.jsonl"
+    spill_path.write_text(
+        '{"event_type": "GET_AGREEMENT", "event_status": "SUCCESS", "event_details": {}, "created_by": 503, '
+        '"created_on": "2026-01-01T00:00:00"}\n'
+        # an event type that no longer exists, and a line truncated by a crash while it was appended
+        '{"event_type": "REMOVED", "event_status": "SUCCESS"}\n'
+        '{"event_type": "GET_AGR'
+    )
+
+    sink = BatchingOpsEventSink(mocker.MagicMock(), flush_interval=0.1, spill_path=str(spill_path))
+    sink.write(_event(OpsEventType.LOGIN_ATTEMPT))
+    sink.close()
+
+    inserted = [row["event_type"] for call in mock_session.execute.call_args_list for row in call.args[1]]
+    assert inserted == [OpsEventType.GET_AGREEMENT, OpsEventType.LOGIN_ATTEMPT]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_writer_keeps_running_when_the_spill_cannot_be_read(mock_session, mocker, tmp_path):
+    spill_path = tmp_path / "ops_events.jsonl"
+    spill_path.write_bytes(b"\xff\xfe not utf-8\n")
+    # left behind by a replay that did not finish
+    (tmp_path / "ops_events.jsonl.replay").write_text("{}\n")
+
+    sink = BatchingOpsEventSink(mocker.MagicMock(), flush_interval=0.1, spill_path=str(spill_path))
+    sink.write(_event())
+    sink.close()
+
+    inserted = [row["event_type"] for call in mock_session.execute.call_args_list for row in call.args[1]]
+    assert inserted == [OpsEventType.GET_AGREEMENT]
+    kept = sorted(path.name.rsplit("-", 1)[0] for path in tmp_path.iterdir())
+    assert kept == ["ops_events.jsonl.unfinished", "ops_events.jsonl.unreadable"]
+
+
+def test_ops_event_handler_uses_sink_for_events_without_subscribers(app, loaded_db, mocker, app_ctx):
+    mocker.patch("ops_api.ops.utils.events.request")
+    mock_cm = mocker.patch("ops_api.ops.utils.events.Session")
+    sink = mocker.MagicMock()
+    mocker.patch.object(app, "ops_event_sink", sink)
+
+    OpsEventHandler(OpsEventType.GET_AGREEMENT).__exit__(None, None, None)
+
+    assert sink.write.call_args.args[0].event_type == OpsEventType.GET_AGREEMENT
+    assert not mock_cm.called
+
+
+def test_ops_event_handler_commits_events_with_subscribers(app, loaded_db, mocker, app_ctx):
+    mocker.patch("ops_api.ops.utils.events.request")
+    mock_cm = mocker.patch("ops_api.ops.utils.events.Session")
+    mock_session = mocker.MagicMock()
+    mock_cm.return_value.__enter__.return_value = mock_session
+    sink = mocker.MagicMock()
+    mocker.patch.object(app, "ops_event_sink", sink)
+
+    OpsEventHandler(OpsEventType.UPDATE_BLI).__exit__(None, None, None)
+
+    assert mock_session.add.call_args.args[0].event_type == OpsEventType.UPDATE_BLI
+    assert not sink.write.called
@@ -0,0 +1,181 @@
+"""
+Tests of the JSON provider and response compression, and a benchmark of the largest list responses (run it with
+``pytest -m benchmark -s`` to see the logged timings and sizes).
+"""
+
+import gzip
+import json
+import time
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+
+import brotli
+import pytest
+from flask import url_for
+from flask.json.provider import DefaultJSONProvider
+from loguru import logger
+
+from models import AgreementType, BudgetLineItemStatus
+from ops_api.ops.utils.json_provider import OpsJSONProvider
+from ops_api.ops.utils.response import compress_response
+
+BENCHMARK_ROUNDS = 20
+
+
+@pytest.fixture()
+def provider(app):
+    return OpsJSONProvider(app)
+
+
+def test_app_uses_the_ops_json_provider(app):
+    assert isinstance(app.json, OpsJSONProvider)
+
+
+def test_values_are_encoded(provider):
+    value = {
+        "amount": Decimal("1234.50"),
+        "date": date(2024, 10, 1),
+        "datetime": datetime(2024, 10, 1, 12, 30, 5, 123456),
+        "status": BudgetLineItemStatus.PLANNED,
+        "type": AgreementType.CONTRACT,
+        "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+        2024: "fiscal year key",
+        "name": "Café",
+    }
+
+    assert json.loads(provider.dumps(value)) == {
+        "amount": "1234.50",
+        "date": "2024-10-01",
+        "datetime": "2024-10-01T12:30:05.123456",
+        "status": "PLANNED",
+        "type": AgreementType.CONTRACT.value,
+        "id": "12345678-1234-5678-1234-567812345678",
+        "2024": "fiscal year key",
+        "name": "Café",
+    }
+
+
+def test_responses_are_compact_unless_debugging(provider, app, mocker):
+    assert provider.response({"a": [1, 2]}).get_data() == b'{"a":[1,2]}\n'
+
+    mocker.patch.object(app, "debug", True)
+    assert provider.response({"a": [1, 2]}).get_data(as_text=True) == '{\n  "a": [\n    1,\n    2\n  ]\n}\n'
+
+
+def test_keys_are_sorted(provider):
+    assert provider.response({"b": 1, "a": {"d": 2, "c": 3}}).get_data() == b'{"a":{"c":3,"d":2},"b":1}\n'
+    assert provider.dumps({"b": 1, "a": 2}, indent=None) == '{"a": 2, "b": 1}'
+
+
+def test_loads(provider):
+    assert provider.loads('{"a": [1, 2.5, null, "b"]}') == {"a": [1, 2.5, None, "b"]}
+    assert provider.loads(b'{"a": true}') == {"a": True}
+
+
+def test_unknown_types_are_not_encoded(provider):
+    with pytest.raises(TypeError):
+        provider.dumps({"a": object()})
+
+
+def test_compress_response(app):
+    body = {"items": [{"id": i, "name": f"Item {i}"} for i in range(200)]}
+    with app.test_request_context(headers={"Accept-Encoding": "gzip, deflate"}):
+        response = compress_response(app.json.response(body), min_size=1024, level=6)
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.vary
+    assert json.loads(gzip.decompress(response.get_data())) == body
+
+
+def test_compress_response_weakens_the_etag(app):
+    body = {"items": [{"id": i, "name": f"Item {i}"} for i in range(200)]}
+    with app.test_request_context(headers={"Accept-Encoding": "br"}):
+        response = app.json.response(body)
+        response.add_etag()
+        etag, _ = response.get_etag()
+        response = compress_response(response, min_size=1024, level=6)
+
+    assert response.headers["Content-Encoding"] == "br"
+    assert response.get_etag() == (etag, True)
+    assert json.loads(brotli.decompress(response.get_data())) == body
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, body, mimetype",
+    [
+        (None, {"items": list(range(1000))}, None),
+        ("gzip", {"id": 1}, None),
+        ("gzip", "x" * 2000, "text/plain"),
+    ],
+)
+def test_compress_response_skipped(app, accept_encoding, body, mimetype):
+    headers = {"Accept-Encoding": accept_encoding} if accept_encoding else {}
+    with app.test_request_context(headers=headers):
+        response = app.response_class(body, mimetype=mimetype) if mimetype else app.json.response(body)
+        data = response.get_data()
+        response = compress_response(response, min_size=1024, level=6)
+
+    assert "Content-Encoding" not in response.headers
+    assert response.get_data() == data
+
+
+def test_large_responses_are_compressed(auth_client, app, app_ctx, mocker):
+    mocker.patch.dict(app.config, {"RESPONSE_COMPRESSION": True})
+
+    uncompressed = auth_client.get(url_for("api.agreements-group"))
+    compressed = auth_client.get(url_for("api.agreements-group"), headers={"Accept-Encoding": "gzip"})
+
+    assert compressed.status_code == 200
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert "Content-Encoding" not in uncompressed.headers
+    assert json.loads(gzip.decompress(compressed.get_data())) == uncompressed.json
+
+
+def _time_response(app, provider, obj, accept_encoding=None):
+    """The mean time to build the compressed (if ``accept_encoding`` is given) response, and its body."""
+    headers = {"Accept-Encoding": accept_encoding} if accept_encoding else {}
+    with app.test_request_context(headers=headers):
+        started = time.perf_counter()
+        for _ in range(BENCHMARK_ROUNDS):
+            response = compress_response(
+                provider.response(obj),
+                min_size=app.config["RESPONSE_COMPRESSION_MIN_SIZE"],
+                level=app.config["RESPONSE_COMPRESSION_LEVEL"],
+            )
+            body = response.get_data()
+        return (time.perf_counter() - started) / BENCHMARK_ROUNDS, body
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize(
+    "endpoint, query_string",
+    [
+        ("api.agreements-group", {}),
+        ("api.budget-line-items-group", {"enable_obe": True}),
+        ("api.can-funding-aggregate", {}),
+    ],
+)
+def test_large_response_encoding_benchmark(auth_client, app, app_ctx, endpoint, query_string):
+    response = auth_client.get(url_for(endpoint), query_string=query_string)
+    assert response.status_code == 200
+    obj = response.json
+
+    results = {}
+    for name, provider in [("ops", OpsJSONProvider(app)), ("flask", DefaultJSONProvider(app))]:
+        for accept_encoding in [None, "gzip", "br"]:
+            results[name, accept_encoding] = _time_response(app, provider, obj, accept_encoding)
+
+    logger.info(
+        f"{endpoint}: "
+        + ", ".join(
+            f"{name} {accept_encoding or 'identity'} {elapsed * 1000:.2f} ms / {len(body)} bytes"
+            for (name, accept_encoding), (elapsed, body) in results.items()
+        )
+    )
+    ops_elapsed, ops_body = results["ops", None]
+    flask_elapsed, flask_body = results["flask", None]
+    assert json.loads(ops_body) == json.loads(flask_body)
+    assert ops_elapsed < flask_elapsed
+    assert len(results["ops", "gzip"][1]) < len(ops_body)
+    assert len(results["ops", "br"][1]) < len(ops_body)
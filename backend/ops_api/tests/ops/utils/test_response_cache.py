@@ -0,0 +1,194 @@
+import fnmatch
+import time
+
+import pytest
+from flask import url_for
+from sqlalchemy import event, select, update
+
+from models import Division, OpsEvent, OpsEventStatus, OpsEventType
+from ops_api.ops.utils.response_cache import (
+    InProcessLRUBackend,
+    RedisResponseCacheBackend,
+    ResponseCache,
+    collect_executed_tables,
+    collect_flushed_tables,
+    create_response_cache,
+    discard_changed_tables,
+    invalidate_committed_tables,
+    response_cache_trigger_func,
+)
+
+
+class FakeRedis:
+    """The subset of the redis client used by RedisResponseCacheBackend."""
+
+    def __init__(self):
+        self.values = {}
+        self.expires_at = {}
+
+    def get(self, name):
+        if name in self.expires_at and time.monotonic() >= self.expires_at[name]:
+            self.delete(name)
+        return self.values.get(name)
+
+    def set(self, name, value, px=None):
+        self.values[name] = value
+        if px is not None:
+            self.expires_at[name] = time.monotonic() + px / 1000
+
+    def mget(self, names):
+        return [self.get(name) for name in names]
+
+    def incr(self, name):
+        self.values[name] = str(int(self.values.get(name) or 0) + 1)
+
+    def scan_iter(self, match):
+        return [name for name in list(self.values) if fnmatch.fnmatch(name, match)]
+
+    def delete(self, name):
+        self.values.pop(name, None)
+        self.expires_at.pop(name, None)
+
+
+@pytest.fixture(params=["memory", "redis"])
+def response_cache(request, app, mocker):
+    backend = InProcessLRUBackend() if request.param == "memory" else RedisResponseCacheBackend(FakeRedis())
+    cache = ResponseCache(backend)
+    mocker.patch.object(app, "response_cache", cache)
+    yield cache
+
+
+@pytest.fixture()
+def tracked_db(loaded_db, response_cache):
+    def receive_after_flush(session, flush_context):
+        collect_flushed_tables(session)
+
+    def receive_after_commit(session):
+        invalidate_committed_tables(response_cache, session)
+
+    event.listen(loaded_db, "after_flush", receive_after_flush)
+    event.listen(loaded_db, "after_commit", receive_after_commit)
+    event.listen(loaded_db, "do_orm_execute", collect_executed_tables)
+    event.listen(loaded_db, "after_rollback", discard_changed_tables)
+    yield loaded_db
+    event.remove(loaded_db, "after_flush", receive_after_flush)
+    event.remove(loaded_db, "after_commit", receive_after_commit)
+    event.remove(loaded_db, "do_orm_execute", collect_executed_tables)
+    event.remove(loaded_db, "after_rollback", discard_changed_tables)
+
+
+def test_create_response_cache_disabled_by_default(app):
+    assert create_response_cache({}) is None
+    assert app.response_cache is None
+
+
+def test_lru_backend_evicts_least_recently_used():
+    backend = InProcessLRUBackend(max_entries=2)
+    backend.set("a", "1", ttl=60)
+    backend.set("b", "2", ttl=60)
+    assert backend.get("a") == "1"
+
+    backend.set("c", "3", ttl=60)
+
+    assert backend.get("b") is None
+    assert backend.get("a") == "1"
+    assert backend.get("c") == "3"
+
+
+def test_backend_entries_expire(response_cache):
+    response_cache.backend.set("a", "1", ttl=0.01)
+    time.sleep(0.02)
+    assert response_cache.backend.get("a") is None
+
+
+def test_invalidating_a_table_changes_the_key(response_cache):
+    key = response_cache.key("divisions", ["division"])
+    assert response_cache.key("divisions", ["division"]) == key
+
+    response_cache.invalidate("ops_user")
+    assert response_cache.key("divisions", ["division"]) == key
+
+    response_cache.invalidate("division")
+    assert response_cache.key("divisions", ["division"]) != key
+
+
+def test_responses_are_cached(auth_client, loaded_db, response_cache, app_ctx):
+    first = auth_client.get(url_for("api.divisions-group"))
+    second = auth_client.get(url_for("api.divisions-group"))
+
+    assert first.status_code == 200
+    assert first.headers["X-Cache"] == "MISS"
+    assert second.status_code == 200
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.json == first.json
+
+    response_cache.invalidate("division")
+    assert auth_client.get(url_for("api.divisions-group")).headers["X-Cache"] == "MISS"
+
+
+def test_unauthorized_users_are_not_served_cached_responses(
+    auth_client, no_perms_auth_client, loaded_db, response_cache, app_ctx
+):
+    assert auth_client.get("/api/v1/budget-line-items-filters/").headers["X-Cache"] == "MISS"
+
+    response = no_perms_auth_client.get("/api/v1/budget-line-items-filters/")
+
+    assert response.status_code == 403
+    assert "X-Cache" not in response.headers
+
+
+def test_only_my_responses_are_not_shared_between_users(auth_client, loaded_db, response_cache, app_ctx, mocker):
+    url = "/api/v1/budget-line-items-filters/?only_my=true"
+    assert auth_client.get(url).headers["X-Cache"] == "MISS"
+    assert auth_client.get(url).headers["X-Cache"] == "HIT"
+
+    mocker.patch("ops_api.ops.utils.response_cache._permission_scope", return_value=["another user"])
+    assert auth_client.get(url).headers["X-Cache"] == "MISS"
+
+
+def test_committed_writes_invalidate_responses(tracked_db, response_cache):
+    key = response_cache.key("divisions", ["division"])
+    division = tracked_db.scalar(select(Division).order_by(Division.id))
+
+    division.name = f"{division.name} (renamed)"
+    tracked_db.flush()
+    assert response_cache.key("divisions", ["division"]) == key
+
+    tracked_db.commit()
+    assert response_cache.key("divisions", ["division"]) != key
+
+
+def test_core_updates_invalidate_responses(tracked_db, response_cache):
+    key = response_cache.key("divisions", ["division"])
+
+    tracked_db.execute(update(Division).where(Division.id == -1).values(name="nothing"))
+    tracked_db.commit()
+
+    assert response_cache.key("divisions", ["division"]) != key
+
+
+def test_rolled_back_writes_do_not_invalidate_responses(tracked_db, response_cache):
+    key = response_cache.key("divisions", ["division"])
+    division = tracked_db.scalar(select(Division).order_by(Division.id))
+
+    division.name = f"{division.name} (renamed)"
+    tracked_db.flush()
+    tracked_db.rollback()
+    tracked_db.commit()
+
+    assert response_cache.key("divisions", ["division"]) == key
+
+
+def test_events_invalidate_responses_on_commit(tracked_db, response_cache):
+    key = response_cache.key("procurement-shops", ["procurement_shop_fee"])
+    ops_event = OpsEvent(
+        event_type=OpsEventType.UPDATE_PROCUREMENT_SHOP,
+        event_status=OpsEventStatus.SUCCESS,
+        event_details={},
+    )
+
+    response_cache_trigger_func(ops_event, tracked_db)
+    assert response_cache.key("procurement-shops", ["procurement_shop_fee"]) == key
+
+    tracked_db.commit()
+    assert response_cache.key("procurement-shops", ["procurement_shop_fee"]) != key